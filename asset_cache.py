@@ -0,0 +1,415 @@
+"""
+Offline Content-Addressed Asset Cache for the Dynamic Shop Placer
+
+Every payload in product_data.json points at the Omniverse S3 bucket, so each
+scene build depends on remote fetches. This cache mirrors every referenced
+asset - and, for USD layers, all of their dependencies (sublayers,
+references, payloads, textures) - into a local content-addressed store:
+
+    <cache_dir>/objects/<first 2 hash chars>/<sha256><extension>
+    <cache_dir>/index.json    (url -> object, size, dependencies, last access)
+
+USD layers are stored with their dependency paths rewritten to the local
+copies, so a cached layer opens without any network access. The store can be
+size-bounded; least recently used entries are evicted first.
+
+Usage:
+    # Prefetch the whole catalog (run once per farm node)
+    python asset_cache.py prefetch --cache-dir ./asset_cache
+
+    # At placement time
+    cache = AssetCache("./asset_cache")
+    local_product_data = cache.localize_catalog(PRODUCT_DATA)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from urllib.parse import urljoin, urlparse
+
+from compact_catalog import CompactCatalog, load_catalog
+
+USD_EXTENSIONS = {".usd", ".usda", ".usdc"}
+CACHEABLE_SCHEMES = {"http", "https"}
+DEFAULT_TIMEOUT = 30  # seconds per download
+
+
+def is_cacheable(url):
+    """Return True for asset paths the cache can fetch (http/https URLs)."""
+    return urlparse(url).scheme in CACHEABLE_SCHEMES
+
+
+class AssetCache:
+    """Local content-addressed mirror of remote USD assets and their dependencies."""
+
+    def __init__(self, cache_dir, max_bytes=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            cache_dir (str): Directory of the cache (created if missing)
+            max_bytes (int): Optional size bound; least recently used entries are evicted
+            timeout (float): Download timeout in seconds
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+
+    # ------------------------------------------------------------------
+    # Index handling
+    # ------------------------------------------------------------------
+
+    def _load_index(self):
+        """Load the url -> entry index from disk."""
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            print(f"Warning: Asset cache index is corrupt, starting empty: {e}")
+            return {}
+
+    def _save_index(self):
+        """Write the index atomically."""
+        temp_path = self.index_path.with_suffix(".json.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(temp_path, self.index_path)
+
+    def _object_path(self, digest, extension):
+        """Return the store path of an object."""
+        return self.objects_dir / digest[:2] / f"{digest}{extension}"
+
+    def _store_bytes(self, data, extension):
+        """Store bytes under their content hash (deduplicated) and return (digest, path)."""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest, extension)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=object_path.parent)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, object_path)
+        return digest, object_path
+
+    def _entry_is_complete(self, url, visited=None):
+        """Check that an entry and (recursively) all of its dependencies are on disk."""
+        visited = visited if visited is not None else set()
+        if url in visited:
+            return True
+        visited.add(url)
+        entry = self.index.get(url)
+        if entry is None or not (self.cache_dir / entry["path"]).exists():
+            return False
+        return all(self._entry_is_complete(dep, visited) for dep in entry.get("dependencies", []))
+
+    def _touch(self, url, visited=None):
+        """Mark an entry and its dependencies as recently used."""
+        visited = visited if visited is not None else set()
+        if url in visited or url not in self.index:
+            return
+        visited.add(url)
+        self.index[url]["last_access"] = time.time()
+        for dependency_url in self.index[url].get("dependencies", []):
+            self._touch(dependency_url, visited)
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _download(self, url):
+        """Download a URL and return its bytes."""
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return response.read()
+
+    def _localize_layer(self, url, data, extension, in_progress):
+        """
+        Rewrite the dependency paths of a downloaded USD layer to cached copies.
+
+        Returns:
+            tuple: (rewritten layer bytes, list of dependency URLs)
+        """
+        from pxr import Sdf, UsdUtils
+
+        dependencies = []
+
+        def localize(asset_path):
+            if not asset_path or "<UDIM>" in asset_path:
+                return asset_path
+            dependency_url = urljoin(url, asset_path)
+            if not is_cacheable(dependency_url):
+                return asset_path
+            local_path = self._fetch(dependency_url, in_progress)
+            if local_path is None:
+                # Keep the original path (e.g. MDL modules resolved through search paths)
+                return asset_path
+            dependencies.append(dependency_url)
+            return Path(local_path).as_posix()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = Path(temp_dir) / f"source{extension}"
+            source_path.write_bytes(data)
+            layer = Sdf.Layer.OpenAsAnonymous(str(source_path))
+            if layer is None:
+                raise ValueError(f"Could not open USD layer downloaded from {url}")
+            UsdUtils.ModifyAssetPaths(layer, localize)
+            output_path = Path(temp_dir) / f"localized{extension}"
+            layer.Export(str(output_path))
+            return output_path.read_bytes(), dependencies
+
+    def _fetch(self, url, in_progress):
+        """Fetch one URL (and its dependencies) into the cache, returning the local path or None."""
+        with self._lock:
+            if url in self.index and self._entry_is_complete(url):
+                self._touch(url)
+                return str(self.cache_dir / self.index[url]["path"])
+            if url in in_progress:
+                # Dependency cycle: the referencing layer keeps the remote path
+                return None
+            in_progress.add(url)
+
+        try:
+            data = self._download(url)
+            extension = PurePosixPath(urlparse(url).path).suffix.lower()
+            dependencies = []
+            if extension in USD_EXTENSIONS:
+                data, dependencies = self._localize_layer(url, data, extension, in_progress)
+        except Exception as e:
+            print(f"Warning: Could not cache {url}: {e}")
+            return None
+        finally:
+            with self._lock:
+                in_progress.discard(url)
+
+        with self._lock:
+            digest, object_path = self._store_bytes(data, extension)
+            self.index[url] = {
+                "hash": digest,
+                "path": object_path.relative_to(self.cache_dir).as_posix(),
+                "size": len(data),
+                "dependencies": sorted(set(dependencies)),
+                "last_access": time.time(),
+            }
+            return str(object_path)
+
+    def fetch(self, url):
+        """
+        Return the local path of an asset, downloading it and its dependencies if needed.
+
+        Non-http(s) paths are returned unchanged. Returns None if the download failed.
+        """
+        if not is_cacheable(url):
+            return url
+        local_path = self._fetch(url, set())
+        with self._lock:
+            if local_path is not None:
+                self.evict(keep={url})
+            self._save_index()
+        return local_path
+
+    def download(self, url):
+        """
+        Fetch one asset without evicting or saving the index (for batches; call commit() afterwards).
+
+        Safe to call from several threads. Non-http(s) paths are returned unchanged,
+        None if the download failed.
+        """
+        if not is_cacheable(url):
+            return url
+        return self._fetch(url, set())
+
+    def commit(self, keep=()):
+        """Evict down to the size bound (never the assets in keep) and save the index."""
+        with self._lock:
+            self.evict(keep=set(keep))
+            self._save_index()
+
+    def resolve(self, url):
+        """Return the local path of a cached asset without downloading, or None."""
+        with self._lock:
+            if url in self.index and self._entry_is_complete(url):
+                self._touch(url)
+                return str(self.cache_dir / self.index[url]["path"])
+        return None
+
+    # ------------------------------------------------------------------
+    # Catalog helpers
+    # ------------------------------------------------------------------
+
+    def prefetch(self, asset_urls, max_workers=8):
+        """
+        Fetch many assets concurrently.
+
+        Returns:
+            dict: url -> local path (None for assets that failed)
+        """
+        unique_urls = sorted({url for url in asset_urls if is_cacheable(url)})
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            local_paths = dict(zip(unique_urls, executor.map(self.download, unique_urls)))
+        self.commit(keep=unique_urls)
+        return local_paths
+
+    def prefetch_catalog(self, product_data, max_workers=8):
+        """Fetch every asset referenced by a product catalog."""
+        return self.prefetch(get_catalog_assets(product_data), max_workers)
+
+    def localize_catalog(self, product_data, fetch=True):
+        """
+        Return a copy of the catalog with asset URLs replaced by local cached paths.
+
+        Args:
+            product_data (dict or CompactCatalog): Product data (product_id -> data)
+            fetch (bool): Download missing assets; otherwise only use what is cached
+
+        Products whose asset is not available locally keep their remote URL.
+        """
+        urls = get_catalog_assets(product_data)
+        if fetch:
+            local_paths = self.prefetch(urls)
+        else:
+            local_paths = {url: self.resolve(url) for url in urls}
+            with self._lock:
+                self._save_index()
+
+        missing = {url for url in urls if not local_paths.get(url) and is_cacheable(url)}
+        for url in sorted(missing):
+            print(f"Warning: {url} is not cached, using remote path")
+        return apply_local_paths(product_data, local_paths)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def total_size(self):
+        """Total size in bytes of all objects referenced by the index."""
+        with self._lock:
+            return sum(entry["size"] for entry in {e["hash"]: e for e in self.index.values()}.values())
+
+    def evict(self, keep=()):
+        """
+        Evict least recently used entries until the store fits in max_bytes.
+
+        Entries in `keep` and their dependencies are never evicted. Objects
+        shared by several URLs are only deleted once no entry references them.
+
+        Returns:
+            list: Evicted URLs
+        """
+        if self.max_bytes is None:
+            return []
+        with self._lock:
+            protected = set()
+            pending = list(keep)
+            while pending:
+                url = pending.pop()
+                if url in protected or url not in self.index:
+                    continue
+                protected.add(url)
+                pending.extend(self.index[url].get("dependencies", []))
+
+            evicted = []
+            total_size = self.total_size()
+            candidates = sorted((url for url in self.index if url not in protected),
+                                key=lambda url: self.index[url]["last_access"])
+            for url in candidates:
+                if total_size <= self.max_bytes:
+                    break
+                entry = self.index.pop(url)
+                evicted.append(url)
+                if not any(other["hash"] == entry["hash"] for other in self.index.values()):
+                    (self.cache_dir / entry["path"]).unlink(missing_ok=True)
+                    total_size -= entry["size"]
+            return evicted
+
+    def clear(self):
+        """Remove every cached object and the index."""
+        with self._lock:
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.index = {}
+            self._save_index()
+
+
+def get_catalog_assets(product_data):
+    """Return the set of asset paths referenced by a catalog (dict or CompactCatalog)."""
+    if isinstance(product_data, CompactCatalog):
+        return set(product_data.get_assets())
+    return {data["asset"] for data in product_data.values()}
+
+
+def apply_local_paths(product_data, local_paths):
+    """
+    Return a copy of a catalog with asset URLs replaced by local paths.
+
+    Args:
+        product_data (dict or CompactCatalog): Product data (product_id -> data)
+        local_paths (dict): url -> local path (None for assets that are not available locally)
+    """
+    # Compact catalogs store each asset once per SKU
+    if isinstance(product_data, CompactCatalog):
+        return product_data.with_assets({url: Path(local_path).as_posix()
+                                         for url, local_path in local_paths.items() if local_path})
+
+    localized = {}
+    for product_id, data in product_data.items():
+        local_path = local_paths.get(data["asset"])
+        if local_path:
+            localized[product_id] = dict(data, asset=Path(local_path).as_posix())
+        else:
+            localized[product_id] = data
+    return localized
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Offline asset cache for the Dynamic Shop Placer")
+    parser.add_argument("command", choices=["prefetch", "info", "clear"])
+    parser.add_argument("--cache-dir", default=str(Path(__file__).parent / "asset_cache"),
+                        help="Cache directory")
+    parser.add_argument("--catalog", default=str(Path(__file__).parent / "assets" / "product_data.json"),
+                        help="Product catalog: .json, .ndjson, .npz or .npy directory")
+    parser.add_argument("--max-size-mb", type=float, default=None,
+                        help="Size bound for the cache (LRU eviction)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads")
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb else None
+    cache = AssetCache(args.cache_dir, max_bytes=max_bytes)
+
+    if args.command == "prefetch":
+        try:
+            product_data = load_catalog(args.catalog)
+        except Exception as e:
+            print(f"❌ Failed to load product data: {e}")
+            return
+        start = time.perf_counter()
+        local_paths = cache.prefetch_catalog(product_data, max_workers=args.workers)
+        failed = [url for url, path in local_paths.items() if path is None]
+        print(f"Cached {len(local_paths) - len(failed)} of {len(local_paths)} assets "
+              f"({len(cache.index)} files, {cache.total_size() / 1024 / 1024:.1f} MB) "
+              f"in {time.perf_counter() - start:.1f}s")
+        for url in failed:
+            print(f"❌ {url}")
+    elif args.command == "info":
+        print(f"Cache directory: {cache.cache_dir}")
+        print(f"Cached files: {len(cache.index)}")
+        print(f"Total size: {cache.total_size() / 1024 / 1024:.1f} MB")
+    elif args.command == "clear":
+        cache.clear()
+        print(f"Cleared asset cache at {cache.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Pipelined Async Scene Setup for the Dynamic Shop Placer
+
+Opening the empty shop, reading and randomizing the catalog, fetching the
+product assets and placing the products used to run one after another, and
+payload fetches were only discovered one product at a time. The pipeline
+overlaps them:
+
+    open    |=========|
+    catalog |==|
+    prefetch   |===========================|   (bounded concurrency, catalog order)
+    hierarchy           |=|
+    placement             |=================|  (each product as soon as its asset is local)
+
+The stage work (hierarchy, placement) stays on the event loop thread, where
+editing the stage is safe; catalog preparation and asset downloads run in
+worker threads. Every stage is timed and reported.
+
+The pipeline only takes callables, so it runs against Kit's USD context as
+well as a plain usd-core stage (see helpers/test_async_setup.py).
+
+Usage:
+    result = await run_setup_pipeline(
+        open_stage=placer.load_empty_shop,
+        prepare_products=placer.prepare_products,
+        create_hierarchy=placer.create_product_hierarchy,
+        place_product=placer.place_product,
+        fetch_asset=AssetCache("./asset_cache").download,
+    )
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from asset_cache import apply_local_paths
+from placement_scheduler import FrameBudget, PlacementCancelled, place_in_chunks
+
+DEFAULT_PREFETCH_CONCURRENCY = 8
+
+
+class StageTimer:
+    """Record start and end of named setup stages relative to a common origin."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = {}  # name -> [start, end] in seconds since origin
+
+    def start(self, name):
+        self.stages[name] = [time.perf_counter() - self.origin, None]
+
+    def stop(self, name):
+        self.stages[name][1] = time.perf_counter() - self.origin
+
+    @contextmanager
+    def measure(self, name):
+        """Time the body of a with block (also around awaits)."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    async def measure_async(self, name, awaitable):
+        """Await an awaitable and time it; returns its result."""
+        with self.measure(name):
+            return await awaitable
+
+    def get_timings(self):
+        """
+        Returns:
+            dict: stage name -> {"start", "end", "seconds"} for every finished stage
+        """
+        return {name: {"start": start, "end": end, "seconds": end - start}
+                for name, (start, end) in self.stages.items() if end is not None}
+
+    def report(self):
+        """Print the stage timeline and return get_timings()."""
+        timings = self.get_timings()
+        print("Setup stage timings:")
+        print(f"  {'stage':<10s} {'start (s)':>9s} {'end (s)':>9s} {'duration (s)':>12s}")
+        for name, timing in sorted(timings.items(), key=lambda item: item[1]["start"]):
+            print(f"  {name:<10s} {timing['start']:9.3f} {timing['end']:9.3f} {timing['seconds']:12.3f}")
+        return timings
+
+
+def ordered_assets(product_data):
+    """Return the unique asset paths of a catalog in the order products are placed."""
+    return list(dict.fromkeys(data["asset"] for data in product_data.values()))
+
+
+class AssetPrefetcher:
+    """Fetch assets in worker threads with bounded concurrency, awaitable per asset."""
+
+    def __init__(self, fetch, max_concurrency=DEFAULT_PREFETCH_CONCURRENCY):
+        """
+        Args:
+            fetch (callable): url -> local path, or None if the asset could not be fetched
+                (e.g. AssetCache.download); called from worker threads
+            max_concurrency (int): Maximum number of fetches in flight
+        """
+        self.fetch = fetch
+        self.max_concurrency = max_concurrency
+        self.executor = None
+        self.futures = {}
+
+    def start(self, urls):
+        """Queue the fetches in the given order (earlier URLs are fetched first)."""
+        loop = asyncio.get_running_loop()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="asset_prefetch")
+        for url in urls:
+            if url not in self.futures:
+                self.futures[url] = loop.run_in_executor(self.executor, self._fetch, url)
+        return self
+
+    def _fetch(self, url):
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            print(f"Warning: Could not prefetch {url}: {e}")
+            return None
+
+    def is_ready(self, url):
+        """True once the fetch of an asset has finished (or when it was never queued)."""
+        future = self.futures.get(url)
+        return future is None or future.done()
+
+    def localize(self, data):
+        """Return product data pointing at the fetched local copy of its asset (unchanged if not fetched)."""
+        future = self.futures.get(data["asset"])
+        if future is None or not future.done() or future.cancelled() or future.exception() or not future.result():
+            return data
+        return dict(data, asset=Path(future.result()).as_posix())
+
+    async def wait(self, url):
+        """Return the local path of an asset once fetched, or None if it failed or was never queued."""
+        future = self.futures.get(url)
+        if future is None:
+            return None
+        return await future
+
+    async def join(self):
+        """
+        Wait for every queued fetch.
+
+        Returns:
+            dict: url -> local path (None for assets that failed)
+        """
+        if self.futures:
+            await asyncio.gather(*self.futures.values(), return_exceptions=True)
+        self.close()
+        return {url: future.result() for url, future in self.futures.items()
+                if not future.cancelled() and future.exception() is None}
+
+    def cancel(self):
+        """Drop the fetches that have not started yet (running downloads finish in the background)."""
+        for future in self.futures.values():
+            future.cancel()
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+async def run_setup_pipeline(open_stage, prepare_products, place_product=None, place_all=None,
+                             create_hierarchy=None, fetch_asset=None, on_assets_fetched=None,
+                             max_concurrency=DEFAULT_PREFETCH_CONCURRENCY, timer=None,
+                             frame_budget=None, chunk_context=None, progress=None):
+    """
+    Open the stage, prefetch the assets and place the products as one overlapping pipeline.
+
+    Exactly one of place_product and place_all is used. place_product places the
+    products in catalog order, each as soon as its asset is local, so placement
+    starts while later assets are still downloading. Placement runs in chunks
+    under frame_budget (placement_scheduler.py), yielding to the event loop
+    between chunks. place_all gets the whole localized catalog once every asset
+    is fetched (PointInstancer authoring).
+
+    Args:
+        open_stage (coroutine function): Opens the stage, returns True on success; None = already open
+        prepare_products (callable): Returns the (randomized) product data to place; runs in a worker thread
+        place_product (callable): (product_id, data) -> bool, called on the event loop thread
+        place_all (callable): (product data) -> bool, called on the event loop thread
+        create_hierarchy (callable): () -> bool, called once the stage is open; None = skip
+        fetch_asset (callable): url -> local path or None, runs in worker threads; None = use assets as is
+        on_assets_fetched (callable): Called with the fetched URLs when the prefetch is done
+            (e.g. AssetCache.commit to save the cache index)
+        max_concurrency (int): Maximum number of asset fetches in flight
+        timer (StageTimer): Timer to record the stages in, None = a new one
+        frame_budget (FrameBudget): Per-frame budget and cancellation token, None = place in one chunk
+        chunk_context (callable): Context manager factory entered around each chunk (e.g. Sdf.ChangeBlock)
+        progress (callable): (done, total) called after every placement chunk
+
+    Returns:
+        dict: success, cancelled, placed and product counts, placed and failed product IDs,
+            frames placement was spread over and the stage timings
+    """
+    if (place_product is None) == (place_all is None):
+        raise ValueError("Pass exactly one of place_product and place_all")
+    timer = timer or StageTimer()
+    loop = asyncio.get_running_loop()
+    frame_budget = frame_budget or FrameBudget(None)
+    result = {"success": False, "cancelled": False, "placed": 0, "products": 0, "placed_ids": [], "failed": [],
+              "frames": 0, "timings": {}}
+
+    timer.start("total")
+    open_task = asyncio.ensure_future(timer.measure_async("open", open_stage()) if open_stage else
+                                      asyncio.sleep(0, result=True))
+    prefetcher = None
+    prefetch_task = None
+    try:
+        with timer.measure("catalog"):
+            product_data = await loop.run_in_executor(None, prepare_products)
+        result["products"] = len(product_data)
+        asset_urls = ordered_assets(product_data)
+
+        if fetch_asset is not None:
+            prefetcher = AssetPrefetcher(fetch_asset, max_concurrency).start(asset_urls)
+            prefetch_task = asyncio.ensure_future(timer.measure_async("prefetch", prefetcher.join()))
+
+        if not await open_task:
+            return result
+
+        if create_hierarchy is not None:
+            with timer.measure("hierarchy"):
+                if not create_hierarchy():
+                    print("Failed to create product hierarchy!")
+                    return result
+
+        with timer.measure("placement"):
+            if place_all is not None:
+                if prefetch_task is not None:
+                    product_data = apply_local_paths(product_data, await prefetch_task)
+                try:
+                    frame_budget.check_cancelled()
+                except PlacementCancelled:
+                    result["cancelled"] = True
+                    return result
+                if place_all(product_data):
+                    result["placed"] = len(product_data)
+                    result["placed_ids"] = list(product_data)
+            else:
+                placement = await place_in_chunks(product_data.items(), place_product, frame_budget,
+                                                  chunk_context=chunk_context, progress=progress,
+                                                  assets=prefetcher)
+                result["placed"] = len(placement["placed"])
+                result["placed_ids"] = placement["placed"]
+                result["failed"] = placement["failed"]
+                result["frames"] = placement["frames"]
+                result["cancelled"] = placement["cancelled"]
+                if result["cancelled"]:
+                    return result
+
+        if prefetch_task is not None:
+            local_paths = await prefetch_task
+            for url in asset_urls:
+                if local_paths.get(url) is None:
+                    print(f"Warning: {url} was not prefetched, using remote path")
+            if on_assets_fetched is not None:
+                on_assets_fetched(list(local_paths))
+        result["success"] = result["placed"] > 0
+        return result
+    finally:
+        if not open_task.done():
+            open_task.cancel()
+        if prefetch_task is not None and not prefetch_task.done():
+            # join() then returns at once with the downloads that already finished
+            prefetcher.cancel()
+            await prefetch_task
+        timer.stop("total")
+        result["timings"] = timer.report()
@@ -0,0 +1,324 @@
+"""
+Bulk Sdf-Layer Authoring for the Dynamic Shop Placer
+
+Writes the product hierarchy and every product prim (payload, xformOps and
+physics API schemas) straight into an Sdf layer inside a single
+Sdf.ChangeBlock, instead of going through the per-prim Usd/UsdGeom API.
+The stage only recomposes once, after the whole catalog has been written.
+
+Only pxr (usd-core or Isaac Sim) is required - no omni/Kit modules - so the
+same code path can be used from Isaac Sim and from headless tooling.
+
+Usage:
+    from bulk_authoring import author_products_to_layer
+    layer = stage.GetEditTarget().GetLayer()
+    product_paths = author_products_to_layer(layer, PRODUCT_DATA)
+"""
+
+from pxr import Sdf, Gf
+
+SHELF_ROOT_PATH = "/World/Shelf"
+
+# Schema names written into the apiSchemas list op. These are the same tokens
+# UsdPhysics.*API.Apply and PhysxSchema.*API.Apply prepend, so the authored
+# layer is identical to the per-prim path without importing PhysxSchema.
+RIGID_BODY_SCHEMAS = ["PhysicsRigidBodyAPI", "PhysxRigidBodyAPI"]
+COLLISION_SCHEMAS = ["PhysicsCollisionAPI", "PhysxCollisionAPI"]
+MESH_COLLISION_SCHEMAS = ["PhysicsCollisionAPI", "PhysxCollisionAPI", "PhysxConvexHullCollisionAPI"]
+VELOCITY_ATTRIBUTES = ["physics:velocity", "physics:angularVelocity"]
+PHYSICS_ATTRIBUTES = ["physics:rigidBodyEnabled", "physics:kinematicEnabled", "physics:collisionEnabled"] + \
+    VELOCITY_ATTRIBUTES
+
+
+def define_prim_spec(layer, path, type_name=""):
+    """Get or create a 'def' prim spec at path (ancestors are created as 'over')."""
+    prim_spec = Sdf.CreatePrimInLayer(layer, path)
+    prim_spec.specifier = Sdf.SpecifierDef
+    if type_name:
+        prim_spec.typeName = type_name
+    return prim_spec
+
+
+def set_attribute_spec(prim_spec, name, type_name, value, variability=Sdf.VariabilityVarying):
+    """Create (or reuse) an attribute spec and set its default value."""
+    attr_spec = prim_spec.attributes.get(name)
+    if attr_spec is None:
+        attr_spec = Sdf.AttributeSpec(prim_spec, name, type_name, variability)
+    attr_spec.default = value
+    return attr_spec
+
+
+def prepend_api_schemas(prim_spec, schema_names):
+    """Prepend API schema names to the prim's apiSchemas list op."""
+    list_op = prim_spec.GetInfo("apiSchemas") if prim_spec.HasInfo("apiSchemas") else Sdf.TokenListOp()
+    prepended = list(list_op.prependedItems)
+    for schema_name in schema_names:
+        if schema_name not in prepended:
+            prepended.append(schema_name)
+    list_op.prependedItems = prepended
+    # Re-applying a schema removed earlier (see remove_api_schemas) drops its delete entry
+    if any(schema_name in list_op.deletedItems for schema_name in schema_names):
+        list_op.deletedItems = [name for name in list_op.deletedItems if name not in schema_names]
+    prim_spec.SetInfo("apiSchemas", list_op)
+
+
+def remove_api_schemas(prim_spec, schema_names):
+    """
+    Remove API schema names from the prim's apiSchemas list op.
+
+    The names are dropped from this layer's own entries and added as deleted
+    items, so schemas applied in a weaker layer are removed as well.
+    """
+    list_op = prim_spec.GetInfo("apiSchemas") if prim_spec.HasInfo("apiSchemas") else Sdf.TokenListOp()
+    list_op.prependedItems = [name for name in list_op.prependedItems if name not in schema_names]
+    list_op.appendedItems = [name for name in list_op.appendedItems if name not in schema_names]
+    deleted = list(list_op.deletedItems)
+    for schema_name in schema_names:
+        if schema_name not in deleted:
+            deleted.append(schema_name)
+    list_op.deletedItems = deleted
+    prim_spec.SetInfo("apiSchemas", list_op)
+
+
+def remove_attribute_spec(prim_spec, name):
+    """Remove an attribute spec from a prim spec if it exists."""
+    attr_spec = prim_spec.attributes.get(name)
+    if attr_spec is not None:
+        prim_spec.RemoveProperty(attr_spec)
+
+
+def collect_shelf_categories(product_data):
+    """Collect the shelf level -> categories mapping used to build the hierarchy."""
+    shelf_categories = {}
+    for product_id, data in product_data.items():
+        shelf = data.get("shelf", "Items_Lower")  # Default fallback
+        category = data.get("category", "Unknown")  # Default fallback
+        shelf_categories.setdefault(shelf, set()).add(category)
+    return shelf_categories
+
+
+def get_product_path(product_id, product_data, root_path=SHELF_ROOT_PATH):
+    """Return the prim path a product is placed at."""
+    shelf_level = product_data.get("shelf", "Items_Lower")
+    category = product_data.get("category", "Unknown")
+    return f"{root_path}/{shelf_level}/{category}/{product_id}"
+
+
+def author_hierarchy_to_layer(layer, product_data, root_path=SHELF_ROOT_PATH):
+    """Author the shelf level and category Scope specs for a catalog."""
+    shelf_categories = collect_shelf_categories(product_data)
+    for shelf_level, categories in shelf_categories.items():
+        shelf_path = f"{root_path}/{shelf_level}"
+        define_prim_spec(layer, shelf_path, "Scope")
+        for category in categories:
+            define_prim_spec(layer, f"{shelf_path}/{category}", "Scope")
+    return shelf_categories
+
+
+def convert_transform(product_data):
+    """
+    Convert a product's translate/rotate|orient/scale entries to Gf values.
+
+    Returns:
+        tuple: (translate, rotation, scale) where rotation is None or
+            (op name, value type, value)
+    """
+    translate = Gf.Vec3d(*product_data["translate"])
+    scale = Gf.Vec3f(*product_data["scale"])
+    rotation = None
+    if "rotate" in product_data:
+        rotation = ("xformOp:rotateZYX", Sdf.ValueTypeNames.Float3, Gf.Vec3f(*product_data["rotate"]))
+    elif "orient" in product_data:
+        quat_data = product_data["orient"]
+        rotation = ("xformOp:orient", Sdf.ValueTypeNames.Quatf,
+                    Gf.Quatf(quat_data[0], Gf.Vec3f(quat_data[1], quat_data[2], quat_data[3])))
+    return translate, rotation, scale
+
+
+def set_transform_specs(prim_spec, transform):
+    """Author the xformOps and xformOpOrder of a converted transform (see convert_transform)."""
+    translate, rotation, scale = transform
+    # Transform operations in the same order as the per-prim path
+    op_order = ["xformOp:translate"]
+    set_attribute_spec(prim_spec, "xformOp:translate", Sdf.ValueTypeNames.Double3, translate)
+    if rotation:
+        op_name, type_name, value = rotation
+        set_attribute_spec(prim_spec, op_name, type_name, value)
+        op_order.append(op_name)
+    set_attribute_spec(prim_spec, "xformOp:scale", Sdf.ValueTypeNames.Float3, scale)
+    op_order.append("xformOp:scale")
+    set_attribute_spec(prim_spec, "xformOpOrder", Sdf.ValueTypeNames.TokenArray, op_order,
+                       Sdf.VariabilityUniform)
+
+
+def set_physics_specs(prim_spec, product_data, force_collision=True):
+    """
+    Author the rigid body (and collision) schemas and attributes of a physics product.
+
+    Velocities missing from the product data are removed from the spec, so
+    the same call also updates a product that was authored before.
+    """
+    schemas = list(RIGID_BODY_SCHEMAS)
+    set_attribute_spec(prim_spec, "physics:rigidBodyEnabled", Sdf.ValueTypeNames.Bool, True)
+    set_attribute_spec(prim_spec, "physics:kinematicEnabled", Sdf.ValueTypeNames.Bool, False)
+    if force_collision:
+        schemas.extend(COLLISION_SCHEMAS)
+        set_attribute_spec(prim_spec, "physics:collisionEnabled", Sdf.ValueTypeNames.Bool, True)
+    prepend_api_schemas(prim_spec, schemas)
+
+    for key, name in (("velocity", "physics:velocity"), ("angular_velocity", "physics:angularVelocity")):
+        if key in product_data:
+            set_attribute_spec(prim_spec, name, Sdf.ValueTypeNames.Vector3f, Gf.Vec3f(*product_data[key]))
+        else:
+            remove_attribute_spec(prim_spec, name)
+
+
+def clear_physics_specs(prim_spec, block=False):
+    """
+    Remove the rigid body and collision schemas and attributes from a product spec.
+
+    With block=True the attributes are blocked instead of removed, which also
+    hides values authored in a weaker layer.
+    """
+    remove_api_schemas(prim_spec, RIGID_BODY_SCHEMAS + COLLISION_SCHEMAS)
+    for name in PHYSICS_ATTRIBUTES:
+        if block:
+            type_name = Sdf.ValueTypeNames.Vector3f if name in VELOCITY_ATTRIBUTES else Sdf.ValueTypeNames.Bool
+            set_attribute_spec(prim_spec, name, type_name, Sdf.ValueBlock())
+        else:
+            remove_attribute_spec(prim_spec, name)
+
+
+def author_product_spec(layer, product_id, product_data, enable_physics=True,
+                        force_collision=True, root_path=SHELF_ROOT_PATH, instanceable=False):
+    """
+    Author one product prim spec with its payload, xformOps and physics schemas.
+
+    Mirrors DynamicShopPlacer.place_product, but at the Sdf level. Call this
+    inside an Sdf.ChangeBlock when authoring many products.
+
+    With instanceable=True static products are marked instanceable, so all
+    of them with the same asset share one prototype. Physics products stay
+    regular prims, like in the PointInstancer mode: their convex hull
+    collision goes on the Mesh children, which a shared prototype cannot hold.
+
+    Returns:
+        str: The prim path of the authored product
+    """
+    # Convert all values first so a malformed entry fails before any spec is created
+    asset = product_data["asset"]
+    transform = convert_transform(product_data)
+
+    product_path = get_product_path(product_id, product_data, root_path)
+    prim_spec = define_prim_spec(layer, product_path)
+    prim_spec.payloadList.Prepend(Sdf.Payload(asset))
+    physics_enabled = product_data.get("physics_enabled", False) and enable_physics
+    if instanceable and not physics_enabled:
+        prim_spec.instanceable = True
+
+    set_transform_specs(prim_spec, transform)
+
+    # Physics (with global override option)
+    if physics_enabled:
+        set_physics_specs(prim_spec, product_data, force_collision)
+
+    return product_path
+
+
+def author_products_to_layer(layer, product_data, enable_physics=True,
+                             force_collision=True, root_path=SHELF_ROOT_PATH, instanceable=False):
+    """
+    Author the product hierarchy and all products into a layer in one pass.
+
+    Everything is written inside a single Sdf.ChangeBlock, so change
+    notification and recomposition happen once for the whole catalog.
+
+    Args:
+        layer (Sdf.Layer): Layer to author into (usually the stage's edit target)
+        product_data (dict): Product data dictionary (product_id -> data)
+        enable_physics (bool): Global physics switch (ENABLE_PHYSICS_FOR_ALL)
+        force_collision (bool): Add collision APIs (FORCE_COLLISION_FOR_PHYSICS)
+        root_path (str): Shelf root prim path
+        instanceable (bool): Mark static product prims instanceable (one shared prototype per asset)
+
+    Returns:
+        dict: product_id -> prim path for every product that was authored
+    """
+    product_paths = {}
+    with Sdf.ChangeBlock():
+        author_hierarchy_to_layer(layer, product_data, root_path)
+        for product_id, data in product_data.items():
+            try:
+                product_paths[product_id] = author_product_spec(
+                    layer, product_id, data, enable_physics, force_collision, root_path, instanceable)
+            except Exception as e:
+                print(f"Error authoring product {product_id}: {str(e)}")
+    return product_paths
+
+
+def get_hierarchy_paths(product_data, root_path=SHELF_ROOT_PATH):
+    """Return the shelf level and category Scope paths author_hierarchy_to_layer creates for a catalog."""
+    paths = []
+    for shelf_level, categories in collect_shelf_categories(product_data).items():
+        paths.append(f"{root_path}/{shelf_level}")
+        paths.extend(f"{root_path}/{shelf_level}/{category}" for category in categories)
+    return paths
+
+
+def remove_products_from_layer(layer, product_paths, scope_paths=()):
+    """
+    Delete product specs from a layer in one Sdf.ChangeBlock, e.g. to abandon a half-built store.
+
+    Args:
+        layer (Sdf.Layer): Layer the products were authored into
+        product_paths (iterable): Prim paths of the products to delete
+        scope_paths (iterable): Hierarchy Scope paths to delete as well once they have no children left
+
+    Returns:
+        int: Number of product specs that were deleted
+    """
+    removed_count = 0
+    with Sdf.ChangeBlock():
+        for path in map(Sdf.Path, product_paths):
+            if layer.GetPrimAtPath(path):
+                del layer.GetPrimAtPath(path.GetParentPath()).nameChildren[path.name]
+                removed_count += 1
+        # Deepest first, so a shelf level is empty once its categories are gone
+        for path in sorted(map(Sdf.Path, scope_paths), key=lambda path: path.pathElementCount, reverse=True):
+            scope_spec = layer.GetPrimAtPath(path)
+            if scope_spec and scope_spec.typeName == "Scope" and not scope_spec.nameChildren:
+                del layer.GetPrimAtPath(path.GetParentPath()).nameChildren[path.name]
+    return removed_count
+
+
+def author_mesh_collision(stage, layer, product_paths):
+    """
+    Add convex hull collision to the Mesh children of loaded product payloads.
+
+    The bulk pass cannot see payload contents, so this optional second pass
+    walks the composed products and authors the mesh collision schemas as
+    'over' specs, again inside a single Sdf.ChangeBlock. Physics products
+    are never instanceable (see author_product_spec); an instance authored
+    elsewhere is skipped, since its meshes live in a read-only prototype.
+
+    Returns:
+        int: Number of meshes that received collision schemas
+    """
+    mesh_paths = []
+    for product_path in product_paths:
+        product_prim = stage.GetPrimAtPath(product_path)
+        # Only rigid bodies with collision need mesh-level collision
+        if not product_prim or "PhysicsCollisionAPI" not in product_prim.GetAppliedSchemas():
+            continue
+        if product_prim.IsInstance():
+            continue
+        for child_prim in product_prim.GetAllChildren():
+            if child_prim.GetTypeName() == "Mesh":
+                mesh_paths.append(child_prim.GetPath())
+
+    with Sdf.ChangeBlock():
+        for mesh_path in mesh_paths:
+            mesh_spec = Sdf.CreatePrimInLayer(layer, mesh_path)
+            prepend_api_schemas(mesh_spec, MESH_COLLISION_SCHEMAS)
+            set_attribute_spec(mesh_spec, "physics:collisionEnabled", Sdf.ValueTypeNames.Bool, True)
+    return len(mesh_paths)
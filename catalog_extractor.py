@@ -0,0 +1,321 @@
+"""
+Populated Shop -> Product Catalog Extractor
+
+product_data.json was copied by hand out of a fully stocked shop file. This
+tool re-extracts it: it opens the populated layer with Sdf only (no stage,
+so no payload is composed or fetched) and walks the product prim specs
+/World/Shelf/Items_<Shelf>/<Category>/<Product> once, in file order:
+
+- "asset": the first payload (or reference) asset path
+- "translate", "rotate" (xformOp:rotateZYX) or "orient" (w, x, y, z), "scale"
+- "physics_enabled": PhysicsRigidBodyAPI applied and physics:rigidBodyEnabled not off
+- "velocity" / "angular_velocity" when authored
+- "shelf" and "category" from the parent scopes
+
+Product IDs are the prim name without the YCB number prefix and the copy
+suffix ("_06_mustard_bottle_05" -> "mustard_bottle"), numbered from 1 per
+name. The walk only collects the raw values; each field is converted to
+floats afterwards in one NumPy pass per value type (iterating Gf vectors
+from Python is the slow part), and float-typed values are written at float
+precision (1.3333334, not 1.3333333730697632) like the hand-made catalog.
+
+The placer authors translate, rotation, scale in that order and nothing
+else, so other ops, a different op order or a missing payload are reported
+as warnings. Output is the product_data.json format or a CompactCatalog
+(.npz / .npy directory). With --check the extracted catalog is compared to
+an existing one instead of written, e.g. to catch a reference shop edit
+that the catalog does not reflect yet.
+
+Only pxr (usd-core or Isaac Sim) and NumPy are required.
+
+Usage:
+    product_data, report = extract_catalog("assets/Shop Minimal Fully Stocked 2.usda")
+    python catalog_extractor.py "assets/Shop Minimal Fully Stocked 2.usda" extracted.json
+    python catalog_extractor.py "assets/Shop Minimal Fully Stocked 2.usda" assets/product_data.json --check
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from pxr import Gf, Sdf, Vt
+
+from compact_catalog import CompactCatalog, load_catalog
+from planogram import save_catalog
+
+SHELF_PATH = "/World/Shelf"
+ITEMS_PREFIX = "Items_"  # Shelf scopes under SHELF_PATH: Items_Lower, Items_Upper, Items_Top
+RIGID_BODY_API = "PhysicsRigidBodyAPI"
+TRANSLATE_OP = "xformOp:translate"
+ROTATE_OP = "xformOp:rotateZYX"
+ORIENT_OP = "xformOp:orient"
+SCALE_OP = "xformOp:scale"
+PLACER_OP_ORDER = [TRANSLATE_OP, ROTATE_OP, ORIENT_OP, SCALE_OP]  # Relative order the placer authors
+# Catalog key -> attribute of the product prim
+VALUE_ATTRIBUTES = {
+    "translate": TRANSLATE_OP,
+    "rotate": ROTATE_OP,
+    "orient": ORIENT_OP,
+    "scale": SCALE_OP,
+    "velocity": "physics:velocity",
+    "angular_velocity": "physics:angularVelocity",
+}
+DEFAULT_VALUES = {"translate": [0.0, 0.0, 0.0], "scale": [1.0, 1.0, 1.0]}
+OUTPUT_FORMATS = ("catalog", "compact")
+
+# Gf value type -> Vt array type, so a whole column converts to NumPy at once
+ARRAY_TYPES = {Gf.Vec3d: Vt.Vec3dArray, Gf.Vec3f: Vt.Vec3fArray, Gf.Vec3h: Vt.Vec3hArray,
+               Gf.Quatd: Vt.QuatdArray, Gf.Quatf: Vt.QuatfArray, Gf.Quath: Vt.QuathArray}
+QUATERNION_TYPES = {Gf.Quatd, Gf.Quatf, Gf.Quath}
+FLOAT_TYPES = {Gf.Vec3f, Gf.Vec3h, Gf.Quatf, Gf.Quath}  # Written at float precision
+
+# "_06_mustard_bottle_05" -> "mustard_bottle", "SM_Mug_A2_01" -> "sm_mug_a2"
+PRODUCT_NAME_PATTERN = re.compile(r"^_?\d+_|_\d+$")
+# Names the hand-made catalog shortened
+PRODUCT_NAME_OVERRIDES = {"mac_n_cheese_centered": "mac_n_cheese", "sm_mug_a2": "sm_mug"}
+
+
+def get_product_name(prim_name):
+    """Catalog name of a product prim: the prim name without number prefix and copy suffix."""
+    name = PRODUCT_NAME_PATTERN.sub("", prim_name).lower()
+    return PRODUCT_NAME_OVERRIDES.get(name, name)
+
+
+def convert_values(values):
+    """
+    Convert Gf vectors or quaternions of one type to lists of floats in one NumPy pass.
+
+    Quaternions become [w, x, y, z]. Float and half values are written at
+    float precision (1.3333334, not 1.3333333730697632).
+    """
+    value_type = type(values[0])
+    array_type = ARRAY_TYPES.get(value_type)
+    if array_type:
+        array = np.array(array_type(values), dtype=np.float64)
+    else:
+        array = np.array([list(value) for value in values], dtype=np.float64)
+    if value_type in QUATERNION_TYPES:
+        array = array[:, [3, 0, 1, 2]]  # Vt stores the real part last
+    if value_type in FLOAT_TYPES:
+        # The shortest decimal of each float32, parsed back as a double
+        array = array.astype(np.float32).astype(str).astype(np.float64)
+    return array.tolist()
+
+
+def iter_product_specs(layer, shelf_path=SHELF_PATH):
+    """
+    Yield (shelf name, category name, prim spec) for every product of a layer, in file order.
+
+    Args:
+        layer (Sdf.Layer): Populated shop layer
+        shelf_path (str): Prim holding the Items_* shelf scopes
+    """
+    shelf = layer.GetPrimAtPath(shelf_path)
+    if not shelf:
+        raise ValueError(f"{layer.identifier} has no {shelf_path}")
+    for shelf_spec in shelf.nameChildren:
+        if not shelf_spec.name.startswith(ITEMS_PREFIX):
+            continue
+        for category_spec in shelf_spec.nameChildren:
+            for prim_spec in category_spec.nameChildren:
+                yield shelf_spec.name, category_spec.name, prim_spec
+
+
+def get_asset_path(prim_spec):
+    """The first payload or reference asset path of a prim spec, or None."""
+    for field in ("payload", "references"):
+        items = prim_spec.GetInfo(field).ApplyOperations([]) if prim_spec.HasInfo(field) else []
+        if items:
+            return items[0].assetPath
+    return None
+
+
+def is_physics_enabled(prim_spec, attribute_names):
+    """True if the prim applies PhysicsRigidBodyAPI and does not turn the rigid body off."""
+    if not prim_spec.HasInfo("apiSchemas") or RIGID_BODY_API not in prim_spec.GetInfo("apiSchemas").ApplyOperations([]):
+        return False
+    if "physics:rigidBodyEnabled" not in attribute_names:
+        return True
+    return prim_spec.attributes["physics:rigidBodyEnabled"].default is not False
+
+
+def get_op_warnings(op_order, authored):
+    """
+    Authored xform ops the catalog cannot express: unknown ops, or known ops in another order.
+
+    Args:
+        op_order (list): xformOpOrder of the prim
+        authored (set): Placer ops with a value (an op without one is the identity)
+    """
+    ops = [op for op in op_order if op not in PLACER_OP_ORDER or op in authored]
+    warnings = [f"xform op {op} is not in the catalog format" for op in ops if op not in PLACER_OP_ORDER]
+    known = [op for op in ops if op in PLACER_OP_ORDER]
+    if known != sorted(known, key=PLACER_OP_ORDER.index):
+        warnings.append(f"op order {known} is placed as translate, rotation, scale")
+    return warnings
+
+
+def read_products(layer, shelf_path=SHELF_PATH):
+    """
+    Read every product prim spec of a layer in one pass, leaving the vector values unconverted.
+
+    Returns:
+        tuple: (records [(product_id, asset, physics_enabled, shelf, category)],
+                columns {(catalog key, Gf type): ([rows], [values])}, warnings {row: [str]})
+    """
+    records, columns, warnings = [], {}, {}
+    counts = Counter()
+    op_orders = {}  # str(xformOpOrder) -> op list; converting token arrays is slow and there are few orders
+    for shelf, category, prim_spec in iter_product_specs(layer, shelf_path):
+        row = len(records)
+        attributes = prim_spec.attributes
+        attribute_names = set(attributes.keys())  # keys() is an iterator, each `in` would walk it again
+        authored = set()
+        for key, attribute in VALUE_ATTRIBUTES.items():
+            if attribute in attribute_names:
+                value = attributes[attribute].default
+                if value is not None:
+                    rows, values = columns.setdefault((key, type(value)), ([], []))
+                    rows.append(row)
+                    values.append(value)
+                    authored.add(attribute)
+
+        asset = get_asset_path(prim_spec)
+        product_warnings = [] if asset else ["no payload or reference"]
+        op_order = attributes["xformOpOrder"].default if "xformOpOrder" in attribute_names else None
+        if op_order:
+            order_key = str(op_order)
+            if order_key not in op_orders:
+                op_orders[order_key] = list(op_order)
+            product_warnings += get_op_warnings(op_orders[order_key], authored)
+        if product_warnings:
+            warnings[row] = product_warnings
+
+        name = get_product_name(prim_spec.name)
+        counts[name] += 1
+        records.append((f"{name}_{counts[name]}", asset or "", is_physics_enabled(prim_spec, attribute_names),
+                        shelf, category))
+    return records, columns, warnings
+
+
+def extract_catalog(shop_path, output="catalog", shelf_path=SHELF_PATH):
+    """
+    Extract the product catalog of a populated shop file.
+
+    Args:
+        shop_path (str): Populated shop .usda/.usdc
+        output (str): "catalog" (product_id -> dict) or "compact" (CompactCatalog)
+        shelf_path (str): Prim holding the Items_* shelf scopes
+
+    Returns:
+        tuple: (catalog, report dict with products, categories and warnings {product_id: [str]})
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output {output!r}, expected one of {OUTPUT_FORMATS}")
+    layer = Sdf.Layer.FindOrOpen(str(shop_path))
+    if not layer:
+        raise ValueError(f"Could not open {shop_path}")
+    records, columns, row_warnings = read_products(layer, shelf_path)
+
+    values = {key: [None] * len(records) for key in VALUE_ATTRIBUTES}
+    for (key, _), (rows, raw_values) in columns.items():
+        for row, value in zip(rows, convert_values(raw_values)):
+            values[key][row] = value
+
+    product_data = {}
+    for row, (product_id, asset, physics_enabled, shelf, category) in enumerate(records):
+        product = {"asset": asset, "translate": values["translate"][row] or DEFAULT_VALUES["translate"]}
+        if values["rotate"][row] is not None:
+            product["rotate"] = values["rotate"][row]
+        elif values["orient"][row] is not None:
+            product["orient"] = values["orient"][row]
+        product["scale"] = values["scale"][row] or DEFAULT_VALUES["scale"]
+        product["physics_enabled"] = physics_enabled
+        for key in ("velocity", "angular_velocity"):
+            if values[key][row] is not None:
+                product[key] = values[key][row]
+        product["shelf"], product["category"] = shelf, category
+        product_data[product_id] = product
+
+    report = {
+        "products": len(product_data),
+        "categories": len({record[4] for record in records}),
+        "warnings": {records[row][0]: warnings for row, warnings in row_warnings.items()},
+    }
+    if output == "compact":
+        return CompactCatalog.from_product_data(product_data), report
+    return product_data, report
+
+
+def diff_catalogs(extracted, existing):
+    """
+    Compare two catalogs by product ID.
+
+    Returns:
+        dict: added, removed (product ID lists) and changed {product_id: [changed keys]}
+    """
+    changed = {}
+    for product_id in extracted.keys() & existing.keys():
+        new, old = extracted[product_id], existing[product_id]
+        keys = [key for key in sorted(new.keys() | old.keys()) if new.get(key) != old.get(key)]
+        if keys:
+            changed[product_id] = keys
+    return {
+        "added": sorted(extracted.keys() - existing.keys()),
+        "removed": sorted(existing.keys() - extracted.keys()),
+        "changed": dict(sorted(changed.items())),
+    }
+
+
+def read_catalog(path):
+    """Read a catalog as a product_data dict (JSON as written, so malformed entries are compared too)."""
+    if Path(path).suffix == ".json":
+        with open(path, 'r') as f:
+            return json.load(f)
+    return load_catalog(path).to_product_data()
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Extract the product catalog from a populated shop file")
+    parser.add_argument("shop", help="Populated shop file (e.g. 'assets/Shop Minimal Fully Stocked 2.usda')")
+    parser.add_argument("output", help="Catalog: .json (product_data format), .npz or a .npy directory")
+    parser.add_argument("--check", action="store_true", help="Compare with the existing catalog instead of writing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        product_data, report = extract_catalog(args.shop)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    extract_time = time.perf_counter() - start
+    for product_id, warnings in report["warnings"].items():
+        for warning in warnings:
+            print(f"Warning: {product_id}: {warning}")
+
+    if args.check:
+        differences = diff_catalogs(product_data, read_catalog(args.output))
+        if not any(differences.values()):
+            print(f"✅ {args.output} matches {report['products']} products of {args.shop} "
+                  f"({extract_time * 1000:.0f} ms)")
+            return 0
+        print(f"❌ {args.output} differs from {args.shop}: {len(differences['added'])} added, "
+              f"{len(differences['removed'])} removed, {len(differences['changed'])} changed")
+        for product_id, keys in differences["changed"].items():
+            print(f"  {product_id}: {', '.join(keys)}")
+        return 1
+
+    catalog = CompactCatalog.from_product_data(product_data) if Path(args.output).suffix != ".json" else product_data
+    target = save_catalog(catalog, args.output)
+    print(f"✅ Extracted {report['products']} products ({report['categories']} categories) into {target} "
+          f"in {extract_time * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
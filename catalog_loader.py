@@ -0,0 +1,102 @@
+"""
+Deferred, Cached Product Catalog Loading for the Dynamic Shop Placer
+
+A CatalogLoader knows where a catalog lives but only reads it the first
+time it is needed, then keeps it. Loaders are shared per path through
+get_catalog_loader(), so the placer and tooling that ask for the same
+catalog read it once. Importing this module is cheap: NumPy and the
+compact catalog code are only imported when a catalog is actually read.
+
+Usage:
+    from catalog_loader import get_catalog_loader, DEFAULT_ASSETS_DIR
+    loader = get_catalog_loader(DEFAULT_ASSETS_DIR / "product_data.json")
+    product_data = loader.get()  # read on first call, cached afterwards
+"""
+
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+DEFAULT_ASSETS_DIR = PROJECT_ROOT / "assets"
+
+_LOADERS = {}
+
+
+class CatalogLoader:
+    """Load a product catalog (JSON, .npz or .npy directory) on first use and cache it."""
+
+    def __init__(self, path, mmap=True):
+        """
+        Args:
+            path (str or Path): Catalog file or .npy directory
+            mmap (bool): Memory-map the instance table (directory form only)
+        """
+        self.path = Path(path)
+        self.mmap = mmap
+        self.catalog = None
+
+    @property
+    def is_loaded(self):
+        return self.catalog is not None
+
+    def read(self):
+        """
+        Read the catalog from disk without touching the cached one.
+
+        Raises:
+            FileNotFoundError, json.JSONDecodeError, ValueError: If the catalog cannot be read
+        """
+        from compact_catalog import load_catalog
+        return load_catalog(self.path, mmap=self.mmap)
+
+    def get(self):
+        """
+        Return the cached catalog, reading it on the first call.
+
+        A catalog that cannot be read is reported and replaced by an empty
+        one, so callers always get a CompactCatalog.
+        """
+        if self.catalog is None:
+            self.catalog = self.load()
+        return self.catalog
+
+    def load(self):
+        """Read the catalog, printing the outcome; returns an empty catalog on errors."""
+        import json
+        from compact_catalog import CompactCatalog
+        try:
+            catalog = self.read()
+            print(f"Loaded product data from: {self.path} ({len(catalog)} products, {len(catalog.skus)} SKUs)")
+            return catalog
+        except FileNotFoundError:
+            print(f"ERROR: Product data file not found at: {self.path}")
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Invalid JSON in product data file: {e}")
+        except Exception as e:
+            print(f"ERROR: Failed to load product data: {e}")
+        return CompactCatalog.from_product_data({})
+
+    def set(self, catalog):
+        """Replace the cached catalog (e.g. after applying an edited catalog)."""
+        self.catalog = catalog
+
+    def reload(self):
+        """Drop the cached catalog and read it again."""
+        self.catalog = None
+        return self.get()
+
+
+def get_catalog_loader(path, mmap=True):
+    """
+    Return the shared loader for a catalog path (created on first request).
+
+    Args:
+        path (str or Path): Catalog file or .npy directory
+        mmap (bool): Memory-map the instance table (only used when the loader is created)
+
+    Returns:
+        CatalogLoader: The same loader for every request of the same path
+    """
+    key = Path(path).resolve()
+    if key not in _LOADERS:
+        _LOADERS[key] = CatalogLoader(key, mmap=mmap)
+    return _LOADERS[key]
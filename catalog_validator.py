@@ -0,0 +1,502 @@
+"""
+Single-Pass Streaming Catalog Validator for the Dynamic Shop Placer
+
+The helper scripts each loaded the whole catalog and repeated the same
+field, length and bounds checks. This module is the one validation engine.
+It streams a catalog once and never holds more than one chunk of products:
+
+- product_data.json (one JSON object, product_id -> product) is decoded
+  entry by entry from a buffered reader, so duplicate IDs, which json.load
+  silently drops, are seen too
+- NDJSON (.ndjson/.jsonl): one product per line, {"id": ..., <product fields>}
+
+Products are queued and checked every CHUNK_SIZE products, one field at a
+time over the whole chunk. The schema: asset, translate, scale,
+physics_enabled, rotate (3) or orient (4), optional velocities, shelf and
+category. The vectors are then stacked and checked with NumPy:
+
+- finite values, non-zero scale, normalized orient quaternions
+- support against the shelf surface index (shelf_surfaces.py), if given: a
+  shelf surface under every product, pivots at most MAX_PIVOT_HEIGHT above
+  it, and one shelf level per catalog shelf
+- duplicate IDs against the 64-bit hashes of all IDs seen so far (16 bytes
+  per product with the line numbers, instead of a set of the ID strings)
+
+Every problem is collected with its line (None for in-memory catalogs) and
+product ID. Only the first max_errors are kept, but all of them are
+counted. Only NumPy is required.
+
+Usage:
+    report = validate_catalog("assets/product_data.json", surfaces=ShelfSurfaces.load("assets/shelf_surfaces.npz"))
+    report = validate_entries((None, product_id, data) for product_id, data in product_data.items())
+    python catalog_validator.py assets/product_data.json
+    python catalog_validator.py catalog.ndjson --surfaces assets/shelf_surfaces.npz --max-errors 50
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+from streaming_catalog import NDJSON_ID_KEY, NDJSON_SUFFIXES
+
+CHUNK_SIZE = 20000  # Products per vectorized check
+READ_SIZE = 1024 * 1024  # Characters read from the file at a time
+MAX_ENTRY_SIZE = 16 * 1024 * 1024  # A single product larger than this is treated as malformed
+MAX_ERRORS = 1000  # Errors and warnings kept in the report (all are counted)
+MAX_PIVOT_HEIGHT = 0.5  # A product's pivot higher than this above its shelf surface is floating
+QUATERNION_TOLERANCE = 1e-3  # Allowed deviation of |orient| from 1
+
+# Field -> number of values
+VECTOR_FIELDS = {"translate": 3, "scale": 3, "rotate": 3, "orient": 4, "velocity": 3, "angular_velocity": 3}
+REQUIRED_FIELDS = ["asset", "translate", "scale", "physics_enabled"]
+STRING_FIELDS = ["shelf", "category"]
+NUMBER_TYPES = {int, float}
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CatalogSyntaxError(ValueError):
+    """Malformed catalog file content at a line."""
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+class _JsonStream:
+    """Buffered reader that decodes one JSON value at a time and tracks line numbers."""
+
+    def __init__(self, file, read_size=READ_SIZE):
+        self.file = file
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.line = 1  # Line at self.counted
+        self.counted = 0
+        self.eof = False
+
+    def get_line(self):
+        """Line number at the current position."""
+        self.line += self.buffer.count("\n", self.counted, self.position)
+        self.counted = self.position
+        return self.line
+
+    def read(self):
+        """Drop the consumed part of the buffer and append the next block; False at the end of the file."""
+        if self.eof:
+            return False
+        block = self.file.read(self.read_size)
+        if not block:
+            self.eof = True
+            return False
+        self.get_line()
+        self.buffer = self.buffer[self.position:] + block
+        self.position = self.counted = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ("" at the end of the file)."""
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                return ""
+
+    def expect(self, characters):
+        """Consume the next character, which must be one of characters."""
+        character = self.peek()
+        if not character or character not in characters:
+            found = repr(character) if character else "end of file"
+            raise CatalogSyntaxError(self.get_line(), f"expected {' or '.join(map(repr, characters))}, found {found}")
+        self.position += 1
+        return character
+
+    def decode(self):
+        """Decode the next value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A number at the end of the buffer may continue in the next block
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof or len(self.buffer) - self.position > MAX_ENTRY_SIZE:
+                    line = self.get_line() + self.buffer.count("\n", self.position, e.pos)
+                    raise CatalogSyntaxError(line, e.msg) from None
+            self.read()
+
+
+def iter_json_entries(file, read_size=READ_SIZE):
+    """
+    Yield (line, product_id, data) from a product_data.json-style object without loading all of it.
+
+    Args:
+        file: Text file object
+        read_size (int): Characters read at a time
+
+    Raises:
+        CatalogSyntaxError: On malformed JSON, with its line (nothing after it can be read)
+    """
+    stream = _JsonStream(file, read_size)
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.position += 1
+        return
+    while True:
+        character = stream.peek()
+        line = stream.get_line()
+        if character != '"':
+            raise CatalogSyntaxError(line, "expected a product ID string")
+        product_id = stream.decode()
+        stream.expect(":")
+        yield line, product_id, stream.decode()
+        if stream.expect(",}") == "}":
+            break
+    if stream.peek():
+        raise CatalogSyntaxError(stream.get_line(), "unexpected data after the catalog object")
+
+
+def iter_ndjson_entries(file, errors=None):
+    """
+    Yield (line, product_id, data) from an NDJSON catalog, one {"id": ..., <fields>} object per line.
+
+    Args:
+        file: Text file object
+        errors (list): If given, malformed lines are appended as (line, message) and skipped
+
+    Raises:
+        CatalogSyntaxError: On a malformed line when errors is None
+    """
+    decoder = json.JSONDecoder()
+    for line, text in enumerate(file, start=1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            data, end = decoder.raw_decode(text)
+            if end < len(text):
+                raise ValueError("extra data after the product")
+            if not isinstance(data, dict):
+                raise ValueError("not a JSON object")
+            if not isinstance(data.get(NDJSON_ID_KEY), str):
+                raise ValueError(f"no {NDJSON_ID_KEY!r} string")
+        except ValueError as e:
+            if errors is None:
+                raise CatalogSyntaxError(line, str(e)) from None
+            errors.append((line, str(e)))
+            continue
+        product_id = data.pop(NDJSON_ID_KEY)
+        yield line, product_id, data
+
+
+class CatalogValidator:
+    """Collects products in chunks, checks them and accumulates the report."""
+
+    def __init__(self, surfaces=None, chunk_size=CHUNK_SIZE, max_errors=MAX_ERRORS):
+        """
+        Args:
+            surfaces (ShelfSurfaces): Shelf surface index for the support checks, None = skip them
+            chunk_size (int): Products per vectorized check
+            max_errors (int): Errors and warnings kept (all are counted)
+        """
+        self.surfaces = surfaces
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.chunk = []  # (line, product_id, data)
+        self.products = 0
+        self.physics_enabled = 0
+        self.errors, self.warnings = [], []
+        self.error_count = self.warning_count = self.support_error_count = 0
+        self.seen_hashes = np.empty(0, dtype=np.int64)  # Sorted hashes of every ID so far
+        self.seen_lines = np.empty(0, dtype=np.int64)
+        self.shelf_levels = Counter()  # (catalog shelf, shelf level name) -> products
+
+    def error(self, line, product_id, message):
+        """Record an error (line None for in-memory catalogs)."""
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, product_id, message))
+
+    def warning(self, line, product_id, message):
+        """Record a warning: the product is placed, but maybe not as intended."""
+        self.warning_count += 1
+        if len(self.warnings) < self.max_errors:
+            self.warnings.append((line, product_id, message))
+
+    def syntax_error(self, line, message):
+        """Record a malformed part of the file after the products queued before it."""
+        self.flush()
+        self.error(line, None, message)
+
+    def add(self, line, product_id, data):
+        """Queue one product; every chunk_size products are checked together."""
+        self.chunk.append((line, product_id, data))
+        if len(self.chunk) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Check the queued chunk, one field at a time over all of its products."""
+        if not self.chunk:
+            return
+        chunk, self.chunk = self.chunk, []
+        self.products += len(chunk)
+        problems = []  # (row, message), recorded in row order
+        products = [data if isinstance(data, dict) else None for _, _, data in chunk]
+        problems += [(row, "product is not an object") for row, data in enumerate(products) if data is None]
+        products = [{} if data is None else data for data in products]
+
+        for field in REQUIRED_FIELDS:
+            problems += [(row, f"missing '{field}'") for row, data in enumerate(products) if field not in data]
+        problems += [(row, "'asset' must be a non-empty string") for row, data in enumerate(products)
+                     if "asset" in data and not (isinstance(data["asset"], str) and data["asset"])]
+        problems += [(row, "'physics_enabled' must be true or false") for row, data in enumerate(products)
+                     if "physics_enabled" in data and not isinstance(data["physics_enabled"], bool)]
+        for field in STRING_FIELDS:
+            problems += [(row, f"'{field}' must be a string") for row, data in enumerate(products)
+                         if field in data and not isinstance(data[field], str)]
+        vectors = {field: self._get_vectors(products, field, problems) for field in VECTOR_FIELDS}
+        self.physics_enabled += sum(data.get("physics_enabled") is True for data in products)
+
+        for field, (rows, values) in vectors.items():
+            problems += [(rows[row], f"'{field}' has non-finite values {values[row].tolist()}")
+                         for row in np.flatnonzero(~np.isfinite(values).all(axis=1))]
+        rows, scales = vectors["scale"]
+        problems += [(rows[row], f"'scale' {scales[row].tolist()} has a zero component")
+                     for row in np.flatnonzero((scales == 0).any(axis=1))]
+        rows, orients = vectors["orient"]
+        norms = np.linalg.norm(orients, axis=1)
+        problems += [(rows[row], f"'orient' is not normalized (|q| = {norms[row]:.4f})")
+                     for row in np.flatnonzero(np.abs(norms - 1.0) > QUATERNION_TOLERANCE)]
+        if self.surfaces is not None:
+            problems += self._check_support(products, *vectors["translate"])
+        problems += self._check_duplicates(chunk)
+
+        for row, message in sorted(problems, key=lambda problem: problem[0]):
+            self.error(*chunk[row][:2], message)
+        for row, data in enumerate(products):
+            if "rotate" not in data and "orient" not in data:
+                self.warning(*chunk[row][:2], "no 'rotate' or 'orient', placed unrotated")
+            elif "rotate" in data and "orient" in data:
+                self.warning(*chunk[row][:2], "both 'rotate' and 'orient', 'rotate' is used")
+
+    @staticmethod
+    def _get_vectors(products, field, problems):
+        """Rows with a valid vector for field and the stacked vectors; the invalid ones are added to problems."""
+        size = VECTOR_FIELDS[field]
+        rows = [row for row, data in enumerate(products) if field in data]
+        values = [products[row][field] for row in rows]
+        # Booleans are not numbers here, type() keeps them out
+        valid = [type(value) is list and len(value) == size for value in values]
+        if all(valid) and set(map(type, chain.from_iterable(values))) <= NUMBER_TYPES:
+            return rows, np.array(values, dtype=np.float64).reshape(len(rows), size)
+        valid = [ok and set(map(type, value)) <= NUMBER_TYPES for ok, value in zip(valid, values)]
+        problems += [(row, f"'{field}' must be a list of {size} numbers") for row, ok in zip(rows, valid) if not ok]
+        rows = [row for row, ok in zip(rows, valid) if ok]
+        values = [value for value, ok in zip(values, valid) if ok]
+        return rows, np.array(values, dtype=np.float64).reshape(len(rows), size)
+
+    def _check_support(self, products, rows, points):
+        """Products must stand on a shelf surface, with their pivot at most MAX_PIVOT_HEIGHT above it."""
+        finite = np.isfinite(points).all(axis=1)
+        rows, points = np.asarray(rows, dtype=np.int64)[finite], points[finite]
+        if not len(points):
+            return []
+        heights, levels = self.surfaces.find_support(points)
+        problems = []
+        unsupported = levels < 0
+        problems += [(row, f"no shelf surface under {point}")
+                     for row, point in zip(rows[unsupported].tolist(), points[unsupported].tolist())]
+        above = points[:, 2] - heights
+        floating = ~unsupported & (above > MAX_PIVOT_HEIGHT)
+        problems += [(row, f"{height:.2f} above {self.surfaces.names[level]}, floating")
+                     for row, height, level in zip(rows[floating].tolist(), above[floating].tolist(),
+                                                   levels[floating].tolist())]
+        self.support_error_count += len(problems)
+        self.shelf_levels.update((products[row].get("shelf"), self.surfaces.names[level])
+                                 for row, level in zip(rows[~unsupported].tolist(), levels[~unsupported].tolist()))
+        return problems
+
+    def _check_duplicates(self, chunk):
+        """Report IDs seen before (in this chunk or an earlier one) and add the chunk's IDs."""
+        hashes = np.fromiter((hash(product_id) for _, product_id, _ in chunk), dtype=np.int64, count=len(chunk))
+        lines = np.fromiter((-1 if line is None else line for line, _, _ in chunk), dtype=np.int64, count=len(chunk))
+        # Earlier chunks
+        positions = np.searchsorted(self.seen_hashes, hashes)
+        found = positions < len(self.seen_hashes)
+        found[found] = self.seen_hashes[positions[found]] == hashes[found]
+        first_lines = np.full(len(chunk), -1, dtype=np.int64)
+        first_lines[found] = self.seen_lines[positions[found]]
+        # Earlier in this chunk: the first row of each run of equal hashes in stable sorted order
+        order = np.argsort(hashes, kind="stable")
+        sorted_hashes = hashes[order]
+        starts = np.ones(len(chunk), dtype=bool)
+        starts[1:] = sorted_hashes[1:] != sorted_hashes[:-1]
+        first_rows = np.empty(len(chunk), dtype=np.int64)
+        first_rows[order] = order[np.maximum.accumulate(np.where(starts, np.arange(len(chunk)), 0))]
+        repeated = ~found & (first_rows != np.arange(len(chunk)))
+        first_lines[repeated] = lines[first_rows[repeated]]
+
+        # Merge the sorted chunk in (one copy, no re-sort of everything seen)
+        order = np.argsort(hashes, kind="stable")
+        positions = np.searchsorted(self.seen_hashes, hashes[order], side="right")
+        self.seen_hashes = np.insert(self.seen_hashes, positions, hashes[order])
+        self.seen_lines = np.insert(self.seen_lines, positions, lines[order])
+        duplicates = found | repeated
+        return [(row, "duplicate product ID" + (f" (first at line {first})" if first >= 0 else ""))
+                for row, first in zip(np.flatnonzero(duplicates).tolist(), first_lines[duplicates].tolist())]
+
+    def _check_shelf_levels(self):
+        """All products of a catalog shelf should stand on one shelf level."""
+        levels_per_shelf = {}
+        for (shelf, level), count in self.shelf_levels.items():
+            levels_per_shelf.setdefault(shelf, {})[level] = count
+        for shelf, levels in levels_per_shelf.items():
+            if shelf is None or len(levels) < 2:
+                continue
+            main_level = max(levels, key=levels.get)
+            for level, count in levels.items():
+                if level != main_level:
+                    self.support_error_count += 1
+                    self.error(None, None, f"{shelf}: {count} products stand on {level}, "
+                                           f"{levels[main_level]} on {main_level}")
+
+    def finish(self):
+        """
+        Check the last chunk and the catalog-wide rules and return the report.
+
+        Returns:
+            dict: products, physics_enabled, errors and warnings [(line, product_id, message)] (the
+                  first max_errors), error_count, warning_count, support_error_count (errors from
+                  the shelf surface checks), shelf_levels {(shelf, level): products}
+        """
+        self.flush()
+        if self.surfaces is not None:
+            self._check_shelf_levels()
+        return {
+            "products": self.products,
+            "physics_enabled": self.physics_enabled,
+            "errors": self.errors,
+            "error_count": self.error_count,
+            "warnings": self.warnings,
+            "warning_count": self.warning_count,
+            "support_error_count": self.support_error_count,
+            "shelf_levels": dict(self.shelf_levels),
+        }
+
+
+def validate_entries(entries, surfaces=None, chunk_size=CHUNK_SIZE, max_errors=MAX_ERRORS):
+    """
+    Validate (line, product_id, data) entries, e.g. from iter_json_entries or an in-memory catalog.
+
+    Returns:
+        dict: The report (CatalogValidator.finish)
+    """
+    validator = CatalogValidator(surfaces, chunk_size, max_errors)
+    for line, product_id, data in entries:
+        validator.add(line, product_id, data)
+    return validator.finish()
+
+
+def validate_catalog(path, surfaces=None, chunk_size=CHUNK_SIZE, max_errors=MAX_ERRORS):
+    """
+    Stream a JSON or NDJSON catalog file once and validate it.
+
+    Args:
+        path (str): product_data.json-style .json, or .ndjson/.jsonl
+        surfaces (ShelfSurfaces): Shelf surface index for the support checks, None = skip them
+        chunk_size (int): Products per vectorized check
+        max_errors (int): Errors and warnings kept (all are counted)
+
+    Returns:
+        dict: The report (CatalogValidator.finish) plus "format"; a JSON syntax error ends the
+              stream and is reported as an error at its line
+    """
+    path = Path(path)
+    validator = CatalogValidator(surfaces, chunk_size, max_errors)
+    ndjson = path.suffix in NDJSON_SUFFIXES
+    with open(path, 'r', encoding="utf-8") as f:
+        try:
+            if ndjson:
+                line_errors = []
+                for line, product_id, data in iter_ndjson_entries(f, errors=line_errors):
+                    for error in line_errors:
+                        validator.syntax_error(*error)
+                    line_errors.clear()
+                    validator.add(line, product_id, data)
+                for error in line_errors:
+                    validator.syntax_error(*error)
+            else:
+                for line, product_id, data in iter_json_entries(f):
+                    validator.add(line, product_id, data)
+        except CatalogSyntaxError as e:
+            validator.syntax_error(e.line, e.message)
+    return dict(validator.finish(), format="ndjson" if ndjson else "json")
+
+
+def format_problem(problem):
+    """One error or warning as "line 12: product_id: message"."""
+    line, product_id, message = problem
+    location = [f"line {line}"] if line is not None else []
+    location += [product_id] if product_id is not None else []
+    return ": ".join(location + [message])
+
+
+def print_report(report, limit=20):
+    """Print the counts and the first errors and warnings of a report."""
+    print(f"Products: {report['products']} ({report['physics_enabled']} with physics)")
+    for kind in ("errors", "warnings"):
+        count = report[f"{kind[:-1]}_count"]
+        if count:
+            print(f"{'❌' if kind == 'errors' else '⚠️ '} {count} {kind}:")
+            for problem in report[kind][:limit]:
+                print(f"  - {format_problem(problem)}")
+            if count > limit:
+                print(f"  ... and {count - limit} more")
+    levels = {}
+    for (shelf, level), count in sorted(report["shelf_levels"].items(), key=lambda item: str(item[0])):
+        levels.setdefault(shelf, []).append(f"{count} on {level}")
+    for shelf, counts in levels.items():
+        print(f"  - {shelf}: {', '.join(counts)}")
+
+
+def main():
+    """Command line entry point."""
+    base_path = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Validate a product catalog (JSON or NDJSON) in one pass")
+    parser.add_argument("catalog", nargs="?", default=str(base_path / "assets" / "product_data.json"),
+                        help="Catalog file (default: assets/product_data.json)")
+    parser.add_argument("--surfaces", default=str(base_path / "assets" / "shelf_surfaces.npz"),
+                        help="Shelf surface index (.npz from shelf_surfaces.py), 'none' = skip the support checks")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Products per vectorized check")
+    parser.add_argument("--max-errors", type=int, default=MAX_ERRORS, help="Errors and warnings kept")
+    args = parser.parse_args()
+
+    surfaces = None
+    if args.surfaces != "none" and Path(args.surfaces).exists():
+        from shelf_surfaces import ShelfSurfaces
+        surfaces = ShelfSurfaces.load(args.surfaces)
+    start = time.perf_counter()
+    report = validate_catalog(args.catalog, surfaces, args.chunk_size, args.max_errors)
+    print(f"=== CATALOG VALIDATION ({report['format'].upper()}, {time.perf_counter() - start:.2f}s) ===")
+    if surfaces is None:
+        print("Note: no shelf surface index, support checks skipped")
+    print_report(report)
+    if report["error_count"]:
+        return 1
+    print("✅ Catalog is valid")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
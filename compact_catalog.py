@@ -0,0 +1,347 @@
+"""
+Compact SKU-Table + Instance-Array Catalog for the Dynamic Shop Placer
+
+product_data.json repeats the asset URL, scale, shelf, category and physics
+flag in every entry. CompactCatalog stores them once per SKU and keeps the
+per-product data in a NumPy structured array:
+
+- SKU table (one row per asset/shelf/category): asset, default scale,
+  shelf, category, default physics flag
+- Instance table (one row per product): SKU index, translate, rotation
+  (kind + 4 values), per-instance scale/physics overrides and optional
+  initial velocities (NaN = not set)
+
+It loads from the existing JSON and from a binary form: a single .npz file,
+or a directory of .npy files that can be memory-mapped. CompactCatalog is a
+read-only Mapping (product_id -> product dict), so code written for
+PRODUCT_DATA keeps working, while bulk operations use the arrays directly.
+
+Only NumPy is required (no pxr, no Isaac Sim).
+
+Usage:
+    catalog = load_catalog("assets/product_data.json")
+    catalog.save("assets/product_data.npz")
+    catalog = load_catalog("assets/product_data_compact", mmap=True)
+    python compact_catalog.py convert assets/product_data.json assets/product_data.npz
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+# Rotation kinds of the instance table
+ROTATION_NONE = 0
+ROTATION_EULER = 1  # rotateZYX degrees in rotation[0:3]
+ROTATION_ORIENT = 2  # quaternion w, x, y, z in rotation[0:4]
+
+# Physics override of the instance table (-1 = use the SKU default)
+PHYSICS_DEFAULT = -1
+
+INSTANCE_DTYPE = np.dtype([
+    ("sku", np.uint32),
+    ("translate", np.float64, 3),
+    ("rotation_kind", np.uint8),
+    ("rotation", np.float64, 4),
+    ("scale", np.float64, 3),  # NaN = SKU default scale
+    ("physics", np.int8),
+    ("velocity", np.float64, 3),  # NaN = not set
+    ("angular_velocity", np.float64, 3),  # NaN = not set
+])
+
+# Files of the directory (memory-mappable) form
+INSTANCES_FILE = "instances.npy"
+PRODUCT_IDS_FILE = "product_ids.npy"
+SKUS_FILE = "skus.npy"
+
+
+def make_sku_dtype(max_asset=1, max_shelf=1, max_category=1):
+    """SKU table dtype with string fields wide enough for the longest values."""
+    return np.dtype([
+        ("asset", f"U{max_asset}"),
+        ("shelf", f"U{max_shelf}"),
+        ("category", f"U{max_category}"),
+        ("scale", np.float64, 3),
+        ("physics_enabled", np.bool_),
+    ])
+
+
+def _vector(values, name, size=3):
+    """Validate the length of a vector entry so one malformed product cannot break the whole table."""
+    if len(values) != size:
+        raise ValueError(f"'{name}' needs {size} values, got {len(values)}")
+    return tuple(values)
+
+
+class CompactCatalog(Mapping):
+    """SKU table + NumPy instance table, readable like the PRODUCT_DATA dict."""
+
+    def __init__(self, skus, product_ids, instances):
+        """
+        Args:
+            skus (np.ndarray): SKU table (make_sku_dtype)
+            product_ids (np.ndarray): Unicode array of product IDs, one per instance
+            instances (np.ndarray): Instance table (INSTANCE_DTYPE)
+        """
+        self.skus = skus
+        self.product_ids = product_ids
+        self.instances = instances
+        self._index = None
+
+    @classmethod
+    def from_product_data(cls, product_data):
+        """
+        Build a compact catalog from a PRODUCT_DATA-style dict.
+
+        Entries that cannot be represented (e.g. a rotate with the wrong
+        number of values) are skipped with an error message, like a failed
+        placement in the per-prim path.
+        """
+        sku_rows = {}
+        sku_values = []
+        product_ids = []
+        records = []
+        for product_id, data in product_data.items():
+            try:
+                rotation = np.zeros(4)
+                if "rotate" in data:
+                    rotation_kind = ROTATION_EULER
+                    rotation[:3] = _vector(data["rotate"], "rotate")
+                elif "orient" in data:
+                    rotation_kind = ROTATION_ORIENT
+                    rotation[:] = _vector(data["orient"], "orient", 4)
+                else:
+                    rotation_kind = ROTATION_NONE
+                scale = tuple(float(value) for value in _vector(data["scale"], "scale"))
+                physics_enabled = bool(data.get("physics_enabled", False))
+                sku_key = (data["asset"], data.get("shelf", "Items_Lower"), data.get("category", "Unknown"))
+                if sku_key not in sku_rows:
+                    sku_rows[sku_key] = len(sku_values)
+                    sku_values.append(sku_key + (scale, physics_enabled))
+                sku = sku_rows[sku_key]
+                _, _, _, default_scale, default_physics = sku_values[sku]
+                record = (
+                    sku,
+                    _vector(data["translate"], "translate"),
+                    rotation_kind,
+                    rotation,
+                    (np.nan, np.nan, np.nan) if scale == default_scale else scale,
+                    PHYSICS_DEFAULT if physics_enabled == default_physics else int(physics_enabled),
+                    _vector(data.get("velocity", (np.nan,) * 3), "velocity"),
+                    _vector(data.get("angular_velocity", (np.nan,) * 3), "angular_velocity"),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Error converting product {product_id}: {str(e)}")
+                continue
+            product_ids.append(product_id)
+            records.append(record)
+
+        sku_dtype = make_sku_dtype(max((len(v[0]) for v in sku_values), default=1),
+                                   max((len(v[1]) for v in sku_values), default=1),
+                                   max((len(v[2]) for v in sku_values), default=1))
+        skus = np.array(sku_values, dtype=sku_dtype)
+        instances = np.array(records, dtype=INSTANCE_DTYPE)
+        return cls(skus, np.array(product_ids, dtype=str), instances)
+
+    @classmethod
+    def from_json(cls, json_file_path):
+        """Load the existing product_data.json format."""
+        with open(json_file_path, 'r') as f:
+            return cls.from_product_data(json.load(f))
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """
+        Load the binary form written by save().
+
+        Args:
+            path (str): .npz file or directory of .npy files
+            mmap (bool): Memory-map the instance table (directory form only)
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path) as arrays:
+                return cls(arrays["skus"], arrays["product_ids"], arrays["instances"])
+        mmap_mode = "r" if mmap else None
+        return cls(np.load(path / SKUS_FILE),
+                   np.load(path / PRODUCT_IDS_FILE, mmap_mode=mmap_mode),
+                   np.load(path / INSTANCES_FILE, mmap_mode=mmap_mode))
+
+    def save(self, path):
+        """
+        Save as a single .npz file, or as a directory of .npy files (memory-mappable).
+
+        Args:
+            path (str): Path ending in .npz, anything else is used as a directory
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            np.savez(path, skus=self.skus, product_ids=self.product_ids, instances=self.instances)
+            return str(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / SKUS_FILE, self.skus)
+        np.save(path / PRODUCT_IDS_FILE, self.product_ids)
+        np.save(path / INSTANCES_FILE, self.instances)
+        return str(path)
+
+    # --- Mapping interface (product_id -> product dict) ---
+
+    def __len__(self):
+        return len(self.instances)
+
+    def __iter__(self):
+        return iter(self.product_ids.tolist())
+
+    def __contains__(self, product_id):
+        return product_id in self.get_index()
+
+    def __getitem__(self, product_id):
+        return self.get_product(self.get_index()[product_id])
+
+    def get_index(self):
+        """Return the product_id -> row lookup (built on first use)."""
+        if self._index is None:
+            self._index = {product_id: row for row, product_id in enumerate(self.product_ids.tolist())}
+        return self._index
+
+    def items(self):
+        """Iterate (product_id, product dict) pairs without building the ID lookup."""
+        for row, product_id in enumerate(self.product_ids.tolist()):
+            yield product_id, self.get_product(row)
+
+    def values(self):
+        for _, product in self.items():
+            yield product
+
+    def get_product(self, row):
+        """Return one instance as a PRODUCT_DATA-style dict."""
+        instance = self.instances[row]
+        sku = self.skus[instance["sku"]]
+        product = {"asset": str(sku["asset"]), "translate": instance["translate"].tolist()}
+        if instance["rotation_kind"] == ROTATION_EULER:
+            product["rotate"] = instance["rotation"][:3].tolist()
+        elif instance["rotation_kind"] == ROTATION_ORIENT:
+            product["orient"] = instance["rotation"].tolist()
+        scale = instance["scale"]
+        product["scale"] = (sku["scale"] if np.isnan(scale[0]) else scale).tolist()
+        physics = instance["physics"]
+        product["physics_enabled"] = bool(sku["physics_enabled"]) if physics == PHYSICS_DEFAULT else bool(physics)
+        product["shelf"] = str(sku["shelf"])
+        product["category"] = str(sku["category"])
+        if not np.isnan(instance["velocity"][0]):
+            product["velocity"] = instance["velocity"].tolist()
+        if not np.isnan(instance["angular_velocity"][0]):
+            product["angular_velocity"] = instance["angular_velocity"].tolist()
+        return product
+
+    def to_product_data(self):
+        """Return the whole catalog as a PRODUCT_DATA-style dict."""
+        return dict(self.items())
+
+    # --- Vectorized accessors ---
+
+    def get_scales(self):
+        """Return the (N, 3) resolved scale of every instance."""
+        scales = np.array(self.instances["scale"])
+        defaults = np.isnan(scales[:, 0])
+        scales[defaults] = self.skus["scale"][self.instances["sku"][defaults]]
+        return scales
+
+    def get_physics_enabled(self):
+        """Return the (N,) resolved physics flag of every instance."""
+        physics = self.instances["physics"]
+        defaults = self.skus["physics_enabled"][self.instances["sku"]]
+        return np.where(physics == PHYSICS_DEFAULT, defaults, physics.astype(bool))
+
+    def get_shelf_categories(self):
+        """Return the shelf level -> categories mapping of the SKUs in use."""
+        shelf_categories = {}
+        for sku in self.skus[np.unique(self.instances["sku"])]:
+            shelf_categories.setdefault(str(sku["shelf"]), set()).add(str(sku["category"]))
+        return shelf_categories
+
+    def content_hash(self):
+        """Return the sha256 of the catalog contents (stable across save/load)."""
+        digest = hashlib.sha256()
+        for array in (self.skus, self.product_ids, self.instances):
+            digest.update(str(array.dtype).encode())
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    # --- Derived catalogs ---
+
+    def with_instances(self, instances):
+        """Return a catalog sharing the SKU table and IDs with a new instance table."""
+        catalog = CompactCatalog(self.skus, self.product_ids, instances)
+        catalog._index = self._index
+        return catalog
+
+    def with_assets(self, asset_map):
+        """Return a catalog whose SKU assets are replaced via asset_map (old -> new, missing = keep)."""
+        assets = [asset_map.get(str(asset), str(asset)) for asset in self.skus["asset"]]
+        skus = np.array(self.skus, dtype=make_sku_dtype(max(map(len, assets), default=1),
+                                                         self.skus.dtype["shelf"].itemsize // 4,
+                                                         self.skus.dtype["category"].itemsize // 4))
+        skus["asset"] = assets
+        catalog = CompactCatalog(skus, self.product_ids, self.instances)
+        catalog._index = self._index
+        return catalog
+
+    def get_assets(self):
+        """Return the unique asset paths of the SKU table."""
+        return sorted(set(self.skus["asset"].tolist()))
+
+
+def load_catalog(path, mmap=False):
+    """
+    Load a catalog from JSON (.json), NDJSON (.ndjson/.jsonl), a single .npz file or a .npy directory.
+
+    Args:
+        path (str): Catalog path
+        mmap (bool): Memory-map the instance table (directory form only)
+
+    Returns:
+        CompactCatalog: The loaded catalog
+    """
+    from streaming_catalog import is_ndjson_catalog, iter_catalog_products
+    path = Path(path)
+    if path.suffix == ".json":
+        return CompactCatalog.from_json(path)
+    if is_ndjson_catalog(path):
+        return CompactCatalog.from_product_data(dict(iter_catalog_products(path)))
+    return CompactCatalog.load(path, mmap=mmap)
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Convert and inspect compact product catalogs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="Convert a catalog (JSON, .npz or directory)")
+    convert_parser.add_argument("source")
+    convert_parser.add_argument("target", help=".npz file or directory (memory-mappable)")
+    info_parser = subparsers.add_parser("info", help="Print catalog statistics")
+    info_parser.add_argument("source")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = load_catalog(args.source)
+    load_time = time.perf_counter() - start
+
+    if args.command == "convert":
+        target = catalog.save(args.target)
+        print(f"Converted {len(catalog)} products ({len(catalog.skus)} SKUs) to {target}")
+    else:
+        print(f"Catalog: {args.source} (loaded in {load_time * 1000:.1f} ms)")
+        print(f"Products: {len(catalog)}")
+        print(f"SKUs: {len(catalog.skus)}")
+        print(f"Physics enabled: {int(catalog.get_physics_enabled().sum())}")
+        print(f"Instance table: {catalog.instances.nbytes / 1024:.1f} KB, "
+              f"SKU table: {catalog.skus.nbytes / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,105 +7,190 @@ at their original positions extracted from the populated shop USD file.
 Features:
 - Places 37 products from 12 categories across lower, upper, and top shelves
 - Automatically randomizes rotation of 3 random products for variety
-- Supports both Euler angles and quaternion rotations
+- Supports both Euler angles and quaternion rotations, normalized to one translate/orient/scale op stack
 - Enables physics simulation for realistic behavior
+- Optional bulk Sdf authoring mode for very large catalogs (PLACEMENT_MODE = "bulk")
+- Optional PointInstancer mode for static products (PLACEMENT_MODE = "point_instancer")
+- Optional scene-graph instancing of product payloads (INSTANCEABLE_PRODUCTS = True)
+- Optional offline asset cache for the remote product payloads (ASSET_CACHE_DIR)
+- Optional prebuilt product layer cache keyed by shop, catalog and options (STAGE_BUILD_CACHE_DIR)
+- Optional streaming mode that loads product payloads per shelf level or region (STREAM_PAYLOADS)
+- Compact SKU-table + instance-array catalog, loadable from JSON, .npz or memory-mapped .npy files
+- Incremental re-placement of only the edited products, optionally live on file change (CATALOG_WATCH_INTERVAL)
+- Cheap to import: Kit, pxr and the catalog load on first use, paths are explicit (ASSETS_DIR)
+- Opens scenes precompiled headlessly by scene_compiler.py instead of building them (PRECOMPILED_SCENE)
+- Pipelined async setup: shop open, catalog randomization, asset prefetch and placement overlap, timed per stage
+- Frame-budgeted async placement with progress and cancellation, so Kit stays interactive (FRAME_BUDGET_MS)
+- Pre-simulation overlap check of the randomized products, optionally reset or nudged apart (OVERLAP_CHECK)
+- Collision-free layout randomization of every product, one new layout per episode (RANDOMIZATION_MODE = "layout")
+- Indexed product registry with cached world-space bounds for spatial queries (placer.find_products_near)
+- Shelf surface index extracted from the shelf meshes; products can be dropped onto it (SNAP_TO_SHELVES)
+- Opens a deduplicated, instanced binary copy of the empty shop from stage_optimizer.py (OPTIMIZED_SHOP_FILE)
+- Opens the fastest up-to-date binary variant of the empty shop measured by stage_converter.py (PREFER_BINARY_SHOP)
+- Streams NDJSON catalogs: products are parsed and placed chunk by chunk in constant memory (CATALOG_CHUNK_SIZE)
 
 Usage:
 - Run this script in IsaacSim
 - It will load the empty shop and populate it with products programmatically
 """
 
-import omni.usd
-from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema
-import asyncio
-import numpy as np
-import random
-import math
-import json
 from pathlib import Path
+from catalog_loader import get_catalog_loader, DEFAULT_ASSETS_DIR
 
-BASE_PATH = "C:/Users/sascha/Code/Hackathon/Code/Dynamic_Shop/"
+# Importing this module stays cheap: Kit (omni), pxr, NumPy and the catalog are
+# only loaded when the placer first touches a stage or the product data.
 
 # Configuration
+ASSETS_DIR = DEFAULT_ASSETS_DIR  # Directory with the empty shop and the product catalog (assets/ next to this file)
 ENABLE_PHYSICS_FOR_ALL = True  # Set to False to make all products static (no physics)
 FORCE_COLLISION_FOR_PHYSICS = True  # Ensure collision detection for physics-enabled products
+PLACEMENT_MODE = "per_prim"  # "per_prim" (Usd API, one prim at a time), "bulk" (single Sdf.ChangeBlock)
+                             # or "point_instancer" (static products as one PointInstancer per SKU)
+INSTANCEABLE_PRODUCTS = False  # Mark static product prims instanceable so each SKU shares one prototype
+ASSET_CACHE_DIR = None  # Local asset cache directory (e.g. "./asset_cache"), None = use remote URLs
+ASSET_CACHE_MAX_MB = None  # Optional size bound for the asset cache (least recently used assets are evicted)
+PREFETCH_CONCURRENCY = 8  # Asset downloads in flight while setup_scene opens the shop and places products
+FRAME_BUDGET_MS = 4.0  # Async placement work per Kit frame, so the app stays responsive; None = one blocking chunk
+RANDOMIZATION_SEED = None  # Seed for the rotation randomization, None = different every run
+RANDOMIZATION_MODE = "rotations"  # "rotations" (NUM_RANDOMIZED_PRODUCTS spun in place) or "layout" (every
+                                  # product jittered within its shelf slot, collision-free, see layout_sampler.py)
+NUM_RANDOMIZED_PRODUCTS = 3  # Products whose rotation is randomized on every build
+LAYOUT_POSITION_JITTER = 0.02  # Max offset along the shelf plane per product in "layout" mode (stage units)
+LAYOUT_YAW_RANGE = 10.0  # Max turn around the up axis per product in "layout" mode (degrees)
+LAYOUT_MIN_FACINGS = None  # "layout" mode keeps between this many and all products per shelf category, None = all
+ORIENTATION_MODE = "quaternion"  # "quaternion" (every product gets translate/orient/scale xformOps)
+                                 # or "original" (keep each product's rotateZYX or orient)
+OVERLAP_CHECK = None  # Check randomized products for intersections before placing: None (off), "report",
+                     # "reset" (intersecting products go back to their catalog pose) or "nudge" (pushed apart)
+SKU_EXTENTS_FILE = None  # JSON cache of per-asset bounding boxes (OVERLAP_CHECK, SNAP_TO_SHELVES, "layout"),
+                        # None = compute every run
+SNAP_TO_SHELVES = False  # Drop every product onto the shelf surface under it before placing (shelf_surfaces.py)
+SHELF_SURFACES_FILE = "shelf_surfaces.npz"  # In assets/: shelf surface index of the empty shop, rebuilt if stale
+POSITION_JITTER = 0.0  # Max position offset per axis for randomized products (stage units)
+SCALE_JITTER = 0.0  # Max relative scale change for randomized products (0.1 = +-10%)
+STAGE_BUILD_CACHE_DIR = None  # Directory for prebuilt product layers (.usdc), needs RANDOMIZATION_SEED
+STREAM_PAYLOADS = False  # Open the shop with nothing loaded; load products with placer.load_region()
+PRODUCT_CATALOG_FILE = "product_data.json"  # In assets/: JSON, NDJSON (streamed), compact .npz or .npy directory
+CATALOG_CHUNK_SIZE = 1000  # Products parsed and placed at a time from an .ndjson catalog (streaming_catalog.py)
+CATALOG_WATCH_INTERVAL = None  # Seconds between checks for catalog edits (applied incrementally), None = no watcher
+PRECOMPILED_SCENE = None  # .usdc/.usda from scene_compiler.py to open instead of building the products, None = build
+OPTIMIZED_SHOP_FILE = None  # In assets/: optimized empty shop from stage_optimizer.py (e.g. "Shop Minimal
+                            # Empty.optimized.usdc"), opened instead of the .usda while it is current, None = off
+PREFER_BINARY_SHOP = True  # Open the fastest current binary variant from stage_converter.py, if it measured any
 
-def load_product_data():
-    """Load product data from JSON file."""
-    json_file_path = Path(BASE_PATH) / "assets" / "product_data.json"
-    try:
-        with open(json_file_path, 'r') as f:
-            product_data = json.load(f)
-        print(f"Loaded product data from: {json_file_path}")
-        return product_data
-    except FileNotFoundError:
-        print(f"ERROR: Product data file not found at: {json_file_path}")
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Invalid JSON in product data file: {e}")
-        return {}
-    except Exception as e:
-        print(f"ERROR: Failed to load product data: {e}")
-        return {}
+def get_catalog_loader_for(assets_dir=None, catalog_path=None):
+    """Return the shared, lazily loading catalog loader for an explicit assets directory or catalog path."""
+    return get_catalog_loader(catalog_path or Path(assets_dir or ASSETS_DIR) / PRODUCT_CATALOG_FILE)
 
-# Load product data from JSON file
-PRODUCT_DATA = load_product_data()
+def __getattr__(name):
+    """Load PRODUCT_DATA (SKU table + instance arrays, read like a dict of products) on first access."""
+    if name == "PRODUCT_DATA":
+        return get_catalog_loader_for().get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class DynamicShopPlacer:
     """Main class for loading empty shop and placing products dynamically."""
     
-    def __init__(self):
+    def __init__(self, assets_dir=None, catalog_path=None):
+        """
+        Args:
+            assets_dir (str or Path): Directory with the empty shop (and the catalog), None = ASSETS_DIR
+            catalog_path (str or Path): Product catalog, None = PRODUCT_CATALOG_FILE in assets_dir
+        """
+        import omni.usd
         self.stage = omni.usd.get_context().get_stage()
-        base_file = Path(BASE_PATH) / "assets" / "Shop Minimal Empty.usda"
-        self.empty_shop_path = str(base_file)
+        self.assets_dir = Path(assets_dir or ASSETS_DIR)
+        self.empty_shop_path = str(self.assets_dir / "Shop Minimal Empty.usda")
+        self.scene_path = str(PRECOMPILED_SCENE) if PRECOMPILED_SCENE else self.get_environment_path()
+        self.catalog = get_catalog_loader_for(self.assets_dir, catalog_path)
+        self.applied_catalog = None  # Snapshot of the catalog as placed (randomized), diffed when applying changes
+        self.applied_source = None  # Snapshot of the catalog the placement came from, diffed against edits
+        self.catalog_watcher = None
+        self.catalog_subscription = None
+        self.placement_token = None  # CancellationToken of the running async placement
+        self.registry = None  # ProductRegistry of the catalog, built on first use
+        self.randomized_ids = []  # Products randomized by the last prepare_products
+        self.layout_sampler = None  # LayoutSampler of the catalog ("layout" mode), built on first use
+        self.prepared_catalog = None  # Catalog of the last prepare_products, before normalizing (what is placed)
+        self.shelf_surfaces = None  # Shelf surface index of the empty shop (SNAP_TO_SHELVES), loaded on first use
+        
+    @property
+    def product_data(self):
+        """The product catalog (CompactCatalog), read on first use."""
+        return self.catalog.get()
+        
+    def get_environment_path(self):
+        """
+        Return the shop file to open.
+
+        OPTIMIZED_SHOP_FILE while it matches the empty shop, else the fastest
+        current variant from stage_converter.py (PREFER_BINARY_SHOP), else the .usda.
+        """
+        if OPTIMIZED_SHOP_FILE:
+            from stage_optimizer import is_optimized_stage_current
+            optimized_path = self.assets_dir / OPTIMIZED_SHOP_FILE
+            if is_optimized_stage_current(optimized_path, self.empty_shop_path):
+                return str(optimized_path)
+            print(f"Warning: {optimized_path} is missing or was built from another empty shop, "
+                  f"rerun stage_optimizer.py")
+        if PREFER_BINARY_SHOP:
+            from stage_converter import find_fastest_variant
+            variant_path = find_fastest_variant(self.empty_shop_path)
+            if variant_path:
+                print(f"Opening binary shop variant {variant_path.name}")
+                return str(variant_path)
+        return self.empty_shop_path
+        
+    def get_initial_load_set(self):
+        """Return the load policy for opening the shop (load nothing in streaming mode)."""
+        import omni.usd
+        if STREAM_PAYLOADS:
+            return omni.usd.UsdContextInitialLoadSet.LOAD_NONE
+        return omni.usd.UsdContextInitialLoadSet.LOAD_ALL
         
     def load_empty_shop_sync(self):
         """Synchronous version of load_empty_shop for easier testing."""
+        import omni.usd
         print("Loading empty shop environment...")
         
         # Open the empty shop USD file
-        success = omni.usd.get_context().open_stage(str(self.empty_shop_path))
+        success = omni.usd.get_context().open_stage(self.scene_path, load_set=self.get_initial_load_set())
         if not success:
-            print(f"Failed to load empty shop from: {self.empty_shop_path}")
+            print(f"Failed to load empty shop from: {self.scene_path}")
             return False
             
         self.stage = omni.usd.get_context().get_stage()
-        print(f"Successfully loaded empty shop: {self.empty_shop_path}")
+        print(f"Successfully loaded empty shop: {self.scene_path}")
         return True
         
     async def load_empty_shop(self):
         """Load the empty shop USD file as the base environment."""
+        import omni.usd
         print("Loading empty shop environment...")
         
         # Open the empty shop USD file
-        success = await omni.usd.get_context().open_stage_async(str(self.empty_shop_path))
+        success = await omni.usd.get_context().open_stage_async(self.scene_path,
+                                                                 load_set=self.get_initial_load_set())
         if not success:
-            print(f"Failed to load empty shop from: {self.empty_shop_path}")
+            print(f"Failed to load empty shop from: {self.scene_path}")
             return False
             
         self.stage = omni.usd.get_context().get_stage()
-        print(f"Successfully loaded empty shop: {self.empty_shop_path}")
+        print(f"Successfully loaded empty shop: {self.scene_path}")
         return True
         
     def create_product_hierarchy(self):
         """Create the product hierarchy structure in the stage based on JSON metadata."""
+        from pxr import UsdGeom
         # Create the main product containers
         shelf_prim = self.stage.GetPrimAtPath("/World/Shelf")
         if not shelf_prim:
             print("Warning: Could not find /World/Shelf in the loaded stage")
             return False
         
-        # Collect unique shelf levels and categories from product data
-        shelf_categories = {}
-        
-        for product_id, product_data in PRODUCT_DATA.items():
-            shelf = product_data.get("shelf", "Items_Lower")  # Default fallback
-            category = product_data.get("category", "Unknown")  # Default fallback
-            
-            if shelf not in shelf_categories:
-                shelf_categories[shelf] = set()
-            shelf_categories[shelf].add(category)
+        # Unique shelf levels and categories from the registry's indexes
+        shelf_categories = self.get_registry().get_shelf_categories()
         
         # Create shelf level scopes and category scopes dynamically
         for shelf_level, categories in shelf_categories.items():
@@ -124,6 +209,7 @@ class DynamicShopPlacer:
         
     def place_product(self, product_id, product_data):
         """Place a single product in the scene with proper transforms and physics."""
+        from pxr import UsdGeom, Gf, UsdPhysics, PhysxSchema
         # Get shelf and category from product metadata
         shelf_level = product_data.get("shelf", "Items_Lower")  # Default fallback
         category = product_data.get("category", "Unknown")  # Default fallback
@@ -134,6 +220,12 @@ class DynamicShopPlacer:
         product_prim = self.stage.DefinePrim(product_path)
         product_prim.GetPayloads().AddPayload(product_data["asset"])
         
+        # Share one prototype per asset; physics products stay regular prims, since their
+        # mesh collision below has to be authored on the Mesh children
+        physics_enabled = product_data.get("physics_enabled", False) and ENABLE_PHYSICS_FOR_ALL
+        if INSTANCEABLE_PRODUCTS and not physics_enabled:
+            product_prim.SetInstanceable(True)
+        
         # Create Xform for transforms
         xform = UsdGeom.Xform(product_prim)
         
@@ -147,7 +239,9 @@ class DynamicShopPlacer:
         scale_op = xform.AddScaleOp()
         scale_op.Set(Gf.Vec3f(*product_data["scale"]))
         
-        # Handle rotation - some products use rotateZYX, others use orient (quaternion)
+        # Handle rotation - some products use rotateZYX, others use orient (quaternion);
+        # with ORIENTATION_MODE "quaternion" every product arrives with orient
+        rotation_op = None
         if "rotate" in product_data:
             # Use Euler rotation (ZYX order)
             rotation_op = xform.AddRotateZYXOp()
@@ -166,8 +260,6 @@ class DynamicShopPlacer:
             xform.SetXformOpOrder([translate_op, scale_op])
         
         # Add physics if enabled (with global override option)
-        physics_enabled = product_data.get("physics_enabled", False) and ENABLE_PHYSICS_FOR_ALL
-        
         if physics_enabled:
             print(f"  Adding physics to {product_id}...")
             # Add RigidBody API
@@ -226,68 +318,306 @@ class DynamicShopPlacer:
         print(f"Placed product: {product_id} at {product_data['translate']} (shelf: {shelf_level}, category: {category})")
         return True
         
-    def randomize_product_rotations(self, product_data_dict, num_products=3):
+    def randomize_product_rotations(self, product_data_dict, num_products=3, seed=None):
         """
         Randomly select and randomize rotation properties of specified number of products.
         
         Args:
-            product_data_dict (dict): The product data dictionary to modify
+            product_data_dict (dict or CompactCatalog): The product data to randomize
             num_products (int): Number of products to randomize (default: 3)
+            seed (int): Optional seed to make the randomization reproducible
+            
+        With RANDOMIZATION_MODE "layout" every product is jittered instead (see sample_product_layout).
         """
-        # Create a copy to avoid modifying the original
-        randomized_data = product_data_dict.copy()
+        from randomization_engine import RandomizationEngine
+        if RANDOMIZATION_MODE == "layout":
+            return self.sample_product_layout(product_data_dict, seed=seed)
+        engine = RandomizationEngine(product_data_dict, seed=seed)
+        if seed is None:
+            print(f"Randomization seed: {engine.seed} (set RANDOMIZATION_SEED to replay this run)")
+        
+        # One batched draw for all selected products (rotations plus optional jitter)
+        draw = engine.draw(num_products=num_products, position_jitter=POSITION_JITTER, scale_jitter=SCALE_JITTER)
+        randomized_data = engine.apply(product_data_dict, draw)
+        
+        self.randomized_ids = draw["product_ids"]
+        print(f"Randomizing rotations for products: {draw['product_ids']}")
+        for product_id in draw["product_ids"]:
+            product_data = randomized_data[product_id]
+            if "orient" in product_data:
+                print(f"  {product_id}: New orientation = {product_data['orient']}")
+            else:
+                print(f"  {product_id}: New rotation = {product_data['rotate']}")
+            
+        return randomized_data
         
-        # Get list of product IDs
-        product_ids = list(randomized_data.keys())
+    def prepare_products(self):
+        """
+        Return the catalog ready to place: NUM_RANDOMIZED_PRODUCTS products randomized
+        (or every product laid out, RANDOMIZATION_MODE; RANDOMIZATION_SEED), dropped onto
+        their shelves (SNAP_TO_SHELVES), checked for intersections (OVERLAP_CHECK) and
+        every rotation normalized to ORIENTATION_MODE.
+        """
+        from orientation import normalize_orientations
+        randomized_data = self.randomize_product_rotations(self.product_data, num_products=NUM_RANDOMIZED_PRODUCTS,
+                                                           seed=RANDOMIZATION_SEED)
+        self.prepared_catalog = self.finalize_products(randomized_data)
+        return normalize_orientations(self.prepared_catalog, ORIENTATION_MODE)
         
-        # Randomly select products to randomize
-        selected_products = random.sample(product_ids, min(num_products, len(product_ids)))
+    def finalize_products(self, product_data, reference_data=None):
+        """
+        Drop the products onto their shelves (SNAP_TO_SHELVES) and check them for
+        intersections (OVERLAP_CHECK), as the last step before they are placed.
         
-        print(f"Randomizing rotations for products: {selected_products}")
+        Runs on every catalog that is placed: the randomized catalog, a new layout
+        (reset_layout) and the placed catalog with edits merged in (apply_catalog_changes).
         
-        for product_id in selected_products:
-            product_data = randomized_data[product_id].copy()
+        Args:
+            product_data (dict or CompactCatalog): Randomized, laid-out or edited product data
+            reference_data (dict or CompactCatalog): Catalog it came from (asset extents, "reset" poses),
+                None = the placer's catalog
             
-            # Generate random rotation values
-            if "rotate" in product_data or "orient" not in product_data:
-                # Use Euler angles (ZYX order) - generate random rotations in degrees
-                random_rotation = [
-                    random.uniform(-180, 180),  # X rotation
-                    random.uniform(-180, 180),  # Y rotation  
-                    random.uniform(-180, 180)   # Z rotation
-                ]
-                product_data["rotate"] = random_rotation
-                # Remove orient if it exists to avoid conflicts
-                if "orient" in product_data:
-                    del product_data["orient"]
-                print(f"  {product_id}: New rotation = {random_rotation}")
-            else:
-                # Generate random quaternion orientation
-                # Create random unit quaternion using Marsaglia method
-                u1, u2, u3 = random.random(), random.random(), random.random()
-                q1 = math.sqrt(1 - u1) * math.sin(2 * math.pi * u2)
-                q2 = math.sqrt(1 - u1) * math.cos(2 * math.pi * u2)
-                q3 = math.sqrt(u1) * math.sin(2 * math.pi * u3)
-                q0 = math.sqrt(u1) * math.cos(2 * math.pi * u3)
-                random_quat = [float(q0), float(q1), float(q2), float(q3)]  # (w, x, y, z)
-                
-                product_data["orient"] = random_quat
-                # Remove rotate if it exists to avoid conflicts
-                if "rotate" in product_data:
-                    del product_data["rotate"]
-                print(f"  {product_id}: New orientation = {random_quat}")
+        Returns:
+            dict or CompactCatalog: The product data to place, rotations not yet normalized
+        """
+        if SNAP_TO_SHELVES:
+            product_data = self.snap_products_to_shelves(product_data, reference_data)
+        if OVERLAP_CHECK:
+            product_data = self.check_product_overlaps(product_data, reference_data)
+        return product_data
+        
+    def get_layout_sampler(self, product_data=None, seed=None):
+        """
+        Return the LayoutSampler of a catalog, built once and reused for every layout.
+        
+        Args:
+            product_data (dict or CompactCatalog): Catalog whose poses define the slots, None = the catalog
+            seed (int): Seed for reproducible layouts, None = different every run
+        """
+        from layout_sampler import LayoutSampler
+        product_data = self.product_data if product_data is None else product_data
+        sampler = self.layout_sampler
+        if sampler is None or sampler.product_data is not product_data or (seed is not None and sampler.seed != seed):
+            sampler = LayoutSampler(product_data, self.get_sku_extents(product_data),
+                                    position_jitter=LAYOUT_POSITION_JITTER, yaw_range=LAYOUT_YAW_RANGE,
+                                    min_facings=LAYOUT_MIN_FACINGS, seed=seed)
+            if seed is None:
+                print(f"Randomization seed: {sampler.seed} (set RANDOMIZATION_SEED to replay this run)")
+            self.layout_sampler = sampler
+        return sampler
+        
+    def sample_product_layout(self, product_data, seed=None, episode=None):
+        """
+        Jitter the position and yaw of every product within its shelf slot, collision-free.
+        
+        Args:
+            product_data (dict or CompactCatalog): The product data to lay out
+            seed (int): Optional seed to make the layouts reproducible
+            episode (int): Sample the episode's own layout (replayable), None = next layout
             
-            # Update the data
-            randomized_data[product_id] = product_data
+        Returns:
+            dict or CompactCatalog: The laid-out product data
+        """
+        sampler = self.get_layout_sampler(product_data, seed)
+        layout = sampler.sample(episode)
+        self.randomized_ids = layout["product_ids"]
+        laid_out_data = sampler.apply(sampler.product_data, layout)
+        print(f"Sampled layout of {len(layout['product_ids'])} products in {layout['rounds']} rounds "
+              f"({layout['rejected']} draws rejected, {layout['reset']} kept at their catalog pose, "
+              f"{len(layout['removed'])} facings removed)")
+        return laid_out_data
+        
+    def reset_layout(self, episode=None):
+        """
+        Apply a new collision-free layout to the placed products (e.g. on an RL episode reset).
+        
+        Only changed products are rewritten (see apply_placed_catalog). The
+        layout is sampled from the current catalog, which it does not replace,
+        and snapped and checked like the first one (finalize_products).
+        
+        Args:
+            episode (int): Episode to lay out (replayable with RANDOMIZATION_SEED), None = next layout
+        """
+        if not self.can_apply_changes():
+            return False
+        laid_out_data = self.sample_product_layout(self.product_data, RANDOMIZATION_SEED, episode)
+        return self.apply_placed_catalog(self.finalize_products(laid_out_data))
+        
+    def get_placed_catalog(self):
+        """Return the catalog as placed: randomized or laid out, snapped and overlap-checked (prepare_products)."""
+        if self.prepared_catalog is None:
+            self.prepare_products()  # A build cache hit needs RANDOMIZATION_SEED, so this is the cached catalog
+        return self.prepared_catalog
+        
+    def get_sku_extent_cache(self):
+        """Return an extent cache backed by SKU_EXTENTS_FILE, opening assets through the asset cache."""
+        from overlap_checker import SkuExtentCache
+        asset_cache = self.get_asset_cache()
+        return SkuExtentCache(SKU_EXTENTS_FILE, resolve=asset_cache.resolve if asset_cache else None)
+        
+    def get_sku_extents(self, product_data):
+        """Return the local extents of the catalog's assets (cached in SKU_EXTENTS_FILE)."""
+        return self.get_sku_extent_cache().get_extents(product_data)
+        
+    def get_shelf_surfaces(self):
+        """Return the shelf surface index of the empty shop (cached in SHELF_SURFACES_FILE)."""
+        from shelf_surfaces import load_shelf_surfaces
+        if self.shelf_surfaces is None:
+            self.shelf_surfaces = load_shelf_surfaces(self.empty_shop_path, self.assets_dir / SHELF_SURFACES_FILE)
+        return self.shelf_surfaces
+        
+    def snap_products_to_shelves(self, product_data, reference_data=None):
+        """
+        Drop every product onto the shelf surface under it (see shelf_surfaces.py).
+        
+        Args:
+            product_data (dict or CompactCatalog): Randomized product data
+            reference_data (dict or CompactCatalog): Catalog whose asset extents to use, None = the catalog
             
-        return randomized_data
+        Returns:
+            dict or CompactCatalog: The product data with every supported product resting on its shelf
+        """
+        from shelf_surfaces import apply_shelf_snap
+        reference_data = self.product_data if reference_data is None else reference_data
+        return apply_shelf_snap(product_data, self.get_sku_extents(reference_data), self.get_shelf_surfaces())
+        
+    def check_product_overlaps(self, product_data, reference_data=None):
+        """
+        Find intersecting products before they reach PhysX (see overlap_checker.py).
+        
+        With OVERLAP_CHECK "reset" or "nudge" the randomized products are moved
+        first; "report" only prints the intersecting pairs.
+        
+        Args:
+            product_data (dict or CompactCatalog): Randomized product data
+            reference_data (dict or CompactCatalog): Catalog poses for "reset" and asset extents, None = the catalog
+            
+        Returns:
+            dict or CompactCatalog: The product data to place
+        """
+        from overlap_checker import apply_overlap_check
+        reference_data = self.product_data if reference_data is None else reference_data
+        return apply_overlap_check(product_data, self.get_sku_extents(reference_data), OVERLAP_CHECK,
+                                   reference_data=reference_data, movable=self.randomized_ids)
+        
+    def get_asset_cache(self):
+        """Return the configured AssetCache, or None without ASSET_CACHE_DIR."""
+        from asset_cache import AssetCache
+        if not ASSET_CACHE_DIR:
+            return None
+        max_bytes = int(ASSET_CACHE_MAX_MB * 1024 * 1024) if ASSET_CACHE_MAX_MB else None
+        return AssetCache(ASSET_CACHE_DIR, max_bytes=max_bytes)
         
     def place_all_products(self):
-        """Place all products from the product data."""
+        """Place all products from the product data (an NDJSON catalog is streamed, see place_streamed_products)."""
         print("Placing all products...")
+        if self.streams_catalog():
+            return self.place_streamed_products()
+        
+        # Randomize a few products before placing
+        randomized_product_data = self.prepare_products()
+        
+        # Point payloads at local cached copies of the remote assets
+        asset_cache = self.get_asset_cache()
+        if asset_cache:
+            randomized_product_data = asset_cache.localize_catalog(randomized_product_data)
+        return self.place_products(randomized_product_data)
+        
+    def streams_catalog(self):
+        """True if the catalog is placed as it is parsed: an NDJSON file, in "per_prim" or "bulk" mode."""
+        from streaming_catalog import is_ndjson_catalog
+        # point_instancer groups the whole catalog per SKU, so it reads the file whole
+        return is_ndjson_catalog(self.catalog.path) and PLACEMENT_MODE != "point_instancer"
+        
+    def place_streamed_products(self):
+        """
+        Place an NDJSON catalog chunk by chunk as the file is parsed (see streaming_catalog.py).
+        
+        Each chunk of CATALOG_CHUNK_SIZE products is converted like load_catalog does (malformed
+        entries are dropped with an error), dropped onto its shelves (SNAP_TO_SHELVES), normalized
+        to ORIENTATION_MODE, localized (ASSET_CACHE_DIR) and placed before the next one is read,
+        so only one chunk is in memory and the first products are on the stage before the file
+        is read to the end. Rotation randomization, the layout sampler and the overlap check
+        need the whole catalog and are skipped.
+        """
+        from pxr import UsdGeom
+        from bulk_authoring import author_products_to_layer, author_mesh_collision
+        from compact_catalog import CompactCatalog
+        from orientation import normalize_orientations
+        from shelf_surfaces import merge_snap_reports, print_snap_report, snap_to_surfaces
+        from streaming_catalog import iter_catalog_chunks, iter_catalog_products, place_catalog_stream
+        if not self.stage.GetPrimAtPath("/World/Shelf"):
+            print("Warning: Could not find /World/Shelf in the loaded stage")
+            return False
+        if NUM_RANDOMIZED_PRODUCTS or RANDOMIZATION_MODE == "layout" or OVERLAP_CHECK:
+            print("Streaming placement: randomization and the overlap check need the whole catalog, skipped")
+        
+        asset_cache = self.get_asset_cache()
+        layer = self.stage.GetEditTarget().GetLayer()
+        scope_paths = set()
+        # One extent cache for the whole stream, so each asset is opened once
+        extent_cache = self.get_sku_extent_cache() if SNAP_TO_SHELVES else None
+        snap_reports = []
+        
+        def prepare_chunk(chunk):
+            # Malformed entries are dropped here, as when the whole catalog is loaded
+            chunk = CompactCatalog.from_product_data(chunk)
+            if SNAP_TO_SHELVES:
+                chunk, report = snap_to_surfaces(chunk, extent_cache.get_extents(chunk), self.get_shelf_surfaces())
+                snap_reports.append(report)
+            chunk = normalize_orientations(chunk, ORIENTATION_MODE)
+            return asset_cache.localize_catalog(chunk) if asset_cache else chunk
+        
+        def place_chunk(chunk):
+            if PLACEMENT_MODE == "bulk":
+                product_paths = author_products_to_layer(
+                    layer, chunk,
+                    enable_physics=ENABLE_PHYSICS_FOR_ALL,
+                    force_collision=FORCE_COLLISION_FOR_PHYSICS,
+                    instanceable=INSTANCEABLE_PRODUCTS,
+                )
+                if ENABLE_PHYSICS_FOR_ALL and FORCE_COLLISION_FOR_PHYSICS:
+                    author_mesh_collision(self.stage, layer, product_paths.values())
+                return len(product_paths)
+            
+            placed_count = 0
+            for product_id, product_data in chunk.items():
+                # The shelf level and category scopes are created as their first product arrives
+                shelf_path = f"/World/Shelf/{product_data.get('shelf', 'Items_Lower')}"
+                for scope_path in (shelf_path, f"{shelf_path}/{product_data.get('category', 'Unknown')}"):
+                    if scope_path not in scope_paths:
+                        UsdGeom.Scope.Define(self.stage, scope_path)
+                        scope_paths.add(scope_path)
+                try:
+                    if self.place_product(product_id, product_data):
+                        placed_count += 1
+                    else:
+                        print(f"Failed to place product: {product_id}")
+                except Exception as e:
+                    print(f"Error placing product {product_id}: {str(e)}")
+            return placed_count
+        
+        chunks = iter_catalog_chunks(iter_catalog_products(self.catalog.path), CATALOG_CHUNK_SIZE)
+        result = place_catalog_stream(chunks, place_chunk, prepare_chunk=prepare_chunk)
+        if SNAP_TO_SHELVES:
+            print_snap_report(merge_snap_reports(snap_reports))
+        first_chunk = f", first chunk after {result['first_chunk_time']:.2f}s" if result["chunks"] else ""
+        print(f"Successfully placed {result['placed']} out of {result['products']} products "
+              f"(streamed in {result['chunks']} chunks{first_chunk})")
+        return result["placed"] > 0
+        
+    def place_products(self, randomized_product_data):
+        """
+        Place already randomized (and localized) product data with the configured PLACEMENT_MODE.
+        
+        Args:
+            randomized_product_data (dict or CompactCatalog): The product data to place
+        """
+        if PLACEMENT_MODE == "bulk":
+            return self.place_all_products_bulk(randomized_product_data)
+        if PLACEMENT_MODE == "point_instancer":
+            return self.place_all_products_point_instancer(randomized_product_data)
         
-        # Randomize 3 products before placing
-        randomized_product_data = self.randomize_product_rotations(PRODUCT_DATA, num_products=3)
         success_count = 0
         
         for product_id, product_data in randomized_product_data.items():
@@ -302,6 +632,333 @@ class DynamicShopPlacer:
         print(f"Successfully placed {success_count} out of {len(randomized_product_data)} products")
         return success_count > 0
         
+    def place_all_products_bulk(self, product_data_dict):
+        """
+        Author the product hierarchy and all products in a single Sdf.ChangeBlock.
+        
+        Args:
+            product_data_dict (dict or CompactCatalog): The (randomized) product data to place
+        """
+        from bulk_authoring import author_products_to_layer, author_mesh_collision
+        if not self.stage.GetPrimAtPath("/World/Shelf"):
+            print("Warning: Could not find /World/Shelf in the loaded stage")
+            return False
+        
+        layer = self.stage.GetEditTarget().GetLayer()
+        product_paths = author_products_to_layer(
+            layer, product_data_dict,
+            enable_physics=ENABLE_PHYSICS_FOR_ALL,
+            force_collision=FORCE_COLLISION_FOR_PHYSICS,
+            instanceable=INSTANCEABLE_PRODUCTS,
+        )
+        
+        # Payloads are composed now, so mesh-level collision can be added in one more block
+        if ENABLE_PHYSICS_FOR_ALL and FORCE_COLLISION_FOR_PHYSICS:
+            mesh_count = author_mesh_collision(self.stage, layer, product_paths.values())
+            print(f"  Added convex hull collision to {mesh_count} meshes")
+        
+        print(f"Successfully placed {len(product_paths)} out of {len(product_data_dict)} products (bulk)")
+        return len(product_paths) > 0
+        
+    def place_all_products_point_instancer(self, product_data_dict):
+        """
+        Place static products as one PointInstancer per SKU and physics products as prims.
+        
+        Args:
+            product_data_dict (dict or CompactCatalog): The (randomized) product data to place
+        """
+        from bulk_authoring import author_mesh_collision
+        from point_instancer_placement import author_point_instancers_to_layer
+        if not self.stage.GetPrimAtPath("/World/Shelf"):
+            print("Warning: Could not find /World/Shelf in the loaded stage")
+            return False
+        
+        layer = self.stage.GetEditTarget().GetLayer()
+        product_paths, instancer_paths = author_point_instancers_to_layer(
+            layer, product_data_dict,
+            enable_physics=ENABLE_PHYSICS_FOR_ALL,
+            force_collision=FORCE_COLLISION_FOR_PHYSICS,
+            instanceable=INSTANCEABLE_PRODUCTS,
+        )
+        
+        if ENABLE_PHYSICS_FOR_ALL and FORCE_COLLISION_FOR_PHYSICS:
+            mesh_count = author_mesh_collision(self.stage, layer, product_paths.values())
+            print(f"  Added convex hull collision to {mesh_count} meshes")
+        
+        instance_count = sum(len(ids) for ids in instancer_paths.values())
+        for instancer_path, product_ids in instancer_paths.items():
+            print(f"  {instancer_path}: {len(product_ids)} instances")
+        print(f"Successfully placed {len(product_paths) + instance_count} out of {len(product_data_dict)} products "
+              f"({instance_count} instanced in {len(instancer_paths)} PointInstancers)")
+        return len(product_paths) + instance_count > 0
+        
+    def expand_instance(self, product_id, physics_enabled=True):
+        """
+        Turn one PointInstancer instance back into a real product prim (e.g. to simulate it).
+        
+        Args:
+            product_id (str): ID of the instanced product
+            physics_enabled (bool): Give the expanded product a rigid body
+        """
+        from point_instancer_placement import expand_instance
+        return expand_instance(
+            self.stage, product_id,
+            physics_enabled=physics_enabled and ENABLE_PHYSICS_FOR_ALL,
+            force_collision=FORCE_COLLISION_FOR_PHYSICS,
+        )
+        
+    def load_region(self, bbox=None, shelf_level=None):
+        """
+        Load the product payloads inside a world-space box and/or on one shelf level.
+        
+        Args:
+            bbox (Gf.Range3d or tuple): World-space box ((min), (max)), None = no spatial filter
+            shelf_level (str): Shelf level to load (e.g. "Items_Lower"), None = all shelves
+        """
+        from bulk_authoring import author_mesh_collision
+        from region_loading import collect_payload_positions, select_payload_paths, set_payloads_loaded
+        paths = select_payload_paths(collect_payload_positions(self.stage), bbox=bbox, shelf_level=shelf_level)
+        loaded_count = set_payloads_loaded(self.stage, paths, True)
+        
+        # Mesh geometry only exists once the payload is loaded
+        if loaded_count and ENABLE_PHYSICS_FOR_ALL and FORCE_COLLISION_FOR_PHYSICS:
+            mesh_count = author_mesh_collision(self.stage, self.stage.GetEditTarget().GetLayer(), paths)
+            print(f"  Added convex hull collision to {mesh_count} meshes")
+        
+        print(f"Loaded {loaded_count} product payloads ({len(paths)} in region)")
+        return loaded_count
+        
+    def unload_region(self, bbox=None, shelf_level=None):
+        """
+        Unload the product payloads inside a world-space box and/or on one shelf level.
+        
+        Without arguments every product payload is unloaded.
+        
+        Args:
+            bbox (Gf.Range3d or tuple): World-space box ((min), (max)), None = no spatial filter
+            shelf_level (str): Shelf level to unload (e.g. "Items_Lower"), None = all shelves
+        """
+        from region_loading import collect_payload_positions, select_payload_paths, set_payloads_loaded
+        paths = select_payload_paths(collect_payload_positions(self.stage), bbox=bbox, shelf_level=shelf_level)
+        unloaded_count = set_payloads_loaded(self.stage, paths, False)
+        print(f"Unloaded {unloaded_count} product payloads ({len(paths)} in region)")
+        return unloaded_count
+        
+    def report_stage_statistics(self):
+        """Print and return prototype / composed prim counts for the current stage."""
+        from stage_statistics import collect_stage_statistics, print_stage_statistics
+        statistics = collect_stage_statistics(self.stage)
+        print_stage_statistics(statistics)
+        return statistics
+        
+    def build_products(self):
+        """Create the product hierarchy and place all products into the current edit target."""
+        # Create product hierarchy (Sdf placement modes and streamed catalogs author it together with the products)
+        if PLACEMENT_MODE == "per_prim" and not self.streams_catalog() and not self.create_product_hierarchy():
+            print("Failed to create product hierarchy!")
+            return False
+            
+        # Place all products
+        if not self.place_all_products():
+            print("Failed to place products!")
+            return False
+        return True
+        
+    def get_build_options(self):
+        """Return every placer option that changes the authored product layer."""
+        return {
+            "enable_physics": ENABLE_PHYSICS_FOR_ALL,
+            "force_collision": FORCE_COLLISION_FOR_PHYSICS,
+            "randomization_seed": RANDOMIZATION_SEED,
+            "randomization_mode": RANDOMIZATION_MODE,
+            "num_products": NUM_RANDOMIZED_PRODUCTS,
+            "layout_position_jitter": LAYOUT_POSITION_JITTER,
+            "layout_yaw_range": LAYOUT_YAW_RANGE,
+            "layout_min_facings": LAYOUT_MIN_FACINGS,
+            "orientation_mode": ORIENTATION_MODE,
+            "overlap_check": OVERLAP_CHECK,
+            "snap_to_shelves": SNAP_TO_SHELVES,
+            "position_jitter": POSITION_JITTER,
+            "scale_jitter": SCALE_JITTER,
+            "placement_mode": PLACEMENT_MODE,
+            "instanceable": INSTANCEABLE_PRODUCTS,
+            "asset_cache_dir": ASSET_CACHE_DIR,
+        }
+        
+    def populate_products(self):
+        """Add the products to the loaded shop, using the prebuilt product layer cache if enabled."""
+        from stage_build_cache import StageBuildCache, compute_build_key, apply_product_layer
+        if self.streams_catalog():
+            # Nothing holds the whole catalog: no build cache key, no snapshot for incremental updates
+            return self.build_products()
+        if not STAGE_BUILD_CACHE_DIR or RANDOMIZATION_SEED is None:
+            if STAGE_BUILD_CACHE_DIR:
+                # Unseeded randomization differs every run, so there is nothing to reuse
+                print("Build cache skipped: set RANDOMIZATION_SEED to make builds reproducible")
+            success = self.build_products()
+            if success:
+                self.remember_placement()
+            return success
+        
+        build_cache = StageBuildCache(STAGE_BUILD_CACHE_DIR)
+        key = compute_build_key(self.empty_shop_path, self.product_data, self.get_build_options())
+        success, cache_hit = apply_product_layer(self.stage, build_cache, key, lambda stage: self.build_products())
+        if success and cache_hit:
+            print(f"Reused prebuilt product layer ({len(self.product_data)} products)")
+        if success:
+            self.remember_placement()
+        return success
+        
+    def remember_placement(self):
+        """Snapshot the placed catalog and the catalog it came from, for apply_catalog_changes."""
+        from incremental_placement import snapshot_catalog
+        self.applied_catalog = snapshot_catalog(self.get_placed_catalog())
+        self.applied_source = snapshot_catalog(self.product_data)
+        
+    def check_precompiled_scene(self):
+        """
+        Check that the opened precompiled scene was built from this placer's catalog and options.
+        
+        A matching scene is treated like a placement of the current catalog, so
+        apply_catalog_changes() can update it incrementally.
+        """
+        from incremental_placement import snapshot_catalog
+        from scene_compiler import read_compiled_metadata
+        from stage_build_cache import compute_build_key
+        
+        metadata = read_compiled_metadata(self.stage.GetRootLayer())
+        if metadata is None:
+            print(f"Warning: {self.scene_path} was not written by scene_compiler.py, using it as is")
+            return True
+        
+        # Unseeded placers accept any seed, the compiled scene records the one it used
+        options = self.get_build_options()
+        if options["randomization_seed"] is None:
+            options["randomization_seed"] = int(metadata["seed"])
+        if compute_build_key(self.empty_shop_path, self.product_data, options) != metadata["buildKey"]:
+            print("Warning: the precompiled scene was built from a different shop, catalog or options; "
+                  "recompile it with scene_compiler.py (incremental updates are disabled)")
+            return True
+        
+        self.applied_catalog = snapshot_catalog(self.product_data)
+        self.applied_source = self.applied_catalog
+        print(f"Opened precompiled scene with {metadata['productCount']} products (seed {metadata['seed']})")
+        return True
+        
+    def can_apply_changes(self):
+        """True if the placed products can be updated incrementally (placed, not PointInstancer)."""
+        if self.applied_catalog is None:
+            print("No products placed yet, run setup_scene first")
+            return False
+        if PLACEMENT_MODE == "point_instancer":
+            print("Incremental updates need PLACEMENT_MODE 'per_prim' or 'bulk', rebuild the scene instead")
+            return False
+        return True
+        
+    def apply_catalog_changes(self, product_data=None):
+        """
+        Re-place only the products that changed since the last placement.
+        
+        Diffs the catalog against the snapshot of the catalog the placement
+        came from (added, removed, moved, rotated, scaled, physics changed),
+        applies just those edits to the catalog as placed and writes them into
+        the current edit target. Randomized rotations and the sampled layout
+        ("layout" mode) of untouched products stay as they are.
+        
+        Args:
+            product_data (dict or CompactCatalog): Edited catalog, None = reload the catalog file
+        """
+        from incremental_placement import count_changes, diff_catalogs, merge_catalog_edits, snapshot_catalog
+        if not self.can_apply_changes():
+            return False
+        
+        if product_data is None:
+            # Unlike load_product_data, a half-written file must not remove every product
+            try:
+                product_data = self.catalog.read()
+            except Exception as e:
+                print(f"Catalog not applied: {e}")
+                return False
+        
+        edits = diff_catalogs(self.applied_source, product_data)
+        if not count_changes(edits):
+            print("Catalog unchanged, nothing to apply")
+            return True
+        
+        merged_data = merge_catalog_edits(self.applied_catalog, edits, product_data)
+        success = self.apply_placed_catalog(self.finalize_products(merged_data, reference_data=product_data))
+        self.applied_source = snapshot_catalog(product_data)
+        self.catalog.set(product_data)
+        return success
+        
+    def apply_placed_catalog(self, product_data):
+        """
+        Rewrite the placed products that differ from product_data, the catalog as it should be placed.
+        
+        Args:
+            product_data (dict or CompactCatalog): Catalog to place (randomized, laid out or edited)
+        """
+        from bulk_authoring import author_mesh_collision
+        from orientation import normalize_orientations
+        from incremental_placement import snapshot_catalog, diff_catalogs, apply_catalog_diff, count_changes, format_diff
+        diff = diff_catalogs(self.applied_catalog, product_data)
+        if not count_changes(diff):
+            print("Placement unchanged, nothing to apply")
+            return True
+        
+        # Added and replaced products get the same op stack and cached assets as the initial placement
+        authored_data = normalize_orientations(product_data, ORIENTATION_MODE)
+        asset_cache = self.get_asset_cache()
+        if asset_cache:
+            authored_data = asset_cache.localize_catalog(authored_data)
+        
+        layer = self.stage.GetEditTarget().GetLayer()
+        counts = apply_catalog_diff(
+            self.stage, layer, diff, self.applied_catalog, authored_data,
+            enable_physics=ENABLE_PHYSICS_FOR_ALL,
+            force_collision=FORCE_COLLISION_FOR_PHYSICS,
+        )
+        if counts["physics_paths"] and FORCE_COLLISION_FOR_PHYSICS:
+            author_mesh_collision(self.stage, layer, counts["physics_paths"])
+        
+        self.applied_catalog = snapshot_catalog(product_data)
+        if self.registry is not None:
+            self.registry.apply_diff(diff, product_data)
+        print(f"Applied catalog changes: {format_diff(diff)}"
+              + (f" ({counts['failed']} failed)" if counts["failed"] else ""))
+        return counts["failed"] == 0
+        
+    def start_catalog_watcher(self, interval=None):
+        """
+        Apply catalog edits live: check the catalog file on every Kit update and
+        re-place the changed products when it was saved.
+        
+        Args:
+            interval (float): Seconds between file checks, None = CATALOG_WATCH_INTERVAL (or 1 second)
+        """
+        import omni.kit.app
+        from incremental_placement import CatalogWatcher
+        self.stop_catalog_watcher()
+        interval = interval or CATALOG_WATCH_INTERVAL or 1.0
+        self.catalog_watcher = CatalogWatcher(self.catalog.path, interval=interval)
+        
+        # Runs on the main thread between frames, where editing the stage is safe
+        def on_update(event):
+            if self.catalog_watcher.poll():
+                self.apply_catalog_changes()
+        
+        update_stream = omni.kit.app.get_app().get_update_event_stream()
+        self.catalog_subscription = update_stream.create_subscription_to_pop(on_update, name="catalog_watcher")
+        print(f"Watching {self.catalog.path} for changes (every {interval}s)")
+        
+    def stop_catalog_watcher(self):
+        """Stop applying catalog edits live."""
+        if self.catalog_subscription is not None:
+            self.catalog_subscription.unsubscribe()
+            print("Stopped watching the product catalog")
+        self.catalog_subscription = None
+        self.catalog_watcher = None
+        
     def setup_scene_sync(self):
         """Synchronous version of setup_scene for easier execution in Isaac Sim."""
         print("Starting dynamic shop setup...")
@@ -311,34 +968,189 @@ class DynamicShopPlacer:
             print("Failed to load empty shop!")
             return False
             
-        # Create product hierarchy
-        if not self.create_product_hierarchy():
-            print("Failed to create product hierarchy!")
+        # Create product hierarchy and place all products (a precompiled scene already has them)
+        populated = self.check_precompiled_scene() if PRECOMPILED_SCENE else self.populate_products()
+        if not populated:
             return False
+        
+        # Apply later catalog edits live
+        if CATALOG_WATCH_INTERVAL:
+            self.start_catalog_watcher()
             
-        # Place all products
-        if not self.place_all_products():
-            print("Failed to place products!")
+        print("Dynamic shop setup completed successfully!")
+        return True
+        
+    def create_product_hierarchy_specs(self):
+        """Author the shelf level and category scopes at the Sdf level in one change block (bulk mode)."""
+        from pxr import Sdf
+        from bulk_authoring import author_hierarchy_to_layer
+        if not self.stage.GetPrimAtPath("/World/Shelf"):
+            print("Warning: Could not find /World/Shelf in the loaded stage")
             return False
+        with Sdf.ChangeBlock():
+            author_hierarchy_to_layer(self.stage.GetEditTarget().GetLayer(), self.product_data)
+        return True
+        
+    def place_product_spec(self, product_id, product_data):
+        """Author one product at the Sdf level (bulk mode; the scheduler wraps each chunk in an Sdf.ChangeBlock)."""
+        from bulk_authoring import author_product_spec
+        return author_product_spec(
+            self.stage.GetEditTarget().GetLayer(), product_id, product_data,
+            enable_physics=ENABLE_PHYSICS_FOR_ALL,
+            force_collision=FORCE_COLLISION_FOR_PHYSICS,
+            instanceable=INSTANCEABLE_PRODUCTS,
+        )
+        
+    def get_registry(self):
+        """
+        Return the ProductRegistry of the catalog (indexes by shelf, category, asset and
+        prim path, cached world-space bounds), bound to the current stage.
+        """
+        from product_registry import ProductRegistry
+        if self.registry is None:
+            self.registry = ProductRegistry(self.product_data)
+        if self.stage is not None and self.registry.stage != self.stage:
+            self.registry.bind_stage(self.stage)
+        return self.registry
+        
+    def find_products_near(self, point, radius=None, shelf=None, category=None, limit=None):
+        """
+        Find the placed products nearest to a world-space point ("what's on shelf X near P").
+        
+        Only the bounds of products that changed since the last query are recomputed.
+        
+        Args:
+            point (3-sequence): World-space point
+            radius (float): Maximum distance to a product's bounding box, None = no limit
+            shelf (str): Shelf level to search (e.g. "Items_Lower"), None = every shelf
+            category (str): Only return products of this category, None = any
+            limit (int): Return at most this many products, None = all
             
-        print("Dynamic shop setup completed successfully!")
+        Returns:
+            list: (product_id, distance) pairs, nearest first
+        """
+        return self.get_registry().query(point, radius=radius, shelf=shelf, category=category, limit=limit)
+        
+    def get_product_paths(self, product_ids):
+        """Return the prim paths of catalog products."""
+        registry = self.get_registry()
+        return [str(registry.get_path(product_id)) for product_id in product_ids]
+        
+    def remove_products(self, product_ids):
+        """
+        Remove placed products from the edit target, plus the hierarchy scopes they leave empty.
+        
+        Args:
+            product_ids (list): IDs of the products to remove (e.g. of a cancelled placement)
+        """
+        from bulk_authoring import remove_products_from_layer
+        removed_count = remove_products_from_layer(self.stage.GetEditTarget().GetLayer(),
+                                                   self.get_product_paths(product_ids),
+                                                   scope_paths=self.get_registry().get_hierarchy_paths())
+        print(f"Removed {removed_count} placed products")
+        return removed_count
+        
+    def cancel_placement(self, reason="cancelled by user"):
+        """Abandon the running async placement after its current chunk; the products placed so far are removed."""
+        if self.placement_token is None:
+            print("No placement running")
+            return False
+        self.placement_token.cancel(reason)
         return True
         
+    async def place_all_products_async(self, open_stage=None):
+        """
+        Place all products without freezing Kit (see async_setup.py and placement_scheduler.py).
+        
+        The catalog is randomized in a worker thread and the assets are prefetched
+        (with ASSET_CACHE_DIR); each product is placed as soon as its asset is local.
+        Products are placed in chunks of FRAME_BUDGET_MS per frame, waiting for the
+        next Kit update between chunks, with progress printed every 10%.
+        cancel_placement() abandons the build cleanly: the products placed so far
+        are removed again. Prints the timing of every stage.
+        
+        Args:
+            open_stage (coroutine function): Opens the stage first, overlapping with the
+                randomization and prefetch; None = place into the current stage
+        """
+        import omni.kit.app
+        from pxr import Sdf
+        from async_setup import run_setup_pipeline
+        from bulk_authoring import author_mesh_collision
+        from placement_scheduler import CancellationToken, FrameBudget, print_progress
+        print("Placing all products...")
+        
+        # point_instancer groups the whole catalog per SKU, so it is authored in one piece
+        placement_steps = {
+            "per_prim": {"place_product": self.place_product, "create_hierarchy": self.create_product_hierarchy},
+            "bulk": {"place_product": self.place_product_spec, "create_hierarchy": self.create_product_hierarchy_specs,
+                     "chunk_context": Sdf.ChangeBlock},
+            "point_instancer": {"place_all": self.place_products},
+        }[PLACEMENT_MODE]
+        
+        asset_cache = self.get_asset_cache()
+        self.placement_token = CancellationToken()
+        budget = FrameBudget(FRAME_BUDGET_MS / 1000 if FRAME_BUDGET_MS else None,
+                             next_frame=omni.kit.app.get_app().next_update_async,
+                             cancel_token=self.placement_token)
+        try:
+            result = await run_setup_pipeline(
+                open_stage=open_stage,
+                prepare_products=self.prepare_products,
+                fetch_asset=asset_cache.download if asset_cache else None,
+                on_assets_fetched=asset_cache.commit if asset_cache else None,
+                max_concurrency=PREFETCH_CONCURRENCY,
+                frame_budget=budget,
+                progress=print_progress("Placing products"),
+                **placement_steps,
+            )
+        finally:
+            self.placement_token = None
+        
+        if result["cancelled"]:
+            print(f"Placement {budget.cancel_token.reason} after {result['placed']} of {result['products']} products")
+            self.remove_products(result["placed_ids"])
+            return False
+        
+        # Payloads are composed now, so mesh-level collision can be added in one more block
+        if PLACEMENT_MODE == "bulk" and ENABLE_PHYSICS_FOR_ALL and FORCE_COLLISION_FOR_PHYSICS:
+            mesh_count = author_mesh_collision(self.stage, self.stage.GetEditTarget().GetLayer(),
+                                               self.get_product_paths(result["placed_ids"]))
+            print(f"  Added convex hull collision to {mesh_count} meshes")
+        if PLACEMENT_MODE != "point_instancer" and result["products"]:
+            print(f"Successfully placed {result['placed']} out of {result['products']} products "
+                  f"over {result['frames'] + 1} frames")
+        return result["success"]
+        
+    async def populate_products_async(self):
+        """Open the empty shop and place the products as one pipeline (see place_all_products_async)."""
+        if STAGE_BUILD_CACHE_DIR:
+            # Unseeded randomization differs every run, so there is nothing to reuse
+            print("Build cache skipped: set RANDOMIZATION_SEED to make builds reproducible")
+        success = await self.place_all_products_async(open_stage=self.load_empty_shop)
+        if success:
+            self.remember_placement()
+        return success
+        
     async def setup_scene(self):
         """Main method to set up the complete scene."""
         print("Starting dynamic shop setup...")
         
-        # Load empty shop
-        if not await self.load_empty_shop():
-            return False
-            
-        # Create product hierarchy
-        if not self.create_product_hierarchy():
-            return False
-            
-        # Place all products
-        if not self.place_all_products():
+        if PRECOMPILED_SCENE or (STAGE_BUILD_CACHE_DIR and RANDOMIZATION_SEED is not None) or self.streams_catalog():
+            # A precompiled scene already has the products, a cached build replays one layer,
+            # an NDJSON catalog is placed chunk by chunk as it is parsed
+            if not await self.load_empty_shop():
+                return False
+            populated = self.check_precompiled_scene() if PRECOMPILED_SCENE else self.populate_products()
+        else:
+            # Open, randomize, prefetch and place concurrently
+            populated = await self.populate_products_async()
+        if not populated:
             return False
+        
+        # Apply later catalog edits live
+        if CATALOG_WATCH_INTERVAL:
+            self.start_catalog_watcher()
             
         print("Dynamic shop setup completed successfully!")
         return True
@@ -12,6 +12,46 @@ Available scripts:
 - verify_data.py: Comprehensive data verification
 - verify_readme.py: Verify README documentation
 - test_and_usage.py: Complete test suite with usage instructions
+- test_bulk_authoring.py: Test bulk Sdf authoring against per-prim authoring
+- test_point_instancer.py: Test PointInstancer placement and instance expansion
+- test_instancing.py: Test instanceable products and stage statistics
+- report_instancing.py: Stage statistics report with and without instancing
+- test_asset_cache.py: Test the offline asset cache against a local HTTP server
+- test_stage_build_cache.py: Test the prebuilt product layer cache
+- test_randomization_engine.py: Test the vectorized, seeded randomization engine
+- test_region_loading.py: Test shelf- and region-scoped payload loading
+- test_compact_catalog.py: Test the compact SKU-table + instance-array catalog
+- test_variant_farm.py: Test the scene-variant farm
+- test_incremental_placement.py: Test catalog diffs and incremental re-placement
+- test_lazy_import.py: Test lazy module import and the cached catalog loader
+- test_scene_compiler.py: Test the headless scene compiler
+- test_async_setup.py: Test the pipelined async setup with asset prefetch
+- test_placement_scheduler.py: Test frame-budgeted chunked placement and cancellation
+- test_orientation.py: Test batch orientation normalization
+- test_product_registry.py: Test the indexed product registry and cached bounds
+- test_overlap_checker.py: Test the pre-simulation overlap check and resolution
+- test_layout_sampler.py: Test the collision-free layout sampler
+- test_planogram.py: Test the planogram compiler
+- test_shelf_surfaces.py: Test the shelf surface index and shelf snapping
+- test_stage_optimizer.py: Test the empty shop optimizer
+- test_stage_converter.py: Test the shop format converter
+- test_catalog_extractor.py: Test the populated shop -> catalog extractor
+- test_catalog_validator.py: Test the streaming catalog validator
+- test_streaming_catalog.py: Test the NDJSON streaming catalog and chunked placement
+- http_stand_in.py: Local HTTP stand-in server used by the tests
+- benchmark_bulk_authoring.py: Benchmark per-prim vs bulk product authoring
+- benchmark_randomization.py: Benchmark the randomization loop vs the NumPy engine
+- benchmark_compact_catalog.py: Benchmark JSON vs compact catalog loading
+- benchmark_stage_cache.py: Benchmark cold vs warm startup with the build cache
+- benchmark_import_time.py: Benchmark lazy vs eager import time of the placer
+- benchmark_orientation.py: Benchmark mixed vs unified xformOp layouts
+- benchmark_registry.py: Benchmark catalog scans vs registry lookups and bounds
+- benchmark_overlap.py: Benchmark the spatial-hash overlap check vs all pairs
+- benchmark_layout_sampler.py: Benchmark batched vs per-product layout sampling
+- benchmark_planogram.py: Benchmark planogram compiling vs JSON catalog loading
+- benchmark_shelf_surfaces.py: Benchmark shelf surface index lookups vs per-triangle support
+- benchmark_catalog_extractor.py: Benchmark Sdf-level catalog extraction vs a composed stage read
+- benchmark_catalog_validator.py: Benchmark streaming catalog validation vs json.load
 
 To run from project root:
 python helpers/script_name.py
@@ -3,7 +3,6 @@
 Check the actual physics settings for all products by reading from JSON data
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -13,12 +12,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Base path is now the parent directory
 BASE_PATH = Path(__file__).parent.parent
 
+from compact_catalog import load_catalog
+
 def load_product_data():
-    """Load product data from JSON file."""
+    """Load product data as a compact catalog (SKU table + instance arrays)."""
     json_file_path = BASE_PATH / "assets" / "product_data.json"
     try:
-        with open(json_file_path, 'r') as f:
-            return json.load(f)
+        return load_catalog(json_file_path)
     except Exception as e:
         print(f"ERROR: Failed to load product data: {e}")
         return {}
@@ -31,14 +31,10 @@ def analyze_physics_settings():
         print("❌ Failed to load product data")
         return
     
-    physics_enabled = []
-    physics_disabled = []
-    
-    for product_name, data in product_data.items():
-        if data.get("physics_enabled", False):
-            physics_enabled.append(product_name)
-        else:
-            physics_disabled.append(product_name)
+    # Resolved per-instance physics flags (SKU default or per-instance override)
+    physics_mask = product_data.get_physics_enabled()
+    physics_enabled = product_data.product_ids[physics_mask].tolist()
+    physics_disabled = product_data.product_ids[~physics_mask].tolist()
     
     print("=== PHYSICS ANALYSIS ===")
     print(f"\nPHYSICS ENABLED ({len(physics_enabled)} products):")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-prim Usd authoring vs. bulk Sdf-layer authoring
+
+Compares the current place_product path (DefinePrim + UsdGeom xformOps +
+API schema Apply per product) with bulk_authoring.author_products_to_layer
+(one Sdf.ChangeBlock for the whole catalog) at several catalog sizes.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+Payloads are never loaded, so no network access is needed.
+
+Usage:
+    python helpers/benchmark_bulk_authoring.py
+    python helpers/benchmark_bulk_authoring.py --sizes 37 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Base path is now the parent directory
+BASE_PATH = Path(__file__).parent.parent
+
+from pxr import Usd, UsdGeom, UsdPhysics, Gf
+from bulk_authoring import author_products_to_layer, collect_shelf_categories
+
+DEFAULT_SIZES = [37, 1000, 10000, 100000]
+
+
+def load_product_data():
+    """Load product data from JSON file."""
+    json_file_path = BASE_PATH / "assets" / "product_data.json"
+    try:
+        with open(json_file_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"ERROR: Failed to load product data: {e}")
+        return {}
+
+
+def make_synthetic_catalog(product_data, count):
+    """Tile the real catalog until it has `count` products (unique IDs, shifted along Y)."""
+    # Skip malformed entries (e.g. a 4-value 'rotate') so every synthetic product is placeable
+    base_items = [(product_id, data) for product_id, data in product_data.items()
+                  if len(data.get("rotate", [0, 0, 0])) == 3 and len(data.get("orient", [1, 0, 0, 0])) == 4]
+    catalog = {}
+    for i in range(count):
+        product_id, data = base_items[i % len(base_items)]
+        copy_index = i // len(base_items)
+        entry = dict(data)
+        x, y, z = data["translate"]
+        entry["translate"] = [x, y + copy_index * 5.0, z]
+        catalog[product_id if copy_index == 0 else f"{product_id}_{copy_index}"] = entry
+    return catalog
+
+
+def create_base_stage():
+    """Create an in-memory stage with /World/Shelf and payloads unloaded."""
+    stage = Usd.Stage.CreateInMemory(load=Usd.Stage.LoadNone)
+    UsdGeom.Xform.Define(stage, "/World")
+    UsdGeom.Xform.Define(stage, "/World/Shelf")
+    return stage
+
+
+def place_per_prim(stage, product_data):
+    """Per-prim reference path (same calls as DynamicShopPlacer, minus PhysxSchema/printing).
+
+    Returns:
+        list: IDs of products that failed to place
+    """
+    for shelf_level, categories in collect_shelf_categories(product_data).items():
+        UsdGeom.Scope.Define(stage, f"/World/Shelf/{shelf_level}")
+        for category in categories:
+            UsdGeom.Scope.Define(stage, f"/World/Shelf/{shelf_level}/{category}")
+
+    failed_ids = []
+    for product_id, data in product_data.items():
+        try:
+            path = f"/World/Shelf/{data.get('shelf', 'Items_Lower')}/{data.get('category', 'Unknown')}/{product_id}"
+            prim = stage.DefinePrim(path)
+            prim.GetPayloads().AddPayload(data["asset"])
+            xform = UsdGeom.Xform(prim)
+            xform.ClearXformOpOrder()
+            ops = [xform.AddTranslateOp()]
+            ops[0].Set(Gf.Vec3d(*data["translate"]))
+            if "rotate" in data:
+                ops.append(xform.AddRotateZYXOp())
+                ops[-1].Set(Gf.Vec3f(*data["rotate"]))
+            elif "orient" in data:
+                q = data["orient"]
+                ops.append(xform.AddOrientOp())
+                ops[-1].Set(Gf.Quatf(q[0], Gf.Vec3f(q[1], q[2], q[3])))
+            ops.append(xform.AddScaleOp())
+            ops[-1].Set(Gf.Vec3f(*data["scale"]))
+            xform.SetXformOpOrder(ops)
+
+            if data.get("physics_enabled", False):
+                rigid_body_api = UsdPhysics.RigidBodyAPI.Apply(prim)
+                rigid_body_api.CreateRigidBodyEnabledAttr(True)
+                rigid_body_api.CreateKinematicEnabledAttr(False)
+                prim.AddAppliedSchema("PhysxRigidBodyAPI")
+                collision_api = UsdPhysics.CollisionAPI.Apply(prim)
+                collision_api.CreateCollisionEnabledAttr(True)
+                prim.AddAppliedSchema("PhysxCollisionAPI")
+                if "velocity" in data:
+                    rigid_body_api.CreateVelocityAttr(Gf.Vec3f(*data["velocity"]))
+                if "angular_velocity" in data:
+                    rigid_body_api.CreateAngularVelocityAttr(Gf.Vec3f(*data["angular_velocity"]))
+        except Exception:
+            # Same behaviour as place_all_products: report and continue
+            failed_ids.append(product_id)
+    return failed_ids
+
+
+def place_bulk(stage, product_data):
+    """Bulk Sdf path.
+
+    Returns:
+        list: IDs of products that failed to place
+    """
+    product_paths = author_products_to_layer(stage.GetRootLayer(), product_data)
+    return [product_id for product_id in product_data if product_id not in product_paths]
+
+
+def time_placement(place_function, product_data):
+    """Time one placement run on a fresh stage, including the final recomposition."""
+    stage = create_base_stage()
+    start = time.perf_counter()
+    failed_ids = place_function(stage, product_data)
+    # Force composition of the authored prims so both paths pay the same cost
+    sum(1 for _ in stage.TraverseAll())
+    elapsed = time.perf_counter() - start
+    return elapsed, len(product_data) - len(failed_ids)
+
+
+def run_benchmark(sizes):
+    """Run the benchmark for each catalog size and print a table."""
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+
+    print("=== BULK AUTHORING BENCHMARK ===")
+    print(f"{'products':>10s} {'per-prim (s)':>14s} {'bulk (s)':>10s} {'speedup':>9s} {'placed':>8s}")
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size)
+        per_prim_time, per_prim_count = time_placement(place_per_prim, catalog)
+        bulk_time, bulk_count = time_placement(place_bulk, catalog)
+        if per_prim_count != bulk_count:
+            print(f"❌ Placed count mismatch at {size}: {per_prim_count} vs {bulk_count}")
+        speedup = per_prim_time / bulk_time if bulk_time > 0 else float("inf")
+        print(f"{size:10d} {per_prim_time:14.3f} {bulk_time:10.3f} {speedup:8.1f}x {bulk_count:8d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-prim vs bulk product authoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Catalog sizes to benchmark")
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
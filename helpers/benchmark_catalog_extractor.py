@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Sdf-level catalog extraction vs reading a composed stage
+
+The reference shop's Items_* scopes are tiled to each size and written as
+.usda. Each file then gets its catalog extracted by catalog_extractor.py
+(Sdf layer parse, then the prim spec walk) and read from a composed stage
+opened with no payloads loaded, one attribute at a time (what a Usd-based
+extractor costs even without fetching the products).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+
+Usage:
+    python helpers/benchmark_catalog_extractor.py
+    python helpers/benchmark_catalog_extractor.py --sizes 37 100000
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from pxr import Sdf, Usd
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from catalog_extractor import (ITEMS_PREFIX, RIGID_BODY_API, SHELF_PATH, VALUE_ATTRIBUTES, extract_catalog,
+                               get_product_name)
+from helpers.test_catalog_extractor import REFERENCE_SHOP_PATH
+
+DEFAULT_SIZES = [37, 1000, 10000]
+
+
+def write_tiled_shop(shop_path, size):
+    """Write the reference shop with its Items_* scopes copied until it holds at least size products."""
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    layer.TransferContent(Sdf.Layer.FindOrOpen(str(REFERENCE_SHOP_PATH)))
+    shelf = layer.GetPrimAtPath(SHELF_PATH)
+    items = [spec for spec in shelf.nameChildren if spec.name.startswith(ITEMS_PREFIX)]
+    products = sum(len(category.nameChildren) for spec in items for category in spec.nameChildren)
+    copies = math.ceil(size / products)
+    for copy in range(1, copies):
+        for spec in items:
+            Sdf.CopySpec(layer, spec.path, layer, spec.path.ReplaceName(f"{spec.name}_{copy}"))
+    if not layer.Export(str(shop_path)):
+        raise OSError(f"Could not write {shop_path}")
+    return products * copies
+
+
+def read_composed(shop_path):
+    """The same catalog read from a composed stage opened without payloads, one attribute at a time."""
+    stage = Usd.Stage.Open(str(shop_path), Usd.Stage.LoadNone)
+    product_data = {}
+    counts = Counter()
+    for shelf in stage.GetPrimAtPath(SHELF_PATH).GetChildren():
+        if not shelf.GetName().startswith(ITEMS_PREFIX):
+            continue
+        for category in shelf.GetChildren():
+            for prim in category.GetAllChildren():  # Unloaded prims are not in GetChildren()
+                payloads = prim.GetMetadata("payload")
+                product = {"asset": payloads.ApplyOperations([])[0].assetPath if payloads else ""}
+                for key, attribute in VALUE_ATTRIBUTES.items():
+                    value = prim.GetAttribute(attribute).Get()
+                    if value is not None:
+                        product[key] = [value.GetReal(), *value.GetImaginary()] if key == "orient" else list(value)
+                product["physics_enabled"] = RIGID_BODY_API in prim.GetAppliedSchemas()
+                product["shelf"], product["category"] = shelf.GetName(), category.GetName()
+                name = get_product_name(prim.GetName())
+                counts[name] += 1
+                product_data[f"{name}_{counts[name]}"] = product
+    return product_data
+
+
+def run_benchmark(sizes):
+    print("=== CATALOG EXTRACTOR BENCHMARK ===")
+    print(f"{'products':>10s} {'file (MB)':>10s} {'parse (ms)':>11s} {'walk (ms)':>10s} {'sdf (ms)':>9s} "
+          f"{'composed (ms)':>14s} {'speedup':>8s}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            shop_path = Path(directory) / f"shop_{size}.usda"
+            products = write_tiled_shop(shop_path, size)
+            start = time.perf_counter()
+            layer = Sdf.Layer.FindOrOpen(str(shop_path))
+            parse_time = time.perf_counter() - start
+            start = time.perf_counter()
+            product_data, _ = extract_catalog(shop_path)  # Reuses the open layer
+            walk_time = time.perf_counter() - start
+            del layer  # Release it, so the stage parses the file again
+            start = time.perf_counter()
+            composed = read_composed(shop_path)
+            composed_time = time.perf_counter() - start
+            assert len(product_data) == len(composed) == products
+            sdf_time = parse_time + walk_time
+            print(f"{products:10d} {shop_path.stat().st_size / 1024 ** 2:10.1f} {parse_time * 1000:11.1f} "
+                  f"{walk_time * 1000:10.1f} {sdf_time * 1000:9.1f} {composed_time * 1000:14.1f} "
+                  f"{composed_time / sdf_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Sdf-level catalog extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Product counts")
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
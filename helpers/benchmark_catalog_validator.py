@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming catalog validation vs loading the whole catalog
+
+The reference catalog's products are repeated (with new IDs) to each size
+and written as product_data.json and NDJSON. Each file is validated by
+catalog_validator.py, which streams it once, and loaded with json.load,
+which the helper scripts did before checking anything. Python heap peaks
+are measured with tracemalloc, so the streaming peak stays at about one
+chunk plus 16 bytes per product while json.load grows with the catalog.
+
+Requires NumPy (pip install numpy), Isaac Sim is NOT required.
+
+Usage:
+    python helpers/benchmark_catalog_validator.py
+    python helpers/benchmark_catalog_validator.py --sizes 1000000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from catalog_validator import NDJSON_ID_KEY, validate_catalog
+from shelf_surfaces import ShelfSurfaces
+
+BASE_PATH = Path(__file__).parent.parent
+CATALOG_PATH = BASE_PATH / "assets" / "product_data.json"
+SHELF_SURFACES_PATH = BASE_PATH / "assets" / "shelf_surfaces.npz"
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def write_catalogs(directory, size):
+    """Write size products as product_data.json and NDJSON and return both paths."""
+    with open(CATALOG_PATH, 'r') as f:
+        products = list(json.load(f).items())
+    json_path, ndjson_path = Path(directory) / f"catalog_{size}.json", Path(directory) / f"catalog_{size}.ndjson"
+    with open(json_path, 'w') as json_file, open(ndjson_path, 'w') as ndjson_file:
+        json_file.write("{\n")
+        for index in range(size):
+            product_id, data = products[index % len(products)]
+            product_id = f"{product_id}_{index // len(products)}"
+            separator = ",\n" if index < size - 1 else "\n"
+            json_file.write(f"    {json.dumps(product_id)}: {json.dumps(data)}{separator}")
+            ndjson_file.write(json.dumps({NDJSON_ID_KEY: product_id, **data}) + "\n")
+        json_file.write("}\n")
+    return json_path, ndjson_path
+
+
+def count_copies(product_ids, size):
+    """How many of size repeated reference products are copies of product_ids."""
+    with open(CATALOG_PATH, 'r') as f:
+        products = list(json.load(f))
+    return sum(products[index % len(products)] in product_ids for index in range(size))
+
+
+def measure(function, *args):
+    """Run function and return (result, seconds, Python heap peak in MB); the peak comes from a second run."""
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()  # Slows allocations down, so not timed
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def run_benchmark(sizes):
+    print("=== CATALOG VALIDATOR BENCHMARK ===")
+    surfaces = ShelfSurfaces.load(SHELF_SURFACES_PATH)
+    invalid = {product_id for _, product_id, _ in validate_catalog(CATALOG_PATH, surfaces)["errors"]}
+    print(f"{'products':>10s} {'file (MB)':>10s} {'json (s)':>9s} {'peak (MB)':>10s} {'ndjson (s)':>11s} "
+          f"{'peak (MB)':>10s} {'json.load (s)':>14s} {'peak (MB)':>10s}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            json_path, ndjson_path = write_catalogs(directory, size)
+            json_report, json_time, json_peak = measure(validate_catalog, json_path, surfaces)
+            ndjson_report, ndjson_time, ndjson_peak = measure(validate_catalog, ndjson_path, surfaces)
+            _, load_time, load_peak = measure(load_json, json_path)
+            # Every copy of a product with an error in the reference catalog is reported, nothing else
+            assert json_report["products"] == ndjson_report["products"] == size
+            assert json_report["error_count"] == ndjson_report["error_count"] == count_copies(invalid, size)
+            print(f"{size:10d} {json_path.stat().st_size / 1024 ** 2:10.1f} {json_time:9.2f} {json_peak:10.1f} "
+                  f"{ndjson_time:11.2f} {ndjson_peak:10.1f} {load_time:14.2f} {load_peak:10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming catalog validation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Product counts")
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON dict-of-dicts catalog vs. compact SKU-table + instance arrays
+
+For each catalog size, writes the tiled catalog as JSON, .npz and a .npy
+directory, then compares file size, load time, resident memory of the
+loaded catalog (tracemalloc) and a full pass over the catalog (counting
+physics products per shelf level).
+
+Requires NumPy only (no USD, no Isaac Sim).
+
+Usage:
+    python helpers/benchmark_compact_catalog.py
+    python helpers/benchmark_compact_catalog.py --sizes 1000 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog, load_catalog
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+
+
+def load_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def measure_load(function):
+    """Return (seconds, traced bytes still allocated, result) of a loader call."""
+    # Timed and traced separately, tracemalloc slows allocation-heavy loaders down a lot
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = function()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current, result
+
+
+def count_physics_dict(product_data):
+    counts = {}
+    for data in product_data.values():
+        if data.get("physics_enabled", False):
+            counts[data["shelf"]] = counts.get(data["shelf"], 0) + 1
+    return counts
+
+
+def count_physics_catalog(catalog):
+    # Count per SKU with one bincount, then aggregate the (few) SKUs per shelf
+    sku_counts = np.bincount(catalog.instances["sku"][catalog.get_physics_enabled()], minlength=len(catalog.skus))
+    counts = {}
+    for shelf, count in zip(catalog.skus["shelf"].tolist(), sku_counts.tolist()):
+        if count:
+            counts[shelf] = counts.get(shelf, 0) + count
+    return counts
+
+
+def run_benchmark(sizes):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+
+    print("=== COMPACT CATALOG BENCHMARK ===")
+    print(f"{'products':>9s} {'form':>10s} {'file (MB)':>10s} {'load (ms)':>10s} {'memory (MB)':>12s} "
+          f"{'full pass (ms)':>15s}")
+    for size in sizes:
+        catalog_data = make_synthetic_catalog(product_data, size)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "catalog.json"
+            with open(json_path, 'w') as f:
+                json.dump(catalog_data, f)
+            catalog = CompactCatalog.from_product_data(catalog_data)
+            npz_path = Path(catalog.save(Path(directory) / "catalog.npz"))
+            npy_path = Path(catalog.save(Path(directory) / "catalog"))
+
+            forms = [
+                ("json dict", json_path.stat().st_size, lambda: load_json(json_path), count_physics_dict),
+                ("json->cc", json_path.stat().st_size, lambda: load_catalog(json_path), count_physics_catalog),
+                (".npz", npz_path.stat().st_size, lambda: load_catalog(npz_path), count_physics_catalog),
+                (".npy mmap", sum(p.stat().st_size for p in npy_path.iterdir()),
+                 lambda: load_catalog(npy_path, mmap=True), count_physics_catalog),
+            ]
+            results = {}
+            for name, file_size, loader, full_pass in forms:
+                load_time, memory, loaded = measure_load(loader)
+                start = time.perf_counter()
+                results[name] = full_pass(loaded)
+                pass_time = time.perf_counter() - start
+                print(f"{size:9d} {name:>10s} {file_size / 1e6:10.2f} {load_time * 1000:10.1f} "
+                      f"{memory / 1e6:12.2f} {pass_time * 1000:15.2f}")
+                del loaded
+            if len({json.dumps(r, sort_keys=True) for r in results.values()}) != 1:
+                print(f"❌ Full pass results differ at {size} products")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs compact catalog loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[37, 10000, 100000],
+                        help="Catalog sizes to benchmark")
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import cost of dynamic_shop_placer (lazy) vs. eager module-level loading
+
+Runs `python -X importtime` in fresh interpreters and sums the cumulative
+time of the top-level imports. "eager" reproduces what importing the placer
+used to cost outside Kit: pxr, NumPy and every placement module imported at
+module top plus the catalog read at import time (omni/PhysxSchema are left
+out, they only exist inside Isaac Sim). "lazy" is the current module, and
+"lazy + catalog" also touches PRODUCT_DATA. Wall time covers the whole
+snippet, including the catalog read that -X importtime does not see.
+
+Requires usd-core and NumPy for the eager case (pip install usd-core numpy).
+
+Usage:
+    python helpers/benchmark_import_time.py
+    python helpers/benchmark_import_time.py --repeats 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CATALOG_PATH = PROJECT_ROOT / "assets" / "product_data.json"
+HEAVY_MODULES = ("omni", "pxr", "numpy", "compact_catalog")
+
+EAGER_IMPORT = f"""
+from pxr import Usd, UsdGeom, Gf, UsdPhysics
+import numpy
+import json
+import bulk_authoring, point_instancer_placement, stage_statistics, asset_cache, stage_build_cache
+import region_loading, randomization_engine, incremental_placement
+from compact_catalog import load_catalog
+PRODUCT_DATA = load_catalog({str(CATALOG_PATH)!r}, mmap=True)
+"""
+
+CASES = {
+    "eager": EAGER_IMPORT,
+    "lazy": "import dynamic_shop_placer",
+    "lazy + catalog": "import dynamic_shop_placer; dynamic_shop_placer.PRODUCT_DATA",
+}
+
+
+def parse_importtime(stderr):
+    """Return the summed cumulative microseconds of the top-level imports in -X importtime output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented below the package that triggered them
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total
+
+
+def measure(code):
+    """
+    Run code in a fresh interpreter.
+
+    Returns:
+        tuple: (import microseconds from -X importtime, wall-clock milliseconds of the
+            whole snippet including the catalog read, heavy modules that got imported)
+    """
+    probe = (f"import time\nstart = time.perf_counter()\n{code}\nelapsed = time.perf_counter() - start\n"
+             f"import sys\nprint(elapsed * 1000, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+    return parse_importtime(result.stderr), float(elapsed), loaded
+
+
+def run_benchmark(repeats):
+    print("=== IMPORT TIME BENCHMARK (python -X importtime) ===")
+    print(f"{'case':>15s} {'imports (ms)':>13s} {'wall (ms)':>10s}  heavy modules imported")
+    medians = {}
+    for name, code in CASES.items():
+        try:
+            runs = [measure(code) for _ in range(repeats)]
+        except RuntimeError as e:
+            print(f"{name:>15s} ❌ {e}")
+            continue
+        import_ms = statistics.median(microseconds / 1000 for microseconds, _, _ in runs)
+        medians[name] = statistics.median(wall for _, wall, _ in runs)
+        print(f"{name:>15s} {import_ms:13.1f} {medians[name]:10.1f}  {runs[0][2] or '-'}")
+    if "eager" in medians and "lazy" in medians:
+        print(f"✅ Importing the placer is {medians['eager'] / medians['lazy']:.1f}x faster "
+              f"({medians['eager'] - medians['lazy']:.0f} ms deferred until a stage operation needs it)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the import cost of the placer module")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per case")
+    args = parser.parse_args()
+    run_benchmark(args.repeats)
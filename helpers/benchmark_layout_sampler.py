@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched vs per-product rejection sampling of collision-free layouts
+
+For each size the tiled catalog (as a compact catalog) gets a LayoutSampler.
+The script times building its spatial index (once per catalog), sampling one
+layout, and applying it to the catalog, and prints the layouts per second an
+RL loop can reset to. For sizes up to --max-loop it also times a per-product
+loop: each product draws until it clears the neighbours placed before it,
+which is what a straightforward sampler would do.
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Products use a fixed product-sized extent, so no assets are opened.
+
+Usage:
+    python helpers/benchmark_layout_sampler.py
+    python helpers/benchmark_layout_sampler.py --sizes 1000 100000 --jitter 0.05 --yaw 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog
+from layout_sampler import LayoutSampler, yaw_quaternions
+from overlap_checker import check_overlaps, quaternions_to_matrices, separating_axis_depths
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+from helpers.test_overlap_checker import BOX_EXTENT
+
+DEFAULT_SIZES = [37, 1000, 10000, 100000]
+
+
+def sample_loop(sampler, rng):
+    """Per-product rejection sampling against the already placed neighbours (the baseline)."""
+    neighbours = [[] for _ in range(len(sampler))]
+    for first, second in zip(sampler.first.tolist(), sampler.second.tolist()):
+        neighbours[max(first, second)].append(min(first, second))
+    centers = sampler.pivots + sampler.offsets
+    axes = sampler.axes.copy()
+    for row in range(len(sampler)):
+        for _ in range(sampler.max_rounds):
+            translate = sampler.pivots[row] + rng.uniform(-1.0, 1.0, 3) * sampler.jitter
+            turn = quaternions_to_matrices(yaw_quaternions([rng.uniform(-sampler.yaw_range, sampler.yaw_range)]))[0]
+            centers[row] = translate + turn @ sampler.offsets[row]
+            axes[row] = turn @ sampler.axes[row]
+            others = neighbours[row]
+            if not others:
+                break
+            depth, _ = separating_axis_depths(centers, axes, sampler.half_extents, others, [row] * len(others))
+            if np.all(depth <= sampler.tolerance):
+                break
+        else:
+            centers[row] = sampler.pivots[row] + sampler.offsets[row]
+            axes[row] = sampler.axes[row]
+
+
+def run_benchmark(sizes, jitter, yaw, repeats, max_loop):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+    extents = {data["asset"]: BOX_EXTENT for data in product_data.values()}
+
+    print(f"=== LAYOUT SAMPLER BENCHMARK (jitter {jitter}, yaw +-{yaw} deg) ===")
+    print(f"{'products':>10s} {'index (s)':>10s} {'sample (ms)':>12s} {'apply (ms)':>11s} {'layouts/s':>10s} "
+          f"{'rounds':>7s} {'rejected':>9s} {'reset':>6s} {'loop (ms)':>10s} {'valid':>6s}")
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size) if size != len(product_data) else product_data
+        catalog = CompactCatalog.from_product_data(catalog)
+        start = time.perf_counter()
+        sampler = LayoutSampler(catalog, extents, position_jitter=jitter, yaw_range=yaw, seed=0)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        layouts = [sampler.sample(episode) for episode in range(repeats)]
+        sample_time = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        laid_out = sampler.apply(catalog, layouts[-1])
+        apply_time = time.perf_counter() - start
+        valid = "yes" if not check_overlaps(laid_out, extents)["pairs"] else "NO"
+
+        loop = "-"
+        if size <= max_loop:
+            start = time.perf_counter()
+            sample_loop(sampler, np.random.default_rng(0))
+            loop = f"{(time.perf_counter() - start) * 1000:.1f}"
+        layout = layouts[-1]
+        print(f"{size:10d} {index_time:10.3f} {sample_time * 1000:12.1f} {apply_time * 1000:11.1f} "
+              f"{1.0 / (sample_time + apply_time):10.1f} {layout['rounds']:7d} {layout['rejected']:9d} "
+              f"{layout['reset']:6d} {loop:>10s} {valid:>6s}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the collision-free layout sampler")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Catalog sizes to benchmark")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Max offset along the shelf plane")
+    parser.add_argument("--yaw", type=float, default=10.0, help="Max yaw in degrees")
+    parser.add_argument("--repeats", type=int, default=5, help="Layouts sampled per size")
+    parser.add_argument("--max-loop", type=int, default=10000, help="Largest size to also run the per-product loop at")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.jitter, args.yaw, args.repeats, args.max_loop)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: mixed rotateZYX/orient xformOps vs. the unified translate/orient/scale stack
+
+For each catalog size the catalog is authored twice with bulk_authoring:
+as is ("mixed": rotateZYX for Euler products, orient for quaternion
+products) and after orientation.normalize_orientations ("unified": orient
+everywhere). It then times UsdGeom.XformCache world-transform computation
+for every product on a fresh cache, plus the catalog conversion itself
+(one NumPy pass vs. one Gf.Rotation per product).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Products point at small local stand-in assets (product prims get their
+Xform type from the payload, so payloads have to be loaded); no network
+access is needed.
+
+Usage:
+    python helpers/benchmark_orientation.py
+    python helpers/benchmark_orientation.py --sizes 1000 100000 --repeats 5
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd, UsdGeom
+from bulk_authoring import author_products_to_layer
+from orientation import normalize_orientations
+from point_instancer_placement import product_orientation
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+from helpers.report_instancing import write_placeholder_assets
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+def build_stage(product_data):
+    """Author the catalog into an in-memory stage and return it with the product prims."""
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/World/Shelf")
+    product_paths = author_products_to_layer(stage.GetRootLayer(), product_data)
+    return stage, [stage.GetPrimAtPath(path) for path in product_paths.values()]
+
+
+def time_world_transforms(prims, repeats):
+    """
+    Median seconds to compute every world transform on a fresh XformCache.
+
+    Returns:
+        tuple: (median seconds, (n, 4, 4) array of the world matrices)
+    """
+    timings = []
+    for _ in range(repeats):
+        xform_cache = UsdGeom.XformCache()
+        start = time.perf_counter()
+        matrices = [xform_cache.GetLocalToWorldTransform(prim) for prim in prims]
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), np.array(matrices)
+
+
+def time_conversion(product_data):
+    """Seconds for the batched conversion and for a per-product Gf.Rotation loop."""
+    start = time.perf_counter()
+    normalize_orientations(product_data)
+    batch_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in product_data.values():
+        product_orientation(data)
+    loop_time = time.perf_counter() - start
+    return batch_time, loop_time
+
+
+def run_benchmark(sizes, repeats):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+    with tempfile.TemporaryDirectory() as asset_dir:
+        run_sizes(write_placeholder_assets(product_data, asset_dir, meshes_per_asset=1), sizes, repeats)
+
+
+def run_sizes(product_data, sizes, repeats):
+    print("=== ORIENTATION LAYOUT BENCHMARK (UsdGeom.XformCache world transforms) ===")
+    print(f"{'products':>10s} {'mixed (ms)':>11s} {'unified (ms)':>13s} {'speedup':>8s} "
+          f"{'convert batch (ms)':>19s} {'convert loop (ms)':>18s} {'max diff':>9s}")
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size)
+        mixed_stage, mixed_prims = build_stage(catalog)
+        unified_stage, unified_prims = build_stage(normalize_orientations(catalog))
+        mixed_time, mixed_matrices = time_world_transforms(mixed_prims, repeats)
+        unified_time, unified_matrices = time_world_transforms(unified_prims, repeats)
+        batch_time, loop_time = time_conversion(catalog)
+        max_diff = float(np.abs(mixed_matrices - unified_matrices).max())
+        print(f"{size:10d} {mixed_time * 1000:11.1f} {unified_time * 1000:13.1f} {mixed_time / unified_time:7.2f}x "
+              f"{batch_time * 1000:19.1f} {loop_time * 1000:18.1f} {max_diff:9.1e}")
+        if max_diff > 1e-4:
+            print(f"❌ World transforms differ by {max_diff} at {size} products")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark mixed vs unified xformOp layouts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Catalog sizes to benchmark")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh-cache runs per layout (median is reported)")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.repeats)
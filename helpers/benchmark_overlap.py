@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: spatial-hash overlap check vs. testing all pairs
+
+For each size, times check_overlaps on the tiled catalog (as a dict and as
+a compact catalog) and on randomly placed, randomly oriented boxes packed
+densely enough that many of them intersect. For sizes up to --max-all-pairs
+it also times the separating-axis test over every pair, which is what an
+O(n^2) checker would do.
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Boxes use a fixed product-sized extent, so no assets are opened.
+
+Usage:
+    python helpers/benchmark_overlap.py
+    python helpers/benchmark_overlap.py --sizes 1000 100000 --max-all-pairs 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog
+from overlap_checker import check_overlaps, get_product_boxes, separating_axis_depths
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+from helpers.test_overlap_checker import BOX_EXTENT, random_boxes
+
+DEFAULT_SIZES = [2000, 10000, 100000]
+
+
+def time_check(product_data, extents):
+    start = time.perf_counter()
+    report = check_overlaps(product_data, extents)
+    return time.perf_counter() - start, report
+
+
+def time_all_pairs(product_data, extents):
+    """Seconds for the separating-axis test over every pair (in blocks to bound memory)."""
+    start = time.perf_counter()
+    boxes = get_product_boxes(product_data, extents)
+    first, second = np.triu_indices(len(boxes["product_ids"]), 1)
+    for block in range(0, len(first), 1000000):
+        rows = slice(block, block + 1000000)
+        separating_axis_depths(boxes["centers"], boxes["axes"], boxes["half_extents"], first[rows], second[rows])
+    return time.perf_counter() - start
+
+
+def run_benchmark(sizes, max_all_pairs):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+    extents = {data["asset"]: BOX_EXTENT for data in product_data.values()}
+    extents["box.usd"] = BOX_EXTENT
+
+    print("=== OVERLAP CHECK BENCHMARK (uniform-grid spatial hash + separating-axis test) ===")
+    print(f"{'products':>10s} {'catalog (s)':>12s} {'compact (s)':>12s} {'dense (s)':>10s} "
+          f"{'candidates':>11s} {'pairs':>7s} {'all pairs (s)':>14s}")
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size)
+        catalog_time, _ = time_check(catalog, extents)
+        compact_time, _ = time_check(CompactCatalog.from_product_data(catalog), extents)
+        # About 30 boxes per cubic meter: the density of a packed shelf, with random orientations
+        dense = random_boxes(size)
+        scale = (size / 30.0) ** (1.0 / 3.0) / 3.0
+        for data in dense.values():
+            data["translate"] = [value * scale for value in data["translate"]]
+        dense_time, report = time_check(dense, extents)
+        all_pairs = f"{time_all_pairs(dense, extents):14.2f}" if size <= max_all_pairs else f"{'-':>14s}"
+        print(f"{size:10d} {catalog_time:12.3f} {compact_time:12.3f} {dense_time:10.3f} "
+              f"{report['candidates']:11d} {len(report['pairs']):7d} {all_pairs}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the spatial-hash overlap check")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Product counts to benchmark")
+    parser.add_argument("--max-all-pairs", type=int, default=2000, help="Largest size to also test all pairs at")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.max_all_pairs)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiling a planogram vs loading the equivalent product_data.json
+
+For each size a synthetic store (two shelf levels per aisle, 8 categories of
+5 facings x 3 deep per bay, bays repeated along the aisle) is compiled to a
+CompactCatalog and to the product_data dict. The dict is then written as
+JSON and loaded back, which is what the hand-maintained catalog costs on
+every start.
+
+Requires NumPy (pip install numpy), Isaac Sim is NOT required.
+Rules carry their own extent, so no assets are opened.
+
+Usage:
+    python helpers/benchmark_planogram.py
+    python helpers/benchmark_planogram.py --sizes 1000 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from planogram import compile_planogram
+from helpers.test_planogram import CAN_EXTENT
+
+DEFAULT_SIZES = [1000, 10000, 50000, 100000]
+CATEGORIES = 40
+SECTIONS = 8
+UNITS_PER_BAY = SECTIONS * 5 * 3
+
+
+def make_store_planogram(size):
+    """Planogram of roughly `size` products: 10 bays per shelf level, as many aisles as needed."""
+    rules = {f"Category{i}": {"asset": f"sku_{i}.usd", "extent": CAN_EXTENT, "facings": 5, "depth_count": 3,
+                              "spacing": 0.005, "orient": [0.5, -0.5, 0.5, -0.5]} for i in range(CATEGORIES)}
+    repeat = max(min(10, size // UNITS_PER_BAY), 1)
+    levels = max(size // (UNITS_PER_BAY * repeat), 1)
+    bays = [{"shelf": ["Items_Lower", "Items_Upper"][level % 2],
+             "origin": [(level // 2) * 2.0, 0.0, 0.5 + (level % 2) * 0.4], "width": 5.0, "depth": 0.4,
+             "categories": [f"Category{(level + k) % CATEGORIES}" for k in range(SECTIONS)], "section_gap": 0.02,
+             "repeat": repeat, "step": [0.0, 5.5, 0.0]}
+            for level in range(levels)]
+    return {"rules": rules, "bays": bays}
+
+
+def run_benchmark(sizes):
+    print("=== PLANOGRAM COMPILER BENCHMARK ===")
+    print(f"{'products':>10s} {'bays':>6s} {'compact (s)':>12s} {'dict (s)':>9s} {'json write (s)':>15s} "
+          f"{'json load (s)':>14s}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            planogram = make_store_planogram(size)
+            start = time.perf_counter()
+            compact, report = compile_planogram(planogram, output="compact")
+            compact_time = time.perf_counter() - start
+            start = time.perf_counter()
+            catalog, _ = compile_planogram(planogram)
+            dict_time = time.perf_counter() - start
+            assert len(compact) == len(catalog) == report["products"]
+
+            path = Path(directory) / f"product_data_{size}.json"
+            start = time.perf_counter()
+            with open(path, 'w') as f:
+                json.dump(catalog, f, indent=4)
+            write_time = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(path, 'r') as f:
+                json.load(f)
+            load_time = time.perf_counter() - start
+            bays = sum(bay["repeat"] for bay in planogram["bays"])
+            print(f"{report['products']:10d} {bays:6d} {compact_time:12.3f} {dict_time:9.3f} {write_time:15.3f} "
+                  f"{load_time:14.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the planogram compiler")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Store sizes (products)")
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
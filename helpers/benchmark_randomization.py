@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-product Python randomization loop vs. the batched NumPy engine
+
+Both randomize every product of a (tiled) catalog with Euler rotations and
+position jitter and return the randomized product data.
+
+Requires NumPy only (no USD, no Isaac Sim).
+
+Usage:
+    python helpers/benchmark_randomization.py
+    python helpers/benchmark_randomization.py --sizes 37 1000 --repeats 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from randomization_engine import RandomizationEngine
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+
+
+def randomize_loop(product_data, rng, position_jitter):
+    """Reference: the original one-product-at-a-time approach with the random module."""
+    randomized_data = product_data.copy()
+    for product_id in rng.sample(list(randomized_data), len(randomized_data)):
+        data = randomized_data[product_id].copy()
+        data["rotate"] = [rng.uniform(-180, 180), rng.uniform(-180, 180), rng.uniform(-180, 180)]
+        data["translate"] = [value + rng.uniform(-position_jitter, position_jitter) for value in data["translate"]]
+        randomized_data[product_id] = data
+    return randomized_data
+
+
+def time_per_call(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(sizes, repeats):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+
+    print("=== RANDOMIZATION BENCHMARK (all products, Euler + position jitter) ===")
+    print(f"{'products':>10s} {'loop (ms)':>10s} {'draw (ms)':>10s} {'draw+apply (ms)':>16s} "
+          f"{'draws/s':>9s} {'speedup':>8s}")
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size)
+        rng = random.Random(0)
+        engine = RandomizationEngine(catalog, seed=0)
+
+        loop_time = time_per_call(lambda: randomize_loop(catalog, rng, 0.01), repeats)
+        draw_time = time_per_call(lambda: engine.draw(rotation="euler", position_jitter=0.01), repeats)
+        apply_time = time_per_call(
+            lambda: engine.apply(catalog, engine.draw(rotation="euler", position_jitter=0.01)), repeats)
+        print(f"{size:10d} {loop_time * 1000:10.3f} {draw_time * 1000:10.3f} {apply_time * 1000:16.3f} "
+              f"{1.0 / draw_time:9.0f} {loop_time / draw_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the randomization loop vs the NumPy engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[37, 1000, 10000],
+                        help="Catalog sizes to benchmark")
+    parser.add_argument("--repeats", type=int, default=50, help="Calls per measurement")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.repeats)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: catalog scans and per-product bounds vs. the indexed ProductRegistry
+
+For each catalog size the tiled catalog is placed on the empty shop with
+stand-in assets loaded, then the script times:
+- a shelf + category lookup by scanning the catalog vs. registry.find
+- world bounds with a fresh BBoxCache per product vs. the registry's single pass
+- refreshing the bounds after one product moved (only that product is recomputed)
+- a "what's on shelf X near point P" query (registry.query)
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+
+Usage:
+    python helpers/benchmark_registry.py
+    python helpers/benchmark_registry.py --sizes 1000 50000 --queries 1000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf, Usd, UsdGeom
+from product_registry import ProductRegistry
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog
+from helpers.report_instancing import write_placeholder_assets
+from helpers.test_product_registry import place_on_shop
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+def time_call(function, repeats=1):
+    """Average seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def per_product_bounds(stage, registry):
+    """Bounds the way ad-hoc code computes them: one BBoxCache per product."""
+    for product_id in registry.products:
+        bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_, UsdGeom.Tokens.render])
+        bbox_cache.ComputeWorldBound(stage.GetPrimAtPath(registry.get_path(product_id))).ComputeAlignedRange()
+
+
+def run_size(product_data, size, queries):
+    catalog = make_synthetic_catalog(product_data, size)
+    stage = place_on_shop(catalog)
+    shelf, category = "Items_Lower", "TunaCans"
+
+    scan_time = time_call(lambda: [product_id for product_id, data in catalog.items()
+                                   if data["shelf"] == shelf and data["category"] == category], 20)
+    start = time.perf_counter()
+    registry = ProductRegistry(catalog)
+    index_build_time = time.perf_counter() - start
+    find_time = time_call(lambda: registry.find(shelf=shelf, category=category), 20)
+
+    loop_time = time_call(lambda: per_product_bounds(stage, registry))
+    registry.bind_stage(stage)
+    bounds_time = time_call(registry.refresh_bounds)
+
+    product_id = next(iter(catalog))
+    translate = stage.GetPrimAtPath(registry.get_path(product_id)).GetAttribute("xformOp:translate")
+    translate.Set(translate.Get() + Gf.Vec3d(0, 0, 1))
+    start = time.perf_counter()
+    refreshed = registry.refresh_bounds()
+    refresh_time = time.perf_counter() - start
+
+    bounds = np.array(list(registry.bounds.values()))
+    points = np.random.default_rng(0).uniform(bounds[:, 0].min(axis=0), bounds[:, 1].max(axis=0), (queries, 3))
+    start = time.perf_counter()
+    for point in points:
+        registry.query(point, radius=0.5, shelf=shelf, limit=5)
+    query_time = (time.perf_counter() - start) / queries
+    registry.unbind_stage()
+
+    print(f"{size:10d} {scan_time * 1000:10.3f} {find_time * 1000:10.3f} {index_build_time * 1000:10.1f} "
+          f"{loop_time * 1000:14.1f} {bounds_time * 1000:14.1f} {refresh_time * 1000:10.3f} ({refreshed:2d}) "
+          f"{query_time * 1e6:10.1f}")
+
+
+def run_benchmark(sizes, queries):
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+    print("=== PRODUCT REGISTRY BENCHMARK ===")
+    print(f"{'products':>10s} {'scan (ms)':>10s} {'find (ms)':>10s} {'index (ms)':>10s} "
+          f"{'bbox loop (ms)':>14s} {'bbox pass (ms)':>14s} {'refresh 1 (ms)':>15s} {'query (us)':>10s}")
+    with tempfile.TemporaryDirectory() as asset_dir:
+        local_data = write_placeholder_assets(product_data, asset_dir, meshes_per_asset=1)
+        for size in sizes:
+            run_size(local_data, size, queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the indexed product registry")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Catalog sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=500, help="Nearest-product queries per size")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.queries)
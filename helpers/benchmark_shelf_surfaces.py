@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shelf surface index lookups vs testing every support triangle
+
+Times extracting the index from the empty shop and loading it from the .npz
+cache. Then, for each size, random points over the shelves get their
+supporting surface from the heightfield index and, up to --max-brute
+points, from a per-point test against every support triangle (what finding
+the surface under a product costs without an index).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+
+Usage:
+    python helpers/benchmark_shelf_surfaces.py
+    python helpers/benchmark_shelf_surfaces.py --sizes 1000 1000000 --max-brute 1000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from shelf_surfaces import ShelfSurfaces, extract_shelf_surfaces, read_shelf_triangles
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+
+DEFAULT_SIZES = [37, 10000, 100000, 1000000]
+
+
+def find_support_brute(points, triangles):
+    """Per point: the highest support triangle at or below it (barycentric test against all of them)."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1])
+    heights = np.full(len(points), np.nan)
+    for row, (x, y, z) in enumerate(points):
+        b1 = ((x - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (y - a[:, 1])) / area
+        b2 = ((b[:, 0] - a[:, 0]) * (y - a[:, 1]) - (x - a[:, 0]) * (b[:, 1] - a[:, 1])) / area
+        b0 = 1.0 - b1 - b2
+        surface = b0 * a[:, 2] + b1 * b[:, 2] + b2 * c[:, 2]
+        hits = (b0 >= 0) & (b1 >= 0) & (b2 >= 0) & (surface <= z)
+        if hits.any():
+            heights[row] = surface[hits].max()
+    return heights
+
+
+def run_benchmark(sizes, max_brute):
+    print("=== SHELF SURFACE INDEX BENCHMARK ===")
+    start = time.perf_counter()
+    surfaces = extract_shelf_surfaces(EMPTY_SHOP_PATH)
+    extract_time = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        path = surfaces.save(Path(directory) / "surfaces.npz")
+        start = time.perf_counter()
+        ShelfSurfaces.load(path)
+        load_time = time.perf_counter() - start
+    rows, columns = surfaces.heights.shape[1:]
+    print(f"Extract: {extract_time:.3f}s, load from cache: {load_time * 1000:.1f} ms "
+          f"({len(surfaces)} levels, {rows} x {columns} cells of {surfaces.cell_size})")
+
+    triangles = np.concatenate(list(read_shelf_triangles(EMPTY_SHOP_PATH).values()))
+    rng = np.random.default_rng(0)
+    low = surfaces.origin
+    high = surfaces.origin + np.array([columns, rows]) * surfaces.cell_size
+    print(f"{'points':>10s} {'index (ms)':>11s} {'per point (us)':>15s} {'brute (ms)':>11s} {'speedup':>8s} "
+          f"{'agree':>6s}")
+    for size in sizes:
+        points = np.column_stack([rng.uniform(low[0], high[0], size), rng.uniform(low[1], high[1], size),
+                                  rng.uniform(0.0, 3.5, size)])
+        start = time.perf_counter()
+        heights, _ = surfaces.find_support(points)
+        index_time = time.perf_counter() - start
+        brute, speedup, agree = "-", "-", "-"
+        if size <= max_brute:
+            start = time.perf_counter()
+            expected = find_support_brute(points, triangles)
+            brute_time = time.perf_counter() - start
+            brute, speedup = f"{brute_time * 1000:.1f}", f"{brute_time / index_time:.0f}x"
+            # Cell centers vs exact points differ only at plane edges
+            same = np.isclose(heights, expected, atol=0.002) | (np.isnan(heights) & np.isnan(expected))
+            agree = f"{same.mean() * 100:.0f}%"
+        print(f"{size:10d} {index_time * 1000:11.2f} {index_time / size * 1e6:15.3f} {brute:>11s} {speedup:>8s} "
+              f"{agree:>6s}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the shelf surface index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Query point counts")
+    parser.add_argument("--max-brute", type=int, default=10000, help="Largest size to also test every triangle at")
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.max_brute)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold vs. warm startup with the prebuilt product layer cache
+
+Cold: open the empty shop, author every product, export the .usdc cache file.
+Warm: open the empty shop and sublayer the cached .usdc file.
+Both include the final stage composition. No cache: the current behaviour
+(open + author every run, nothing stored).
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+Payloads are never loaded, so no network access is needed.
+
+Usage:
+    python helpers/benchmark_stage_cache.py
+    python helpers/benchmark_stage_cache.py --products 37 10000 --mode per_prim
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Base path is now the parent directory
+BASE_PATH = Path(__file__).parent.parent
+
+from pxr import Usd
+from bulk_authoring import author_products_to_layer
+from stage_build_cache import StageBuildCache, compute_build_key, apply_product_layer
+from helpers.benchmark_bulk_authoring import load_product_data, make_synthetic_catalog, place_per_prim
+
+EMPTY_SHOP_PATH = str(BASE_PATH / "assets" / "Shop Minimal Empty.usda")
+
+
+def authoring_function(mode, product_data):
+    """Return a build function that authors products into the stage's edit target."""
+    def build(stage):
+        if mode == "bulk":
+            author_products_to_layer(stage.GetEditTarget().GetLayer(), product_data)
+        else:
+            place_per_prim(stage, product_data)
+        return True
+    return build
+
+
+def time_startup(product_data, mode, build_cache=None):
+    """Open the empty shop and populate it, with or without the build cache."""
+    gc.collect()
+    start = time.perf_counter()
+    stage = Usd.Stage.Open(EMPTY_SHOP_PATH, load=Usd.Stage.LoadNone)
+    build = authoring_function(mode, product_data)
+    if build_cache is None:
+        build(stage)
+        cache_hit = False
+    else:
+        key = compute_build_key(EMPTY_SHOP_PATH, product_data, {"mode": mode})
+        _, cache_hit = apply_product_layer(stage, build_cache, key, build)
+    prim_count = sum(1 for _ in stage.TraverseAll())
+    elapsed = time.perf_counter() - start
+    del stage
+    return elapsed, prim_count, cache_hit
+
+
+def run_benchmark(sizes, mode):
+    """Print cold/warm/no-cache startup times per catalog size."""
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        return
+
+    results = []
+    for size in sizes:
+        catalog = make_synthetic_catalog(product_data, size)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            build_cache = StageBuildCache(cache_dir)
+            no_cache_time, _, _ = time_startup(catalog, mode)
+            cold_time, cold_prims, cold_hit = time_startup(catalog, mode, build_cache)
+            warm_time, warm_prims, warm_hit = time_startup(catalog, mode, build_cache)
+            cache_size = sum(p.stat().st_size for p in Path(cache_dir).glob("*.usdc"))
+        if cold_hit or not warm_hit or cold_prims != warm_prims:
+            print(f"❌ Unexpected cache behaviour at {size} products")
+        results.append((size, no_cache_time, cold_time, warm_time, cache_size))
+
+    print(f"\n=== STAGE BUILD CACHE BENCHMARK ({mode}) ===")
+    print(f"{'products':>10s} {'no cache (s)':>13s} {'cold (s)':>10s} {'warm (s)':>10s} "
+          f"{'speedup':>9s} {'.usdc (KB)':>11s}")
+    for size, no_cache_time, cold_time, warm_time, cache_size in results:
+        print(f"{size:10d} {no_cache_time:13.3f} {cold_time:10.3f} {warm_time:10.3f} "
+              f"{no_cache_time / warm_time:8.1f}x {cache_size / 1024:11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm startup with the build cache")
+    parser.add_argument("--products", type=int, nargs="+", default=[37, 1000, 10000],
+                        help="Catalog sizes to benchmark")
+    parser.add_argument("--mode", choices=["per_prim", "bulk"], default="per_prim",
+                        help="Authoring path used on a cache miss")
+    args = parser.parse_args()
+    run_benchmark(args.products, args.mode)
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
 """
-Quick product count verification script - now reads from JSON data
+Quick product count verification script - reads the JSON data through the compact catalog
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -13,12 +12,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Base path is now the parent directory
 BASE_PATH = Path(__file__).parent.parent
 
+from compact_catalog import load_catalog
+
 def load_product_data():
-    """Load product data from JSON file."""
+    """Load product data as a compact catalog (SKU table + instance arrays)."""
     json_file_path = BASE_PATH / "assets" / "product_data.json"
     try:
-        with open(json_file_path, 'r') as f:
-            return json.load(f)
+        return load_catalog(json_file_path)
     except Exception as e:
         print(f"ERROR: Failed to load product data: {e}")
         return {}
@@ -31,9 +31,9 @@ def count_products_in_file():
         print("❌ Failed to load product data")
         return
     
-    products = list(product_data.keys())
+    products = product_data.product_ids.tolist()
     
-    print(f"Total products found: {len(products)}")
+    print(f"Total products found: {len(products)} ({len(product_data.skus)} SKUs)")
     print("\nAll products:")
     for i, product in enumerate(products, 1):
         print(f"{i:2d}. {product}")
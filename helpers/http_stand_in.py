@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the Omniverse content server
+
+Serves a local directory over HTTP on 127.0.0.1 so asset fetching code can
+be tested without network access. Counts requests per path and can add an
+artificial per-request latency.
+
+Usage:
+    with LocalHTTPServer(asset_dir) as server:
+        url = server.url("Props/YCB/006_mustard_bottle.usd")
+"""
+
+import functools
+import threading
+import time
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Request handler that counts requests and does not log to stderr."""
+
+    def do_GET(self):
+        self.server.request_counts[self.path] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalHTTPServer:
+    """Serve a directory over HTTP in a background thread (context manager)."""
+
+    def __init__(self, directory, latency=0.0):
+        """
+        Args:
+            directory (str): Directory to serve
+            latency (float): Seconds to wait before answering each request
+        """
+        handler = functools.partial(_QuietHandler, directory=str(directory))
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.request_counts = Counter()
+        self.httpd.latency = latency
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        """Base URL of the server (with trailing slash)."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def request_counts(self):
+        """Counter of requested paths."""
+        return self.httpd.request_counts
+
+    def url(self, relative_path):
+        """Return the URL of a file below the served directory."""
+        return self.base_url + relative_path.lstrip("/")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
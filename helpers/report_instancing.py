@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Stage statistics report: regular product prims vs. instanceable products
+
+Places the catalog twice on in-memory stages with payloads loaded - once with
+regular product prims and once with INSTANCEABLE_PRODUCTS-style instanceable
+prims - and prints prototype and composed prim counts side by side. Physics
+products are never instanceable, so use --static to see every product instanced.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+The real asset URLs need an HTTP-capable resolver (Isaac Sim's Python); with
+plain usd-core use --placeholder-assets to substitute local stand-in assets.
+
+Usage:
+    python helpers/report_instancing.py --placeholder-assets
+    python helpers/report_instancing.py --placeholder-assets --static
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path, PurePosixPath
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd, UsdGeom
+from bulk_authoring import author_products_to_layer
+from stage_statistics import collect_stage_statistics, print_statistics_comparison
+from helpers.benchmark_bulk_authoring import load_product_data
+
+
+def write_placeholder_assets(product_data, directory, meshes_per_asset=4):
+    """
+    Write one small stand-in layer per asset and return a catalog pointing at them.
+
+    Each stand-in has an Xform default prim with a few Mesh children, which is
+    enough to show how much composition instancing saves.
+    """
+    directory = Path(directory)
+    local_assets = {}
+    for asset in {data["asset"] for data in product_data.values()}:
+        asset_path = directory / PurePosixPath(asset).name
+        if asset not in local_assets:
+            stage = Usd.Stage.CreateNew(str(asset_path))
+            root = UsdGeom.Xform.Define(stage, "/Root")
+            stage.SetDefaultPrim(root.GetPrim())
+            for i in range(meshes_per_asset):
+                mesh = UsdGeom.Mesh.Define(stage, f"/Root/Mesh_{i}")
+                mesh.CreatePointsAttr([(0, 0, 0), (0.1, 0, 0), (0, 0.1, 0)])
+                mesh.CreateFaceVertexCountsAttr([3])
+                mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+            stage.GetRootLayer().Save()
+            local_assets[asset] = str(asset_path)
+
+    return {product_id: dict(data, asset=local_assets[data["asset"]])
+            for product_id, data in product_data.items()}
+
+
+def build_stage(product_data, instanceable, enable_physics=True):
+    """Place the catalog on a fully loaded in-memory stage."""
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/World")
+    UsdGeom.Xform.Define(stage, "/World/Shelf")
+    author_products_to_layer(stage.GetRootLayer(), product_data, enable_physics=enable_physics,
+                             instanceable=instanceable)
+    return stage
+
+
+def report_instancing(product_data, enable_physics=True):
+    """Print stage statistics without and with instanceable products."""
+    before = collect_stage_statistics(build_stage(product_data, False, enable_physics))
+    after = collect_stage_statistics(build_stage(product_data, True, enable_physics))
+
+    print("=== INSTANCING REPORT ===")
+    print(f"Products: {len(product_data)}, unique assets: {len({d['asset'] for d in product_data.values()})}")
+    print_statistics_comparison(before, after, "regular", "instanceable")
+    return before, after
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare stage statistics with and without instancing")
+    parser.add_argument("--placeholder-assets", action="store_true",
+                        help="Use local stand-in assets instead of the remote asset URLs")
+    parser.add_argument("--static", action="store_true",
+                        help="Place every product without physics (physics products are not instanced)")
+    args = parser.parse_args()
+
+    product_data = load_product_data()
+    if not product_data:
+        print("❌ Failed to load product data")
+        sys.exit(1)
+
+    if args.placeholder_assets:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_instancing(write_placeholder_assets(product_data, temp_dir), not args.static)
+    else:
+        report_instancing(product_data, not args.static)
@@ -47,6 +47,31 @@ def main():
         ("analyze_physics.py", "Physics Settings Analysis"),
         ("verify_data.py", "Comprehensive Data Verification"),
         ("test_randomization.py", "Randomization Functionality Test"),
+        ("test_randomization_engine.py", "NumPy Randomization Engine Test"),
+        ("test_bulk_authoring.py", "Bulk Authoring Test (requires usd-core)"),
+        ("test_point_instancer.py", "PointInstancer Placement Test (requires usd-core)"),
+        ("test_instancing.py", "Instanceable Products Test (requires usd-core)"),
+        ("test_asset_cache.py", "Offline Asset Cache Test (requires usd-core)"),
+        ("test_stage_build_cache.py", "Prebuilt Stage Cache Test (requires usd-core)"),
+        ("test_region_loading.py", "Region-Scoped Payload Loading Test (requires usd-core)"),
+        ("test_compact_catalog.py", "Compact Catalog Test (requires usd-core)"),
+        ("test_variant_farm.py", "Scene-Variant Farm Test (requires usd-core)"),
+        ("test_incremental_placement.py", "Incremental Re-Placement Test (requires usd-core)"),
+        ("test_lazy_import.py", "Lazy Import Test"),
+        ("test_scene_compiler.py", "Headless Scene Compiler Test (requires usd-core)"),
+        ("test_async_setup.py", "Pipelined Async Setup Test (requires usd-core)"),
+        ("test_placement_scheduler.py", "Frame-Budgeted Placement Test (requires usd-core)"),
+        ("test_orientation.py", "Orientation Normalization Test (requires usd-core)"),
+        ("test_product_registry.py", "Product Registry Test (requires usd-core)"),
+        ("test_overlap_checker.py", "Overlap Checker Test (requires usd-core)"),
+        ("test_layout_sampler.py", "Layout Sampler Test (requires usd-core)"),
+        ("test_planogram.py", "Planogram Compiler Test"),
+        ("test_shelf_surfaces.py", "Shelf Surface Index Test (requires usd-core)"),
+        ("test_stage_optimizer.py", "Empty Shop Optimizer Test (requires usd-core)"),
+        ("test_stage_converter.py", "Shop Format Converter Test (requires usd-core)"),
+        ("test_catalog_extractor.py", "Catalog Extractor Test (requires usd-core)"),
+        ("test_catalog_validator.py", "Streaming Catalog Validator Test"),
+        ("test_streaming_catalog.py", "NDJSON Streaming Catalog Test (requires usd-core)"),
         ("verify_readme.py", "README Documentation Check"),
         ("test_and_usage.py", "Complete Test Suite & Usage Instructions")
     ]
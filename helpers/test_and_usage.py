@@ -106,52 +106,24 @@ def load_product_data():
         return {}
 
 def test_product_data_integrity():
-    """Test function to verify product data is properly structured."""
-    product_data = load_product_data()
-    
-    if not product_data:
-        print("❌ Failed to load product data")
-        return False
+    """Test function to verify product data is properly structured (catalog_validator.py)."""
+    from catalog_validator import format_problem, validate_catalog
     
     print("Testing product data integrity...")
     
-    required_fields = ["asset", "translate", "scale"]
-    physics_fields = ["physics_enabled"]
-    rotation_fields = ["rotate", "orient"]  # One of these must be present
-    
-    issues = []
-    
-    for product_id, data in product_data.items():
-        # Check required fields
-        for field in required_fields:
-            if field not in data:
-                issues.append(f"{product_id}: Missing required field '{field}'")
-                
-        # Check rotation field (either rotate or orient)
-        has_rotation = any(field in data for field in rotation_fields)
-        if not has_rotation:
-            issues.append(f"{product_id}: Missing rotation information (rotate or orient)")
-            
-        # Validate transform data types
-        if "translate" in data and len(data["translate"]) != 3:
-            issues.append(f"{product_id}: translate must have 3 values")
-            
-        if "scale" in data and len(data["scale"]) != 3:
-            issues.append(f"{product_id}: scale must have 3 values")
-            
-        if "rotate" in data and len(data["rotate"]) != 3:
-            issues.append(f"{product_id}: rotate must have 3 values (ZYX)")
-            
-        if "orient" in data and len(data["orient"]) != 4:
-            issues.append(f"{product_id}: orient must have 4 values (quaternion)")
+    try:
+        report = validate_catalog(BASE_PATH / "assets" / "product_data.json")
+    except Exception as e:
+        print(f"❌ Failed to load product data: {e}")
+        return False
     
-    if issues:
+    if report["error_count"]:
         print("❌ Product data integrity test FAILED:")
-        for issue in issues:
-            print(f"  - {issue}")
+        for problem in report["errors"]:
+            print(f"  - {format_problem(problem)}")
         return False
     else:
-        print(f"✅ Product data integrity test PASSED - {len(product_data)} products validated")
+        print(f"✅ Product data integrity test PASSED - {report['products']} products validated")
         return True
 
 def print_product_summary():
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the offline asset cache against a local HTTP stand-in server.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd, Sdf
+from asset_cache import AssetCache
+from helpers.http_stand_in import LocalHTTPServer
+
+
+def write_remote_assets(directory):
+    """Write a small asset tree: product layer -> sublayer + texture, plus a second product."""
+    props = Path(directory) / "Props"
+    (props / "textures").mkdir(parents=True)
+    (props / "textures" / "label.png").write_bytes(b"\x89PNG fake texture" * 64)
+    (props / "can_base.usda").write_text('''#usda 1.0
+over "Can"
+{
+    asset inputs:diffuse_texture = @./textures/label.png@
+}
+''')
+    (props / "can.usda").write_text('''#usda 1.0
+(
+    defaultPrim = "Can"
+    subLayers = [@./can_base.usda@]
+)
+
+def Xform "Can"
+{
+    def Mesh "Body"
+    {
+    }
+}
+''')
+    (props / "box.usda").write_text('''#usda 1.0
+(
+    defaultPrim = "Box"
+)
+
+def Xform "Box"
+{
+}
+''' + "# padding\n" * 200)
+
+
+def test_fetch_mirrors_dependencies():
+    """A cached layer and its sublayer/texture open offline from the local store."""
+    print("Testing asset cache fetch with dependencies...")
+    with tempfile.TemporaryDirectory() as remote_dir, tempfile.TemporaryDirectory() as cache_dir:
+        write_remote_assets(remote_dir)
+        with LocalHTTPServer(remote_dir) as server:
+            cache = AssetCache(cache_dir)
+            can_url = server.url("Props/can.usda")
+            local_path = cache.fetch(can_url)
+            assert local_path and Path(local_path).exists()
+            assert server.request_counts["/Props/can_base.usda"] == 1
+            assert server.request_counts["/Props/textures/label.png"] == 1
+
+            # Second fetch is a cache hit
+            assert cache.fetch(can_url) == local_path
+            assert server.request_counts["/Props/can.usda"] == 1
+
+        # Server is gone: the cached copy must still compose completely
+        reopened = AssetCache(cache_dir)
+        assert reopened.resolve(can_url) == local_path
+        stage = Usd.Stage.Open(local_path)
+        texture = stage.GetPrimAtPath("/Can").GetAttribute("inputs:diffuse_texture").Get()
+        assert Path(texture.path).exists(), "Texture path was not rewritten to the local copy"
+        assert stage.GetPrimAtPath("/Can/Body")
+        for sublayer in Sdf.Layer.FindOrOpen(local_path).subLayerPaths:
+            assert Path(sublayer).exists()
+    print("✅ Asset and dependencies cached and usable offline")
+
+
+def test_localize_catalog_and_lru_eviction():
+    """Catalog assets are rewritten to local paths and the store stays within its size bound."""
+    print("Testing catalog localization and LRU eviction...")
+    with tempfile.TemporaryDirectory() as remote_dir, tempfile.TemporaryDirectory() as cache_dir:
+        write_remote_assets(remote_dir)
+        with LocalHTTPServer(remote_dir) as server:
+            catalog = {
+                "can_1": {"asset": server.url("Props/can.usda"), "translate": [0, 0, 0]},
+                "can_2": {"asset": server.url("Props/can.usda"), "translate": [1, 0, 0]},
+                "box_1": {"asset": server.url("Props/box.usda"), "translate": [2, 0, 0]},
+                "local": {"asset": "C:/assets/local.usd", "translate": [3, 0, 0]},
+            }
+            cache = AssetCache(cache_dir)
+            localized = cache.localize_catalog(catalog)
+            assert localized["can_1"]["asset"] == localized["can_2"]["asset"]
+            assert Path(localized["box_1"]["asset"]).exists()
+            assert localized["local"]["asset"] == "C:/assets/local.usd"
+            assert catalog["can_1"]["asset"].startswith("http"), "Original catalog must not be modified"
+
+            # Bound the cache to roughly the can tree only: fetching the box again evicts the can
+            can_size = sum(entry["size"] for url, entry in cache.index.items() if "box" not in url)
+            bounded = AssetCache(cache_dir, max_bytes=can_size)
+            bounded.fetch(server.url("Props/box.usda"))
+            assert bounded.total_size() <= can_size
+            assert bounded.resolve(server.url("Props/box.usda")) is not None
+            assert bounded.resolve(server.url("Props/can.usda")) is None
+    print("✅ Catalog localized and LRU eviction keeps the cache within its bound")
+
+
+if __name__ == "__main__":
+    test_fetch_mirrors_dependencies()
+    test_localize_catalog_and_lru_eviction()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the pipelined async setup against a local HTTP stand-in
+and a stubbed stage context (usd-core stage instead of Kit's USD context).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd
+from asset_cache import AssetCache
+from async_setup import run_setup_pipeline, AssetPrefetcher, ordered_assets
+from placement_scheduler import CancellationToken, FrameBudget
+from bulk_authoring import author_hierarchy_to_layer, author_product_spec, get_product_path
+from helpers.http_stand_in import LocalHTTPServer
+from helpers.report_instancing import write_placeholder_assets
+from helpers.test_region_loading import load_valid_product_data
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+
+
+class StubStageContext:
+    """Stands in for omni.usd's context: opens a usd-core stage after a simulated delay."""
+
+    def __init__(self, open_delay=0.0, fail=False):
+        self.open_delay = open_delay
+        self.fail = fail
+        self.stage = None
+
+    async def open_stage_async(self, path):
+        await asyncio.sleep(self.open_delay)
+        if self.fail:
+            return False
+        self.stage = Usd.Stage.Open(path, load=Usd.Stage.LoadNone)
+        return True
+
+    def get_stage(self):
+        return self.stage
+
+
+def serve_catalog(server, product_data, directory):
+    """Write stand-in assets and return a catalog whose assets are URLs on the stand-in server."""
+    local_data = write_placeholder_assets(product_data, directory)
+    return {product_id: dict(data, asset=server.url(Path(data["asset"]).name))
+            for product_id, data in local_data.items()}
+
+
+def run_pipeline(context, product_data, cache=None, max_concurrency=2, frame_budget=None, progress=None):
+    """Run the pipeline with per-prim Sdf placement into the stubbed stage's root layer."""
+    placed_at = {}
+
+    async def open_stage():
+        return await context.open_stage_async(EMPTY_SHOP_PATH)
+
+    def create_hierarchy():
+        author_hierarchy_to_layer(context.get_stage().GetRootLayer(), product_data)
+        return True
+
+    def place_product(product_id, data):
+        placed_at[product_id] = time.perf_counter()
+        author_product_spec(context.get_stage().GetRootLayer(), product_id, data)
+        return True
+
+    result = asyncio.run(run_setup_pipeline(
+        open_stage, lambda: product_data, place_product=place_product, create_hierarchy=create_hierarchy,
+        fetch_asset=cache.download if cache else None, on_assets_fetched=cache.commit if cache else None,
+        max_concurrency=max_concurrency, frame_budget=frame_budget, progress=progress))
+    return result, placed_at
+
+
+def test_pipeline_overlaps_open_prefetch_and_placement():
+    """Assets download while the shop opens, and placement starts before the last download."""
+    print("Testing pipelined setup with asset prefetch...")
+    with tempfile.TemporaryDirectory() as remote_dir, tempfile.TemporaryDirectory() as cache_dir:
+        with LocalHTTPServer(remote_dir, latency=0.05) as server:
+            product_data = serve_catalog(server, load_valid_product_data(), remote_dir)
+            context = StubStageContext(open_delay=0.1)
+            cache = AssetCache(cache_dir)
+            result, _ = run_pipeline(context, product_data, cache)
+
+            assert result["success"] and result["placed"] == len(product_data) == result["products"]
+            timings = result["timings"]
+            assert timings["prefetch"]["start"] < timings["open"]["end"], "Prefetch must run while the shop opens"
+            assert timings["placement"]["start"] < timings["prefetch"]["end"], \
+                "Placement must start while assets are still downloading"
+            assert timings["hierarchy"]["start"] >= timings["open"]["end"]
+
+            # Every unique asset was requested once, and every payload points at the cached copy
+            assert len(server.request_counts) == len(ordered_assets(product_data))
+            assert set(server.request_counts.values()) == {1}
+            layer = context.get_stage().GetRootLayer()
+            for product_id, data in product_data.items():
+                prim_spec = layer.GetPrimAtPath(get_product_path(product_id, data))
+                payload = prim_spec.payloadList.prependedItems[0]
+                assert payload.assetPath == Path(cache.resolve(data["asset"])).as_posix()
+        assert AssetCache(cache_dir).resolve(data["asset"]), "The cache index is saved after the prefetch"
+    print(f"✅ {result['placed']} products placed; placement started at {timings['placement']['start']:.2f}s, "
+          f"prefetch finished at {timings['prefetch']['end']:.2f}s")
+
+
+def test_prefetch_concurrency_is_bounded():
+    """No more than max_concurrency fetches run at once."""
+    print("Testing bounded prefetch concurrency...")
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fetch(url):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return None if url.endswith("broken") else f"/local/{url}"
+
+    async def prefetch(urls):
+        return await AssetPrefetcher(fetch, max_concurrency=3).start(urls).join()
+
+    urls = [f"asset_{i}" for i in range(12)] + ["asset_broken"]
+    local_paths = asyncio.run(prefetch(urls))
+    assert state["peak"] == 3, f"Expected 3 fetches in flight, saw {state['peak']}"
+    assert local_paths["asset_0"] == "/local/asset_0" and local_paths["asset_broken"] is None
+    print(f"✅ At most {state['peak']} fetches in flight for {len(urls)} assets")
+
+
+def test_failed_open_places_nothing():
+    """A failed open stops the pipeline before any stage edit and drops pending downloads."""
+    print("Testing failed stage open...")
+    with tempfile.TemporaryDirectory() as remote_dir, tempfile.TemporaryDirectory() as cache_dir:
+        with LocalHTTPServer(remote_dir, latency=0.05) as server:
+            product_data = serve_catalog(server, load_valid_product_data(), remote_dir)
+            result, placed_at = run_pipeline(StubStageContext(fail=True), product_data, AssetCache(cache_dir))
+            assert not result["success"] and not placed_at
+            assert "hierarchy" not in result["timings"] and "open" in result["timings"]
+            time.sleep(0.2)
+            assert sum(server.request_counts.values()) < len(ordered_assets(product_data)), \
+                "Queued downloads must be cancelled"
+    print("✅ Nothing placed and queued downloads cancelled")
+
+
+def test_cancelled_placement_reports_placed_products():
+    """A cancel token stops placement between chunks and reports what was placed so far."""
+    print("Testing cancelled pipelined placement...")
+    with tempfile.TemporaryDirectory() as remote_dir, tempfile.TemporaryDirectory() as cache_dir:
+        with LocalHTTPServer(remote_dir, latency=0.02) as server:
+            product_data = serve_catalog(server, load_valid_product_data(), remote_dir)
+            token = CancellationToken()
+
+            def progress(done, total):
+                if done >= 10:
+                    token.cancel()
+
+            result, placed_at = run_pipeline(StubStageContext(), product_data, AssetCache(cache_dir),
+                                             frame_budget=FrameBudget(0.0, cancel_token=token), progress=progress)
+            assert result["cancelled"] and not result["success"]
+            assert result["placed_ids"] == list(placed_at) and 10 <= len(placed_at) < len(product_data)
+    print(f"✅ Cancelled after {len(placed_at)} of {len(product_data)} products")
+
+
+if __name__ == "__main__":
+    test_pipeline_overlaps_open_prefetch_and_placement()
+    test_prefetch_concurrency_is_bounded()
+    test_failed_open_places_nothing()
+    test_cancelled_placement_reports_placed_products()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script to verify bulk Sdf authoring produces the same scene as the
+per-prim placement path.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from helpers.benchmark_bulk_authoring import (
+    load_product_data, make_synthetic_catalog, create_base_stage, place_per_prim, place_bulk
+)
+
+
+def describe_stage(stage):
+    """Collect payloads, applied schemas and authored attribute values per prim."""
+    description = {}
+    for prim in stage.TraverseAll():
+        attributes = {}
+        for attr in prim.GetAuthoredAttributes():
+            attributes[attr.GetName()] = attr.Get()
+        description[str(prim.GetPath())] = {
+            "type": prim.GetTypeName(),
+            "schemas": sorted(prim.GetAppliedSchemas()),
+            "payloads": [str(p.assetPath) for p in prim.GetPrimStack()[0].payloadList.GetAddedOrExplicitItems()],
+            "attributes": attributes,
+        }
+    return description
+
+
+def test_bulk_matches_per_prim():
+    """Bulk and per-prim authoring must produce identical prims for the real catalog."""
+    print("Testing bulk authoring against per-prim authoring...")
+    product_data = load_product_data()
+    assert product_data, "Failed to load product data"
+
+    per_prim_stage = create_base_stage()
+    per_prim_failed = place_per_prim(per_prim_stage, product_data)
+    bulk_stage = create_base_stage()
+    bulk_failed = place_bulk(bulk_stage, product_data)
+    assert per_prim_failed == bulk_failed, f"Failed products differ: {per_prim_failed} vs {bulk_failed}"
+    if bulk_failed:
+        print(f"  Products with malformed data (skipped by both paths): {bulk_failed}")
+
+    per_prim_description = describe_stage(per_prim_stage)
+    bulk_description = describe_stage(bulk_stage)
+
+    # The per-prim path leaves a partial prim behind for failed products, bulk does not
+    partial_paths = set(per_prim_description) - set(bulk_description)
+    assert all(path.rsplit("/", 1)[-1] in bulk_failed for path in partial_paths), "Prim paths differ"
+    for path, expected in bulk_description.items():
+        assert per_prim_description[path] == expected, f"Mismatch at {path}"
+
+    print(f"✅ {len(bulk_description)} prims identical between per-prim and bulk authoring")
+
+
+def test_bulk_large_catalog():
+    """Bulk authoring places every product of a synthetic 1k catalog."""
+    print("Testing bulk authoring with a 1000 product catalog...")
+    catalog = make_synthetic_catalog(load_product_data(), 1000)
+    stage = create_base_stage()
+
+    failed_ids = place_bulk(stage, catalog)
+    assert not failed_ids, f"Failed to place: {failed_ids}"
+
+    product_count = sum(1 for prim in stage.TraverseAll() if prim.HasAuthoredPayloads())
+    assert product_count == 1000, f"Expected 1000 products, found {product_count}"
+    print(f"✅ Placed {product_count} products")
+
+
+if __name__ == "__main__":
+    test_bulk_matches_per_prim()
+    test_bulk_large_catalog()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the populated shop -> catalog extractor (fields, IDs, warnings, outputs).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+The shops are read at the Sdf level, so the remote product payloads are never fetched.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from catalog_extractor import diff_catalogs, extract_catalog, get_product_name, read_catalog
+from compact_catalog import CompactCatalog
+from planogram import save_catalog
+from helpers.benchmark_stage_cache import BASE_PATH
+
+REFERENCE_SHOP_PATH = BASE_PATH / "assets" / "Shop Minimal Fully Stocked 2.usda"
+OTHER_SHOP_PATH = BASE_PATH / "assets" / "Shop Minimal Fully Stocked.usda"
+CATALOG_PATH = BASE_PATH / "assets" / "product_data.json"
+
+# Where the hand-made catalog disagrees with the reference shop: no rigid body in the shop,
+# values copied from the other stocked shop, and an identity rotate for a mug without rotation
+KNOWN_DIFFERENCES = {
+    "bleach_cleanser_2": ["orient"],
+    "bowl_1": ["physics_enabled"],
+    "bowl_2": ["physics_enabled"],
+    "bowl_3": ["physics_enabled"],
+    "mug_1": ["translate"],
+    "pudding_box_1": ["orient"],
+    "sm_mug_1": ["physics_enabled", "rotate"],
+}
+
+SYNTHETIC_SHOP = """#usda 1.0
+def Xform "World"
+{
+    def Xform "Shelf"
+    {
+        def Xform "mac_and_cheese" (
+            prepend payload = @./not_a_product.usd@
+        )
+        {
+        }
+        def Scope "Items_Lower"
+        {
+            def Scope "Cans"
+            {
+                def "_07_tuna_fish_can_61" (
+                    prepend apiSchemas = ["PhysicsRigidBodyAPI", "PhysicsCollisionAPI"]
+                    prepend payload = @./007_tuna_fish_can.usd@
+                )
+                {
+                    vector3f physics:velocity = (0.1, 0, 0)
+                    quatf xformOp:orient = (0.5, -0.5, 0.5, -0.5)
+                    float3 xformOp:scale = (1.3333334, 1.3333334, 1.3333334)
+                    double3 xformOp:translate = (1, 2, 3)
+                    uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:orient", "xformOp:scale"]
+                }
+                def "_07_tuna_fish_can_64" (
+                    prepend apiSchemas = ["PhysicsRigidBodyAPI"]
+                    prepend references = @./007_tuna_fish_can.usd@
+                )
+                {
+                    bool physics:rigidBodyEnabled = 0
+                    double3 xformOp:rotateZYX = (0, 0, 90)
+                    double3 xformOp:translate = (1, 2.5, 3)
+                    double xformOp:rotateX:unitsResolve = 90
+                    uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:rotateZYX", "xformOp:rotateX:unitsResolve"]
+                }
+            }
+        }
+        def Scope "Items_Top"
+        {
+            def Scope "Mugs"
+            {
+                def "SM_Mug_A2"
+                {
+                    float3 xformOp:rotateZYX
+                    float3 xformOp:scale = (0.013333333, 0.013333333, 0.013333333)
+                    double3 xformOp:translate = (4, 5, 6)
+                    uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:scale", "xformOp:rotateZYX"]
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def test_product_names():
+    """Number prefixes and copy suffixes are stripped; the hand-made catalog's short names are kept."""
+    print("Testing product names...")
+    assert get_product_name("_06_mustard_bottle_05") == "mustard_bottle"
+    assert get_product_name("_25_mug") == "mug"
+    assert get_product_name("mac_n_cheese_centered_01") == "mac_n_cheese"
+    assert get_product_name("SM_Mug_A2_02") == "sm_mug"
+    assert get_product_name("rubiks_cube") == "rubiks_cube"
+    print("✅ Prim names map to catalog names")
+
+
+def test_synthetic_shop():
+    """Every field is read from the prim specs; non-product prims are skipped and odd ops are reported."""
+    print("Testing extraction from a synthetic shop...")
+    with tempfile.TemporaryDirectory() as directory:
+        shop_path = Path(directory) / "shop.usda"
+        shop_path.write_text(SYNTHETIC_SHOP)
+        product_data, report = extract_catalog(shop_path)
+        assert list(product_data) == ["tuna_fish_can_1", "tuna_fish_can_2", "sm_mug_1"]
+        assert product_data["tuna_fish_can_1"] == {
+            "asset": "./007_tuna_fish_can.usd", "translate": [1.0, 2.0, 3.0], "orient": [0.5, -0.5, 0.5, -0.5],
+            "scale": [1.3333334, 1.3333334, 1.3333334], "physics_enabled": True, "velocity": [0.1, 0.0, 0.0],
+            "shelf": "Items_Lower", "category": "Cans"}
+        second = product_data["tuna_fish_can_2"]
+        assert second["asset"] == "./007_tuna_fish_can.usd" and second["rotate"] == [0.0, 0.0, 90.0]
+        assert second["scale"] == [1.0, 1.0, 1.0] and second["physics_enabled"] is False
+        mug = product_data["sm_mug_1"]
+        assert "rotate" not in mug and mug["physics_enabled"] is False and mug["asset"] == ""
+        assert report["warnings"] == {
+            "tuna_fish_can_2": ["xform op xformOp:rotateX:unitsResolve is not in the catalog format"],
+            "sm_mug_1": ["no payload or reference"],
+        }, report["warnings"]
+        assert report["products"] == 3 and report["categories"] == 2
+
+        compact, _ = extract_catalog(shop_path, output="compact")
+        assert isinstance(compact, CompactCatalog) and compact.to_product_data() == product_data
+    print(f"✅ {report['products']} products read, {len(report['warnings'])} with warnings")
+
+
+def test_reference_shop_matches_catalog():
+    """The reference shop gives the hand-made catalog's products, apart from its known hand-copy errors."""
+    print("Testing extraction of the reference shop...")
+    product_data, report = extract_catalog(REFERENCE_SHOP_PATH)
+    with open(CATALOG_PATH, 'r') as f:
+        catalog = json.load(f)
+    differences = diff_catalogs(product_data, catalog)
+    assert differences == {"added": [], "removed": [], "changed": KNOWN_DIFFERENCES}, differences
+    assert not report["warnings"] and report["categories"] == 12
+    # The bowls and the first top mug have no rigid body in the shop
+    assert sum(not product["physics_enabled"] for product in product_data.values()) == 4
+
+    other_data, other_report = extract_catalog(OTHER_SHOP_PATH)
+    assert sorted(other_report["warnings"]) == ["rubiks_cube_1", "rubiks_cube_2", "rubiks_cube_3",
+                                                "sm_mug_1", "sm_mug_2", "sm_mug_3"]
+    assert other_data["bleach_cleanser_2"]["orient"] == catalog["bleach_cleanser_2"]["orient"]
+    print(f"✅ {report['products']} products, {len(KNOWN_DIFFERENCES)} known hand-copy differences")
+
+
+def test_output_formats():
+    """The extracted catalog round-trips through JSON and the compact formats and compares clean."""
+    print("Testing catalog outputs...")
+    product_data, _ = extract_catalog(REFERENCE_SHOP_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("catalog.json", "catalog.npz", "catalog_compact"):
+            catalog = product_data if name.endswith(".json") else CompactCatalog.from_product_data(product_data)
+            target = save_catalog(catalog, Path(directory) / name)
+            assert read_catalog(target) == product_data, name
+            assert not any(diff_catalogs(product_data, read_catalog(target)).values()), name
+    print("✅ JSON, .npz and .npy directory outputs match the extracted catalog")
+
+
+if __name__ == "__main__":
+    test_product_names()
+    test_synthetic_shop()
+    test_reference_shop_matches_catalog()
+    test_output_formats()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streaming catalog validator (schema, values, shelf support, duplicates, locations).
+
+Requires NumPy (pip install numpy), Isaac Sim is NOT required.
+The catalogs are written to a temporary directory, so nothing is written to assets/.
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from catalog_validator import (NDJSON_ID_KEY, format_problem, iter_json_entries, iter_ndjson_entries,
+                               validate_catalog, validate_entries)
+from shelf_surfaces import ShelfSurfaces
+
+BASE_PATH = Path(__file__).parent.parent
+CATALOG_PATH = BASE_PATH / "assets" / "product_data.json"
+SHELF_SURFACES_PATH = BASE_PATH / "assets" / "shelf_surfaces.npz"
+
+GOOD = {"asset": "a.usd", "translate": [-25.0, 45.0, 0.9], "scale": [1, 1, 1], "physics_enabled": True,
+        "rotate": [0, 0, 90], "shelf": "Items_Lower"}
+
+# (product_id, product, expected error messages); one product per line when written
+SYNTHETIC_PRODUCTS = [
+    ("good_1", GOOD, []),
+    ("missing_1", {"asset": "a.usd", "translate": [-25, 45, 0.9], "rotate": [0, 0, 0]},
+     ["missing 'scale'", "missing 'physics_enabled'"]),
+    ("types_1", dict(GOOD, asset="", physics_enabled=1, shelf=3),
+     ["'asset' must be a non-empty string", "'physics_enabled' must be true or false", "'shelf' must be a string"]),
+    ("vectors_1", dict(GOOD, translate=[-25, 45], rotate=[0, 0, 0, 0], scale=[1, "1", 1]),
+     ["'translate' must be a list of 3 numbers", "'scale' must be a list of 3 numbers",
+      "'rotate' must be a list of 3 numbers"]),
+    ("bool_1", dict(GOOD, scale=[True, 1, 1]), ["'scale' must be a list of 3 numbers"]),
+    ("zero_scale_1", dict(GOOD, scale=[1, 0, 1]), ["'scale' [1.0, 0.0, 1.0] has a zero component"]),
+    ("orient_1", dict({k: v for k, v in GOOD.items() if k != "rotate"}, orient=[1, 0, 0, 0.5]),
+     ["'orient' is not normalized (|q| = 1.1180)"]),
+    ("floating_1", dict(GOOD, translate=[-25.0, 45.0, 1.5]), ["0.64 above SM_RackShelf_156, floating"]),
+    ("nowhere_1", dict(GOOD, translate=[0.0, 0.0, 0.9]), ["no shelf surface under [0.0, 0.0, 0.9]"]),
+    ("good_1", GOOD, ["duplicate product ID (first at line 2)"]),
+    ("unrotated_1", {k: v for k, v in GOOD.items() if k != "rotate"}, []),
+]
+
+
+def write_json_catalog(path, products):
+    """Write products as a product_data.json object, one product per line from line 2."""
+    lines = [f"    {json.dumps(product_id)}: {json.dumps(data)}" for product_id, data, *_ in products]
+    Path(path).write_text("{\n" + ",\n".join(lines) + "\n}\n")
+
+
+def write_ndjson_catalog(path, products):
+    """Write products as NDJSON, preceded by a blank line so the lines match the JSON file."""
+    lines = [json.dumps({NDJSON_ID_KEY: product_id, **data}) for product_id, data, *_ in products]
+    Path(path).write_text("\n" + "\n".join(lines) + "\n")
+
+
+def test_reference_catalog():
+    """The reference catalog is valid and every product rests on its shelf level."""
+    print("Testing the reference catalog...")
+    report = validate_catalog(CATALOG_PATH, ShelfSurfaces.load(SHELF_SURFACES_PATH))
+    assert report["products"] == 37 and report["physics_enabled"] == 37 and report["format"] == "json"
+    assert not report["errors"] and not report["error_count"], report["errors"]
+    assert not report["warnings"] and not report["support_error_count"]
+    assert report["shelf_levels"] == {("Items_Lower", "SM_RackShelf_156"): 13, ("Items_Upper", "SM_RackShelf_157"): 12,
+                                      ("Items_Top", "SM_RackShelf_158"): 12}
+    print(f"✅ {report['products']} products, no errors")
+
+
+def test_synthetic_errors():
+    """Every kind of error is found at its line, in JSON and NDJSON and for any chunk size."""
+    print("Testing the synthetic catalog errors...")
+    surfaces = ShelfSurfaces.load(SHELF_SURFACES_PATH)
+    expected = [(line, product_id, message)
+                for line, (product_id, _, messages) in enumerate(SYNTHETIC_PRODUCTS, start=2) for message in messages]
+    with tempfile.TemporaryDirectory() as directory:
+        json_path, ndjson_path = Path(directory) / "catalog.json", Path(directory) / "catalog.ndjson"
+        write_json_catalog(json_path, SYNTHETIC_PRODUCTS)
+        write_ndjson_catalog(ndjson_path, SYNTHETIC_PRODUCTS)
+        for path in (json_path, ndjson_path):
+            for chunk_size in (1, 3, 1000):
+                report = validate_catalog(path, surfaces, chunk_size=chunk_size)
+                assert report["errors"] == expected, (path.suffix, chunk_size, report["errors"])
+                assert report["warnings"] == [(12, "unrotated_1", "no 'rotate' or 'orient', placed unrotated")]
+                assert report["products"] == len(SYNTHETIC_PRODUCTS) and report["support_error_count"] == 2
+        # json.load keeps only the last of the duplicate IDs
+        with open(json_path, 'r') as f:
+            assert len(json.load(f)) == len(SYNTHETIC_PRODUCTS) - 1
+        # Without a shelf index the support checks are skipped
+        report = validate_catalog(json_path)
+        assert report["error_count"] == len(expected) - 2 and not report["shelf_levels"]
+    print(f"✅ {len(expected)} errors found at their lines in JSON and NDJSON")
+
+
+def test_malformed_files():
+    """A JSON syntax error ends the stream at its line; a bad NDJSON line is reported and skipped."""
+    print("Testing malformed catalog files...")
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "catalog.json"
+        write_json_catalog(json_path, SYNTHETIC_PRODUCTS[:3])
+        json_path.write_text(json_path.read_text()[:-8])  # Cut into the last product
+        report = validate_catalog(json_path)
+        assert report["products"] == 2 and report["error_count"] == 3, report
+        assert report["errors"][-1][0] == 4 and report["errors"][-1][1] is None
+
+        ndjson_path = Path(directory) / "catalog.ndjson"
+        write_ndjson_catalog(ndjson_path, SYNTHETIC_PRODUCTS[:2])
+        with open(ndjson_path, 'a') as f:
+            f.write('{"asset": "a.usd"\n[1, 2]\n' + json.dumps(dict(GOOD)) + "\n")
+            f.write(json.dumps({NDJSON_ID_KEY: "good_2", **GOOD}) + "\n")
+        report = validate_catalog(ndjson_path)
+        assert report["products"] == 3
+        assert [(line, message) for line, _, message in report["errors"][2:]] == [
+            (4, "Expecting ',' delimiter: line 1 column 18 (char 17)"), (5, "not a JSON object"),
+            (6, "no 'id' string")], report["errors"]
+    print("✅ Syntax errors are reported at their lines")
+
+
+def test_streaming_reader():
+    """The streamed entries match json.load for any read size, with the line of each product ID."""
+    print("Testing the streaming JSON reader...")
+    text = CATALOG_PATH.read_text()
+    catalog = json.loads(text)
+    lines = {line.split('"')[1]: number for number, line in enumerate(text.splitlines(), start=1)
+             if line.startswith('    "')}
+    for read_size in (1, 7, 4096):
+        entries = list(iter_json_entries(io.StringIO(text), read_size=read_size))
+        assert {product_id: data for _, product_id, data in entries} == catalog, read_size
+        assert {product_id: line for line, product_id, _ in entries} == lines, read_size
+    assert list(iter_json_entries(io.StringIO(" { } "))) == []
+    entries = list(iter_ndjson_entries(io.StringIO('{"id": "a", "x": 1}\n\n{"id": "b"}\n')))
+    assert entries == [(1, "a", {"x": 1}), (3, "b", {})]
+    print(f"✅ {len(catalog)} products streamed for every read size")
+
+
+def test_in_memory_catalog():
+    """In-memory catalogs have no lines; errors beyond max_errors are counted but not kept."""
+    print("Testing an in-memory catalog...")
+    product_data = {f"product_{index}": dict(GOOD, scale=[0, 1, 1]) for index in range(50)}
+    report = validate_entries(((None, product_id, data) for product_id, data in product_data.items()),
+                              chunk_size=8, max_errors=5)
+    assert report["error_count"] == 50 and len(report["errors"]) == 5
+    assert report["errors"][0] == (None, "product_0", "'scale' [0.0, 1.0, 1.0] has a zero component")
+    assert format_problem(report["errors"][0]) == "product_0: 'scale' [0.0, 1.0, 1.0] has a zero component"
+    report = validate_entries([(None, "a", GOOD), (None, "a", GOOD), (None, "b", [])])
+    assert report["errors"][0] == (None, "a", "duplicate product ID")
+    assert report["errors"][1] == (None, "b", "product is not an object")
+    print("✅ Errors without lines are reported, the first 5 of 50 kept")
+
+
+if __name__ == "__main__":
+    test_reference_catalog()
+    test_synthetic_errors()
+    test_malformed_files()
+    test_streaming_reader()
+    test_in_memory_catalog()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compact SKU-table + instance-array catalog.
+
+Requires NumPy (pip install numpy); the layer comparison also needs usd-core.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Sdf
+from compact_catalog import CompactCatalog, load_catalog, PHYSICS_DEFAULT
+from bulk_authoring import author_products_to_layer
+from randomization_engine import RandomizationEngine
+from helpers.test_randomization import load_product_data
+
+JSON_PATH = Path(__file__).parent.parent / "assets" / "product_data.json"
+
+
+def load_valid_product_data():
+    """Real catalog without entries the compact table rejects (malformed rotations)."""
+    return {pid: data for pid, data in load_product_data().items() if len(data.get("rotate", [0, 0, 0])) == 3}
+
+
+def test_json_round_trip():
+    """Every valid product reads back exactly; SKU fields are stored once."""
+    print("Testing JSON round trip...")
+    product_data = load_valid_product_data()
+    catalog = load_catalog(JSON_PATH)
+    assert catalog.to_product_data() == product_data
+    malformed = dict(product_data["sm_mug_1"], rotate=[0, 0, 0, 0])
+    assert "malformed_1" not in CompactCatalog.from_product_data(dict(product_data, malformed_1=malformed)), \
+        "Malformed entries must be skipped"
+    assert len(catalog.skus) == len({data["asset"] for data in product_data.values()})
+    assert np.all(np.isnan(catalog.instances["scale"])), "Shared scales belong in the SKU table"
+    print(f"✅ {len(catalog)} products, {len(catalog.skus)} SKUs")
+
+
+def test_per_instance_overrides():
+    """Scale and physics differing from the SKU default are kept per instance."""
+    print("Testing per-instance overrides...")
+    product_data = load_valid_product_data()
+    product_data["tuna_fish_can_2"] = dict(product_data["tuna_fish_can_2"], scale=[2.0, 2.0, 2.0],
+                                           physics_enabled=False)
+    catalog = CompactCatalog.from_product_data(product_data)
+    row = catalog.get_index()["tuna_fish_can_2"]
+    assert catalog.instances["physics"][row] == 0
+    assert catalog.instances["physics"][row - 1] == PHYSICS_DEFAULT
+    assert catalog.get_scales()[row].tolist() == [2.0, 2.0, 2.0]
+    assert catalog["tuna_fish_can_2"] == product_data["tuna_fish_can_2"]
+    print("✅ Overrides survive the round trip")
+
+
+def test_binary_forms():
+    """.npz and memory-mapped directories load the same catalog."""
+    print("Testing .npz and memory-mapped forms...")
+    catalog = load_catalog(JSON_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        npz_catalog = load_catalog(catalog.save(Path(directory) / "catalog.npz"))
+        mmap_catalog = load_catalog(catalog.save(Path(directory) / "catalog"), mmap=True)
+        assert isinstance(mmap_catalog.instances, np.memmap)
+        for loaded in (npz_catalog, mmap_catalog):
+            assert loaded.content_hash() == catalog.content_hash()
+            assert loaded.to_product_data() == catalog.to_product_data()
+        del mmap_catalog, loaded
+    print("✅ Binary forms load identically")
+
+
+def test_consumers_read_catalog():
+    """Bulk authoring and randomization give the same results from the catalog as from the dict."""
+    print("Testing catalog consumers...")
+    product_data = load_valid_product_data()
+    catalog = load_catalog(JSON_PATH)
+
+    from_dict, from_catalog = Sdf.Layer.CreateAnonymous(), Sdf.Layer.CreateAnonymous()
+    author_products_to_layer(from_dict, product_data)
+    author_products_to_layer(from_catalog, catalog)
+    assert from_dict.ExportToString() == from_catalog.ExportToString()
+
+    options = {"num_products": 10, "position_jitter": 0.01, "scale_jitter": 0.1}
+    dict_engine, catalog_engine = RandomizationEngine(product_data, seed=5), RandomizationEngine(catalog, seed=5)
+    randomized_dict = dict_engine.apply(product_data, dict_engine.draw(**options))
+    randomized_catalog = catalog_engine.apply(catalog, catalog_engine.draw(**options))
+    assert isinstance(randomized_catalog, CompactCatalog)
+    assert randomized_catalog.to_product_data() == randomized_dict
+    assert catalog.to_product_data() == product_data, "apply() must not modify the catalog"
+    print("✅ Layers and randomization match the dict path")
+
+
+if __name__ == "__main__":
+    test_json_round_trip()
+    test_per_instance_overrides()
+    test_binary_forms()
+    test_consumers_read_catalog()
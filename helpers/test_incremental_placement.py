@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental re-placement (catalog diff + partial re-authoring).
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+Products point at small local stand-in assets, so no network access is needed.
+"""
+
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Pcp, Sdf, Usd, UsdGeom
+from bulk_authoring import author_products_to_layer, author_mesh_collision
+from incremental_placement import (snapshot_catalog, diff_catalogs, merge_catalog_edits, apply_catalog_diff,
+                                   count_changes, format_diff, CatalogWatcher)
+from compact_catalog import CompactCatalog
+from helpers.test_region_loading import load_valid_product_data
+from helpers.report_instancing import write_placeholder_assets
+
+
+def edit_catalog(product_data):
+    """Return an edited copy of the catalog with one change of every kind."""
+    edited = copy.deepcopy(product_data)
+    edited["mustard_bottle_1"]["translate"][0] += 0.05
+    rotated_id = next(pid for pid, data in edited.items() if "rotate" in data and not pid.startswith("mustard"))
+    edited[rotated_id]["orient"] = [0.0, 0.0, 0.0, 1.0]
+    del edited[rotated_id]["rotate"]
+    edited["tuna_fish_can_2"]["scale"] = [2.0, 2.0, 2.0]
+    edited["tuna_fish_can_2"]["physics_enabled"] = False
+    edited["mustard_bottle_2"]["shelf"] = "Items_Upper"
+    edited["mustard_bottle_4"] = dict(copy.deepcopy(edited["mustard_bottle_1"]), translate=[-25.0, 46.5, 1.0])
+    del edited["tuna_fish_can_1"]
+    return edited, rotated_id
+
+
+def create_shop_stage():
+    """In-memory stage with an empty shelf root, like the empty shop."""
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/World/Shelf")
+    return stage
+
+
+def describe_products(stage):
+    """Composed transform, payload and physics of every active product prim."""
+    description = {}
+    for prim in stage.Traverse():
+        if not prim.HasAuthoredPayloads():
+            continue
+        values = {name: prim.GetAttribute(name).Get() for name in prim.GetAttribute("xformOpOrder").Get()}
+        physics = {attr.GetName(): attr.Get() for attr in prim.GetAttributes()
+                   if attr.GetName().startswith("physics:") and attr.HasAuthoredValue()}
+        meshes = sorted(tuple(child.GetAppliedSchemas()) for child in prim.GetAllChildren())
+        payloads = sorted(arc.GetTargetLayer().identifier for arc in Usd.PrimCompositionQuery(prim).GetCompositionArcs()
+                          if arc.GetArcType() == Pcp.ArcTypePayload)
+        description[str(prim.GetPath())] = (values, sorted(prim.GetAppliedSchemas()), physics, meshes, payloads)
+    return description
+
+
+def test_diff_catalogs():
+    """Every kind of edit lands in its own list; identical catalogs give an empty diff."""
+    print("Testing catalog diff...")
+    product_data = load_valid_product_data()
+    edited, rotated_id = edit_catalog(product_data)
+    assert count_changes(diff_catalogs(product_data, product_data)) == 0
+
+    diff = diff_catalogs(CompactCatalog.from_product_data(product_data), edited)
+    assert diff["added"] == ["mustard_bottle_4"]
+    assert diff["removed"] == ["tuna_fish_can_1"]
+    assert diff["replaced"] == ["mustard_bottle_2"]
+    assert diff["moved"] == ["mustard_bottle_1"]
+    assert diff["rotated"] == [rotated_id]
+    assert diff["scaled"] == ["tuna_fish_can_2"] and diff["physics"] == ["tuna_fish_can_2"]
+    assert count_changes(diff) == 6
+    print(f"✅ {format_diff(diff)}")
+
+
+def test_merge_catalog_edits():
+    """Edits land on the placed catalog; the rest of the placement is kept."""
+    print("Testing catalog edit merge...")
+    product_data = load_valid_product_data()
+    edited, rotated_id = edit_catalog(product_data)
+    # Placement randomized every rotation and moved an untouched product
+    placed = {product_id: dict(data, orient=[0.0, 0.0, 0.7071068, 0.7071068]) for product_id, data in
+              copy.deepcopy(product_data).items()}
+    placed["mustard_bottle_3"]["translate"] = [1.0, 2.0, 3.0]
+
+    merged = merge_catalog_edits(placed, diff_catalogs(product_data, edited), edited)
+    assert "tuna_fish_can_1" not in merged and merged["mustard_bottle_4"] == edited["mustard_bottle_4"]
+    assert merged["mustard_bottle_2"] == edited["mustard_bottle_2"]
+    assert merged["mustard_bottle_1"]["translate"] == edited["mustard_bottle_1"]["translate"]
+    assert merged["mustard_bottle_1"]["orient"] == placed["mustard_bottle_1"]["orient"]
+    assert merged[rotated_id]["orient"] == [0.0, 0.0, 0.0, 1.0] and "rotate" not in merged[rotated_id]
+    assert merged["tuna_fish_can_2"]["scale"] == [2.0, 2.0, 2.0]
+    assert merged["mustard_bottle_3"] == placed["mustard_bottle_3"]
+    assert placed["mustard_bottle_1"]["translate"] == product_data["mustard_bottle_1"]["translate"]
+    print("✅ Only the edited fields replace the placed values")
+
+
+def check_incremental_matches_rebuild(product_layer_is_edit_target):
+    with tempfile.TemporaryDirectory() as asset_dir:
+        product_data = write_placeholder_assets(load_valid_product_data(), asset_dir)
+        edited, _ = edit_catalog(product_data)
+
+        # Full rebuild of the edited catalog for reference
+        rebuilt = create_shop_stage()
+        author_mesh_collision(rebuilt, rebuilt.GetRootLayer(),
+                              author_products_to_layer(rebuilt.GetRootLayer(), edited).values())
+
+        # Initial placement of the original catalog, then only the diff
+        stage = create_shop_stage()
+        if product_layer_is_edit_target:
+            product_layer = stage.GetRootLayer()
+        else:
+            # Products live in a weaker sublayer, like a prebuilt layer from the build cache
+            product_layer = Sdf.Layer.CreateAnonymous()
+            stage.GetRootLayer().subLayerPaths.append(product_layer.identifier)
+        layer = stage.GetRootLayer()
+        author_mesh_collision(stage, product_layer, author_products_to_layer(product_layer, product_data).values())
+        snapshot = snapshot_catalog(product_data)
+
+        diff = diff_catalogs(snapshot, edited)
+        counts = apply_catalog_diff(stage, layer, diff, snapshot, edited)
+        author_mesh_collision(stage, layer, counts["physics_paths"])
+        assert counts["failed"] == 0
+        assert all(counts[kind] == len(diff[kind]) for kind in diff)
+        assert describe_products(stage) == describe_products(rebuilt)
+        if not product_layer_is_edit_target:
+            assert not stage.GetPrimAtPath("/World/Shelf/Items_Lower/MustardBottles/mustard_bottle_2").IsActive()
+
+
+
+def test_incremental_matches_rebuild():
+    """Applying only the diff composes the same products as rebuilding from scratch."""
+    print("Testing incremental re-placement...")
+    check_incremental_matches_rebuild(product_layer_is_edit_target=True)
+    print("✅ Diff applied in the product layer matches a full rebuild")
+
+
+def test_incremental_over_weaker_layer():
+    """Products from a weaker (cached) layer are edited, hidden and replaced through overs."""
+    print("Testing incremental re-placement over a prebuilt product layer...")
+    check_incremental_matches_rebuild(product_layer_is_edit_target=False)
+    print("✅ Diff applied over a weaker product layer matches a full rebuild")
+
+
+def test_catalog_watcher():
+    """The watcher reports each change once."""
+    print("Testing catalog watcher...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "product_data.json"
+        path.write_text("{}")
+        watcher = CatalogWatcher(path, interval=0.0)
+        assert not watcher.poll()
+        time.sleep(0.01)
+        path.write_text('{"a": 1}')
+        assert watcher.poll()
+        assert not watcher.poll()
+        path.unlink()
+        assert not watcher.poll(), "A file that is being replaced must not trigger an update"
+    print("✅ Changes are reported once")
+
+
+if __name__ == "__main__":
+    test_diff_catalogs()
+    test_merge_catalog_edits()
+    test_incremental_matches_rebuild()
+    test_incremental_over_weaker_layer()
+    test_catalog_watcher()
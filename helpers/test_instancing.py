@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to verify instanceable product placement and the stage statistics report.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import UsdPhysics, Gf
+from bulk_authoring import MESH_COLLISION_SCHEMAS, author_mesh_collision, get_product_path
+from stage_statistics import collect_stage_statistics
+from helpers.benchmark_bulk_authoring import load_product_data
+from helpers.report_instancing import write_placeholder_assets, build_stage
+
+
+def test_instanceable_products_share_prototypes():
+    """Every SKU of a static catalog gets exactly one prototype."""
+    print("Testing instanceable product placement...")
+    product_data = load_product_data()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_data = write_placeholder_assets(product_data, temp_dir)
+        regular_stage = build_stage(local_data, instanceable=False, enable_physics=False)
+        instanced_stage = build_stage(local_data, instanceable=True, enable_physics=False)
+
+        before = collect_stage_statistics(regular_stage)
+        after = collect_stage_statistics(instanced_stage)
+
+        skus = {data["asset"] for data in product_data.values()}
+        assert before["prototypes"] == 0
+        assert after["prototypes"] == len(skus), f"Expected {len(skus)} prototypes, got {after['prototypes']}"
+        assert after["instances"] == len(product_data)
+        assert after["composed_prims"] < before["composed_prims"]
+        assert after["expanded_prims"] == before["composed_prims"]
+        assert all(instanced_stage.GetPrimAtPath(get_product_path(product_id, data)).IsInstance()
+                   for product_id, data in product_data.items())
+
+    print(f"✅ {after['instances']} instances share {after['prototypes']} prototypes "
+          f"({before['composed_prims']} -> {after['composed_prims']} composed prims)")
+
+
+def test_physics_products_keep_mesh_collision():
+    """Physics products stay regular prims, so their meshes get convex hull collision; static ones are instanced."""
+    print("Testing physics products with instancing...")
+    # The lower shelf static, everything else a rigid body
+    product_data = {product_id: dict(data, physics_enabled=data["shelf"] != "Items_Lower")
+                    for product_id, data in load_product_data().items()}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_data = write_placeholder_assets(product_data, temp_dir)
+        stage = build_stage(local_data, instanceable=True)
+        paths = {product_id: get_product_path(product_id, data) for product_id, data in local_data.items()}
+        assert author_mesh_collision(stage, stage.GetRootLayer(), paths.values()) > 0
+
+        for product_id, data in product_data.items():
+            prim = stage.GetPrimAtPath(paths[product_id])
+            if not data["physics_enabled"]:
+                assert prim.IsInstance() and not prim.HasAPI(UsdPhysics.RigidBodyAPI), product_id
+                continue
+            assert not prim.IsInstance(), f"{product_id} is a rigid body and must not be instanced"
+            rigid_body = UsdPhysics.RigidBodyAPI(prim)
+            assert prim.HasAPI(UsdPhysics.RigidBodyAPI)
+            if "velocity" in data:
+                assert Gf.IsClose(rigid_body.GetVelocityAttr().Get(), Gf.Vec3f(*data["velocity"]), 1e-6)
+            if "angular_velocity" in data:
+                assert Gf.IsClose(rigid_body.GetAngularVelocityAttr().Get(),
+                                  Gf.Vec3f(*data["angular_velocity"]), 1e-6)
+            meshes = [child for child in prim.GetAllChildren() if child.GetTypeName() == "Mesh"]
+            assert meshes, product_id
+            for mesh in meshes:
+                # PhysX schemas are not registered in usd-core, so read the authored list op
+                schemas = mesh.GetMetadata("apiSchemas").GetAddedOrExplicitItems()
+                assert set(MESH_COLLISION_SCHEMAS) <= set(schemas), mesh.GetPath()
+                assert mesh.GetAttribute("physics:collisionEnabled").Get() is True
+
+    static_count = sum(not data["physics_enabled"] for data in product_data.values())
+    print(f"✅ {static_count} static instances, {len(product_data) - static_count} rigid bodies "
+          f"with mesh collision")
+
+
+if __name__ == "__main__":
+    test_instanceable_products_share_prototypes()
+    test_physics_products_keep_mesh_collision()
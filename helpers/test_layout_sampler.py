@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the collision-free layout sampler (slots, shelf bounds, facings, replay).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Products use a fixed product-sized extent, so no assets are opened.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog
+from layout_sampler import LayoutSampler, PLANE_AXES
+from overlap_checker import UP_AXIS, check_overlaps, get_product_boxes
+from scene_compiler import randomize_catalog, DEFAULT_OPTIONS
+from helpers.benchmark_bulk_authoring import make_synthetic_catalog
+from helpers.test_overlap_checker import BOX_EXTENT, product_extents
+from helpers.test_region_loading import load_valid_product_data
+
+
+def assert_valid_layout(sampler, catalog, laid_out, extents):
+    """Collision-free, every pivot within its slot and only yaw added to the catalog rotation."""
+    assert check_overlaps(laid_out, extents)["pairs"] == []
+    before = get_product_boxes(catalog, extents)
+    after = get_product_boxes(laid_out, extents)
+    rows = {product_id: row for row, product_id in enumerate(before["product_ids"])}
+    for row, product_id in enumerate(after["product_ids"]):
+        offset = after["pivots"][row] - before["pivots"][rows[product_id]]
+        assert np.all(np.abs(offset) <= sampler.jitter + 1e-9), (product_id, offset)
+        # The extra rotation only turns around the up axis
+        extra = after["axes"][row] @ before["axes"][rows[product_id]].T
+        assert abs(extra[UP_AXIS, UP_AXIS] - 1.0) < 1e-6, product_id
+        angle = np.degrees(np.arctan2(extra[PLANE_AXES[1], PLANE_AXES[0]], extra[PLANE_AXES[0], PLANE_AXES[0]]))
+        assert abs(angle) <= sampler.yaw_range + 1e-6, (product_id, angle)
+        # Boxes stay on their shelf
+        shelf_bounds = sampler.shelf_bounds[sampler.shelf_index[rows[product_id]]]
+        reach = np.abs(after["axes"][row]) @ after["half_extents"][row]
+        center = after["centers"][row]
+        assert np.all((center - reach)[PLANE_AXES] >= shelf_bounds[0][PLANE_AXES] - 1e-9)
+        assert np.all((center + reach)[PLANE_AXES] <= shelf_bounds[1][PLANE_AXES] + 1e-9)
+
+
+def test_layouts_are_collision_free():
+    """Large jitter and yaw on a tightly packed store still give collision-free layouts."""
+    print("Testing collision-free layouts...")
+    catalog = make_synthetic_catalog(load_valid_product_data(), 2000)
+    extents = product_extents(catalog)
+    sampler = LayoutSampler(catalog, extents, position_jitter=0.05, yaw_range=30.0, shelf_margin=0.02, seed=1)
+    assert len(sampler.first) < len(catalog) * 10, "Slots only reach their neighbours"
+    for episode in range(3):
+        layout = sampler.sample(episode)
+        assert layout["rejected"] > 0, "This much jitter must collide on the first draw"
+        assert len(layout["product_ids"]) == len(catalog) and layout["removed"] == []
+        assert_valid_layout(sampler, catalog, sampler.apply(catalog, layout), extents)
+    print(f"✅ 3 layouts of {len(catalog)} products without intersections "
+          f"({layout['rounds']} rounds, {layout['rejected']} rejected draws)")
+
+
+def test_unresolvable_products_keep_their_catalog_pose():
+    """With a single round the leftovers fall back to the catalog pose, and the layout stays valid."""
+    print("Testing the catalog-pose fallback...")
+    catalog = load_valid_product_data()
+    extents = product_extents(catalog)
+    sampler = LayoutSampler(catalog, extents, position_jitter=0.2, yaw_range=90.0, seed=4, max_rounds=1)
+    layout = sampler.sample()
+    assert layout["rounds"] == 1 and layout["reset"] > 0
+    laid_out = sampler.apply(catalog, layout)
+    assert_valid_layout(sampler, catalog, laid_out, extents)
+    unchanged = [product_id for product_id in catalog
+                 if laid_out[product_id]["translate"] == catalog[product_id]["translate"]]
+    assert len(unchanged) >= layout["reset"]
+    print(f"✅ {layout['reset']} products kept their catalog pose, no intersections")
+
+
+def test_episodes_replay_and_compact_catalogs_match():
+    """Episodes replay exactly, and a compact catalog gets the same layout as the dict."""
+    print("Testing episode replay and compact catalogs...")
+    catalog = load_valid_product_data()
+    extents = product_extents(catalog)
+    sampler = LayoutSampler(catalog, extents, seed=42)
+    first, again = sampler.sample(episode=5), LayoutSampler(catalog, extents, seed=42).sample(episode=5)
+    assert np.array_equal(first["translate"], again["translate"]) and np.array_equal(first["orient"], again["orient"])
+    assert not np.array_equal(first["translate"], sampler.sample(episode=6)["translate"])
+
+    compact = CompactCatalog.from_product_data(catalog)
+    compact_sampler = LayoutSampler(compact, extents, seed=42)
+    compact_layout = compact_sampler.sample(episode=5)
+    assert compact_layout["product_ids"] == first["product_ids"]
+    assert np.allclose(compact_layout["translate"], first["translate"])
+    laid_out = compact_sampler.apply(compact, compact_layout)
+    expected = sampler.apply(catalog, first)
+    for product_id, data in laid_out.items():
+        assert np.allclose(data["translate"], expected[product_id]["translate"])
+        assert np.allclose(data["orient"], expected[product_id]["orient"])
+    assert "rotate" not in expected["cracker_box_1"] and catalog["cracker_box_1"]["rotate"] == [-90, 90, 0]
+    print("✅ Same seed and episode give the same layout, dict and compact catalogs agree")
+
+
+def test_facing_counts():
+    """Every shelf category keeps between min_facings and all of its products."""
+    print("Testing facing counts...")
+    catalog = load_valid_product_data()
+    extents = product_extents(catalog)
+    sampler = LayoutSampler(catalog, extents, min_facings=2, seed=3)
+    groups = {}
+    for product_id, data in catalog.items():
+        groups.setdefault((data["shelf"], data["category"]), set()).add(product_id)
+
+    removed_counts = set()
+    for episode in range(10):
+        layout = sampler.sample(episode)
+        laid_out = sampler.apply(catalog, layout)
+        assert set(laid_out) == set(catalog) - set(layout["removed"])
+        for members in groups.values():
+            assert min(2, len(members)) <= len(members & set(laid_out)) <= len(members)
+        removed_counts.add(len(layout["removed"]))
+        compact = CompactCatalog.from_product_data(catalog)
+        compact_sampler = LayoutSampler(compact, extents, min_facings=2, seed=3)
+        assert set(compact_sampler.apply(compact, compact_sampler.sample(episode))) == set(laid_out)
+    assert len(removed_counts) > 1, "Facing counts must vary between episodes"
+    print(f"✅ Facing counts vary per episode ({sorted(removed_counts)} products removed)")
+
+
+def test_scene_compiler_layout_mode():
+    """randomize_catalog lays out every product when randomization_mode is 'layout'."""
+    print("Testing the scene compiler's layout mode...")
+    catalog = load_valid_product_data()
+    with tempfile.TemporaryDirectory() as directory:
+        # A prefilled extent cache keeps the remote assets closed
+        extents_path = Path(directory) / "extents.json"
+        extents_path.write_text(json.dumps({data["asset"]: BOX_EXTENT.tolist() for data in catalog.values()}))
+        options = dict(DEFAULT_OPTIONS, randomization_mode="layout", randomization_seed=9, overlap_check="report")
+        randomized_data, seed, randomized_ids = randomize_catalog(catalog, options, str(extents_path))
+    assert seed == 9 and randomized_ids == list(catalog)
+    assert check_overlaps(randomized_data, product_extents(catalog))["pairs"] == []
+    assert all("orient" in data for data in randomized_data.values())
+    moved = [product_id for product_id in catalog
+             if randomized_data[product_id]["translate"] != catalog[product_id]["translate"]]
+    assert len(moved) > len(catalog) / 2
+    print(f"✅ Compiled layout moved {len(moved)} of {len(catalog)} products")
+
+
+if __name__ == "__main__":
+    test_layouts_are_collision_free()
+    test_unresolvable_products_keep_their_catalog_pose()
+    test_episodes_replay_and_compact_catalogs_match()
+    test_facing_counts()
+    test_scene_compiler_layout_mode()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the placer module imports cheaply and loads the catalog lazily.
+
+Requires NumPy (pip install numpy) for the catalog; Isaac Sim is NOT required.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from catalog_loader import CatalogLoader, get_catalog_loader, DEFAULT_ASSETS_DIR
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def run_python(code):
+    """Run code in a fresh interpreter from the project root and return its stdout lines."""
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()
+
+
+def test_import_is_lazy():
+    """Importing the placer needs neither Kit nor pxr nor NumPy, and reads no catalog."""
+    print("Testing lazy module import...")
+    lines = run_python(
+        "import sys, dynamic_shop_placer as placer\n"
+        "print([m for m in ('omni', 'pxr', 'numpy', 'compact_catalog') if m in sys.modules])\n"
+        "print(placer.get_catalog_loader_for().is_loaded)\n"
+        "print(len(placer.PRODUCT_DATA))\n"
+        "print([m for m in ('omni', 'pxr') if m in sys.modules])\n"
+    )
+    assert lines[0] == "[]", f"Heavy modules imported eagerly: {lines[0]}"
+    assert lines[1] == "False"
+    assert lines[-2] == "37", "PRODUCT_DATA must load on first access"
+    assert lines[-1] == "[]", "Reading the catalog must not import Kit or pxr"
+    print("✅ Import loads nothing heavy; PRODUCT_DATA loads on first access")
+
+
+def test_catalog_loader_caches():
+    """Loaders are shared per path, read once and re-read on reload()."""
+    print("Testing cached catalog loader...")
+    loader = get_catalog_loader(DEFAULT_ASSETS_DIR / "product_data.json")
+    assert get_catalog_loader(str(DEFAULT_ASSETS_DIR / ".." / "assets" / "product_data.json")) is loader
+    catalog = loader.get()
+    assert loader.is_loaded and loader.get() is catalog
+    assert loader.reload() is not catalog
+    assert len(loader.get()) == len(catalog)
+
+    with tempfile.TemporaryDirectory() as directory:
+        broken = Path(directory) / "product_data.json"
+        broken.write_text("{ not json")
+        broken_loader = CatalogLoader(broken)
+        assert len(broken_loader.get()) == 0, "An unreadable catalog gives an empty one"
+        try:
+            broken_loader.read()
+            assert False, "read() must raise for an unreadable catalog"
+        except json.JSONDecodeError:
+            pass
+    print("✅ One shared loader per path, cached until reload()")
+
+
+if __name__ == "__main__":
+    test_import_is_lazy()
+    test_catalog_loader_caches()
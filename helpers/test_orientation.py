@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to verify orientation normalization (batch Euler -> quaternion, uniform op stack).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd, UsdGeom
+from bulk_authoring import author_products_to_layer
+from compact_catalog import CompactCatalog
+from orientation import euler_zyx_to_quaternions, normalize_orientations
+from point_instancer_placement import product_orientation
+from helpers.test_randomization import load_product_data
+from helpers.test_region_loading import load_valid_product_data
+from helpers.report_instancing import write_placeholder_assets
+
+
+def test_batch_conversion_matches_rotate_zyx():
+    """The vectorized conversion gives the same rotation as Gf for xformOp:rotateZYX."""
+    print("Testing batch Euler -> quaternion conversion...")
+    angles = np.random.default_rng(5).uniform(-180, 180, (500, 3))
+    quaternions = euler_zyx_to_quaternions(angles)
+    for angle, quaternion in zip(angles, quaternions):
+        expected = product_orientation({"rotate": angle.tolist()})
+        expected = np.array([expected.GetReal(), *expected.GetImaginary()])
+        # q and -q are the same rotation
+        assert abs(abs(np.dot(quaternion, expected)) - 1.0) < 1e-12
+    assert np.allclose(np.linalg.norm(quaternions, axis=1), 1.0)
+    print(f"✅ {len(angles)} rotations match Gf.Rotation")
+
+
+def test_normalize_catalog():
+    """Every product ends up with 'orient', for dicts and compact catalogs alike."""
+    print("Testing catalog normalization...")
+    product_data = load_product_data()
+    product_data["no_rotation"] = {key: value for key, value in product_data["tuna_fish_can_1"].items()
+                                   if key not in ("rotate", "orient")}
+    normalized = normalize_orientations(product_data)
+
+    for product_id, data in normalized.items():
+        if len(product_data[product_id].get("rotate", [0, 0, 0])) != 3:
+            assert data is product_data[product_id], "Malformed rotations are left for placement to report"
+            continue
+        assert "orient" in data and "rotate" not in data, product_id
+    assert normalized["no_rotation"]["orient"] == [1.0, 0.0, 0.0, 0.0]
+    assert any("rotate" in data for data in product_data.values()), "The input must not be modified"
+    assert normalize_orientations(product_data, "original") is product_data
+
+    compact = normalize_orientations(CompactCatalog.from_product_data(product_data))
+    for product_id, data in compact.items():
+        assert np.allclose(data["orient"], normalized[product_id]["orient"])
+    print(f"✅ {len(normalized)} products normalized, compact catalog agrees")
+
+
+def test_unified_layout_keeps_world_transforms():
+    """The translate/orient/scale stack places every product exactly where the mixed stack did."""
+    print("Testing unified op stack against the mixed one...")
+    with tempfile.TemporaryDirectory() as directory:
+        # Product prims get their Xform type from the payload, so the payloads must be loaded
+        product_data = write_placeholder_assets(load_valid_product_data(), directory)
+        stages = {}
+        for name, data in (("mixed", product_data), ("unified", normalize_orientations(product_data))):
+            stage = Usd.Stage.CreateInMemory()
+            UsdGeom.Xform.Define(stage, "/World/Shelf")
+            stages[name] = (stage, author_products_to_layer(stage.GetRootLayer(), data))
+
+        (mixed_stage, mixed_paths), (unified_stage, unified_paths) = stages["mixed"], stages["unified"]
+        assert mixed_paths == unified_paths
+        mixed_cache, unified_cache = UsdGeom.XformCache(), UsdGeom.XformCache()
+        op_orders = set()
+        for product_id, path in unified_paths.items():
+            unified_prim = unified_stage.GetPrimAtPath(path)
+            op_orders.add(tuple(unified_prim.GetAttribute("xformOpOrder").Get()))
+            expected = np.array(mixed_cache.GetLocalToWorldTransform(mixed_stage.GetPrimAtPath(path)))
+            actual = np.array(unified_cache.GetLocalToWorldTransform(unified_prim))
+            assert np.allclose(expected[3, :3], product_data[product_id]["translate"]), "Transform was not composed"
+            assert np.allclose(expected, actual, atol=1e-5), path
+        assert op_orders == {("xformOp:translate", "xformOp:orient", "xformOp:scale")}
+    print(f"✅ {len(unified_paths)} world transforms unchanged, one op stack for every product")
+
+
+if __name__ == "__main__":
+    test_batch_conversion_matches_rotate_zyx()
+    test_normalize_catalog()
+    test_unified_layout_keeps_world_transforms()
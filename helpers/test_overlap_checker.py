@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the pre-simulation overlap checker (OBB spatial hash, resolution, extent cache).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf
+from compact_catalog import CompactCatalog
+from overlap_checker import (SkuExtentCache, check_overlaps, find_candidate_pairs, get_product_boxes,
+                             quaternions_to_matrices, resolve_overlaps, separating_axis_depths)
+from helpers.benchmark_bulk_authoring import make_synthetic_catalog
+from helpers.report_instancing import write_placeholder_assets
+from helpers.test_region_loading import load_valid_product_data
+
+# Roughly product-sized boxes (stage units are meters)
+BOX_EXTENT = np.array([[-0.04, -0.04, -0.09], [0.04, 0.04, 0.09]])
+
+
+def product_extents(product_data):
+    return {data["asset"]: BOX_EXTENT for data in product_data.values()}
+
+
+def random_boxes(count, seed=0):
+    """Randomly placed and oriented boxes in a 3 m cube, many of them intersecting."""
+    rng = np.random.default_rng(seed)
+    quaternions = rng.normal(size=(count, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return {f"box_{i}": {"asset": "box.usd", "translate": rng.uniform(0, 3, 3).tolist(),
+                         "orient": quaternions[i].tolist(), "scale": [1.0, 1.0, 1.0]}
+            for i in range(count)}
+
+
+def test_rotation_matrices_match_gf():
+    """Quaternion -> matrix conversion agrees with Gf.Rotation."""
+    print("Testing quaternion to matrix conversion...")
+    quaternions = np.random.default_rng(1).normal(size=(100, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    for quaternion, matrix in zip(quaternions, quaternions_to_matrices(quaternions)):
+        expected = Gf.Matrix3d(Gf.Rotation(Gf.Quatd(quaternion[0], Gf.Vec3d(*quaternion[1:]))))
+        # Gf uses row vectors, the checker column vectors
+        assert np.allclose(np.array(expected).T, matrix)
+    print("✅ 100 rotation matrices match Gf.Rotation")
+
+
+def test_separating_axis_depths():
+    """Exact results for unit cubes, including a 45-degree turn that an AABB test gets wrong."""
+    print("Testing the separating-axis test...")
+    turn = quaternions_to_matrices([[np.cos(np.pi / 8), 0.0, 0.0, np.sin(np.pi / 8)]])[0]
+    half = np.full((2, 3), 0.5)
+    reach = 0.5 + np.sqrt(0.5)  # Cube face to the turned cube's corner
+
+    for distance, expected in ((0.9, reach - 0.9), (reach - 0.01, 0.01), (reach + 0.01, -0.01)):
+        centers = np.array([[0.0, 0.0, 0.0], [distance, 0.0, 0.0]])
+        depth, direction = separating_axis_depths(centers, np.stack([np.eye(3), turn]), half, [0], [1])
+        assert abs(depth[0] - expected) < 1e-9, (distance, depth)
+        assert np.allclose(direction[0], [1.0, 0.0, 0.0])
+
+    # Diagonal neighbours whose axis-aligned boxes overlap but whose turned boxes do not
+    centers = np.array([[0.0, 0.0, 0.0], [0.95, 0.95, 0.0]])
+    depth, _ = separating_axis_depths(centers, np.stack([turn, turn]), half, [0], [1])
+    assert depth[0] < 0, "Turned cubes touching only in their AABBs must be separated"
+    print("✅ Penetration depths and directions are exact")
+
+
+def test_spatial_hash_matches_brute_force():
+    """The spatial hash finds exactly the pairs an all-pairs test finds, for any cell size."""
+    print("Testing the spatial hash against an all-pairs test...")
+    boxes_data = random_boxes(2000)
+    extents = {"box.usd": np.array([[-0.05, -0.03, -0.1], [0.05, 0.03, 0.1]])}
+    boxes = get_product_boxes(boxes_data, extents)
+    first, second = np.triu_indices(len(boxes_data), 1)
+    depth, _ = separating_axis_depths(boxes["centers"], boxes["axes"], boxes["half_extents"], first, second)
+    expected = {(boxes["product_ids"][i], boxes["product_ids"][j])
+                for i, j in zip(first[depth > 0], second[depth > 0])}
+
+    for cell_size in (None, 0.5):
+        report = check_overlaps(boxes_data, extents, tolerance=0.0, cell_size=cell_size)
+        assert {(a, b) for a, b, _ in report["pairs"]} == expected
+        assert report["candidates"] < len(first) / 100, "The hash must prune almost every pair"
+    depths = [depth for _, _, depth in report["pairs"]]
+    assert depths == sorted(depths, reverse=True)
+
+    # Both indices of every candidate pair are ordered and unique
+    reach = np.einsum("nij,nj->ni", np.abs(boxes["axes"]), boxes["half_extents"])
+    first, second = find_candidate_pairs(boxes["centers"] - reach, boxes["centers"] + reach)
+    assert np.all(first < second) and len(set(zip(first.tolist(), second.tolist()))) == len(first)
+    print(f"✅ {len(expected)} intersecting pairs found from {report['candidates']} candidates "
+          f"(all-pairs: {len(depth)})")
+
+
+def test_resolve_catalog_overlaps():
+    """Reset undoes a colliding randomization, nudge pushes hand-placed products apart."""
+    print("Testing overlap resolution on the catalog...")
+    catalog = load_valid_product_data()
+    extents = product_extents(catalog)
+    assert check_overlaps(catalog, extents)["pairs"] == [], "The catalog itself must not intersect"
+
+    # A "randomized" can rotated and moved into its neighbour
+    randomized = dict(catalog)
+    randomized["tuna_fish_can_2"] = dict(catalog["tuna_fish_can_2"], rotate=[0.0, 90.0, 0.0],
+                                         translate=catalog["tuna_fish_can_1"]["translate"])
+    randomized["tuna_fish_can_2"].pop("orient")
+    report = check_overlaps(randomized, extents)
+    assert {pair[:2] for pair in report["pairs"]} == {("tuna_fish_can_1", "tuna_fish_can_2")}
+
+    fixed, report = resolve_overlaps(randomized, extents, mode="reset", reference_data=catalog,
+                                     movable={"tuna_fish_can_2"})
+    assert report["pairs"] == [] and report["moved"] == ["tuna_fish_can_2"]
+    assert fixed["tuna_fish_can_2"] == catalog["tuna_fish_can_2"]
+    assert randomized["tuna_fish_can_2"] != catalog["tuna_fish_can_2"], "The input must not be modified"
+
+    # Compact catalogs give the same pairs and are fixed the same way
+    compact_fixed, compact_report = resolve_overlaps(CompactCatalog.from_product_data(randomized), extents,
+                                                     mode="reset", reference_data=catalog,
+                                                     movable={"tuna_fish_can_2"})
+    assert compact_report["pairs"] == [] and np.allclose(compact_fixed["tuna_fish_can_2"]["translate"],
+                                                         catalog["tuna_fish_can_2"]["translate"])
+
+    # Hand-edited products overlapping in the catalog itself can only be nudged
+    edited = dict(catalog)
+    x, y, z = catalog["cracker_box_1"]["translate"]
+    edited["cracker_box_2"] = dict(catalog["cracker_box_2"], translate=[x, y + 0.03, z])
+    nudged, report = resolve_overlaps(edited, extents, mode="reset", reference_data=edited)
+    assert report["pairs"] == [] and report["moved"] == ["cracker_box_2"]
+    assert nudged["cracker_box_2"]["translate"][2] == z, "Nudges stay in the shelf plane"
+    print("✅ Randomized product reset, hand-placed product nudged apart")
+
+
+def test_sku_extent_cache():
+    """Extents are computed once per asset from its default prim and kept in the JSON file."""
+    print("Testing the per-SKU extent cache...")
+    with tempfile.TemporaryDirectory() as directory:
+        product_data = write_placeholder_assets(load_valid_product_data(), directory, meshes_per_asset=1)
+        cache_path = Path(directory) / "extents.json"
+        extents = SkuExtentCache(cache_path).get_extents(product_data)
+        assert len(extents) == len({data["asset"] for data in product_data.values()})
+        for extent in extents.values():
+            assert np.allclose(extent, [[0, 0, 0], [0.1, 0.1, 0]])  # The stand-in triangle
+        assert set(json.loads(cache_path.read_text())) == set(extents)
+
+        # A second cache reads the file instead of opening the assets
+        cached = SkuExtentCache(cache_path)
+        missing = dict(product_data, broken=dict(next(iter(product_data.values())), asset="missing.usd"))
+        cached_extents = cached.get_extents(missing)
+        assert set(cached_extents) == set(extents)
+        assert "broken" in check_overlaps(missing, cached_extents)["skipped"]
+    print(f"✅ {len(extents)} asset extents computed and cached")
+
+
+def test_hundred_thousand_products_under_a_second():
+    """A 100k-product compact catalog is checked in well under a second."""
+    print("Testing a 100,000-product store...")
+    catalog = CompactCatalog.from_product_data(make_synthetic_catalog(load_valid_product_data(), 100000))
+    extents = product_extents(load_valid_product_data())
+    start = time.perf_counter()
+    report = check_overlaps(catalog, extents)
+    seconds = time.perf_counter() - start
+    assert report["checked"] == 100000 and report["pairs"] == []
+    assert seconds < 1.0, f"Checking 100k products took {seconds:.2f}s"
+    print(f"✅ {report['checked']} products ({report['candidates']} candidate pairs) checked in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    test_rotation_matrices_match_gf()
+    test_separating_axis_depths()
+    test_spatial_hash_matches_brute_force()
+    test_resolve_catalog_overlaps()
+    test_sku_extent_cache()
+    test_hundred_thousand_products_under_a_second()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the frame-budgeted placement scheduler (chunks, progress, cancellation).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Sdf
+from bulk_authoring import (author_hierarchy_to_layer, author_product_spec, get_hierarchy_paths,
+                            get_product_path, remove_products_from_layer, SHELF_ROOT_PATH)
+from placement_scheduler import CancellationToken, FrameBudget, place_in_chunks
+from helpers.test_region_loading import load_valid_product_data
+
+
+def make_store(copies):
+    """Return a catalog with every product repeated `copies` times under unique IDs."""
+    return {f"{product_id}_{copy}": data for copy in range(copies)
+            for product_id, data in load_valid_product_data().items()}
+
+
+def test_chunks_follow_the_frame_budget():
+    """With 1 ms per product and a 4 ms budget, every frame places four products."""
+    print("Testing frame-budgeted chunks...")
+    clock = {"now": 0.0}
+    frames = []
+    progress = []
+
+    async def next_frame():
+        frames.append(clock["now"])
+
+    def place(product_id, data):
+        clock["now"] += 0.001
+        return product_id != "broken"
+
+    items = [(f"product_{i}", {}) for i in range(10)] + [("broken", {})]
+    budget = FrameBudget(0.004, next_frame=next_frame, clock=lambda: clock["now"])
+    result = asyncio.run(place_in_chunks(items, place, budget, progress=lambda done, total: progress.append(done)))
+
+    assert len(result["placed"]) == 10 and result["failed"] == ["broken"]
+    assert progress == [4, 8, 11], f"Unexpected chunk boundaries: {progress}"
+    assert result["frames"] == len(frames) == 2
+    assert abs(result["longest_chunk"] - 0.004) < 1e-9
+    print(f"✅ {len(result['placed'])} products placed in {len(progress)} chunks of at most 4 ms")
+
+
+def test_cancel_abandons_a_half_built_store():
+    """Cancelling stops between chunks, and the placed products and empty scopes can be removed."""
+    print("Testing cancellation and cleanup...")
+    store = make_store(3)
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    Sdf.CreatePrimInLayer(layer, SHELF_ROOT_PATH).specifier = Sdf.SpecifierDef
+    author_hierarchy_to_layer(layer, store)
+
+    token = CancellationToken()
+
+    def progress(done, total):
+        if done >= total // 2:
+            token.cancel("abandoned")
+
+    budget = FrameBudget(0.0005, cancel_token=token)
+    result = asyncio.run(place_in_chunks(store.items(), lambda product_id, data: author_product_spec(
+        layer, product_id, data), budget, chunk_context=Sdf.ChangeBlock, progress=progress))
+
+    assert result["cancelled"] and token.reason == "abandoned"
+    assert len(store) // 2 <= len(result["placed"]) < len(store), "Placement must stop at a chunk boundary"
+    placed_paths = [get_product_path(product_id, store[product_id]) for product_id in result["placed"]]
+    assert all(layer.GetPrimAtPath(path) for path in placed_paths)
+
+    removed_count = remove_products_from_layer(layer, placed_paths, get_hierarchy_paths(store))
+    assert removed_count == len(placed_paths)
+    assert not layer.GetPrimAtPath(SHELF_ROOT_PATH).nameChildren, "Empty hierarchy scopes must be removed"
+    print(f"✅ Cancelled after {len(result['placed'])} of {len(store)} products, store cleaned up")
+
+
+def test_event_loop_stays_responsive():
+    """Placing a thousand-item store never blocks the event loop much longer than the budget."""
+    print("Testing responsiveness while placing a thousand-item store...")
+    store = make_store(28)
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    Sdf.CreatePrimInLayer(layer, SHELF_ROOT_PATH).specifier = Sdf.SpecifierDef
+    author_hierarchy_to_layer(layer, store)
+
+    async def run():
+        gaps = []
+        done = asyncio.Event()
+
+        async def frame_ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.ensure_future(frame_ticker())
+        result = await place_in_chunks(store.items(), lambda product_id, data: author_product_spec(
+            layer, product_id, data), FrameBudget(0.004), chunk_context=Sdf.ChangeBlock)
+        done.set()
+        await ticker
+        return result, gaps
+
+    result, gaps = asyncio.run(run())
+    assert len(result["placed"]) == len(store) >= 1000
+    assert result["frames"] > 1 and len(gaps) >= result["frames"]
+    # A chunk stops after the product that crossed the budget, plus closing the change block
+    assert max(gaps) < 0.05, f"Event loop blocked for {max(gaps) * 1000:.1f} ms"
+    print(f"✅ {len(store)} products over {result['frames'] + 1} frames, "
+          f"longest chunk {result['longest_chunk'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_chunks_follow_the_frame_budget()
+    test_cancel_abandons_a_half_built_store()
+    test_event_loop_stays_responsive()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the planogram compiler (packing geometry, fill, overflow, output formats).
+
+Requires NumPy (pip install numpy), Isaac Sim is NOT required.
+Rules carry their own extent, so no assets are opened.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog, load_catalog
+from overlap_checker import find_candidate_pairs, get_product_boxes
+from planogram import compile_planogram, default_id_prefix, save_catalog
+
+# Local extent of a can-sized product (x, y, z half sizes 0.04, 0.03, 0.06)
+CAN_EXTENT = [[-0.04, -0.03, -0.06], [0.04, 0.03, 0.06]]
+# Box whose pivot sits at its bottom face
+BOX_EXTENT = [[-0.1, -0.05, 0.0], [0.1, 0.05, 0.3]]
+
+
+def make_planogram(**bay):
+    """One bay along +Y at the origin, depth going to -X, with a can and a box category."""
+    return {
+        "rules": {
+            "TunaCans": {"asset": "tuna.usd", "extent": CAN_EXTENT, "facings": 4, "depth_count": 2,
+                         "spacing": 0.01},
+            "CrackerBox": {"asset": "crackers.usd", "extent": BOX_EXTENT, "facings": 2, "rotate": [0, 0, 90],
+                           "scale": [1.0, 1.0, 1.0], "id_prefix": "cracker_box"},
+        },
+        "bays": [dict({"shelf": "Items_Lower", "origin": [0.0, 0.0, 1.0], "width": 1.0, "depth": 0.5,
+                       "categories": ["TunaCans", "CrackerBox"], "section_gap": 0.05}, **bay)],
+    }
+
+
+def get_box_bounds(catalog, sku_extents):
+    """World-space min and max corners of every product's box, keyed by product ID."""
+    boxes = get_product_boxes(catalog, sku_extents)
+    reach = np.einsum("nij,nj->ni", np.abs(boxes["axes"]), boxes["half_extents"])
+    return {product_id: (boxes["centers"][row] - reach[row], boxes["centers"][row] + reach[row])
+            for row, product_id in enumerate(boxes["product_ids"])}
+
+
+def planogram_extents(planogram):
+    """asset -> extent of every rule, for the overlap checker."""
+    return {rule["asset"]: rule["extent"] for rule in planogram["rules"].values()}
+
+
+def test_packing_geometry():
+    """Facings are packed with their spacing, rest on the surface and stay inside the bay."""
+    print("Testing packing geometry...")
+    planogram = make_planogram()
+    catalog, report = compile_planogram(planogram, output="compact")
+    assert report["products"] == 4 * 2 + 2 and report["dropped"] == 0
+    bounds = get_box_bounds(catalog, planogram_extents(planogram))
+    for product_id, (low, high) in bounds.items():
+        assert abs(low[2] - 1.0) < 1e-9, f"{product_id} does not rest on the shelf surface"
+        assert low[1] >= -1e-9 and high[1] <= 1.0 + 1e-9, f"{product_id} leaves the bay width"
+        assert high[0] <= 1e-9 and low[0] >= -0.5 - 1e-9, f"{product_id} leaves the bay depth"
+
+    # Front row of cans: 0.06 wide along Y, 0.01 apart, starting at the bay edge
+    front = sorted(low[1] for product_id, (low, high) in bounds.items()
+                   if product_id.startswith("tuna_cans") and abs(high[0]) < 1e-9)
+    assert np.allclose(front, [0.0, 0.07, 0.14, 0.21])
+    # Cracker boxes are turned 90 degrees, so 0.2 wide along Y, after the cans and the section gap
+    crackers = sorted(low[1] for product_id, (low, high) in bounds.items() if product_id.startswith("cracker_box"))
+    assert np.allclose(crackers, [0.27 + 0.05, 0.52])
+    assert catalog.to_product_data()["cracker_box_1"]["rotate"] == [0, 0, 90]
+
+    # Shrunk a little, since units behind each other touch
+    low, high = (np.array([corners[i] for corners in bounds.values()]) for i in (0, 1))
+    first, _ = find_candidate_pairs(low + 1e-6, high - 1e-6)
+    assert len(first) == 0, "Packed boxes must not overlap"
+    print(f"✅ {report['products']} products packed on the surface without overlaps")
+
+
+def test_fill_and_overflow():
+    """'fill' takes the width the fixed sections leave, and what does not fit is dropped."""
+    print("Testing fill sections and overflow...")
+    planogram = make_planogram()
+    planogram["rules"]["TunaCans"]["facings"] = "fill"
+    catalog, report = compile_planogram(planogram)
+    # 1.0 - (2 * 0.2 crackers) - 0.05 gap = 0.55 left, cans take 0.06 + 0.01 per facing -> 8 facings
+    assert sum(product_id.startswith("tuna_cans") for product_id in catalog) == 8 * 2
+    assert report["dropped"] == 0
+
+    planogram = make_planogram(width=0.3, depth=0.1)
+    catalog, report = compile_planogram(planogram)
+    # The cans fill 0.27 of the width with one unit in depth, no room for the crackers
+    assert len(catalog) == 4 and report["dropped"] == 4 + 2
+    assert all(product_id.startswith("tuna_cans") for product_id in catalog)
+
+    planogram = make_planogram(repeat=3, step=[0.0, 2.0, 0.0])
+    catalog, report = compile_planogram(planogram)
+    assert len(catalog) == 3 * 10 and report["bays"] == [{"shelf": "Items_Lower", "products": 30, "dropped": 0}]
+    assert sorted(int(product_id.split("_")[-1]) for product_id in catalog if product_id.startswith("tuna")) \
+        == list(range(1, 25))
+    assert np.allclose(np.array(catalog["tuna_cans_9"]["translate"]) - catalog["tuna_cans_1"]["translate"],
+                       [0.0, 2.0, 0.0])
+    print("✅ Fill sections, dropped units and repeats are counted correctly")
+
+
+def test_output_formats_round_trip():
+    """Dict and compact output agree and survive save_catalog and load_catalog."""
+    print("Testing output formats...")
+    planogram = make_planogram(repeat=2, step=[0.0, 1.5, 0.0])
+    catalog, _ = compile_planogram(planogram)
+    compact, _ = compile_planogram(planogram, output="compact")
+    assert isinstance(compact, CompactCatalog) and compact.to_product_data() == catalog
+    assert catalog["tuna_cans_1"]["category"] == "TunaCans" and catalog["tuna_cans_1"]["shelf"] == "Items_Lower"
+    assert default_id_prefix("TunaCans") == "tuna_cans"
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("store.json", "store.npz"):
+            target = save_catalog(compact, Path(directory) / name)
+            assert load_catalog(target).to_product_data() == catalog if name.endswith(".npz") \
+                else load_catalog(target) == catalog
+    print("✅ Dict, compact, JSON and .npz catalogs match")
+
+
+def test_missing_extents_and_rules():
+    """Rules need an extent and bays may only use known categories."""
+    print("Testing planogram errors...")
+    planogram = make_planogram()
+    del planogram["rules"]["TunaCans"]["extent"]
+    for broken in (planogram, make_planogram(categories=["Missing"]), make_planogram(depth_axis=[0, 1, 0])):
+        try:
+            compile_planogram(broken)
+        except ValueError as e:
+            print(f"   {e}")
+        else:
+            raise AssertionError("Broken planogram compiled")
+    catalog, _ = compile_planogram(planogram, {"tuna.usd": CAN_EXTENT})
+    assert len(catalog) == 10
+    print("✅ Missing extents, unknown categories and bad axes are reported")
+
+
+def test_large_store_compiles_quickly():
+    """A 50k-facing store compiles in a few seconds and packs without overlaps."""
+    print("Testing a 50k-facing store...")
+    rules = {f"Category{i}": {"asset": f"sku_{i}.usd", "extent": CAN_EXTENT, "facings": 5, "depth_count": 3,
+                              "spacing": 0.005, "orient": [0.5, -0.5, 0.5, -0.5]} for i in range(20)}
+    bays = [{"shelf": shelf, "origin": [aisle * 2.0, 0.0, 0.5 + level * 0.4], "width": 5.0, "depth": 0.4,
+             "categories": [f"Category{(aisle + level + k) % 20}" for k in range(8)], "section_gap": 0.02,
+             "repeat": 10, "step": [0.0, 5.5, 0.0]}
+            for aisle in range(35) for level, shelf in enumerate(["Items_Lower", "Items_Upper"])]
+    planogram = {"rules": rules, "bays": bays}
+    start = time.perf_counter()
+    catalog, report = compile_planogram(planogram, output="compact")
+    elapsed = time.perf_counter() - start
+    assert report["products"] >= 50000 and report["dropped"] == 0
+    assert len(set(catalog.product_ids.tolist())) == len(catalog)
+    assert elapsed < 5.0, f"Compiling took {elapsed:.2f}s"
+    boxes = get_product_boxes(catalog, planogram_extents(planogram))
+    reach = np.einsum("nij,nj->ni", np.abs(boxes["axes"]), boxes["half_extents"])
+    first, _ = find_candidate_pairs(boxes["centers"] - reach + 1e-6, boxes["centers"] + reach - 1e-6)
+    assert len(first) == 0
+    print(f"✅ {report['products']} products compiled in {elapsed:.2f}s, no overlaps")
+
+
+if __name__ == "__main__":
+    test_packing_geometry()
+    test_fill_and_overflow()
+    test_output_formats_round_trip()
+    test_missing_extents_and_rules()
+    test_large_store_compiles_quickly()
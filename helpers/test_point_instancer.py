@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script to verify PointInstancer placement and instance expansion.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Usd, UsdGeom, UsdPhysics, Gf
+from helpers.benchmark_bulk_authoring import load_product_data, create_base_stage, place_per_prim
+from point_instancer_placement import author_point_instancers_to_layer, expand_instance, find_instance
+
+
+def get_valid_product_data():
+    """Load the catalog without malformed entries (the per-prim path cannot place them either)."""
+    return {product_id: data for product_id, data in load_product_data().items()
+            if len(data.get("rotate", [0, 0, 0])) == 3}
+
+
+def get_instance_transforms(stage):
+    """Return {product_id: local transform matrix} for every PointInstancer instance."""
+    transforms = {}
+    for prim in stage.TraverseAll():
+        if not prim.IsA(UsdGeom.PointInstancer):
+            continue
+        instancer = UsdGeom.PointInstancer(prim)
+        matrices = instancer.ComputeInstanceTransformsAtTime(Usd.TimeCode.Default(), Usd.TimeCode.Default())
+        product_ids = prim.GetAttribute("dynamicShop:productIds").Get()
+        transforms.update(zip(product_ids, matrices))
+    return transforms
+
+
+def test_static_products_are_instanced():
+    """With physics off every product becomes an instance at its per-prim transform."""
+    print("Testing PointInstancer placement of static products...")
+    product_data = get_valid_product_data()
+
+    stage = create_base_stage()
+    product_paths, instancer_paths = author_point_instancers_to_layer(
+        stage.GetRootLayer(), product_data, enable_physics=False)
+    assert not product_paths, "No product should be a regular prim when physics is disabled"
+
+    skus = {data["asset"] for data in product_data.values()}
+    assert len(instancer_paths) == len(skus), f"Expected one instancer per SKU, got {len(instancer_paths)}"
+
+    reference_stage = create_base_stage()
+    place_per_prim(reference_stage, product_data)
+    instance_transforms = get_instance_transforms(stage)
+    assert len(instance_transforms) == len(product_data)
+
+    for product_id, matrix in instance_transforms.items():
+        path = f"/World/Shelf/{product_data[product_id]['shelf']}/{product_data[product_id]['category']}/{product_id}"
+        expected = UsdGeom.Xformable(reference_stage.GetPrimAtPath(path)).GetLocalTransformation()
+        # Orientations are stored as half-precision quaternions
+        assert Gf.IsClose(matrix, expected, 1e-2), f"Transform mismatch for {product_id}"
+
+    print(f"✅ {len(instance_transforms)} products in {len(instancer_paths)} PointInstancers")
+
+
+def test_physics_products_stay_prims():
+    """Physics products are authored as regular rigid body prims."""
+    print("Testing physics products in PointInstancer mode...")
+    product_data = get_valid_product_data()
+    stage = create_base_stage()
+    product_paths, instancer_paths = author_point_instancers_to_layer(
+        stage.GetRootLayer(), product_data, enable_physics=True)
+
+    physics_ids = [pid for pid, data in product_data.items() if data.get("physics_enabled", False)]
+    assert sorted(product_paths) == sorted(physics_ids)
+    for path in product_paths.values():
+        assert stage.GetPrimAtPath(path).HasAPI(UsdPhysics.RigidBodyAPI)
+    print(f"✅ {len(product_paths)} physics products, {len(instancer_paths)} instancers")
+
+
+def test_expand_instance():
+    """Expanding an instance removes it from the instancer and creates a rigid body prim."""
+    print("Testing instance expansion...")
+    product_data = get_valid_product_data()
+    stage = create_base_stage()
+    author_point_instancers_to_layer(stage.GetRootLayer(), product_data, enable_physics=False)
+
+    product_id = "tuna_fish_can_2"
+    instance_matrix = get_instance_transforms(stage)[product_id]
+    instancer, _ = find_instance(stage, product_id)
+    instance_count = len(instancer.GetPositionsAttr().Get())
+
+    product_path = expand_instance(stage, product_id, velocity=[0, 0, 1])
+    assert product_path is not None
+
+    assert len(instancer.GetPositionsAttr().Get()) == instance_count - 1
+    assert len(instancer.GetProtoIndicesAttr().Get()) == instance_count - 1
+    assert find_instance(stage, product_id) == (None, -1)
+
+    prim = stage.GetPrimAtPath(product_path)
+    assert prim.HasAPI(UsdPhysics.RigidBodyAPI)
+    assert UsdPhysics.RigidBodyAPI(prim).GetVelocityAttr().Get() == Gf.Vec3f(0, 0, 1)
+    assert Gf.IsClose(UsdGeom.Xformable(prim).GetLocalTransformation(), instance_matrix, 1e-5)
+    print(f"✅ Expanded {product_id} into {product_path}")
+
+
+if __name__ == "__main__":
+    test_static_products_are_instanced()
+    test_physics_products_stay_prims()
+    test_expand_instance()
@@ -59,17 +59,12 @@ def test_product_data():
     elif 'orient' in sample_data:
         print(f"  Orientation: {sample_data['orient']}")
     
-    # Verify all required fields are present for all products
-    required_fields = ['asset', 'translate', 'scale', 'physics_enabled']
-    missing_fields = []
+    # Verify all products in one streaming pass (catalog_validator.py)
+    from catalog_validator import format_problem, validate_catalog
+    report = validate_catalog(BASE_PATH / "assets" / "product_data.json")
     
-    for product_id, product_data in data.items():
-        for field in required_fields:
-            if field not in product_data:
-                missing_fields.append(f"{product_id}.{field}")
-    
-    if missing_fields:
-        print(f"❌ Missing required fields: {missing_fields}")
+    if report["error_count"]:
+        print(f"❌ Invalid products: {[format_problem(problem) for problem in report['errors']]}")
         return False
     else:
         print("✅ All products have required fields")
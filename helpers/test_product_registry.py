@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the indexed product registry (lookups, cached bounds, incremental invalidation).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Products point at small local stand-in assets, so no network access is needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf, Usd, UsdGeom
+from bulk_authoring import author_products_to_layer, collect_shelf_categories, get_hierarchy_paths
+from incremental_placement import diff_catalogs
+from product_registry import ProductRegistry
+from helpers.benchmark_bulk_authoring import make_synthetic_catalog
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+from helpers.report_instancing import write_placeholder_assets
+from helpers.test_region_loading import load_valid_product_data
+
+
+def place_on_shop(product_data):
+    """Open the empty shop with payloads loaded and author the catalog into its root layer."""
+    stage = Usd.Stage.Open(EMPTY_SHOP_PATH)
+    author_products_to_layer(stage.GetRootLayer(), product_data)
+    return stage
+
+
+def world_bounds(stage, path):
+    """Reference bounds of one product, computed on its own."""
+    bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_, UsdGeom.Tokens.render])
+    bound_range = bbox_cache.ComputeWorldBound(stage.GetPrimAtPath(path)).ComputeAlignedRange()
+    return np.array([bound_range.GetMin(), bound_range.GetMax()])
+
+
+def test_indexes_match_a_full_scan():
+    """Every index lookup returns what scanning the catalog would."""
+    print("Testing registry indexes...")
+    product_data = load_valid_product_data()
+    registry = ProductRegistry(product_data)
+
+    for product_id, data in product_data.items():
+        shelf, category = data["shelf"], data["category"]
+        expected = sorted(pid for pid, other in product_data.items()
+                          if other["shelf"] == shelf and other["category"] == category)
+        assert registry.find(shelf=shelf, category=category) == expected
+        assert product_id in registry.find(asset=data["asset"])
+        path = registry.get_path(product_id)
+        assert registry.get_product_at(path.AppendPath("Root/Mesh_0")) == product_id
+    assert registry.get_shelf_categories() == collect_shelf_categories(product_data)
+    assert sorted(registry.get_hierarchy_paths()) == sorted(get_hierarchy_paths(product_data))
+    assert registry.get_product_at("/World/Shelf/Items_Lower") is None
+    assert registry.find(shelf="Items_Missing") == []
+
+    # Removing the last product of a category drops it from the hierarchy
+    mugs = registry.find(category="TopMugs")
+    for product_id in mugs:
+        registry.remove_product(product_id)
+    assert "TopMugs" not in registry.get_shelf_categories().get("Items_Top", set())
+    assert len(registry) == len(product_data) - len(mugs)
+    print(f"✅ {len(product_data)} products indexed by shelf, category, asset and prim path")
+
+
+def test_bounds_refresh_incrementally():
+    """Bounds are computed in one pass, and a moved product is the only one recomputed."""
+    print("Testing cached bounds and incremental invalidation...")
+    with tempfile.TemporaryDirectory() as asset_dir:
+        product_data = write_placeholder_assets(load_valid_product_data(), asset_dir)
+        stage = place_on_shop(product_data)
+        registry = ProductRegistry(product_data)
+        registry.bind_stage(stage)
+
+        assert registry.refresh_bounds() == len(product_data)
+        for product_id in product_data:
+            expected = world_bounds(stage, registry.get_path(product_id))
+            assert np.allclose(registry.bounds[product_id], expected)
+        assert registry.refresh_bounds() == 0, "Unchanged products must not be recomputed"
+
+        # Move one product on the stage: the notice listener marks only that product stale
+        product_id = "mustard_bottle_1"
+        prim = stage.GetPrimAtPath(registry.get_path(product_id))
+        translate = prim.GetAttribute("xformOp:translate")
+        translate.Set(translate.Get() + Gf.Vec3d(0, 0, 50))
+        assert registry.stale == {product_id}
+        moved = registry.get_bounds(product_id)
+        assert np.allclose([moved.GetMin(), moved.GetMax()], world_bounds(stage, registry.get_path(product_id)))
+        assert registry.refresh_bounds() == 0
+
+        # The moved product is now the nearest one to its new location
+        center = moved.GetMidpoint()
+        nearest = registry.query(center, shelf=product_data[product_id]["shelf"], limit=3)
+        assert nearest[0] == (product_id, 0.0)
+
+        # Unloading the payload leaves the product's pivot
+        stage.Unload(registry.get_path(product_id))
+        pivot = registry.get_bounds(product_id)
+        to_world = UsdGeom.Xformable(prim).GetLocalTransformation() * \
+            UsdGeom.XformCache().GetLocalToWorldTransform(prim.GetParent())
+        assert pivot.GetMin() == pivot.GetMax() == to_world.ExtractTranslation()
+
+        # Editing a shelf scope marks everything on that shelf stale
+        shelf = product_data[product_id]["shelf"]
+        UsdGeom.Xformable(stage.GetPrimAtPath(f"/World/Shelf/{shelf}")).AddTranslateOp().Set(Gf.Vec3d(1, 0, 0))
+        assert registry.stale == set(registry.find(shelf=shelf))
+        registry.unbind_stage()
+    print(f"✅ {len(product_data)} bounds computed once; one move, one unload and one shelf edit refreshed incrementally")
+
+
+def test_queries_match_brute_force():
+    """Nearest and box queries on a tiled store agree with a brute-force scan."""
+    print("Testing spatial queries against a brute-force scan...")
+    with tempfile.TemporaryDirectory() as asset_dir:
+        product_data = write_placeholder_assets(make_synthetic_catalog(load_valid_product_data(), 1000), asset_dir)
+        stage = place_on_shop(product_data)
+        registry = ProductRegistry(product_data)
+        registry.bind_stage(stage, watch=False)
+        registry.refresh_bounds()
+
+        bounds = {product_id: world_bounds(stage, registry.get_path(product_id)) for product_id in product_data}
+        rng = np.random.default_rng(3)
+        all_bounds = np.array(list(bounds.values()))
+        for _ in range(20):
+            point = rng.uniform(all_bounds[:, 0].min(axis=0), all_bounds[:, 1].max(axis=0))
+            shelf = rng.choice(["Items_Lower", "Items_Upper", "Items_Top"])
+            expected = sorted(
+                (float(np.linalg.norm(np.maximum(np.maximum(box[0] - point, point - box[1]), 0.0))), product_id)
+                for product_id, box in bounds.items() if product_data[product_id]["shelf"] == shelf)
+            expected = [(product_id, distance) for distance, product_id in expected if distance <= 2.0]
+            result = registry.query(point, radius=2.0, shelf=shelf)
+            assert [product_id for product_id, _ in result] == [product_id for product_id, _ in expected]
+
+            box = (point - 1.0, point + 1.0)
+            expected_ids = sorted(product_id for product_id, (lower, upper) in bounds.items()
+                                  if np.all(lower <= box[1]) and np.all(upper >= box[0]))
+            assert registry.find_in_box(box) == expected_ids
+
+        # Catalog diffs update the indexes; moved products only go stale
+        edited = {product_id: dict(data) for product_id, data in product_data.items()}
+        first_id, second_id = list(edited)[:2]
+        edited[first_id]["translate"] = [value + 1.0 for value in edited[first_id]["translate"]]
+        del edited[second_id]
+        registry.apply_diff(diff_catalogs(product_data, edited), edited)
+        assert registry.stale == {first_id} and second_id not in registry
+        assert second_id not in registry.find(category=product_data[second_id]["category"])
+    print(f"✅ Queries on {len(product_data)} products match the brute-force scan")
+
+
+if __name__ == "__main__":
+    test_indexes_match_a_full_scan()
+    test_bounds_refresh_incrementally()
+    test_queries_match_brute_force()
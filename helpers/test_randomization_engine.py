@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the vectorized, seeded randomization engine.
+
+Requires NumPy only (no USD, no Isaac Sim).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from randomization_engine import RandomizationEngine, random_unit_quaternions
+from helpers.test_randomization import load_product_data
+
+
+def test_seeded_draws_are_reproducible():
+    """Same seed, same draws; episodes replay independently of the draws before them."""
+    print("Testing reproducibility...")
+    product_data = load_product_data()
+    first = RandomizationEngine(product_data, seed=1234)
+    second = RandomizationEngine(product_data, seed=1234)
+    for _ in range(3):
+        a, b = first.draw(num_products=5), second.draw(num_products=5)
+        assert a["product_ids"] == b["product_ids"]
+        assert np.array_equal(a["rotate"], b["rotate"]) and np.array_equal(a["orient"], b["orient"])
+
+    # Replaying episode 41 alone reproduces it exactly
+    episodes = [first.draw(num_products=5, position_jitter=0.01, episode=e) for e in range(42)]
+    replay = RandomizationEngine(product_data, seed=1234).draw(num_products=5, position_jitter=0.01, episode=41)
+    assert replay["product_ids"] == episodes[41]["product_ids"]
+    assert np.array_equal(replay["translate"], episodes[41]["translate"])
+
+    # Unseeded engines record the seed they picked
+    unseeded = RandomizationEngine(product_data)
+    replayed = RandomizationEngine(product_data, seed=unseeded.seed)
+    assert np.array_equal(unseeded.draw()["rotate"], replayed.draw()["rotate"])
+    print("✅ Seeded draws and episodes are reproducible")
+
+
+def test_draw_values():
+    """Subsets are unique, quaternions are unit length and jitter stays in bounds."""
+    print("Testing draw values...")
+    product_data = load_product_data()
+    engine = RandomizationEngine(product_data, seed=7)
+
+    draw = engine.draw(position_jitter=[0.01, 0.02, 0.0], scale_jitter=0.1, rotation="auto")
+    assert sorted(draw["product_ids"]) == sorted(product_data)
+    assert np.all(np.abs(draw["rotate"]) <= 180.0)
+    assert np.allclose(np.linalg.norm(draw["orient"], axis=1), 1.0)
+    offsets = np.abs(draw["translate"] - engine.translate[draw["indices"]])
+    assert np.all(offsets <= [0.01, 0.02, 0.0])
+    ratios = draw["scale"] / engine.scale[draw["indices"]]
+    assert np.all((ratios >= 0.9) & (ratios <= 1.1))
+    assert np.allclose(ratios, ratios[:, :1]), "Scale jitter must keep proportions"
+
+    # Uniform quaternions: each component averages to zero
+    quats = random_unit_quaternions(np.random.default_rng(0), 100000)
+    assert np.all(np.abs(quats.mean(axis=0)) < 0.01)
+    print("✅ Draws are within their ranges")
+
+
+def test_apply_does_not_modify_input():
+    """apply() copies the randomized entries and keeps rotate/orient exclusive."""
+    print("Testing apply...")
+    product_data = load_product_data()
+    original = {pid: dict(data) for pid, data in product_data.items()}
+    engine = RandomizationEngine(product_data, seed=3)
+
+    for rotation in ("euler", "quaternion"):
+        draw = engine.draw(num_products=10, rotation=rotation)
+        randomized = engine.apply(product_data, draw)
+        assert product_data == original
+        for product_id in draw["product_ids"]:
+            data = randomized[product_id]
+            if rotation == "euler":
+                assert len(data["rotate"]) == 3 and "orient" not in data
+            else:
+                assert len(data["orient"]) == 4 and "rotate" not in data
+        untouched = set(product_data) - set(draw["product_ids"])
+        assert all(randomized[pid] is product_data[pid] for pid in untouched)
+    print("✅ apply() leaves the catalog untouched")
+
+
+if __name__ == "__main__":
+    test_seeded_draws_are_reproducible()
+    test_draw_values()
+    test_apply_does_not_modify_input()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify region-scoped payload loading (streaming mode).
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+Products point at small local stand-in assets, so no network access is needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf, Usd
+from bulk_authoring import author_products_to_layer
+from point_instancer_placement import author_point_instancers_to_layer
+from region_loading import (collect_payload_positions, select_payload_paths, set_payloads_loaded,
+                            get_loaded_payload_paths)
+from helpers.benchmark_bulk_authoring import load_product_data
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+from helpers.report_instancing import write_placeholder_assets
+
+
+def load_valid_product_data():
+    """Real catalog without entries the authoring path rejects (malformed rotations)."""
+    return {pid: data for pid, data in load_product_data().items() if len(data.get("rotate", [0, 0, 0])) == 3}
+
+
+def open_streaming_stage():
+    """Open the empty shop like STREAM_PAYLOADS does: nothing loaded."""
+    return Usd.Stage.Open(EMPTY_SHOP_PATH, load=Usd.Stage.LoadNone)
+
+
+def count_composed_prims(stage):
+    return sum(1 for _ in stage.Traverse())
+
+
+def test_load_shelf_and_region():
+    """Only the selected shelf or box is loaded, and unloading restores the empty load set."""
+    print("Testing shelf and region payload loading...")
+    with tempfile.TemporaryDirectory() as asset_dir:
+        product_data = write_placeholder_assets(load_valid_product_data(), asset_dir)
+        stage = open_streaming_stage()
+        author_products_to_layer(stage.GetRootLayer(), product_data)
+        assert get_loaded_payload_paths(stage) == [], "Products must not load in streaming mode"
+        empty_prims = count_composed_prims(stage)
+
+        payload_positions = collect_payload_positions(stage)
+        assert len(payload_positions) == len(product_data)
+
+        lower_paths = select_payload_paths(payload_positions, shelf_level="Items_Lower")
+        lower_ids = {pid for pid, data in product_data.items() if data["shelf"] == "Items_Lower"}
+        assert {path.name for path in lower_paths} == lower_ids
+        assert set_payloads_loaded(stage, lower_paths, True) == len(lower_ids)
+        assert set(get_loaded_payload_paths(stage)) == set(lower_paths)
+        lower_prims = count_composed_prims(stage)
+
+        # A box around the world-space pivots of the lower shelf selects the same products
+        lower_positions = [payload_positions[path][0] for path in lower_paths]
+        bbox = Gf.Range3d()
+        for position in lower_positions:
+            bbox.UnionWith(position)
+        assert set(select_payload_paths(payload_positions, bbox=bbox)) == set(lower_paths)
+
+        # Loading the same region again changes nothing
+        assert set_payloads_loaded(stage, lower_paths, True) == 0
+
+        set_payloads_loaded(stage, list(payload_positions), True)
+        all_prims = count_composed_prims(stage)
+        loaded_positions = collect_payload_positions(stage)
+        for path, positions in payload_positions.items():
+            assert Gf.IsClose(loaded_positions[path][0], positions[0], 1e-9), f"{path} moved when loaded"
+        set_payloads_loaded(stage, list(payload_positions), False)
+        assert get_loaded_payload_paths(stage) == []
+        assert stage.GetLoadRules() == Usd.StageLoadRules.LoadNone()
+
+    print(f"✅ Composed prims: nothing loaded {empty_prims}, lower shelf {lower_prims}, everything {all_prims}")
+
+
+def test_point_instancer_prototypes():
+    """A PointInstancer prototype is loaded when any of its instances is in the region."""
+    print("Testing PointInstancer prototype loading...")
+    with tempfile.TemporaryDirectory() as asset_dir:
+        product_data = write_placeholder_assets(load_valid_product_data(), asset_dir)
+        stage = open_streaming_stage()
+        _, instancer_paths = author_point_instancers_to_layer(stage.GetRootLayer(), product_data,
+                                                              enable_physics=False)
+        payload_positions = collect_payload_positions(stage)
+        assert len(payload_positions) == len(instancer_paths)
+
+        # A tiny box around a single instance loads exactly its prototype
+        instancer_path, product_ids = next(iter(instancer_paths.items()))
+        prototype_path = next(path for path in payload_positions if str(path).startswith(instancer_path + "/"))
+        position = payload_positions[prototype_path][-1]
+        bbox = Gf.Range3d(position - Gf.Vec3d(0.001), position + Gf.Vec3d(0.001))
+        assert select_payload_paths(payload_positions, bbox=bbox) == [prototype_path]
+        set_payloads_loaded(stage, [prototype_path], True)
+        assert stage.GetPrimAtPath(prototype_path).IsLoaded()
+        assert len(get_loaded_payload_paths(stage)) == 1
+    print(f"✅ Prototype of {instancer_path} loaded from one of its {len(product_ids)} instances")
+
+
+if __name__ == "__main__":
+    test_load_shelf_and_region()
+    test_point_instancer_prototypes()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the headless scene compiler (usd-core, no Isaac Sim).
+
+Requires usd-core and NumPy (pip install usd-core numpy).
+Products point at small local stand-in assets, so no network access is needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf, Sdf, Usd
+from scene_compiler import compile_scene, randomize_catalog, read_compiled_metadata, DEFAULT_OPTIONS
+from stage_build_cache import compute_build_key
+from bulk_authoring import get_product_path
+from helpers.test_region_loading import load_valid_product_data
+from helpers.report_instancing import write_placeholder_assets
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+
+
+def test_compiled_scene_matches_placement():
+    """The compiled file opens with the shop, every product and the placer's randomization."""
+    print("Testing compiled scene contents...")
+    product_data = load_valid_product_data()
+    options = {"randomization_seed": 7, "position_jitter": 0.01}
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = Path(directory) / "build" / "shop.usdc"
+        summary = compile_scene(EMPTY_SHOP_PATH, product_data, output_path, options)
+        assert summary["products"] == len(product_data) and summary["seed"] == 7
+
+        stage = Usd.Stage.Open(str(output_path), load=Usd.Stage.LoadNone)
+        assert stage.GetDefaultPrim().GetPath() == Sdf.Path("/World"), "Shop metadata must be carried over"
+        assert stage.GetPrimAtPath("/World/Shelf").IsValid()
+        assert stage.GetRootLayer().subLayerPaths[0].startswith("./"), "The shop is sublayered relatively"
+
+        randomized_data, _, randomized_ids = randomize_catalog(product_data, dict(DEFAULT_OPTIONS, **options))
+        assert randomized_ids == summary["randomized_products"]
+        for product_id, data in randomized_data.items():
+            prim = stage.GetPrimAtPath(get_product_path(product_id, data))
+            assert Gf.IsClose(prim.GetAttribute("xformOp:translate").Get(), Gf.Vec3d(*data["translate"]), 1e-9)
+            assert ("PhysicsRigidBodyAPI" in prim.GetAppliedSchemas()) == data["physics_enabled"]
+
+        # The placer computes the same build key for the same catalog and settings
+        metadata = read_compiled_metadata(stage.GetRootLayer())
+        placer_options = dict(DEFAULT_OPTIONS, randomization_seed=7, position_jitter=0.01)
+        assert metadata["buildKey"] == compute_build_key(EMPTY_SHOP_PATH, product_data, placer_options)
+        assert list(metadata["randomizedProducts"]) == randomized_ids
+    print(f"✅ {summary['products']} products compiled in {summary['seconds']:.2f}s")
+
+
+def test_compiler_is_reproducible():
+    """The same seed writes the same layer; flattening inlines the shop."""
+    print("Testing reproducible and flattened output...")
+    product_data = load_valid_product_data()
+    with tempfile.TemporaryDirectory() as directory:
+        first, second = Path(directory) / "a.usda", Path(directory) / "b.usda"
+        for path in (first, second):
+            compile_scene(EMPTY_SHOP_PATH, product_data, path, {"randomization_seed": 3})
+        assert first.read_text() == second.read_text()
+
+        flat_path = Path(directory) / "flat.usdc"
+        summary = compile_scene(EMPTY_SHOP_PATH, product_data, flat_path,
+                                {"randomization_seed": 3, "placement_mode": "point_instancer",
+                                 "enable_physics": False}, flatten=True)
+        layer = Sdf.Layer.FindOrOpen(str(flat_path))
+        assert not layer.subLayerPaths and layer.GetPrimAtPath("/World/Shelf")
+        assert read_compiled_metadata(layer)["productCount"] == len(product_data)
+        assert summary["instanced_products"] == len(product_data), "Static products are all instanced"
+    print("✅ Same seed, same file; flattened output is self-contained")
+
+
+def test_mesh_collision_with_local_assets():
+    """With readable assets the compiler loads payloads and adds mesh collision."""
+    print("Testing mesh collision on local assets...")
+    with tempfile.TemporaryDirectory() as directory:
+        product_data = write_placeholder_assets(load_valid_product_data(), directory)
+        summary = compile_scene(EMPTY_SHOP_PATH, product_data, Path(directory) / "shop.usdc",
+                                {"randomization_seed": 1}, mesh_collision=True)
+        physics_count = sum(1 for data in product_data.values() if data["physics_enabled"])
+        assert summary["collision_meshes"] == physics_count * 4
+    print(f"✅ {summary['collision_meshes']} meshes received convex hull collision")
+
+
+if __name__ == "__main__":
+    test_compiled_scene_matches_placement()
+    test_compiler_is_reproducible()
+    test_mesh_collision_with_local_assets()
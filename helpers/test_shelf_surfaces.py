@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shelf surface index (extraction, cache, support queries, snapping).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+Surfaces come from the empty shop in assets/; products use a fixed product-sized extent.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from compact_catalog import CompactCatalog
+from overlap_checker import get_product_boxes
+from scene_compiler import randomize_catalog, DEFAULT_OPTIONS
+from shelf_surfaces import (DEFAULT_SURFACES_FILE, ShelfSurfaces, build_surfaces, extract_shelf_surfaces,
+                            get_support_triangles, hash_file, load_shelf_surfaces, merge_snap_reports,
+                            snap_to_surfaces)
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+from helpers.test_overlap_checker import BOX_EXTENT, product_extents
+from helpers.test_region_loading import load_valid_product_data
+
+# Top plates of the three SM_RackShelf levels in the catalog frame
+PLATE_HEIGHTS = [0.859, 1.919, 2.982]
+# Small cube, so a random rotation barely changes how far it reaches down
+CUBE_EXTENT = np.array([[-0.02, -0.02, -0.02], [0.02, 0.02, 0.02]])
+
+
+def make_square(low, high, z):
+    """Two upward triangles covering [low, high]^2 at height z."""
+    corners = np.array([[low, low, z], [high, low, z], [high, high, z], [low, high, z]])
+    return corners[[[0, 1, 2], [0, 2, 3]]]
+
+
+def get_box_bottoms(product_data, extent=BOX_EXTENT):
+    """Lowest point of every product's box, keyed by product ID."""
+    boxes = get_product_boxes(product_data, {data["asset"]: extent for data in product_data.values()})
+    reach = np.einsum("nij,nj->ni", np.abs(boxes["axes"]), boxes["half_extents"])
+    return dict(zip(boxes["product_ids"], (boxes["centers"][:, 2] - reach[:, 2]).tolist()))
+
+
+def test_extracts_shelf_levels():
+    """The three rack shelves become three levels at their top plates, ignoring clips and knobs."""
+    print("Testing shelf surface extraction...")
+    start = time.perf_counter()
+    surfaces = extract_shelf_surfaces(EMPTY_SHOP_PATH)
+    elapsed = time.perf_counter() - start
+    assert surfaces.names == ["SM_RackShelf_156", "SM_RackShelf_157", "SM_RackShelf_158"]
+    assert np.allclose(surfaces.get_level_heights(), PLATE_HEIGHTS, atol=0.001)
+    for level, plate in zip(surfaces.heights, PLATE_HEIGHTS):
+        # Knobs stick out above the plate; they are too small to be support
+        assert abs(np.nanmax(level) - plate) < 0.001
+    assert surfaces.source_hash == hash_file(EMPTY_SHOP_PATH)
+
+    cached = ShelfSurfaces.load(Path(EMPTY_SHOP_PATH).with_name(DEFAULT_SURFACES_FILE))
+    assert cached.source_hash == surfaces.source_hash, "assets/shelf_surfaces.npz is stale, rerun shelf_surfaces.py"
+    assert np.array_equal(cached.heights, surfaces.heights, equal_nan=True)
+    print(f"✅ {len(surfaces)} levels extracted in {elapsed:.2f}s, the committed cache is current")
+
+
+def test_catalog_products_stand_on_their_shelf():
+    """Every catalog product is above exactly the level of its catalog shelf."""
+    print("Testing support queries for the catalog...")
+    surfaces = load_shelf_surfaces(EMPTY_SHOP_PATH)
+    product_data = load_valid_product_data()
+    points = [data["translate"] for data in product_data.values()]
+    heights, levels = surfaces.find_support(points)
+    assert np.all(levels >= 0)
+    assert np.all(np.array(points)[:, 2] - heights < 0.2)
+    shelves = {}
+    for data, level in zip(product_data.values(), levels.tolist()):
+        shelves.setdefault(data["shelf"], set()).add(surfaces.names[level])
+    assert shelves == {"Items_Lower": {"SM_RackShelf_156"}, "Items_Upper": {"SM_RackShelf_157"},
+                       "Items_Top": {"SM_RackShelf_158"}}
+
+    # Off the shelf and below the lowest level there is no support
+    heights, levels = surfaces.find_support([[-20.0, 45.0, 1.0], [-25.3, 45.0, 0.5]])
+    assert levels.tolist() == [-1, -1] and np.all(np.isnan(heights))
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(0)
+    queries = np.column_stack([rng.uniform(-26.0, -24.5, 1000000), rng.uniform(43.5, 48.5, 1000000),
+                               rng.uniform(0.0, 3.5, 1000000)])
+    _, levels = surfaces.find_support(queries)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 2.0, f"1M queries took {elapsed:.2f}s"
+    print(f"✅ Products map to their shelf levels, 1M queries in {elapsed:.2f}s")
+
+
+def test_support_picks_highest_surface_below():
+    """Synthetic stacked planes: the highest surface at or below the point wins, small planes are ignored."""
+    print("Testing support on stacked planes...")
+    knob = make_square(0.45, 0.5, 1.2)
+    lower = get_support_triangles(np.concatenate([make_square(0.0, 1.0, 1.0), knob]))
+    assert len(lower) == 2, "The knob's plane is below MIN_SURFACE_AREA"
+    surfaces = build_surfaces({"upper": make_square(0.0, 0.5, 2.0), "lower": lower}, cell_size=0.05)
+    assert surfaces.names == ["lower", "upper"]
+    heights, levels = surfaces.find_support([[0.25, 0.25, 2.5], [0.25, 0.25, 1.5], [0.75, 0.75, 2.5],
+                                             [0.25, 0.25, 0.5], [0.25, 0.25, 1.98]], tolerance=0.0)
+    assert levels.tolist() == [1, 0, 0, -1, 0] and np.allclose(heights[:3], [2.0, 1.0, 1.0])
+    _, levels = surfaces.find_support([[0.25, 0.25, 1.98]], tolerance=0.05)
+    assert levels.tolist() == [1], "A point sunk into a surface by less than the tolerance rests on it"
+    print("✅ Stacked planes resolve to the right level")
+
+
+def test_cache_rebuilds_when_stage_changes():
+    """The cache is reused for the same stage and rebuilt when the stage file changes."""
+    print("Testing the shelf surface cache...")
+    with tempfile.TemporaryDirectory() as directory:
+        stage_path = Path(directory) / "shop.usda"
+        shutil.copyfile(EMPTY_SHOP_PATH, stage_path)
+        cache_path = Path(directory) / "surfaces.npz"
+        first = load_shelf_surfaces(stage_path, cache_path)
+        assert cache_path.exists()
+        stamp = cache_path.stat().st_mtime_ns
+        assert load_shelf_surfaces(stage_path, cache_path).source_hash == first.source_hash
+        assert cache_path.stat().st_mtime_ns == stamp, "Same stage, the cache must be reused"
+
+        with open(stage_path, 'a') as f:
+            f.write("\n# edited\n")
+        rebuilt = load_shelf_surfaces(stage_path, cache_path)
+        assert rebuilt.source_hash != first.source_hash and rebuilt.source_hash == ShelfSurfaces.load(
+            cache_path).source_hash
+        assert np.array_equal(rebuilt.heights, first.heights, equal_nan=True)
+    print("✅ Cache reused for the same stage, rebuilt after an edit")
+
+
+def test_snap_drops_products_onto_shelves():
+    """Snapped boxes rest on their surface; dict and compact catalogs agree; products off the shelf stay."""
+    print("Testing snapping onto the shelves...")
+    surfaces = load_shelf_surfaces(EMPTY_SHOP_PATH)
+    product_data = dict(load_valid_product_data())
+    product_data["tuna_fish_can_1"] = dict(product_data["tuna_fish_can_1"], translate=[-20.0, 45.0, 1.0])
+    extents = product_extents(product_data)
+    snapped, report = snap_to_surfaces(product_data, extents, surfaces)
+    assert report["unsupported"] == ["tuna_fish_can_1"] and report["snapped"] == len(product_data) - 1
+    assert snapped["tuna_fish_can_1"] == product_data["tuna_fish_can_1"]
+    assert report["levels"] == {"SM_RackShelf_156": 12, "SM_RackShelf_157": 12, "SM_RackShelf_158": 12}
+
+    bottoms = get_box_bottoms(snapped)
+    for product_id, data in snapped.items():
+        if product_id == "tuna_fish_can_1":
+            continue
+        assert data["translate"][:2] == product_data[product_id]["translate"][:2], "Snapping only moves along Z"
+        center = np.array(data["translate"], dtype=np.float64)
+        center[2] = bottoms[product_id]
+        height, _ = surfaces.find_support([center], tolerance=1e-6)
+        assert abs(bottoms[product_id] - height[0]) < 1e-6, product_id
+
+    compact, compact_report = snap_to_surfaces(CompactCatalog.from_product_data(product_data), extents, surfaces)
+    assert compact_report == report
+    for product_id, data in compact.items():
+        assert np.allclose(data["translate"], snapped[product_id]["translate"])
+
+    # Snapping in chunks (streamed catalogs) adds up to the same report
+    items = list(product_data.items())
+    chunk_reports = [snap_to_surfaces(dict(items[start:start + 10]), extents, surfaces)[1]
+                     for start in range(0, len(items), 10)]
+    assert merge_snap_reports(chunk_reports) == report
+    print(f"✅ {report['snapped']} products dropped onto their shelf (max shift {report['max_shift'] * 1000:.0f} mm)")
+
+
+def test_scene_compiler_snaps_to_shelves():
+    """randomize_catalog snaps after randomizing when snap_to_shelves is set."""
+    print("Testing the scene compiler's shelf snap...")
+    surfaces = load_shelf_surfaces(EMPTY_SHOP_PATH)
+    extents = {data["asset"]: CUBE_EXTENT for data in load_valid_product_data().values()}
+    product_data, _ = snap_to_surfaces(load_valid_product_data(), extents, surfaces)
+    options = dict(DEFAULT_OPTIONS, randomization_seed=3, position_jitter=0.01, snap_to_shelves=True)
+    with tempfile.TemporaryDirectory() as directory:
+        # A prefilled extent cache keeps the remote assets closed
+        extents_path = Path(directory) / "extents.json"
+        extents_path.write_text(json.dumps({asset: extent.tolist() for asset, extent in extents.items()}))
+        try:
+            randomize_catalog(product_data, options, str(extents_path))
+        except ValueError as e:
+            print(f"   {e}")
+        else:
+            raise AssertionError("snap_to_shelves without surfaces must fail")
+        randomized_data, _, randomized_ids = randomize_catalog(product_data, options, str(extents_path), surfaces)
+    bottoms = get_box_bottoms(randomized_data, CUBE_EXTENT)
+    plates = dict(zip(["Items_Lower", "Items_Upper", "Items_Top"], PLATE_HEIGHTS))
+    for product_id, data in product_data.items():
+        assert abs(bottoms[product_id] - plates[data["shelf"]]) < 0.001, product_id
+    print(f"✅ All products rest on their shelf after jittering {randomized_ids}")
+
+
+if __name__ == "__main__":
+    test_extracts_shelf_levels()
+    test_catalog_products_stand_on_their_shelf()
+    test_support_picks_highest_surface_below()
+    test_cache_rebuilds_when_stage_changes()
+    test_snap_drops_products_onto_shelves()
+    test_scene_compiler_snaps_to_shelves()
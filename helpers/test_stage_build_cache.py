@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the prebuilt product layer cache.
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Sdf, Usd
+from stage_build_cache import StageBuildCache, compute_build_key, apply_product_layer
+from helpers.benchmark_bulk_authoring import load_product_data
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH, authoring_function
+
+OPTIONS = {"enable_physics": True, "force_collision": True, "randomization_seed": 7}
+
+
+def describe_products(stage):
+    """Return {path: (applied schemas, translate)} for every prim below /World/Shelf."""
+    description = {}
+    for prim in Usd.PrimRange(stage.GetPrimAtPath("/World/Shelf"), Usd.PrimAllPrimsPredicate):
+        translate = prim.GetAttribute("xformOp:translate")
+        description[str(prim.GetPath())] = (tuple(prim.GetAppliedSchemas()),
+                                            translate.Get() if translate else None)
+    return description
+
+
+def test_build_key_changes_with_inputs():
+    """The key depends on the catalog and on every option."""
+    print("Testing build key sensitivity...")
+    product_data = load_product_data()
+    key = compute_build_key(EMPTY_SHOP_PATH, product_data, OPTIONS)
+    assert key == compute_build_key(EMPTY_SHOP_PATH, dict(product_data), dict(OPTIONS))
+
+    for option, value in [("enable_physics", False), ("force_collision", False), ("randomization_seed", 8)]:
+        assert compute_build_key(EMPTY_SHOP_PATH, product_data, dict(OPTIONS, **{option: value})) != key
+
+    moved = {pid: dict(data) for pid, data in product_data.items()}
+    first_id = next(iter(moved))
+    moved[first_id]["translate"] = [0.0, 0.0, 0.0]
+    assert compute_build_key(EMPTY_SHOP_PATH, moved, OPTIONS) != key
+    print("✅ Build key changes with catalog and options")
+
+
+def test_cache_miss_then_hit():
+    """A warm start sublayers the .usdc file and composes the same products as the cold start."""
+    print("Testing build cache miss and hit...")
+    product_data = load_product_data()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        build_cache = StageBuildCache(cache_dir)
+        key = compute_build_key(EMPTY_SHOP_PATH, product_data, OPTIONS)
+
+        cold_stage = Usd.Stage.Open(EMPTY_SHOP_PATH, load=Usd.Stage.LoadNone)
+        success, cache_hit = apply_product_layer(cold_stage, build_cache, key,
+                                                 authoring_function("per_prim", product_data))
+        assert success and not cache_hit
+        cache_path = build_cache.lookup(key)
+        assert cache_path and cache_path.endswith(".usdc")
+        assert Path(cache_path).read_bytes()[:8] == b"PXR-USDC", "Cache file is not a crate file"
+        assert cold_stage.GetRootLayer().subLayerPaths[0] == cache_path
+        cold_description = describe_products(cold_stage)
+
+        def fail_if_called(stage):
+            raise AssertionError("Products must not be re-authored on a cache hit")
+
+        # Discard the cold start's in-memory edits to the shared empty shop layer
+        del cold_stage
+        shop_layer = Sdf.Layer.Find(EMPTY_SHOP_PATH)
+        if shop_layer:
+            shop_layer.Reload()
+        warm_stage = Usd.Stage.Open(EMPTY_SHOP_PATH, load=Usd.Stage.LoadNone)
+        success, cache_hit = apply_product_layer(warm_stage, build_cache, key, fail_if_called)
+        assert success and cache_hit
+        assert list(warm_stage.GetRootLayer().subLayerPaths).count(cache_path) == 1
+        assert describe_products(warm_stage) == cold_description
+    print(f"✅ Warm start reproduced {len(cold_description)} prims from the cache")
+
+
+if __name__ == "__main__":
+    test_build_key_changes_with_inputs()
+    test_cache_miss_then_hit()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shop format converter (binary variants, manifest, fastest current variant).
+
+Requires usd-core (pip install usd-core), Isaac Sim is NOT required.
+The shops are copied to a temporary directory, so nothing is written to assets/.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from pxr import Sdf, Usd
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from stage_build_cache import hash_file
+from stage_converter import convert_stage, find_fastest_variant, get_manifest_path, get_variant_path
+from helpers.benchmark_stage_cache import BASE_PATH, EMPTY_SHOP_PATH
+
+STOCKED_SHOP_PATH = str(BASE_PATH / "assets" / "Shop Minimal Fully Stocked.usda")
+
+
+def copy_shop(source_path, directory):
+    """Copy a shop file into a directory and return the copy's path."""
+    copy_path = Path(directory) / Path(source_path).name
+    shutil.copyfile(source_path, copy_path)
+    return copy_path
+
+
+def test_empty_shop_variants():
+    """Every variant of the empty shop is written, binary, hashed in the manifest and composes the same prims."""
+    print("Testing the empty shop variants...")
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = copy_shop(EMPTY_SHOP_PATH, directory)
+        manifest = convert_stage(source_path, repeats=1)
+        with open(get_manifest_path(source_path), 'r') as f:
+            assert json.load(f) == manifest
+        assert manifest["sourceHash"] == hash_file(source_path)
+
+        source_prims = manifest["measurements"]["prims"]
+        for name, variant in manifest["variants"].items():
+            variant_path = get_variant_path(source_path, name)
+            assert variant["file"] == variant_path.name and variant["hash"] == hash_file(variant_path), name
+            layer = Sdf.Layer.FindOrOpen(str(variant_path))
+            assert layer.GetFileFormat() == Sdf.FileFormat.FindByExtension("usdc"), name
+            assert variant["measurements"]["file_size"] < manifest["measurements"]["file_size"], name
+        assert sorted(manifest["variants"]) == ["flat", "optimized", "usdc"]
+        # The crate copy composes the same prims; instance proxies are not counted
+        assert manifest["variants"]["usdc"]["measurements"]["prims"] == source_prims
+        assert manifest["variants"]["optimized"]["measurements"]["prims"] < source_prims
+        flat = Usd.Stage.Open(str(get_variant_path(source_path, "flat")))
+        assert not flat.GetRootLayer().GetCompositionAssetDependencies() and not flat.GetCompositionErrors()
+    print(f"✅ usdc, flat and optimized written and hashed, {source_prims} prims in the source")
+
+
+def test_stocked_shop_skips_flat():
+    """Flattening the stocked shop would drop its unresolvable payloads, so that variant is skipped."""
+    print("Testing the stocked shop variants...")
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = copy_shop(STOCKED_SHOP_PATH, directory)
+        manifest = convert_stage(source_path, variants=["usdc", "flat"], repeats=1)
+        assert "composition arcs do not resolve" in manifest["variants"]["flat"]["skipped"]
+        assert not get_variant_path(source_path, "flat").exists()
+        usdc = Usd.Stage.Open(str(get_variant_path(source_path, "usdc")))
+        assert len(usdc.GetCompositionErrors()) == len(Usd.Stage.Open(str(source_path)).GetCompositionErrors())
+    print(f"✅ flat skipped ({manifest['variants']['flat']['skipped']}), usdc keeps the payload arcs")
+
+
+def test_find_fastest_variant():
+    """The fastest current variant is returned; none without a manifest, after a source edit or a replaced file."""
+    print("Testing the fastest variant lookup...")
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = copy_shop(EMPTY_SHOP_PATH, directory)
+        assert find_fastest_variant(source_path) is None
+        manifest = convert_stage(source_path, variants=["usdc", "optimized"], repeats=1)
+        fastest = find_fastest_variant(source_path)
+        assert fastest is not None and fastest.suffix == ".usdc"
+        times = {name: variant["measurements"]["open_time"] for name, variant in manifest["variants"].items()}
+        assert fastest == get_variant_path(source_path, min(times, key=times.get))
+
+        # A replaced variant file is ignored, the other one is still current
+        with open(fastest, 'ab') as f:
+            f.write(b"\0")
+        assert find_fastest_variant(source_path) not in (None, fastest)
+
+        with open(source_path, 'a') as f:
+            f.write("\n# edited\n")
+        assert find_fastest_variant(source_path) is None
+    print(f"✅ {fastest.name} picked, replaced variants and edited sources are not opened")
+
+
+if __name__ == "__main__":
+    test_empty_shop_variants()
+    test_stocked_shop_skips_flat()
+    test_find_fastest_variant()
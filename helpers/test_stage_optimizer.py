@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the empty shop optimizer (material dedupe, geometry instancing, report, staleness).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+The optimized shop is written to a temporary directory and compared to the source prim by prim.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from pxr import Sdf, Usd, UsdGeom, UsdShade
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from shelf_surfaces import extract_shelf_surfaces
+from stage_optimizer import (LOOKS_PATH, dedupe_materials, get_optimized_path, instance_geometry,
+                             is_optimized_stage_current, optimize_stage)
+from helpers.benchmark_stage_cache import EMPTY_SHOP_PATH
+
+# Two racks with their own copy of one material, a third whose mesh differs and a
+# fourth whose mesh a light links to (so it cannot become an instance proxy)
+SYNTHETIC_SHOP = """#usda 1.0
+def Xform "World"
+{
+    def Scope "Objects"
+    {
+%s
+    }
+    def DistantLight "Light"
+    {
+        rel light:filters = </World/Objects/RackD/Geometry/Mesh>
+    }
+}
+"""
+SYNTHETIC_RACK = """
+        def Xform "%(name)s"
+        {
+            def Xform "Geometry"
+            {
+                double3 xformOp:translate = (%(offset)s, 0, 0)
+                uniform token[] xformOpOrder = ["xformOp:translate"]
+                def Mesh "Mesh" (
+                    apiSchemas = ["MaterialBindingAPI"]
+                )
+                {
+                    point3f[] points = [(0, 0, 0), (1, 0, 0), (1, 1, %(height)s)]
+                    int[] faceVertexCounts = [3]
+                    int[] faceVertexIndices = [0, 1, 2]
+                    uchar[] physxCookedData:triangleMesh:buffer = [%(offset)s]
+                    rel material:binding = </World/Objects/%(name)s/Looks/Paint>
+                }
+            }
+            def Scope "Looks"
+            {
+                def Material "Paint"
+                {
+                    token outputs:surface.connect = </World/Objects/%(name)s/Looks/Paint/Shader.outputs:surface>
+                    def Shader "Shader"
+                    {
+                        uniform token info:id = "UsdPreviewSurface"
+                        color3f inputs:diffuseColor = (0.5, 0.1, 0)
+                        token outputs:surface
+                    }
+                }
+            }
+        }"""
+
+
+def make_synthetic_layer():
+    """Four racks: A and B identical, C with another mesh, D the target of a light filter."""
+    racks = [SYNTHETIC_RACK % {"name": name, "offset": offset, "height": height}
+             for name, offset, height in [("RackA", 0, 0), ("RackB", 2, 0), ("RackC", 4, 1), ("RackD", 6, 0)]]
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    layer.ImportFromString(SYNTHETIC_SHOP % "".join(racks))
+    return layer
+
+
+def get_bound_surface(prim):
+    """The shader driving the surface of the material bound to a prim, as (shader name, albedo or diffuse color)."""
+    material, _ = UsdShade.MaterialBindingAPI(prim).ComputeBoundMaterial()
+    outputs = [output for output in material.GetSurfaceOutputs() if output.HasConnectedSource()]
+    shader = outputs[0].GetConnectedSources()[0][0].source.GetPrim()
+    value = shader.GetAttribute("inputs:AlbedoTexture").Get() or shader.GetAttribute("inputs:diffuseColor").Get()
+    return shader.GetName(), str(value)
+
+
+def matrices_close(first, second, tolerance=1e-9):
+    """True if two Gf.Matrix4d are equal within tolerance."""
+    return np.allclose(np.array(first), np.array(second), atol=tolerance)
+
+
+def get_meshes(stage):
+    """Mesh path -> (world transform, points, bound surface, applied schemas), instance proxies included."""
+    xform_cache = UsdGeom.XformCache()
+    return {str(prim.GetPath()): (xform_cache.GetLocalToWorldTransform(prim), prim.GetAttribute("points").Get(),
+                                  get_bound_surface(prim), prim.GetAppliedSchemas())
+            for prim in stage.Traverse(Usd.TraverseInstanceProxies()) if prim.IsA(UsdGeom.Mesh)}
+
+
+def test_synthetic_dedupe():
+    """Identical materials share one library entry; only identical, untargeted subtrees are instanced."""
+    print("Testing dedupe on a synthetic shop...")
+    layer = make_synthetic_layer()
+    before = get_meshes(Usd.Stage.Open(layer))
+    mapping = dedupe_materials(layer)
+    assert sorted(str(path) for path in mapping) == [f"/World/Objects/Rack{name}/Looks/Paint" for name in "ABCD"]
+    assert set(mapping.values()) == {Sdf.Path(LOOKS_PATH).AppendChild("Paint")}
+    assert not layer.GetPrimAtPath("/World/Objects/RackA/Looks"), "Empty Looks scopes are removed"
+
+    prototypes = instance_geometry(layer, root_path="/World/Objects")
+    # The cooked buffers differ, but they are derived from the same mesh
+    assert {str(path): [str(instance) for instance in instances] for path, instances in prototypes.items()} == {
+        "/Prototypes/Geometry": ["/World/Objects/RackA/Geometry", "/World/Objects/RackB/Geometry"]}
+    stage = Usd.Stage.Open(layer)
+    assert stage.GetPrimAtPath("/World/Objects/RackB/Geometry").IsInstance()
+    assert not stage.GetPrimAtPath("/World/Objects/RackD/Geometry").IsInstance()
+    assert get_meshes(stage) == before
+    print(f"✅ 4 materials -> 1, {len(prototypes)} prototype for the 2 identical racks, same meshes as before")
+
+
+def test_optimized_shop_matches_source():
+    """Every mesh keeps its transform, points, material and schemas; the shelf surfaces do not change."""
+    print("Testing the optimized empty shop...")
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = Path(directory) / "shop.optimized.usdc"
+        report = optimize_stage(EMPTY_SHOP_PATH, output_path, repeats=1)
+        source, optimized = Usd.Stage.Open(EMPTY_SHOP_PATH), Usd.Stage.Open(str(output_path))
+        assert Sdf.FileFormat.FindByExtension("usdc") == optimized.GetRootLayer().GetFileFormat()
+        before, after = get_meshes(source), get_meshes(optimized)
+        assert before.keys() == after.keys()
+        for path, (transform, points, surface, schemas) in before.items():
+            assert matrices_close(after[path][0], transform) and after[path][1] == points, path
+            assert after[path][2:] == (surface, schemas), path
+
+        materials = [prim for prim in optimized.Traverse() if prim.IsA(UsdShade.Material)]
+        assert all(str(prim.GetPath()).startswith(LOOKS_PATH + "/") for prim in materials)
+        assert len(materials) == report["shared_materials"] + 1  # + OmniSurface, which had no copies
+        racks = [optimized.GetPrimAtPath(f"/World/Shelf/ShelfObjects/SM_RackShelf_{number}/SM_RackShelf_01")
+                 for number in (156, 157, 158)]
+        assert all(rack.IsInstance() for rack in racks) and len({rack.GetPrototype() for rack in racks}) == 1
+
+        surfaces, optimized_surfaces = extract_shelf_surfaces(EMPTY_SHOP_PATH), extract_shelf_surfaces(output_path)
+        assert optimized_surfaces.names == surfaces.names
+        assert np.array_equal(optimized_surfaces.heights, surfaces.heights, equal_nan=True)
+    print(f"✅ {len(before)} meshes match, {report['instances']} instances of {report['prototypes']} prototypes")
+
+
+def test_report_and_staleness():
+    """The report shows a smaller, faster file with fewer prims; an edited source makes the output stale."""
+    print("Testing the optimization report and staleness...")
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = Path(directory) / "Shop Minimal Empty.usda"
+        shutil.copyfile(EMPTY_SHOP_PATH, source_path)
+        report = optimize_stage(source_path, repeats=1)
+        output_path = get_optimized_path(source_path)
+        assert report["output"] == str(output_path) and output_path.name == "Shop Minimal Empty.optimized.usdc"
+        before, after = report["before"], report["after"]
+        assert after["file_size"] < before["file_size"] / 4
+        assert after["composed_prims"] < before["composed_prims"]
+        assert after["open_time"] < before["open_time"]
+        assert report["materials_removed"] == 39 and report["shared_materials"] == 8
+
+        assert is_optimized_stage_current(output_path, source_path)
+        with open(source_path, 'a') as f:
+            f.write("\n# edited\n")
+        assert not is_optimized_stage_current(output_path, source_path)
+        assert not is_optimized_stage_current(Path(directory) / "missing.usdc", source_path)
+    print(f"✅ {before['file_size'] // 1024} KB -> {after['file_size'] // 1024} KB, "
+          f"{before['composed_prims']} -> {after['composed_prims']} prims, stale after an edit")
+
+
+if __name__ == "__main__":
+    test_synthetic_dedupe()
+    test_optimized_shop_matches_source()
+    test_report_and_staleness()
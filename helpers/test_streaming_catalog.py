@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the NDJSON streaming catalog (converter, chunked reading, chunked placement).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+The catalogs are written to a temporary directory, so nothing is written to assets/.
+"""
+
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from pxr import Sdf
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from bulk_authoring import author_products_to_layer
+from compact_catalog import CompactCatalog, load_catalog
+from orientation import normalize_orientations
+from planogram import save_catalog
+from streaming_catalog import (NDJSON_ID_KEY, convert_catalog, iter_catalog_chunks, iter_catalog_products,
+                               place_catalog_stream, write_ndjson_catalog)
+
+BASE_PATH = Path(__file__).parent.parent
+CATALOG_PATH = BASE_PATH / "assets" / "product_data.json"
+
+
+def load_reference_catalog():
+    with open(CATALOG_PATH, 'r') as f:
+        return json.load(f)
+
+
+def repeat_catalog(size):
+    """Yield size products: the reference catalog repeated, with new IDs."""
+    products = list(load_reference_catalog().items())
+    for index in range(size):
+        product_id, data = products[index % len(products)]
+        yield f"{product_id}_{index // len(products)}", data
+
+
+def test_convert_round_trip():
+    """JSON -> NDJSON -> JSON keeps every product, in order, in the product_data.json format."""
+    print("Testing the catalog converter...")
+    catalog = load_reference_catalog()
+    with tempfile.TemporaryDirectory() as directory:
+        ndjson_path, json_path = Path(directory) / "catalog.ndjson", Path(directory) / "catalog.json"
+        assert convert_catalog(CATALOG_PATH, ndjson_path) == len(catalog)
+        lines = ndjson_path.read_text().splitlines()
+        assert len(lines) == len(catalog) and json.loads(lines[0])[NDJSON_ID_KEY] == next(iter(catalog))
+        assert dict(iter_catalog_products(ndjson_path)) == catalog
+
+        assert convert_catalog(ndjson_path, json_path) == len(catalog)
+        assert json_path.read_text() == json.dumps(catalog, indent=4)
+
+        # Compact sources are loaded whole; every loader reads NDJSON like JSON
+        npz_path = save_catalog(CompactCatalog.from_product_data(catalog), Path(directory) / "catalog.npz")
+        convert_catalog(npz_path, ndjson_path)
+        assert load_catalog(ndjson_path).to_product_data() == load_catalog(CATALOG_PATH).to_product_data()
+        try:
+            convert_catalog(CATALOG_PATH, Path(directory) / "catalog.csv")
+            assert False, "unsupported target accepted"
+        except ValueError:
+            pass
+    print(f"✅ {len(catalog)} products converted to NDJSON and back")
+
+
+def test_chunks_follow_the_reader():
+    """Each chunk is placed as soon as it is parsed; a bad line is skipped and reported."""
+    print("Testing chunked reading...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "catalog.ndjson"
+        write_ndjson_catalog(repeat_catalog(250), path)
+        _, data = next(repeat_catalog(1))
+        with open(path, 'a') as f:
+            f.write('{"asset": "no id"}\n' + json.dumps({NDJSON_ID_KEY: "last_1", **data}) + "\n")
+
+        parsed = []
+
+        def record(products):
+            for product in products:
+                parsed.append(product[0])
+                yield product
+
+        placed_after = []
+
+        def place_chunk(chunk):
+            placed_after.append(len(parsed))
+            return len(chunk)
+
+        # prepare_chunk drops the first product of every chunk; products counts what was parsed
+        result = place_catalog_stream(iter_catalog_chunks(record(iter_catalog_products(path)), 100), place_chunk,
+                                      prepare_chunk=lambda chunk: dict(list(chunk.items())[1:]))
+        assert placed_after == [100, 200, 251], placed_after
+        assert result["chunks"] == 3 and result["products"] == 251 and result["placed"] == 251 - 3
+        assert parsed[-1] == "last_1" and result["first_chunk_time"] <= result["total_time"]
+    print(f"✅ {result['chunks']} chunks placed as they were parsed")
+
+
+def test_bounded_memory():
+    """Streaming 20k products in chunks of 500 peaks far below holding the catalog as one dict."""
+    print("Testing streaming memory...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "catalog.ndjson"
+        write_ndjson_catalog(repeat_catalog(20000), path)
+
+        tracemalloc.start()
+        result = place_catalog_stream(iter_catalog_chunks(iter_catalog_products(path), 500), len)
+        streamed_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        whole = dict(iter_catalog_products(path))
+        whole_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert result["placed"] == len(whole) == 20000
+        assert streamed_peak * 10 < whole_peak, (streamed_peak, whole_peak)
+    print(f"✅ Streamed peak {streamed_peak / 1024 ** 2:.1f} MB vs {whole_peak / 1024 ** 2:.1f} MB "
+          f"for the whole catalog")
+
+
+def prepare_chunk(chunk):
+    """Convert and normalize a chunk like the placer: malformed entries are dropped with an error."""
+    return normalize_orientations(CompactCatalog.from_product_data(chunk))
+
+
+def test_chunked_bulk_authoring():
+    """Authoring the catalog chunk by chunk gives the same layer as authoring it at once."""
+    print("Testing chunked bulk authoring...")
+    catalog = dict(repeat_catalog(300))
+    # A malformed copy (4-value rotate) is dropped before authoring
+    catalog["sm_mug_1_3"] = dict(catalog["sm_mug_1_3"], rotate=[0, 0, 0, 0])
+    whole_layer = Sdf.Layer.CreateAnonymous(".usda")
+    author_products_to_layer(whole_layer, prepare_chunk(catalog))
+    chunk_layer = Sdf.Layer.CreateAnonymous(".usda")
+    result = place_catalog_stream(iter_catalog_chunks(catalog.items(), 64),
+                                  lambda chunk: len(author_products_to_layer(chunk_layer, chunk)),
+                                  prepare_chunk=prepare_chunk)
+    assert result["products"] == len(catalog) and result["placed"] == len(catalog) - 1
+    assert result["chunks"] == 5
+    assert chunk_layer.ExportToString() == whole_layer.ExportToString()
+    print(f"✅ {result['placed']} products in {result['chunks']} chunks match one bulk pass")
+
+
+if __name__ == "__main__":
+    test_convert_round_trip()
+    test_chunks_follow_the_reader()
+    test_bounded_memory()
+    test_chunked_bulk_authoring()
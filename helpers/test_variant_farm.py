@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the scene-variant farm (shards, override layers, manifest).
+
+Requires usd-core and NumPy (pip install usd-core numpy), Isaac Sim is NOT required.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to access main project files
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pxr import Gf, Sdf, Usd
+from compact_catalog import load_catalog
+from variant_farm import shard_seeds, run_farm, get_manifest_path, hash_catalog
+from randomization_engine import RandomizationEngine
+from helpers.benchmark_bulk_authoring import load_product_data
+from helpers.benchmark_stage_cache import BASE_PATH, EMPTY_SHOP_PATH
+
+OPTIONS = {"num_products": 5, "position_jitter": 0.01, "enable_physics": False}
+
+
+def collect_prim_specs_with_attributes(layer):
+    """Return every prim spec in a layer that authors at least one attribute."""
+    prim_specs = []
+
+    def visit(path):
+        if path.IsPrimPath() and layer.GetPrimAtPath(path).attributes:
+            prim_specs.append(layer.GetPrimAtPath(path))
+
+    layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+    return prim_specs
+
+
+def test_shards_cover_seed_range():
+    """Shards are contiguous, disjoint and cover the whole seed range."""
+    print("Testing seed sharding...")
+    for count, shard_count in [(10, 3), (2, 4), (1000, 7)]:
+        shards = [shard_seeds(100, count, i, shard_count) for i in range(shard_count)]
+        assert [seed for shard in shards for seed in shard] == list(range(100, 100 + count))
+        assert max(len(s) for s in shards) - min(len(s) for s in shards) <= 1
+    print("✅ Shards split the seed range without gaps or overlaps")
+
+
+def test_farm_writes_variants_and_manifest():
+    """Each variant composes the base plus its own randomized transforms and is reproducible."""
+    print("Testing variant generation...")
+    product_data = load_product_data()
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifests = [run_farm(EMPTY_SHOP_PATH, product_data, output_dir, count=6, seed_start=10,
+                              shard_index=i, shard_count=2, workers=workers, options=OPTIONS)
+                     for i, workers in [(0, 0), (1, 2)]]
+        for i, manifest in enumerate(manifests):
+            assert get_manifest_path(output_dir, i, 2).exists()
+        variants = [entry for manifest in manifests for entry in manifest["variants"]]
+        assert [entry["seed"] for entry in variants] == list(range(10, 16))
+        assert manifests[0]["base_layer"] == manifests[1]["base_layer"]
+
+        entry = variants[4]
+        variant_path = Path(output_dir) / entry["path"]
+        assert entry["options"]["position_jitter"] == 0.01
+
+        # The variant layer only holds overrides for its randomized products
+        layer = Sdf.Layer.FindOrOpen(str(variant_path))
+        product_specs = collect_prim_specs_with_attributes(layer)
+        assert sorted(spec.name for spec in product_specs) == sorted(entry["randomized_products"])
+        assert all(spec.specifier == Sdf.SpecifierOver for spec in product_specs)
+
+        # Regenerating the seed alone reproduces the composed transforms
+        base_catalog = {pid: data for pid, data in product_data.items()
+                        if len(data.get("rotate", [0, 0, 0])) == 3}
+        engine = RandomizationEngine(base_catalog, seed=entry["seed"])
+        draw = engine.draw(num_products=5, position_jitter=0.01)
+        expected = engine.apply(base_catalog, draw)
+        assert draw["product_ids"] == entry["randomized_products"]
+
+        stage = Usd.Stage.Open(str(variant_path), load=Usd.Stage.LoadNone)
+        for product_id in entry["randomized_products"]:
+            data = expected[product_id]
+            prim = stage.GetPrimAtPath(f"/World/Shelf/{data['shelf']}/{data['category']}/{product_id}")
+            assert Gf.IsClose(prim.GetAttribute("xformOp:translate").Get(), Gf.Vec3d(*data["translate"]), 1e-9)
+        untouched = next(pid for pid in base_catalog if pid not in entry["randomized_products"])
+        data = product_data[untouched]
+        prim = stage.GetPrimAtPath(f"/World/Shelf/{data['shelf']}/{data['category']}/{untouched}")
+        assert prim.GetAttribute("xformOp:translate").Get() == Gf.Vec3d(*data["translate"])
+        assert stage.GetPrimAtPath("/World/Shelf").IsValid(), "Empty shop must compose through the base layer"
+
+        with open(get_manifest_path(output_dir, 1, 2)) as f:
+            assert json.load(f)["shard"] == {"index": 1, "count": 2, "seed_start": 13, "seed_stop": 16}
+    print(f"✅ {len(variants)} variants over one shared base layer, reproducible from their seeds")
+
+
+def test_farm_accepts_compact_catalog():
+    """A CompactCatalog from load_catalog runs through to the manifest, with the hash of the JSON dict."""
+    print("Testing the farm with a compact catalog...")
+    catalog = load_catalog(BASE_PATH / "assets" / "product_data.json")
+    assert hash_catalog(catalog) == hash_catalog(load_product_data())
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest = run_farm(EMPTY_SHOP_PATH, catalog, output_dir, count=2, workers=0, options=OPTIONS)
+        with open(get_manifest_path(output_dir)) as f:
+            assert json.load(f)["catalog_sha256"] == manifest["catalog_sha256"] == catalog.content_hash()
+    print("✅ Manifest written for a compact catalog")
+
+
+if __name__ == "__main__":
+    test_shards_cover_seed_range()
+    test_farm_writes_variants_and_manifest()
+    test_farm_accepts_compact_catalog()
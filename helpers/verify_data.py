@@ -15,78 +15,67 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Base path is now the parent directory
 BASE_PATH = Path(__file__).parent.parent
+PRODUCT_DATA_PATH = BASE_PATH / "assets" / "product_data.json"
+SHELF_SURFACES_PATH = BASE_PATH / "assets" / "shelf_surfaces.npz"
 
 def load_product_data():
     """Load product data from JSON file."""
-    json_file_path = BASE_PATH / "assets" / "product_data.json"
     try:
-        with open(json_file_path, 'r') as f:
+        with open(PRODUCT_DATA_PATH, 'r') as f:
             return json.load(f)
     except Exception as e:
         print(f"ERROR: Failed to load product data: {e}")
         return {}
 
-def verify_product_data_structure():
+def load_shelf_surfaces():
+    """Load the cached shelf surface index (shelf_surfaces.py), or None without it or without NumPy."""
+    try:
+        from shelf_surfaces import ShelfSurfaces
+        return ShelfSurfaces.load(SHELF_SURFACES_PATH)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Note: shelf surface index not available ({e}), using fixed bounds")
+        return None
+
+def get_shelf_levels(product_data, surfaces):
+    """Return product_id -> (shelf level name, pivot height above it); the name is None without a surface."""
+    product_ids = list(product_data)
+    points = [product_data[product_id]['translate'] for product_id in product_ids]
+    heights, levels = surfaces.find_support(points)
+    return {product_id: (surfaces.names[level] if level >= 0 else None, point[2] - height)
+            for product_id, point, height, level in zip(product_ids, points, heights.tolist(), levels.tolist())}
+
+def validate_product_data(surfaces):
+    """Validate the catalog in one pass (catalog_validator.py), with the shelf support checks if surfaces are given."""
+    from catalog_validator import validate_catalog
+    try:
+        return validate_catalog(PRODUCT_DATA_PATH, surfaces)
+    except Exception as e:
+        print(f"ERROR: Failed to load product data: {e}")
+        return None
+
+def verify_product_data_structure(report):
     """Verify the structure and content of product data."""
+    from catalog_validator import format_problem
     print("=== PRODUCT DATA VERIFICATION ===")
     
-    product_data = load_product_data()
-    
-    if not product_data:
+    if not report or not report["products"]:
         print("❌ Failed to load product data")
         return False
     
-    print(f"✅ Loaded {len(product_data)} products from JSON")
-    
-    # Test each product entry
-    issues = []
-    physics_count = 0
-    static_count = 0
-    
-    for product_id, data in product_data.items():
-        # Required fields check
-        required_fields = ["asset", "translate", "scale", "physics_enabled"]
-        for field in required_fields:
-            if field not in data:
-                issues.append(f"{product_id}: Missing '{field}' field")
-        
-        # Rotation check (must have either rotate or orient)
-        if "rotate" not in data and "orient" not in data:
-            issues.append(f"{product_id}: Missing rotation data (neither 'rotate' nor 'orient')")
-        
-        # Data type checks
-        if "translate" in data:
-            if not isinstance(data["translate"], list) or len(data["translate"]) != 3:
-                issues.append(f"{product_id}: 'translate' must be a list of 3 numbers")
-        
-        if "scale" in data:
-            if not isinstance(data["scale"], list) or len(data["scale"]) != 3:
-                issues.append(f"{product_id}: 'scale' must be a list of 3 numbers")
-        
-        if "rotate" in data:
-            if not isinstance(data["rotate"], list) or len(data["rotate"]) != 3:
-                issues.append(f"{product_id}: 'rotate' must be a list of 3 numbers")
-        
-        if "orient" in data:
-            if not isinstance(data["orient"], list) or len(data["orient"]) != 4:
-                issues.append(f"{product_id}: 'orient' must be a list of 4 numbers (quaternion)")
-        
-        # Count physics vs static
-        if data.get("physics_enabled", False):
-            physics_count += 1
-        else:
-            static_count += 1
+    print(f"✅ Loaded {report['products']} products from JSON")
     
     # Report issues
-    if issues:
-        print(f"❌ Found {len(issues)} data structure issues:")
-        for issue in issues:
-            print(f"  - {issue}")
+    for problem in report["warnings"]:
+        print(f"⚠️  {format_problem(problem)}")
+    if report["error_count"]:
+        print(f"❌ Found {report['error_count']} data issues:")
+        for problem in report["errors"]:
+            print(f"  - {format_problem(problem)}")
         return False
     else:
         print("✅ All product data structure checks passed")
-        print(f"  - Physics enabled: {physics_count} products")
-        print(f"  - Static objects: {static_count} products")
+        print(f"  - Physics enabled: {report['physics_enabled']} products")
+        print(f"  - Static objects: {report['products'] - report['physics_enabled']} products")
         return True
 
 def categorize_products():
@@ -131,13 +120,18 @@ def categorize_products():
             categories['Mac-n-Cheese'].append(product_id)
     
     # Print categorization
+    surfaces = load_shelf_surfaces()
+    shelf_levels = get_shelf_levels(product_data, surfaces) if surfaces else {}
     total_categorized = 0
     for category, products in categories.items():
         if products:
-            # Check shelf level based on Z coordinate (height)
+            # Check shelf level: the shelf surface under the product, or a guess from the height
             sample_product = products[0]
             z_coord = product_data[sample_product]['translate'][2]
-            shelf_level = "Upper" if z_coord > 1.5 else "Lower"
+            if shelf_levels:
+                shelf_level = shelf_levels[sample_product][0] or "No"
+            else:
+                shelf_level = "Upper" if z_coord > 1.5 else "Lower"
             
             # Check physics
             sample_data = product_data[sample_product]
@@ -148,10 +142,14 @@ def categorize_products():
     
     print(f"\nTotal products categorized: {total_categorized}")
 
-def validate_positions():
+def validate_positions(report, surfaces):
     """Validate product positions are reasonable for the shop environment."""
     print("\n=== POSITION VALIDATION ===")
     
+    if surfaces and report:
+        print_shelf_support(report, surfaces)
+        return
+    
     product_data = load_product_data()
     
     if not product_data:
@@ -196,6 +194,17 @@ def validate_positions():
     print(f"  - Lower shelf items: {len(lower_shelf_items)}")
     print(f"  - Upper shelf items: {len(upper_shelf_items)}")
 
+def print_shelf_support(report, surfaces):
+    """Print the catalog shelves' shelf levels; the support problems are in the validation report."""
+    if report["support_error_count"]:
+        print(f"❌ Found {report['support_error_count']} position issues (listed above)")
+    else:
+        print(f"✅ All products stand on a shelf surface ({len(surfaces)} levels from the empty shop)")
+    
+    heights = dict(zip(surfaces.names, surfaces.get_level_heights().tolist()))
+    for (shelf, level), count in sorted(report["shelf_levels"].items(), key=lambda item: str(item[0])):
+        print(f"  - {shelf}: {count} items on {level} (surface at {heights[level]:.3f})")
+
 def check_assets():
     """Check asset URL validity (basic format check)."""
     print("\n=== ASSET URL VALIDATION ===")
@@ -248,10 +257,12 @@ def run_all_verifications():
     print("🔍 DYNAMIC SHOP PLACER - DATA VERIFICATION")
     print("=" * 50)
     
-    # Run all verification functions
-    structure_ok = verify_product_data_structure()
+    # Run all verification functions; the catalog checks share one validation pass
+    surfaces = load_shelf_surfaces()
+    report = validate_product_data(surfaces)
+    structure_ok = verify_product_data_structure(report)
     categorize_products()
-    validate_positions()
+    validate_positions(report, surfaces)
     check_assets()
     
     print("\n" + "=" * 50)
@@ -261,7 +272,7 @@ def run_all_verifications():
     else:
         print("⚠️  VERIFICATION ISSUES FOUND - Please fix data structure problems")
     
-    print(f"\nTotal products verified: {len(load_product_data())}")
+    print(f"\nTotal products verified: {report['products'] if report else 0}")
 
 if __name__ == "__main__":
     run_all_verifications()
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+Incremental Re-Placement for the Dynamic Shop Placer
+
+Keeps a snapshot of the last applied catalog, computes a per-product diff
+against an edited catalog (added, removed, moved, rotated, scaled, physics
+changed) and writes only those edits into the open stage's edit target,
+inside a single Sdf.ChangeBlock. A small polling watcher detects when the
+catalog file changes on disk, so edits can be picked up live.
+
+Only pxr (usd-core or Isaac Sim) is required - no omni/Kit modules.
+
+Usage:
+    snapshot = snapshot_catalog(PRODUCT_DATA)
+    ...
+    new_data = load_catalog("assets/product_data.json")
+    diff = diff_catalogs(snapshot, new_data)
+    apply_catalog_diff(stage, stage.GetEditTarget().GetLayer(), diff, snapshot, new_data)
+
+When the placement differs from its catalog (randomized), merge_catalog_edits
+applies a diff of the catalog to the placed catalog first.
+"""
+
+import copy
+import os
+import time
+from pathlib import Path
+
+from pxr import Sdf, Gf
+
+from bulk_authoring import (SHELF_ROOT_PATH, author_hierarchy_to_layer, author_product_spec, convert_transform,
+                            set_transform_specs, set_attribute_spec, set_physics_specs, clear_physics_specs,
+                            remove_api_schemas, remove_attribute_spec, get_product_path, MESH_COLLISION_SCHEMAS)
+
+# Changes that move a product to another prim path or payload are applied as remove + add
+PATH_KEYS = ("asset", "shelf", "category")
+ROTATION_KEYS = ("rotate", "orient")
+PHYSICS_KEYS = ("physics_enabled", "velocity", "angular_velocity")
+ROTATION_OPS = ("xformOp:rotateZYX", "xformOp:orient")
+
+DIFF_KINDS = ("added", "removed", "replaced", "moved", "rotated", "scaled", "physics")
+
+
+def snapshot_catalog(product_data):
+    """
+    Return an independent dict copy of a catalog to diff later edits against.
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog as currently placed
+
+    Returns:
+        dict: product_id -> product data (deep copy)
+    """
+    return {product_id: copy.deepcopy(data) for product_id, data in product_data.items()}
+
+
+def diff_catalogs(old_data, new_data):
+    """
+    Compute the per-product difference between two catalogs.
+
+    Args:
+        old_data (dict or CompactCatalog): Catalog that is currently placed
+        new_data (dict or CompactCatalog): Edited catalog
+
+    Returns:
+        dict: Lists of product IDs per change kind (see DIFF_KINDS). "replaced"
+            products changed asset, shelf or category; a product can be in
+            several of moved / rotated / scaled / physics at once.
+    """
+    old_data = old_data if isinstance(old_data, dict) else snapshot_catalog(old_data)
+    new_data = new_data if isinstance(new_data, dict) else snapshot_catalog(new_data)
+    diff = {kind: [] for kind in DIFF_KINDS}
+
+    for product_id, new in new_data.items():
+        old = old_data.get(product_id)
+        if old is None:
+            diff["added"].append(product_id)
+            continue
+        if old == new:
+            continue
+        if any(old.get(key) != new.get(key) for key in PATH_KEYS):
+            diff["replaced"].append(product_id)
+            continue
+        if old.get("translate") != new.get("translate"):
+            diff["moved"].append(product_id)
+        if any(old.get(key) != new.get(key) for key in ROTATION_KEYS):
+            diff["rotated"].append(product_id)
+        if old.get("scale") != new.get("scale"):
+            diff["scaled"].append(product_id)
+        if any(old.get(key) != new.get(key) for key in PHYSICS_KEYS):
+            diff["physics"].append(product_id)
+
+    diff["removed"] = [product_id for product_id in old_data if product_id not in new_data]
+    return diff
+
+
+def merge_catalog_edits(placed_data, diff, edited_data):
+    """
+    Apply catalog edits to the catalog as placed, keeping what placement changed elsewhere.
+
+    The placed catalog can differ from the catalog it came from (randomized
+    rotations, a sampled layout). Only the fields a catalog edit touched are
+    taken from the edited catalog, so e.g. a moved product keeps its
+    randomized rotation and untouched products keep their layout pose.
+
+    Args:
+        placed_data (dict or CompactCatalog): Catalog as currently placed
+        diff (dict): diff_catalogs(catalog the placement came from, edited_data)
+        edited_data (dict or CompactCatalog): Edited catalog
+
+    Returns:
+        dict: The placed catalog with the edits applied (placed_data is not modified)
+    """
+    merged = dict(placed_data.items())
+    for product_id in diff["removed"]:
+        merged.pop(product_id, None)
+    for product_id in diff["added"] + diff["replaced"]:
+        merged[product_id] = edited_data[product_id]
+
+    field_edits = (("moved", ("translate",)), ("rotated", ROTATION_KEYS), ("scaled", ("scale",)),
+                   ("physics", PHYSICS_KEYS))
+    for kind, keys in field_edits:
+        for product_id in diff[kind]:
+            # A product left out of the placement (e.g. a removed facing) stays out
+            if product_id not in merged:
+                continue
+            edited, data = edited_data[product_id], dict(merged[product_id])
+            for key in keys:
+                if key in edited:
+                    data[key] = edited[key]
+                else:
+                    data.pop(key, None)
+            merged[product_id] = data
+    return merged
+
+
+def count_changes(diff):
+    """Return the number of distinct products touched by a diff."""
+    return len({product_id for kind in DIFF_KINDS for product_id in diff[kind]})
+
+
+def format_diff(diff):
+    """Return a one-line summary of a diff, e.g. '2 moved, 1 added'."""
+    parts = [f"{len(diff[kind])} {kind}" for kind in DIFF_KINDS if diff[kind]]
+    return ", ".join(parts) if parts else "no changes"
+
+
+def is_defined_outside(stage, layer, path):
+    """
+    True if the stage's layer stack has opinions about path in a layer other
+    than the given one (e.g. a prebuilt product layer from the build cache).
+    Opinions from the product's own payload don't count.
+    """
+    prim = stage.GetPrimAtPath(path)
+    if not prim:
+        return False
+    layer_stack = set(stage.GetLayerStack())
+    return any(spec.layer != layer and spec.layer in layer_stack for spec in prim.GetPrimStack())
+
+
+def remove_product_spec(layer, path, deactivate=False):
+    """
+    Remove a product from the layer.
+
+    The product's spec is deleted from the layer; if the product is also
+    defined in a weaker layer, an 'over' with active = false hides it.
+    """
+    path = Sdf.Path(path)
+    prim_spec = layer.GetPrimAtPath(path)
+    if prim_spec:
+        del layer.GetPrimAtPath(path.GetParentPath()).nameChildren[path.name]
+    if deactivate:
+        Sdf.CreatePrimInLayer(layer, path).active = False
+
+
+def collect_collision_meshes(stage, paths):
+    """Return the paths of the Mesh children with collision schemas under the given product paths."""
+    mesh_paths = []
+    for path in paths:
+        prim = stage.GetPrimAtPath(path)
+        if not prim or prim.IsInstance():
+            continue
+        for child_prim in prim.GetAllChildren():
+            if child_prim.GetTypeName() == "Mesh" and "PhysicsCollisionAPI" in child_prim.GetAppliedSchemas():
+                mesh_paths.append(child_prim.GetPath())
+    return mesh_paths
+
+
+def apply_catalog_diff(stage, layer, diff, old_data, new_data, enable_physics=True,
+                       force_collision=True, root_path=SHELF_ROOT_PATH):
+    """
+    Apply a catalog diff to the products in an open stage.
+
+    Only the changed products are touched and every edit is written to the
+    layer inside one Sdf.ChangeBlock. Products that live in a weaker layer
+    (e.g. a prebuilt product layer from the build cache) are edited through
+    'over' specs in this layer.
+
+    Args:
+        stage (Usd.Stage): Stage the products were placed into
+        layer (Sdf.Layer): Layer to author into (usually the stage's edit target)
+        diff (dict): Result of diff_catalogs(old_data, new_data)
+        old_data (dict or CompactCatalog): Catalog that is currently placed
+        new_data (dict or CompactCatalog): Edited catalog (asset paths as they should be authored)
+        enable_physics (bool): Global physics switch (ENABLE_PHYSICS_FOR_ALL)
+        force_collision (bool): Add collision APIs (FORCE_COLLISION_FOR_PHYSICS)
+        root_path (str): Shelf root prim path
+
+    Returns:
+        dict: Number of products applied per change kind, plus "failed" and
+            "physics_paths" (products that now need mesh-level collision)
+    """
+    counts = {kind: 0 for kind in DIFF_KINDS}
+    counts["failed"] = 0
+    physics_paths = []
+
+    def get_path(data, product_id):
+        return get_product_path(product_id, data, root_path)
+
+    def wants_physics(data):
+        return data.get("physics_enabled", False) and enable_physics
+
+    # Everything that reads the composed stage happens before the change block
+    removed_paths = {product_id: get_path(old_data[product_id], product_id)
+                     for product_id in diff["removed"] + diff["replaced"]}
+    added_ids = diff["replaced"] + diff["added"]
+    new_paths = {product_id: get_path(new_data[product_id], product_id) for product_id in added_ids}
+    defined_outside = {path for path in list(removed_paths.values()) + list(new_paths.values())
+                       if is_defined_outside(stage, layer, path)}
+    physics_off = [get_path(new_data[pid], pid) for pid in diff["physics"] if not wants_physics(new_data[pid])]
+    stale_meshes = collect_collision_meshes(stage, physics_off)
+    defined_outside.update(path for path in physics_off + stale_meshes if is_defined_outside(stage, layer, path))
+
+    with Sdf.ChangeBlock():
+        for product_id, path in removed_paths.items():
+            remove_product_spec(layer, path, deactivate=path in defined_outside)
+            counts["removed"] += product_id in diff["removed"]
+
+        if added_ids:
+            author_hierarchy_to_layer(layer, {pid: new_data[pid] for pid in added_ids}, root_path)
+        for product_id in added_ids:
+            data = new_data[product_id]
+            path = new_paths[product_id]
+            try:
+                author_product_spec(layer, product_id, data, enable_physics, force_collision, root_path)
+            except Exception as e:
+                print(f"Error authoring product {product_id}: {str(e)}")
+                counts["failed"] += 1
+                continue
+            prim_spec = layer.GetPrimAtPath(path)
+            if path in defined_outside:
+                # Replace, don't extend, what the weaker layer says about this prim
+                prim_spec.active = True
+                prim_spec.payloadList.explicitItems = [Sdf.Payload(data["asset"])]
+                if not wants_physics(data):
+                    clear_physics_specs(prim_spec, block=True)
+            counts["replaced" if product_id in diff["replaced"] else "added"] += 1
+            if wants_physics(data):
+                physics_paths.append(path)
+
+        transform_ids = dict.fromkeys(diff["moved"] + diff["rotated"] + diff["scaled"] + diff["physics"])
+        for product_id in transform_ids:
+            data = new_data[product_id]
+            prim_spec = Sdf.CreatePrimInLayer(layer, get_path(data, product_id))
+            try:
+                if product_id in diff["rotated"]:
+                    # The rotation op may change (rotateZYX <-> orient), so rewrite the whole op stack
+                    translate, rotation, scale = convert_transform(data)
+                    for op_name in ROTATION_OPS:
+                        if not rotation or op_name != rotation[0]:
+                            remove_attribute_spec(prim_spec, op_name)
+                    set_transform_specs(prim_spec, (translate, rotation, scale))
+                    counts["rotated"] += 1
+                else:
+                    # Single op edits keep everything else (e.g. a randomized rotation) as placed
+                    if product_id in diff["moved"]:
+                        set_attribute_spec(prim_spec, "xformOp:translate", Sdf.ValueTypeNames.Double3,
+                                           Gf.Vec3d(*data["translate"]))
+                    if product_id in diff["scaled"]:
+                        set_attribute_spec(prim_spec, "xformOp:scale", Sdf.ValueTypeNames.Float3,
+                                           Gf.Vec3f(*data["scale"]))
+                counts["moved"] += product_id in diff["moved"]
+                counts["scaled"] += product_id in diff["scaled"]
+
+                if product_id in diff["physics"]:
+                    if wants_physics(data):
+                        # A static product placed instanceable needs its own meshes for collision
+                        if prim_spec.instanceable:
+                            prim_spec.instanceable = False
+                        set_physics_specs(prim_spec, data, force_collision)
+                        physics_paths.append(prim_spec.path)
+                    else:
+                        clear_physics_specs(prim_spec, block=str(prim_spec.path) in defined_outside)
+                    counts["physics"] += 1
+            except Exception as e:
+                print(f"Error updating product {product_id}: {str(e)}")
+                counts["failed"] += 1
+
+        for mesh_path in stale_meshes:
+            mesh_spec = Sdf.CreatePrimInLayer(layer, mesh_path)
+            remove_api_schemas(mesh_spec, MESH_COLLISION_SCHEMAS)
+            if mesh_path in defined_outside:
+                set_attribute_spec(mesh_spec, "physics:collisionEnabled", Sdf.ValueTypeNames.Bool, Sdf.ValueBlock())
+            else:
+                remove_attribute_spec(mesh_spec, "physics:collisionEnabled")
+
+    counts["physics_paths"] = physics_paths
+    return counts
+
+
+class CatalogWatcher:
+    """Detect changes to a catalog file (or .npy directory) by polling its modification time."""
+
+    def __init__(self, path, interval=1.0):
+        """
+        Args:
+            path (str or Path): Catalog file or directory to watch
+            interval (float): Minimum seconds between two checks of the file system
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.last_check = 0.0
+        self.signature = self.get_signature()
+
+    def get_signature(self):
+        """Return (mtime_ns, size) of the catalog (summed over the files of a directory), None if missing."""
+        try:
+            paths = list(self.path.iterdir()) if self.path.is_dir() else [self.path]
+            stats = [os.stat(path) for path in paths]
+        except FileNotFoundError:
+            return None
+        return max(s.st_mtime_ns for s in stats), sum(s.st_size for s in stats)
+
+    def poll(self):
+        """
+        Check the catalog for changes; cheap enough to call every frame.
+
+        Returns:
+            bool: True once per change (never while the file is missing)
+        """
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return False
+        self.last_check = now
+        signature = self.get_signature()
+        if signature is None or signature == self.signature:
+            return False
+        self.signature = signature
+        return True
+
+    def run(self, callback, stop_event=None, settle=0.2):
+        """
+        Call callback() after every change until stop_event is set (blocking, for headless use).
+
+        Args:
+            callback (callable): Called with no arguments after each change
+            stop_event (threading.Event): Stops the loop when set, None = run forever
+            settle (float): Seconds to wait after a change so the editor finishes writing
+        """
+        while stop_event is None or not stop_event.is_set():
+            if self.poll():
+                time.sleep(settle)
+                self.signature = self.get_signature()
+                callback()
+            time.sleep(self.interval)
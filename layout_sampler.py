@@ -0,0 +1,319 @@
+"""
+Collision-Free Layout Sampler for the Dynamic Shop Placer
+
+Domain randomization for whole-store layouts: every product is jittered in
+position and yaw within its shelf slot, and optionally the facing count of
+each shelf category is varied. The result is guaranteed to be free of
+intersecting products (as check_overlaps in overlap_checker.py sees them),
+so a new layout can be generated on every RL episode reset without PhysX
+depenetration on the first frame.
+
+How it works:
+- A product's slot is its catalog pose: the pivot may move up to
+  position_jitter along the shelf plane and turn up to yaw_range degrees
+  around the up axis, and its box must stay inside its shelf's bounds.
+- The spatial index is built once per catalog. The swept box of every product
+  (every pose its slot allows) goes through the spatial hash of
+  find_candidate_pairs, and the resulting pairs are the only neighbours a
+  product can ever collide with.
+- Each episode is batched rejection sampling. All products draw a pose at
+  once, the separating-axis test runs over their neighbour pairs, and every
+  product that collides with an accepted neighbour (or with a lower-indexed
+  candidate, or leaves its shelf) draws again. Only the rejected products
+  are redrawn in the next round.
+- Products still rejected after max_rounds go back to their catalog pose,
+  and so does any jittered neighbour they then collide with. The catalog
+  itself is collision-free, so this always terminates with a valid layout.
+
+Like RandomizationEngine, every episode has its own generator derived from
+(seed, episode), so any layout can be replayed. Only NumPy is required.
+
+Usage:
+    extents = SkuExtentCache("sku_extents.json").get_extents(PRODUCT_DATA)
+    sampler = LayoutSampler(PRODUCT_DATA, extents, position_jitter=0.02, yaw_range=10.0, seed=42)
+    layout = sampler.sample(episode=17)
+    product_data = sampler.apply(PRODUCT_DATA, layout)
+"""
+
+import numpy as np
+
+from compact_catalog import CompactCatalog, ROTATION_ORIENT
+from overlap_checker import (DEFAULT_TOLERANCE, UP_AXIS, find_candidate_pairs, get_product_boxes,
+                             quaternions_to_matrices, separating_axis_depths)
+
+RANDOMIZATION_MODES = ("rotations", "layout")
+DEFAULT_MAX_ROUNDS = 8  # Rejection rounds before the remaining products keep their catalog pose
+PLANE_AXES = [axis for axis in range(3) if axis != UP_AXIS]
+
+
+def quaternion_multiply(first, second):
+    """Hamilton product of (n, 4) quaternions (w, x, y, z): the rotation `second` followed by `first`."""
+    w1, v1 = first[:, 0], first[:, 1:]
+    w2, v2 = second[:, 0], second[:, 1:]
+    return np.concatenate([(w1 * w2 - np.einsum("ni,ni->n", v1, v2))[:, None],
+                           w1[:, None] * v2 + w2[:, None] * v1 + np.cross(v1, v2)], axis=1)
+
+
+def yaw_quaternions(angles):
+    """Quaternions (w, x, y, z) of rotations by `angles` degrees around the up axis."""
+    half = np.radians(angles) / 2.0
+    quaternions = np.zeros((len(half), 4))
+    quaternions[:, 0] = np.cos(half)
+    quaternions[:, 1 + UP_AXIS] = np.sin(half)
+    return quaternions
+
+
+def get_catalog_rows(product_data, product_ids):
+    """Return the instance rows of some products of a CompactCatalog."""
+    index = product_data.get_index()
+    return np.array([index[product_id] for product_id in product_ids], dtype=np.int64)
+
+
+def get_slot_labels(product_data, product_ids):
+    """
+    Return the shelf level and the (shelf level, category) group of some products.
+
+    Returns:
+        tuple: (shelves, groups) string arrays, one entry per product ID
+    """
+    if isinstance(product_data, CompactCatalog):
+        # Label the (small) SKU table once, then gather per product
+        skus = product_data.skus
+        sku_groups = np.array([f"{shelf}/{category}" for shelf, category in
+                               zip(skus["shelf"].tolist(), skus["category"].tolist())], dtype=str)
+        sku_rows = product_data.instances["sku"][get_catalog_rows(product_data, product_ids)]
+        return skus["shelf"][sku_rows], sku_groups[sku_rows]
+    shelves = [product_data[product_id]["shelf"] for product_id in product_ids]
+    categories = [product_data[product_id]["category"] for product_id in product_ids]
+    return (np.array(shelves, dtype=str),
+            np.array([f"{shelf}/{category}" for shelf, category in zip(shelves, categories)], dtype=str))
+
+
+class LayoutSampler:
+    """Batched rejection sampler for collision-free whole-store layouts."""
+
+    def __init__(self, product_data, sku_extents, position_jitter=0.02, yaw_range=10.0, min_facings=None,
+                 shelf_bounds=None, shelf_margin=0.0, seed=None, max_rounds=DEFAULT_MAX_ROUNDS,
+                 tolerance=DEFAULT_TOLERANCE):
+        """
+        Args:
+            product_data (dict or CompactCatalog): Catalog whose poses define the slots (not modified)
+            sku_extents (dict): asset -> (min, max) local extents (SkuExtentCache.get_extents)
+            position_jitter (float or sequence): Max pivot offset; a float applies to both shelf-plane
+                axes, a sequence gives the offset per axis (stage units)
+            yaw_range (float): Max turn around the up axis (degrees)
+            min_facings (int): Each shelf category keeps between min_facings and all of its
+                products (drawn per episode), None = keep every product
+            shelf_bounds (dict): shelf level -> (min, max) points in the catalog frame, None = the
+                bounds of the shelf's products in the catalog, grown by shelf_margin
+            shelf_margin (float): Growth of the default shelf bounds along the shelf plane
+            seed (int): Seed for reproducible layouts, None = fresh OS entropy (kept in self.seed)
+            max_rounds (int): Rejection rounds per layout
+            tolerance (float): Penetration depth still accepted (as in check_overlaps)
+        """
+        self.product_data = product_data
+        self.max_rounds = max_rounds
+        self.tolerance = tolerance
+        self.min_facings = min_facings
+        self.yaw_range = float(yaw_range)
+        if np.ndim(position_jitter) == 0:
+            self.jitter = np.zeros(3)
+            self.jitter[PLANE_AXES] = position_jitter
+        else:
+            self.jitter = np.asarray(position_jitter, dtype=np.float64).reshape(3)
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.rng = np.random.default_rng(self.seed)
+
+        boxes = get_product_boxes(product_data, sku_extents)
+        self.product_ids = boxes["product_ids"]
+        self.skipped = boxes["skipped"]
+        self.pivots = boxes["pivots"]
+        self.quaternions = boxes["quaternions"]
+        self.axes = boxes["axes"]
+        self.half_extents = boxes["half_extents"]
+        self.offsets = boxes["centers"] - self.pivots  # Box center relative to the pivot
+        self.reach = np.einsum("nij,nj->ni", np.abs(self.axes), self.half_extents)
+
+        shelves, groups = get_slot_labels(product_data, self.product_ids)
+        shelf_names, self.shelf_index = np.unique(shelves, return_inverse=True)
+        _, self.group_index = np.unique(groups, return_inverse=True)
+        self.shelf_bounds = self.get_shelf_bounds(shelf_names, shelf_bounds, shelf_margin)
+        self.first, self.second = self.find_neighbours()
+        if isinstance(product_data, CompactCatalog):
+            self.catalog_rows = get_catalog_rows(product_data, self.product_ids)
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def get_shelf_bounds(self, shelf_names, shelf_bounds, shelf_margin):
+        """Return the (shelves, 2, 3) bounds products must stay inside (only the shelf-plane axes count)."""
+        bounds = np.empty((len(shelf_names), 2, 3))
+        for row, shelf in enumerate(shelf_names):
+            if shelf_bounds and shelf in shelf_bounds:
+                bounds[row] = np.asarray(shelf_bounds[shelf], dtype=np.float64)
+                continue
+            on_shelf = self.shelf_index == row
+            centers = self.pivots[on_shelf] + self.offsets[on_shelf]
+            bounds[row, 0] = (centers - self.reach[on_shelf]).min(axis=0) - shelf_margin
+            bounds[row, 1] = (centers + self.reach[on_shelf]).max(axis=0) + shelf_margin
+        return bounds
+
+    def find_neighbours(self):
+        """
+        Build the spatial index: every pair of products whose slots can put them in contact.
+
+        Returns:
+            tuple: (first, second) index arrays of the neighbour pairs
+        """
+        centers = self.pivots + self.offsets
+        sweep = self.reach + self.jitter
+        if self.yaw_range:
+            # Turning around the pivot keeps every point within this distance of it in the shelf plane
+            radius = (np.linalg.norm(self.offsets[:, PLANE_AXES], axis=1)
+                      + np.linalg.norm(self.reach[:, PLANE_AXES], axis=1))
+            centers = centers.copy()
+            centers[:, PLANE_AXES] = self.pivots[:, PLANE_AXES]
+            sweep[:, PLANE_AXES] = radius[:, None] + self.jitter[PLANE_AXES]
+        return find_candidate_pairs(centers - sweep, centers + sweep)
+
+    def episode_rng(self, episode):
+        """Return the generator of one episode; the same (seed, episode) always samples the same layout."""
+        return np.random.default_rng([self.seed, episode])
+
+    def draw_facings(self, rng):
+        """Return which products are kept, with a random facing count per shelf category."""
+        count = len(self)
+        if self.min_facings is None or not count:
+            return np.ones(count, dtype=bool)
+        # Rank the products of each group in a random order and keep the first k of every group
+        order = np.lexsort((rng.random(count), self.group_index))
+        group_sizes = np.bincount(self.group_index)
+        group_starts = np.cumsum(group_sizes) - group_sizes
+        ranks = np.empty(count, dtype=np.int64)
+        ranks[order] = np.arange(count) - group_starts[self.group_index[order]]
+        lowest = np.minimum(self.min_facings, group_sizes)
+        kept_counts = rng.integers(lowest, group_sizes + 1)
+        return ranks < kept_counts[self.group_index]
+
+    def find_collisions(self, centers, axes, reach, pair_mask):
+        """Return the neighbour pairs selected by pair_mask that intersect in the given poses."""
+        rows = np.flatnonzero(pair_mask)
+        first, second = self.first[rows], self.second[rows]
+        touching = np.all(np.abs(centers[first] - centers[second]) <= reach[first] + reach[second], axis=1)
+        first, second = first[touching], second[touching]
+        depth, _ = separating_axis_depths(centers, axes, self.half_extents, first, second)
+        hit = depth > self.tolerance
+        return first[hit], second[hit]
+
+    def sample(self, episode=None):
+        """
+        Sample one collision-free layout.
+
+        Args:
+            episode (int): Sample from the episode's own generator (replayable), None = sampler stream
+
+        Returns:
+            dict: indices (kept rows of self.product_ids), product_ids (kept), removed (IDs
+                dropped by the facing count), translate (k, 3), orient (k, 4) w,x,y,z,
+                rounds, rejected (rejected draws), reset (products left at their catalog pose)
+        """
+        rng = self.rng if episode is None else self.episode_rng(episode)
+        count = len(self)
+        kept = self.draw_facings(rng)
+        active_pairs = kept[self.first] & kept[self.second]
+
+        translate = self.pivots.copy()
+        yaw = np.zeros(count)
+        centers = self.pivots + self.offsets
+        axes = self.axes.copy()
+        reach = self.reach.copy()
+        pending = kept.copy()
+        rejected = 0
+        rounds = 0
+        while rounds < self.max_rounds and pending.any():
+            rounds += 1
+            rows = np.flatnonzero(pending)
+            translate[rows] = self.pivots[rows] + rng.uniform(-1.0, 1.0, (len(rows), 3)) * self.jitter
+            yaw[rows] = rng.uniform(-self.yaw_range, self.yaw_range, len(rows)) if self.yaw_range else 0.0
+            turn = quaternions_to_matrices(yaw_quaternions(yaw[rows]))
+            axes[rows] = turn @ self.axes[rows]
+            centers[rows] = translate[rows] + np.einsum("nij,nj->ni", turn, self.offsets[rows])
+            reach[rows] = np.einsum("nij,nj->ni", np.abs(axes[rows]), self.half_extents[rows])
+
+            bounds = self.shelf_bounds[self.shelf_index[rows]]
+            outside = np.any((centers[rows] - reach[rows] < bounds[:, 0])[:, PLANE_AXES]
+                             | (centers[rows] + reach[rows] > bounds[:, 1])[:, PLANE_AXES], axis=1)
+            first, second = self.find_collisions(centers, axes, reach,
+                                                 active_pairs & (pending[self.first] | pending[self.second]))
+            # Against an accepted neighbour the candidate goes; between two candidates the later one
+            reject = np.zeros(count, dtype=bool)
+            reject[rows[outside]] = True
+            reject[second[pending[second]]] = True
+            reject[first[pending[first] & ~pending[second]]] = True
+            rejected += int(reject.sum())
+            pending = reject
+
+        # Whatever is left keeps its catalog pose, and so does every jittered neighbour it then hits
+        at_catalog = np.zeros(count, dtype=bool)
+        changed = pending
+        while changed.any():
+            rows = np.flatnonzero(changed)
+            translate[rows] = self.pivots[rows]
+            yaw[rows] = 0.0
+            axes[rows] = self.axes[rows]
+            centers[rows] = self.pivots[rows] + self.offsets[rows]
+            reach[rows] = self.reach[rows]
+            at_catalog |= changed
+            first, second = self.find_collisions(centers, axes, reach,
+                                                 active_pairs & (changed[self.first] | changed[self.second]))
+            changed = np.zeros(count, dtype=bool)
+            changed[first] = True
+            changed[second] = True
+            changed &= ~at_catalog  # Two catalog poses that touch are the catalog's own overlap
+
+        indices = np.flatnonzero(kept)
+        return {
+            "indices": indices,
+            "product_ids": list(self.product_ids) if len(indices) == count else
+            [self.product_ids[row] for row in indices],
+            "removed": [self.product_ids[row] for row in np.flatnonzero(~kept)],
+            "translate": translate[indices],
+            "orient": quaternion_multiply(yaw_quaternions(yaw[indices]), self.quaternions[indices]),
+            "rounds": rounds,
+            "rejected": rejected,
+            "reset": int(at_catalog.sum()),
+        }
+
+    def apply(self, product_data, layout):
+        """
+        Return a copy of the catalog with a layout applied (the input is not modified).
+
+        Kept products get the sampled translate and an orient (their rotate is
+        dropped), products removed by the facing count are left out, and
+        products the sampler skipped keep their entries.
+
+        Args:
+            product_data (dict or CompactCatalog): The catalog the sampler was built from
+            layout (dict): Result of sample()
+        """
+        if isinstance(product_data, CompactCatalog):
+            instances = np.array(product_data.instances)
+            rows = self.catalog_rows[layout["indices"]]
+            instances["translate"][rows] = layout["translate"]
+            instances["rotation_kind"][rows] = ROTATION_ORIENT
+            instances["rotation"][rows] = layout["orient"]
+            keep = np.ones(len(instances), dtype=bool)
+            if layout["removed"]:
+                index = product_data.get_index()
+                keep[[index[product_id] for product_id in layout["removed"]]] = False
+                return CompactCatalog(product_data.skus, product_data.product_ids[keep], instances[keep])
+            return product_data.with_instances(instances)
+
+        removed = set(layout["removed"])
+        laid_out = {product_id: data for product_id, data in product_data.items() if product_id not in removed}
+        for product_id, translate, orient in zip(layout["product_ids"], layout["translate"].tolist(),
+                                                 layout["orient"].tolist()):
+            data = dict(laid_out[product_id], translate=translate, orient=orient)
+            data.pop("rotate", None)
+            laid_out[product_id] = data
+        return laid_out
@@ -0,0 +1,94 @@
+"""
+Orientation Normalization for the Dynamic Shop Placer
+
+The catalog mixes two rotation representations: 'rotate' (Euler degrees,
+authored as xformOp:rotateZYX) and 'orient' (a w, x, y, z quaternion,
+authored as xformOp:orient), and randomization can switch a product from
+one to the other. The stage then holds two different xformOp schemas, and
+products without either key get no rotation op at all.
+
+normalize_orientations() converts every rotation of a catalog to a
+quaternion in one vectorized NumPy pass, so every product is authored with
+the same translate / orient / scale op stack. Pass mode "original" to keep
+the catalog's own representation.
+
+Usage:
+    from orientation import normalize_orientations
+    product_data = normalize_orientations(product_data)  # every product has 'orient'
+"""
+
+import numpy as np
+
+from compact_catalog import CompactCatalog, ROTATION_EULER, ROTATION_NONE, ROTATION_ORIENT
+
+ORIENTATION_MODES = ("quaternion", "original")
+IDENTITY_QUATERNION = (1.0, 0.0, 0.0, 0.0)
+
+
+def euler_zyx_to_quaternions(angles):
+    """
+    Convert rotateZYX Euler angles to quaternions.
+
+    Matches xformOp:rotateZYX (X applied first, then Y, then Z), i.e. the
+    same rotation as point_instancer_placement.product_orientation.
+
+    Args:
+        angles (array-like): (n, 3) rotations in degrees (x, y, z)
+
+    Returns:
+        np.ndarray: (n, 4) float64 unit quaternions (w, x, y, z)
+    """
+    half = np.radians(np.asarray(angles, dtype=np.float64).reshape(-1, 3)) / 2.0
+    cos_x, cos_y, cos_z = np.cos(half).T
+    sin_x, sin_y, sin_z = np.sin(half).T
+    return np.stack([
+        cos_x * cos_y * cos_z - sin_x * sin_y * sin_z,
+        sin_x * cos_y * cos_z + cos_x * sin_y * sin_z,
+        cos_x * sin_y * cos_z - sin_x * cos_y * sin_z,
+        cos_x * cos_y * sin_z + sin_x * sin_y * cos_z,
+    ], axis=1)
+
+
+def normalize_orientations(product_data, mode="quaternion"):
+    """
+    Return the catalog with every rotation as an 'orient' quaternion.
+
+    Euler rotations are converted in one batch; products without a rotation
+    get the identity quaternion. Entries with a malformed 'rotate' are kept
+    as they are, so placement still reports them.
+
+    Args:
+        product_data (dict or CompactCatalog): Product data (product_id -> data)
+        mode (str): "quaternion" to normalize, "original" to return the catalog unchanged
+
+    Returns:
+        dict or CompactCatalog: Same type as product_data (the input is not modified)
+    """
+    if mode not in ORIENTATION_MODES:
+        raise ValueError(f"Unknown orientation mode '{mode}', expected one of {ORIENTATION_MODES}")
+    if mode == "original":
+        return product_data
+
+    if isinstance(product_data, CompactCatalog):
+        instances = np.array(product_data.instances)
+        kinds = instances["rotation_kind"]
+        euler_rows = kinds == ROTATION_EULER
+        instances["rotation"][euler_rows] = euler_zyx_to_quaternions(instances["rotation"][euler_rows, :3])
+        instances["rotation"][kinds == ROTATION_NONE] = IDENTITY_QUATERNION
+        instances["rotation_kind"] = ROTATION_ORIENT
+        return product_data.with_instances(instances)
+
+    euler_ids = [product_id for product_id, data in product_data.items()
+                 if "rotate" in data and len(data["rotate"]) == 3]
+    quaternions = euler_zyx_to_quaternions([product_data[product_id]["rotate"] for product_id in euler_ids])
+    converted = dict(zip(euler_ids, quaternions.tolist()))
+
+    normalized = {}
+    for product_id, data in product_data.items():
+        if product_id in converted:
+            data = {key: value for key, value in data.items() if key != "rotate"}
+            data["orient"] = converted[product_id]
+        elif "rotate" not in data and "orient" not in data:
+            data = dict(data, orient=list(IDENTITY_QUATERNION))
+        normalized[product_id] = data
+    return normalized
@@ -0,0 +1,521 @@
+"""
+Pre-Simulation Overlap Checker for the Dynamic Shop Placer
+
+Randomized rotations and hand-edited translates can leave products
+interpenetrating, which PhysX resolves with an explosive depenetration on
+the first simulated frame. This module finds every intersecting pair before
+the simulation starts, from the catalog alone:
+
+- Every product is an oriented bounding box (OBB): the local extents of its
+  asset (computed once per SKU and cached, see SkuExtentCache) put through
+  the product's translate / rotation / scale.
+- A uniform-grid spatial hash finds candidate pairs. The cell size is at
+  least the largest box, so each box is hashed into the cell of its min
+  corner and only meets boxes in its own cell and the 13 forward neighbour
+  cells. The cost is O(n + candidates), not O(n^2).
+- Candidates whose axis-aligned boxes touch get an exact separating-axis
+  test (15 axes), vectorized over all pairs at once. It also yields the
+  penetration depth and direction.
+
+resolve_overlaps() fixes what it finds. It either resets an offending
+product to its catalog pose (e.g. undoes a randomization) or nudges it
+sideways along the shelf until the pair separates.
+
+Boxes are compared in the catalog's frame (the products' parent scopes),
+which is the same for every product. Only NumPy is required. Computing
+extents from the assets needs pxr (usd-core or Isaac Sim).
+
+Usage:
+    extents = SkuExtentCache("sku_extents.json").get_extents(PRODUCT_DATA)
+    report = check_overlaps(product_data, extents)
+    product_data, report = resolve_overlaps(product_data, extents, reference_data=PRODUCT_DATA)
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from compact_catalog import CompactCatalog, ROTATION_EULER, ROTATION_ORIENT
+from orientation import euler_zyx_to_quaternions
+
+DEFAULT_TOLERANCE = 0.001  # Penetration (stage units) still accepted, e.g. products resting against each other
+RESOLUTION_MODES = ("reset", "nudge")
+OVERLAP_CHECK_MODES = ("report",) + RESOLUTION_MODES
+UP_AXIS = 2  # Nudges stay in the shelf plane (the shop is Z-up)
+
+# Forward neighbour cells (the other 13 of the 26 are covered from the neighbour's side)
+FORWARD_OFFSETS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                   if (dx, dy, dz) > (0, 0, 0)]
+
+
+class SkuExtentCache:
+    """Local-space bounding boxes of product assets, computed once per asset and optionally kept on disk."""
+
+    def __init__(self, path=None, resolve=None):
+        """
+        Args:
+            path (str or Path): JSON file the extents are kept in, None = memory only
+            resolve (callable): asset -> local path to open instead (e.g. AssetCache.resolve), None = open as is
+        """
+        self.path = Path(path) if path else None
+        self.resolve = resolve
+        self.extents = {}
+        if self.path and self.path.exists():
+            with open(self.path, 'r') as f:
+                self.extents = {asset: np.array(extent) for asset, extent in json.load(f).items()}
+
+    def get_extents(self, product_data):
+        """
+        Return the local extents of every asset the catalog uses.
+
+        Args:
+            product_data (dict or CompactCatalog): Catalog whose assets are needed
+
+        Returns:
+            dict: asset -> (2, 3) array (min, max); assets that could not be opened are left out
+        """
+        if isinstance(product_data, CompactCatalog):
+            assets = product_data.get_assets()
+        else:
+            assets = sorted({data["asset"] for data in product_data.values()})
+        missing = [asset for asset in assets if asset not in self.extents]
+        for asset in missing:
+            extent = compute_asset_extent((self.resolve and self.resolve(asset)) or asset)
+            if extent is None:
+                print(f"Warning: could not compute the extent of {asset}, its products are not checked")
+                continue
+            self.extents[asset] = extent
+        if missing and self.path:
+            self.save()
+        return {asset: self.extents[asset] for asset in assets if asset in self.extents}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({asset: extent.tolist() for asset, extent in self.extents.items()}, f, indent=2)
+
+
+def compute_asset_extent(asset):
+    """
+    Compute an asset's bounding box in the space of its default prim.
+
+    The product prim authors its own xformOps over the default prim's, so
+    the default prim's transform is not part of the extent.
+
+    Returns:
+        np.ndarray: (2, 3) array (min, max), or None if the asset has no geometry or cannot be opened
+    """
+    from pxr import Usd, UsdGeom
+    try:
+        stage = Usd.Stage.Open(asset)
+    except Exception:
+        return None
+    prim = stage.GetDefaultPrim() if stage else None
+    if not prim:
+        return None
+    bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_, UsdGeom.Tokens.render],
+                                   useExtentsHint=True)
+    bound_range = bbox_cache.ComputeUntransformedBound(prim).ComputeAlignedRange()
+    if bound_range.IsEmpty():
+        return None
+    return np.array([bound_range.GetMin(), bound_range.GetMax()])
+
+
+def quaternions_to_matrices(quaternions):
+    """
+    Convert (n, 4) unit quaternions (w, x, y, z) to (n, 3, 3) rotation matrices.
+
+    Columns are the rotated local X, Y and Z axes (column-vector convention).
+    """
+    w, x, y, z = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4).T
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1),
+    ], axis=1)
+
+
+def get_catalog_arrays(product_data):
+    """
+    Return the transform arrays of a catalog.
+
+    Returns:
+        dict: product_ids (list), assets (list of distinct assets), asset_index (n,
+            row into assets), translate (n, 3), quaternion (n, 4) and scale (n, 3). Products with a malformed rotation are left out
+            and listed in "skipped".
+    """
+    if isinstance(product_data, CompactCatalog):
+        instances = product_data.instances
+        kinds = instances["rotation_kind"]
+        quaternions = np.tile([1.0, 0.0, 0.0, 0.0], (len(instances), 1))
+        quaternions[kinds == ROTATION_ORIENT] = instances["rotation"][kinds == ROTATION_ORIENT]
+        euler_rows = kinds == ROTATION_EULER
+        quaternions[euler_rows] = euler_zyx_to_quaternions(instances["rotation"][euler_rows, :3])
+        return {
+            "product_ids": product_data.product_ids.tolist(),
+            "assets": product_data.skus["asset"].tolist(),
+            "asset_index": np.asarray(instances["sku"], dtype=np.int64),
+            "translate": np.array(instances["translate"]),
+            "quaternion": quaternions,
+            "scale": product_data.get_scales(),
+            "skipped": [],
+        }
+
+    product_ids, skipped = [], []
+    for product_id, data in product_data.items():
+        if len(data.get("rotate", (0, 0, 0))) == 3 and len(data.get("orient", (1, 0, 0, 0))) == 4:
+            product_ids.append(product_id)
+        else:
+            skipped.append(product_id)
+    entries = [product_data[product_id] for product_id in product_ids]
+    quaternions = np.tile([1.0, 0.0, 0.0, 0.0], (len(entries), 1))
+    euler_rows = [row for row, data in enumerate(entries) if "rotate" in data]
+    orient_rows = [row for row, data in enumerate(entries) if "rotate" not in data and "orient" in data]
+    if euler_rows:
+        quaternions[euler_rows] = euler_zyx_to_quaternions([entries[row]["rotate"] for row in euler_rows])
+    if orient_rows:
+        quaternions[orient_rows] = [entries[row]["orient"] for row in orient_rows]
+    asset_rows = {}
+    asset_index = np.array([asset_rows.setdefault(data["asset"], len(asset_rows)) for data in entries],
+                           dtype=np.int64)
+    return {
+        "product_ids": product_ids,
+        "assets": list(asset_rows),
+        "asset_index": asset_index,
+        "translate": np.array([data["translate"] for data in entries], dtype=np.float64).reshape(-1, 3),
+        "quaternion": quaternions,
+        "scale": np.array([data.get("scale", (1.0, 1.0, 1.0)) for data in entries], dtype=np.float64).reshape(-1, 3),
+        "skipped": skipped,
+    }
+
+
+def get_product_boxes(product_data, sku_extents):
+    """
+    Build the oriented bounding box of every product.
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog to check
+        sku_extents (dict): asset -> (min, max) local extents (SkuExtentCache.get_extents)
+
+    Returns:
+        dict: product_ids, centers (n, 3), axes (n, 3, 3; columns are the box axes),
+            half_extents (n, 3), the products' pivots (translate, n, 3) and
+            quaternions (n, 4), and the IDs of products without an extent or
+            with a malformed rotation in "skipped"
+    """
+    arrays = get_catalog_arrays(product_data)
+    # One lookup per distinct asset, then a gather per product
+    known = np.array([asset in sku_extents for asset in arrays["assets"]], dtype=bool)
+    asset_extents = np.array([sku_extents[asset] if asset in sku_extents else np.zeros((2, 3))
+                              for asset in arrays["assets"]], dtype=np.float64).reshape(-1, 2, 3)
+    has_extent = known[arrays["asset_index"]] if len(known) else np.zeros(0, dtype=bool)
+    skipped = arrays["skipped"] + [arrays["product_ids"][row] for row in np.flatnonzero(~has_extent)]
+    rows = np.flatnonzero(has_extent)
+    extents = asset_extents[arrays["asset_index"][rows]]
+
+    axes = quaternions_to_matrices(arrays["quaternion"][rows])
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)  # Tolerate slightly denormalized quaternions
+    scale = arrays["scale"][rows]
+    local_centers = (extents[:, 0] + extents[:, 1]) / 2.0 * scale
+    return {
+        "product_ids": arrays["product_ids"] if len(rows) == len(has_extent) else
+        [arrays["product_ids"][row] for row in rows],
+        "centers": arrays["translate"][rows] + np.einsum("nij,nj->ni", axes, local_centers),
+        "axes": axes,
+        "half_extents": np.abs((extents[:, 1] - extents[:, 0]) / 2.0 * scale),
+        "pivots": arrays["translate"][rows],
+        "quaternions": arrays["quaternion"][rows],
+        "skipped": skipped,
+    }
+
+
+def find_candidate_pairs(box_min, box_max, cell_size=None):
+    """
+    Find the pairs of axis-aligned boxes that intersect, with a uniform-grid spatial hash.
+
+    Args:
+        box_min (np.ndarray): (n, 3) box minima
+        box_max (np.ndarray): (n, 3) box maxima
+        cell_size (float): Grid cell size, None = the largest box dimension
+            (smaller values are raised to it, so each box spans at most 2 cells per axis)
+
+    Returns:
+        tuple: (first, second) index arrays with first < second
+    """
+    count = len(box_min)
+    if count < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    largest = float(np.max(box_max - box_min))
+    cell_size = max(cell_size or 0.0, largest, 1e-9)
+
+    cells = np.floor(box_min / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # Keep a free layer of cells around the occupied ones
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    # Work in key order: boxes of one cell are one run, and lookups and gathers stay cache-friendly
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    box_min, box_max = box_min[order], box_max[order]
+    cell_keys, cell_starts, cell_counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+
+    firsts, seconds = [], []
+    for offset in [(0, 0, 0)] + FORWARD_OFFSETS:
+        offset_key = (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        cells_found = np.minimum(np.searchsorted(cell_keys, sorted_keys + offset_key), len(cell_keys) - 1)
+        found = cell_keys[cells_found] == sorted_keys + offset_key
+        counts = np.where(found, cell_counts[cells_found], 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        first = np.repeat(np.arange(count), counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        second = np.repeat(cell_starts[cells_found], counts) + np.arange(total) - run_starts
+        if offset == (0, 0, 0):
+            keep = first < second  # Both orders of a same-cell pair are found
+            first, second = first[keep], second[keep]
+        overlapping = np.all((box_min[first] <= box_max[second]) & (box_min[second] <= box_max[first]), axis=1)
+        firsts.append(first[overlapping])
+        seconds.append(second[overlapping])
+
+    first = order[np.concatenate(firsts)] if firsts else np.empty(0, dtype=np.int64)
+    second = order[np.concatenate(seconds)] if seconds else np.empty(0, dtype=np.int64)
+    swap = first > second
+    first[swap], second[swap] = second[swap], first[swap]
+    return first, second
+
+
+def separating_axis_depths(centers, axes, half_extents, first, second):
+    """
+    Separating-axis test of box pairs (Ericson, Real-Time Collision Detection 4.4.1), vectorized.
+
+    Returns:
+        tuple: depth (m,) penetration along the best separating direction
+            (<= 0 = separated) and direction (m, 3) unit vectors pointing from
+            the first box to the second
+    """
+    axes_a, axes_b = axes[first], axes[second]
+    a, b = half_extents[first], half_extents[second]
+    offset = centers[second] - centers[first]
+    rotation = np.einsum("mki,mkj->mij", axes_a, axes_b)  # B's axes in A's frame
+    abs_rotation = np.abs(rotation) + 1e-12
+    t = np.einsum("mki,mk->mi", axes_a, offset)
+
+    depths, directions = [], []
+    for i in range(3):
+        # A's face normals
+        depths.append(a[:, i] + np.einsum("mj,mj->m", b, abs_rotation[:, i, :]) - np.abs(t[:, i]))
+        directions.append(axes_a[:, :, i])
+    for j in range(3):
+        # B's face normals
+        depths.append(np.einsum("mi,mi->m", a, abs_rotation[:, :, j]) + b[:, j]
+                      - np.abs(np.einsum("mi,mi->m", t, rotation[:, :, j])))
+        directions.append(axes_b[:, :, j])
+    for i in range(3):
+        i1, i2 = (i + 1) % 3, (i + 2) % 3
+        for j in range(3):
+            j1, j2 = (j + 1) % 3, (j + 2) % 3
+            # Edge-edge axes; parallel edges give no axis (the face tests cover them)
+            length = np.sqrt(np.maximum(1.0 - rotation[:, i, j] ** 2, 0.0))
+            usable = length > 1e-6
+            overlap = (a[:, i1] * abs_rotation[:, i2, j] + a[:, i2] * abs_rotation[:, i1, j]
+                       + b[:, j1] * abs_rotation[:, i, j2] + b[:, j2] * abs_rotation[:, i, j1]
+                       - np.abs(t[:, i2] * rotation[:, i1, j] - t[:, i1] * rotation[:, i2, j]))
+            depths.append(np.where(usable, overlap / np.where(usable, length, 1.0), np.inf))
+            directions.append(np.cross(axes_a[:, :, i], axes_b[:, :, j]) / np.where(usable, length, 1.0)[:, None])
+
+    depths = np.stack(depths, axis=1)
+    best = np.argmin(depths, axis=1)
+    rows = np.arange(len(first))
+    direction = np.stack(directions, axis=1)[rows, best]
+    direction *= np.where(np.einsum("mk,mk->m", direction, offset) < 0, -1.0, 1.0)[:, None]
+    return depths[rows, best], direction
+
+
+def check_overlaps(product_data, sku_extents, tolerance=DEFAULT_TOLERANCE, cell_size=None):
+    """
+    Find every pair of interpenetrating products.
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog to check
+        sku_extents (dict): asset -> (min, max) local extents
+        tolerance (float): Penetration depth still accepted (stage units)
+        cell_size (float): Spatial hash cell size, None = largest product
+
+    Returns:
+        dict: pairs - list of (product_id, product_id, depth), deepest first
+              directions - (k, 3) separation directions from the first product to the second
+              checked - number of products checked
+              candidates - pairs whose axis-aligned boxes touch
+              skipped - IDs of products without an extent or with a malformed rotation
+    """
+    boxes = get_product_boxes(product_data, sku_extents)
+    centers, axes, half_extents = boxes["centers"], boxes["axes"], boxes["half_extents"]
+    reach = np.einsum("nij,nj->ni", np.abs(axes), half_extents)
+    first, second = find_candidate_pairs(centers - reach, centers + reach, cell_size)
+
+    depth, direction = separating_axis_depths(centers, axes, half_extents, first, second)
+    overlapping = np.flatnonzero(depth > tolerance)
+    overlapping = overlapping[np.argsort(-depth[overlapping], kind="stable")]
+    product_ids = boxes["product_ids"]
+    return {
+        "pairs": [(product_ids[first[row]], product_ids[second[row]], float(depth[row])) for row in overlapping],
+        "directions": direction[overlapping],
+        "checked": len(product_ids),
+        "candidates": len(first),
+        "skipped": boxes["skipped"],
+    }
+
+
+def format_overlaps(report, limit=10):
+    """One line per intersecting pair (deepest first), at most `limit`."""
+    lines = [f"  {first} <-> {second}: {depth * 1000:.1f} mm" for first, second, depth in report["pairs"][:limit]]
+    if len(report["pairs"]) > limit:
+        lines.append(f"  ... and {len(report['pairs']) - limit} more")
+    return "\n".join(lines)
+
+
+def set_products(product_data, updates):
+    """
+    Return a copy of the catalog with some products replaced (the input is not modified).
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog to update
+        updates (dict): product_id -> new product dict (same asset, shelf and category)
+    """
+    if not isinstance(product_data, CompactCatalog):
+        return dict(product_data, **updates)
+
+    instances = np.array(product_data.instances)
+    index = product_data.get_index()
+    for product_id, data in updates.items():
+        instance = instances[index[product_id]]
+        instance["translate"] = data["translate"]
+        instance["scale"] = data["scale"]
+        if "rotate" in data:
+            instance["rotation_kind"] = ROTATION_EULER
+            instance["rotation"] = list(data["rotate"]) + [0.0]
+        elif "orient" in data:
+            instance["rotation_kind"] = ROTATION_ORIENT
+            instance["rotation"] = data["orient"]
+    return product_data.with_instances(instances)
+
+
+def pick_offenders(report, movable=None):
+    """
+    Choose the product to move for every intersecting pair, deepest pair first.
+
+    A product in `movable` (e.g. the randomized ones) is preferred; otherwise
+    the second product of the pair moves. Each product is picked once.
+
+    Returns:
+        dict: product_id -> (other product_id, depth, direction to move it in)
+    """
+    offenders = {}
+    for (first, second, depth), direction in zip(report["pairs"], report["directions"]):
+        if movable is not None and first in movable and second not in movable:
+            offender, other, direction = first, second, -direction
+        else:
+            offender, other = second, first
+        if offender not in offenders and other not in offenders:
+            offenders[offender] = (other, depth, direction)
+    return offenders
+
+
+def nudge_direction(direction, offset):
+    """Separation direction within the shelf plane (the centre offset if the overlap is vertical)."""
+    for vector in (direction, offset, np.array([1.0, 0.0, 0.0])):
+        planar = np.array(vector, dtype=np.float64)
+        planar[UP_AXIS] = 0.0
+        length = np.linalg.norm(planar)
+        if length > 1e-6:
+            return planar / length
+    return planar
+
+
+def resolve_overlaps(product_data, sku_extents, mode="reset", reference_data=None, movable=None,
+                     tolerance=DEFAULT_TOLERANCE, max_iterations=10):
+    """
+    Check a catalog and fix the intersecting pairs it finds.
+
+    "reset" puts each offending product back to its pose in reference_data
+    (e.g. the catalog before randomization). Products that already have that
+    pose are nudged instead. "nudge" pushes the offending product sideways
+    in the shelf plane, along the separating direction, by the penetration
+    depth.
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog to check (not modified)
+        sku_extents (dict): asset -> (min, max) local extents
+        mode (str): "reset" or "nudge"
+        reference_data (dict or CompactCatalog): Poses to reset to (needed for "reset")
+        movable (set): Product IDs to prefer moving, None = no preference
+        tolerance (float): Penetration depth still accepted (stage units)
+        max_iterations (int): Check/fix rounds before giving up
+
+    Returns:
+        tuple: (fixed catalog, final check_overlaps report with "moved" - IDs of the products changed)
+    """
+    if mode not in RESOLUTION_MODES:
+        raise ValueError(f"Unknown resolution mode '{mode}', expected one of {RESOLUTION_MODES}")
+    if mode == "reset" and reference_data is None:
+        raise ValueError("Resolution mode 'reset' needs reference_data")
+
+    moved = set()
+    report = check_overlaps(product_data, sku_extents, tolerance)
+    for _ in range(max_iterations):
+        if not report["pairs"]:
+            break
+        updates = {}
+        for product_id, (other_id, depth, direction) in pick_offenders(report, movable).items():
+            data = dict(product_data[product_id])
+            if mode == "reset" and product_id not in moved:
+                reference = reference_data[product_id]
+                pose = {key: reference[key] for key in ("translate", "rotate", "orient", "scale") if key in reference}
+                if any(data.get(key) != value for key, value in pose.items()):
+                    data.pop("rotate", None)
+                    data.pop("orient", None)
+                    updates[product_id] = dict(data, **pose)
+                    continue
+            offset = np.subtract(data["translate"], product_data[other_id]["translate"])
+            step = nudge_direction(direction, offset) * (depth + tolerance)
+            updates[product_id] = dict(data, translate=(np.array(data["translate"]) + step).tolist())
+        product_data = set_products(product_data, updates)
+        moved.update(updates)
+        report = check_overlaps(product_data, sku_extents, tolerance)
+
+    report["moved"] = sorted(moved)
+    return product_data, report
+
+
+def apply_overlap_check(product_data, sku_extents, mode, reference_data=None, movable=None,
+                        tolerance=DEFAULT_TOLERANCE):
+    """
+    Run the overlap check the placer and the scene compiler use before placing, and print the result.
+
+    Args:
+        product_data (dict or CompactCatalog): Randomized catalog about to be placed
+        sku_extents (dict): asset -> (min, max) local extents
+        mode (str): "report" (print only), "reset" or "nudge" (see resolve_overlaps)
+        reference_data (dict or CompactCatalog): Catalog poses for "reset"
+        movable (iterable): Product IDs to prefer moving (e.g. the randomized ones)
+        tolerance (float): Penetration depth still accepted (stage units)
+
+    Returns:
+        dict or CompactCatalog: The catalog to place
+    """
+    if mode not in OVERLAP_CHECK_MODES:
+        raise ValueError(f"Unknown overlap check '{mode}', expected one of {OVERLAP_CHECK_MODES}")
+    movable = set(movable) if movable is not None else None
+    if mode == "report":
+        report = check_overlaps(product_data, sku_extents, tolerance)
+    else:
+        product_data, report = resolve_overlaps(product_data, sku_extents, mode, reference_data, movable, tolerance)
+        if report["moved"]:
+            print(f"Overlap check ({mode}) moved {len(report['moved'])} products: {report['moved']}")
+    if report["pairs"]:
+        print(f"Warning: {len(report['pairs'])} intersecting product pairs:")
+        print(format_overlaps(report))
+    else:
+        print(f"Overlap check: no intersecting products ({report['checked']} checked)")
+    return product_data
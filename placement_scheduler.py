@@ -0,0 +1,177 @@
+"""
+Frame-Budgeted Chunked Placement for the Dynamic Shop Placer
+
+Placing a whole catalog in one loop on Kit's main thread freezes the UI and
+any running simulation until the last product is authored. The scheduler
+places products in chunks instead: each chunk authors products until the
+per-frame time budget (e.g. 4 ms) is used up, then yields to the event loop
+so Kit can render the next frame. Progress is reported after every chunk,
+and a CancellationToken abandons the placement between two chunks.
+
+Each chunk can run inside a context (e.g. Sdf.ChangeBlock), so Sdf-level
+authoring still recomposes once per chunk rather than once per product.
+
+No pxr or Kit imports - the frame wait is passed in (Kit:
+omni.kit.app.get_app().next_update_async).
+
+Usage:
+    token = CancellationToken()
+    budget = FrameBudget(0.004, next_frame=app.next_update_async, cancel_token=token)
+    result = await place_in_chunks(product_data.items(), placer.place_product, budget,
+                                   progress=print_progress("Placing products"))
+"""
+
+import asyncio
+import time
+from contextlib import nullcontext
+
+DEFAULT_FRAME_BUDGET = 0.004  # seconds of placement work per frame
+
+
+class PlacementCancelled(Exception):
+    """Raised inside the scheduler when its CancellationToken was cancelled."""
+
+
+class CancellationToken:
+    """Shared flag to abandon a running placement (checked between chunks)."""
+
+    def __init__(self):
+        self.cancelled = False
+        self.reason = None
+
+    def cancel(self, reason="cancelled"):
+        self.cancelled = True
+        self.reason = reason
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise PlacementCancelled(self.reason)
+
+
+async def next_event_loop_turn():
+    """Default frame wait outside Kit: give every other task one turn."""
+    await asyncio.sleep(0)
+
+
+class FrameBudget:
+    """Split main-thread work into chunks that each fit into one frame."""
+
+    def __init__(self, budget=DEFAULT_FRAME_BUDGET, next_frame=None, cancel_token=None, clock=time.perf_counter):
+        """
+        Args:
+            budget (float): Seconds of work per frame, None = no limit (one chunk)
+            next_frame (coroutine function): Waits for the next frame, None = one event loop turn
+            cancel_token (CancellationToken): Token checked between chunks, None = not cancellable
+            clock (callable): Time source in seconds
+        """
+        self.budget = budget
+        self.next_frame = next_frame or next_event_loop_turn
+        self.cancel_token = cancel_token
+        self.clock = clock
+        self.frames = 0
+        self.longest_chunk = 0.0
+        self.chunk_start = clock()
+
+    def start_chunk(self):
+        self.chunk_start = self.clock()
+
+    def exhausted(self):
+        """True once the current chunk has used up the frame budget."""
+        return self.budget is not None and self.clock() - self.chunk_start >= self.budget
+
+    def end_chunk(self):
+        self.longest_chunk = max(self.longest_chunk, self.clock() - self.chunk_start)
+
+    def check_cancelled(self):
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    async def wait_next_frame(self):
+        """Yield to the event loop until the next frame, then start a new chunk."""
+        await self.next_frame()
+        self.frames += 1
+        self.check_cancelled()
+        self.start_chunk()
+
+
+def print_progress(label, step=10):
+    """
+    Return a progress callback that prints every `step` percent.
+
+    Returns:
+        callable: (done, total) -> None
+    """
+    state = {"next": step}
+
+    def progress(done, total):
+        percent = 100 * done // total if total else 100
+        if percent >= state["next"] or done == total:
+            print(f"{label}: {done}/{total} ({percent}%)")
+            state["next"] = (percent // step + 1) * step
+    return progress
+
+
+async def place_in_chunks(product_items, place_product, budget=None, chunk_context=None, progress=None,
+                          assets=None):
+    """
+    Place products in frame-sized chunks, yielding to the event loop between chunks.
+
+    Every chunk places at least one product, so placement always advances.
+
+    Args:
+        product_items (iterable): (product_id, data) pairs in placement order
+        place_product (callable): (product_id, data) -> truthy on success
+        budget (FrameBudget): Frame budget and cancellation, None = FrameBudget() with the default budget
+        chunk_context (callable): Returns a context manager entered around each chunk (e.g. Sdf.ChangeBlock)
+        progress (callable): (done, total) called after every chunk
+        assets (AssetPrefetcher): Products wait for their asset; a chunk ends at the first asset
+            that is not local yet, None = place the data as is
+
+    Returns:
+        dict: placed and failed product IDs, cancelled flag, frame count, longest chunk in seconds
+    """
+    items = list(product_items)
+    budget = budget or FrameBudget()
+    result = {"placed": [], "failed": [], "cancelled": False, "frames": 0, "longest_chunk": 0.0}
+    index = 0
+    frames_before = budget.frames
+    try:
+        budget.check_cancelled()
+        budget.start_chunk()
+        while index < len(items):
+            waiting_for = None
+            with chunk_context() if chunk_context is not None else nullcontext():
+                while index < len(items):
+                    product_id, data = items[index]
+                    if assets is not None:
+                        if not assets.is_ready(data["asset"]):
+                            waiting_for = data["asset"]
+                            break
+                        data = assets.localize(data)
+                    index += 1
+                    try:
+                        if place_product(product_id, data):
+                            result["placed"].append(product_id)
+                        else:
+                            print(f"Failed to place product: {product_id}")
+                            result["failed"].append(product_id)
+                    except Exception as e:
+                        print(f"Error placing product {product_id}: {str(e)}")
+                        result["failed"].append(product_id)
+                    if budget.exhausted():
+                        break
+            budget.end_chunk()
+            if progress is not None:
+                progress(index, len(items))
+            if waiting_for is not None:
+                # Downloads finish in worker threads; the frame keeps running meanwhile
+                await assets.wait(waiting_for)
+                budget.check_cancelled()
+                budget.start_chunk()
+            elif index < len(items):
+                await budget.wait_next_frame()
+    except PlacementCancelled:
+        result["cancelled"] = True
+    result["frames"] = budget.frames - frames_before
+    result["longest_chunk"] = budget.longest_chunk
+    return result
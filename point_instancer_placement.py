@@ -0,0 +1,242 @@
+"""
+PointInstancer Placement for the Dynamic Shop Placer
+
+Most facings in product_data.json repeat the same handful of asset URLs. In
+this placement mode static (non-physics) products are grouped by asset and
+written as one UsdGeom.PointInstancer per SKU under
+/World/Shelf/<shelf>/<category>, with positions, orientations and scales
+stored as packed arrays. Each SKU then costs one prototype payload instead of
+one composed payload per facing. Physics-enabled products still need to be
+individual rigid bodies and are authored as regular product prims.
+
+expand_instance() converts a single instance back into a real product prim
+when physics or interaction is needed for it.
+
+Only pxr (usd-core or Isaac Sim) is required.
+"""
+
+from pathlib import PurePosixPath
+
+from pxr import Usd, Sdf, Gf, Tf, Vt, UsdGeom
+
+from bulk_authoring import (
+    SHELF_ROOT_PATH, author_hierarchy_to_layer, author_product_spec, define_prim_spec, set_attribute_spec
+)
+
+# Custom attribute on each instancer that maps instance index -> product ID
+PRODUCT_IDS_ATTR = "dynamicShop:productIds"
+
+
+def get_sku_name(asset):
+    """Return a valid prim name for an asset URL (e.g. '006_mustard_bottle.usd' -> '_06_mustard_bottle')."""
+    return Tf.MakeValidIdentifier(PurePosixPath(asset).stem)
+
+
+def product_orientation(product_data):
+    """
+    Return the product rotation as a Gf.Quatd.
+
+    'rotate' is treated exactly like xformOp:rotateZYX (X applied first, then Y, then Z),
+    'orient' is a [w, x, y, z] quaternion and products without either get identity.
+    """
+    if "rotate" in product_data:
+        x, y, z = product_data["rotate"]
+        rotation = (Gf.Rotation(Gf.Vec3d.ZAxis(), z) *
+                    Gf.Rotation(Gf.Vec3d.YAxis(), y) *
+                    Gf.Rotation(Gf.Vec3d.XAxis(), x))
+        return rotation.GetQuat()
+    if "orient" in product_data:
+        w, x, y, z = product_data["orient"]
+        return Gf.Quatd(w, x, y, z)
+    return Gf.Quatd(1.0)
+
+
+def group_static_products(product_data, enable_physics=True):
+    """
+    Split the catalog into instanceable static products and physics products.
+
+    Returns:
+        tuple: ({(shelf, category, asset): [product_id, ...]}, {product_id: data} for physics products)
+    """
+    sku_groups = {}
+    physics_products = {}
+    for product_id, data in product_data.items():
+        if data.get("physics_enabled", False) and enable_physics:
+            physics_products[product_id] = data
+            continue
+        key = (data.get("shelf", "Items_Lower"), data.get("category", "Unknown"), data["asset"])
+        sku_groups.setdefault(key, []).append(product_id)
+    return sku_groups, physics_products
+
+
+def author_point_instancer(layer, instancer_path, asset, product_ids, product_data):
+    """
+    Author one PointInstancer with a single payload prototype and packed instance arrays.
+
+    Returns:
+        list: Product IDs that were added as instances
+    """
+    positions, orientations, scales, instance_ids = [], [], [], []
+    for product_id in product_ids:
+        data = product_data[product_id]
+        try:
+            position = Gf.Vec3f(*data["translate"])
+            orientation = Gf.Quath(product_orientation(data))
+            scale = Gf.Vec3f(*data["scale"])
+        except Exception as e:
+            print(f"Error instancing product {product_id}: {str(e)}")
+            continue
+        positions.append(position)
+        orientations.append(orientation)
+        scales.append(scale)
+        instance_ids.append(product_id)
+
+    if not instance_ids:
+        return []
+
+    instancer_spec = define_prim_spec(layer, instancer_path, "PointInstancer")
+    define_prim_spec(layer, f"{instancer_path}/Prototypes", "Scope")
+    prototype_path = f"{instancer_path}/Prototypes/{get_sku_name(asset)}"
+    prototype_spec = define_prim_spec(layer, prototype_path)
+    prototype_spec.payloadList.Prepend(Sdf.Payload(asset))
+
+    prototypes_rel = instancer_spec.relationships.get("prototypes")
+    if prototypes_rel is None:
+        prototypes_rel = Sdf.RelationshipSpec(instancer_spec, "prototypes")
+    prototypes_rel.targetPathList.explicitItems = [prototype_path]
+
+    set_attribute_spec(instancer_spec, "protoIndices", Sdf.ValueTypeNames.IntArray,
+                       Vt.IntArray(len(instance_ids), 0))
+    set_attribute_spec(instancer_spec, "positions", Sdf.ValueTypeNames.Point3fArray, Vt.Vec3fArray(positions))
+    set_attribute_spec(instancer_spec, "orientations", Sdf.ValueTypeNames.QuathArray, Vt.QuathArray(orientations))
+    set_attribute_spec(instancer_spec, "scales", Sdf.ValueTypeNames.Float3Array, Vt.Vec3fArray(scales))
+    set_attribute_spec(instancer_spec, PRODUCT_IDS_ATTR, Sdf.ValueTypeNames.StringArray,
+                       Vt.StringArray(instance_ids)).custom = True
+    return instance_ids
+
+
+def author_point_instancers_to_layer(layer, product_data, enable_physics=True,
+                                     force_collision=True, root_path=SHELF_ROOT_PATH, instanceable=False):
+    """
+    Author the hierarchy, one PointInstancer per static SKU and all physics products.
+
+    Everything is written inside a single Sdf.ChangeBlock.
+
+    Args:
+        layer (Sdf.Layer): Layer to author into (usually the stage's edit target)
+        product_data (dict): Product data dictionary (product_id -> data)
+        enable_physics (bool): Global physics switch (ENABLE_PHYSICS_FOR_ALL)
+        force_collision (bool): Add collision APIs (FORCE_COLLISION_FOR_PHYSICS)
+        root_path (str): Shelf root prim path
+        instanceable (bool): Passed to author_product_spec (physics products are never instanceable)
+
+    Returns:
+        tuple: ({product_id: prim path} for physics products,
+                {instancer path: [product_id, ...]} for instanced static products)
+    """
+    sku_groups, physics_products = group_static_products(product_data, enable_physics)
+    product_paths = {}
+    instancer_paths = {}
+    with Sdf.ChangeBlock():
+        author_hierarchy_to_layer(layer, product_data, root_path)
+
+        for (shelf_level, category, asset), product_ids in sku_groups.items():
+            instancer_path = f"{root_path}/{shelf_level}/{category}/{get_sku_name(asset)}_instancer"
+            instanced_ids = author_point_instancer(layer, instancer_path, asset, product_ids, product_data)
+            if instanced_ids:
+                instancer_paths[instancer_path] = instanced_ids
+
+        for product_id, data in physics_products.items():
+            try:
+                product_paths[product_id] = author_product_spec(
+                    layer, product_id, data, enable_physics, force_collision, root_path, instanceable)
+            except Exception as e:
+                print(f"Error authoring product {product_id}: {str(e)}")
+    return product_paths, instancer_paths
+
+
+def find_instance(stage, product_id, root_path=SHELF_ROOT_PATH):
+    """
+    Find the PointInstancer and instance index holding a product.
+
+    Returns:
+        tuple: (UsdGeom.PointInstancer, index) or (None, -1) if the product is not instanced
+    """
+    root_prim = stage.GetPrimAtPath(root_path)
+    if not root_prim:
+        return None, -1
+    for prim in Usd.PrimRange(root_prim):
+        if not prim.IsA(UsdGeom.PointInstancer):
+            continue
+        product_ids = prim.GetAttribute(PRODUCT_IDS_ATTR).Get() or []
+        if product_id in product_ids:
+            return UsdGeom.PointInstancer(prim), list(product_ids).index(product_id)
+    return None, -1
+
+
+def expand_instance(stage, product_id, physics_enabled=True, force_collision=True,
+                    velocity=None, angular_velocity=None, root_path=SHELF_ROOT_PATH):
+    """
+    Convert one PointInstancer instance back into a real product prim.
+
+    The instance is removed from the instancer's packed arrays and a regular
+    product prim (payload, translate/orient/scale, optional physics) is
+    authored in its place under the same shelf/category scope.
+
+    Args:
+        stage (Usd.Stage): Stage holding the instancer
+        product_id (str): ID of the instanced product to expand
+        physics_enabled (bool): Make the expanded product a rigid body
+        force_collision (bool): Add collision APIs to the expanded product
+        velocity (list): Optional initial velocity
+        angular_velocity (list): Optional initial angular velocity
+
+    Returns:
+        str: Prim path of the expanded product, or None if it was not found
+    """
+    instancer, index = find_instance(stage, product_id, root_path)
+    if instancer is None:
+        print(f"Warning: {product_id} is not a PointInstancer instance")
+        return None
+
+    instancer_prim = instancer.GetPrim()
+    prototype_path = instancer.GetPrototypesRel().GetTargets()[0]
+    payloads = stage.GetPrimAtPath(prototype_path).GetPrimStack()[0].payloadList.GetAddedOrExplicitItems()
+    category_prim = instancer_prim.GetParent()
+
+    position = instancer.GetPositionsAttr().Get()[index]
+    orientation = instancer.GetOrientationsAttr().Get()[index]
+    scale = instancer.GetScalesAttr().Get()[index]
+    imaginary = orientation.GetImaginary()
+    product_data = {
+        "asset": payloads[0].assetPath,
+        "translate": list(position),
+        "orient": [orientation.GetReal(), imaginary[0], imaginary[1], imaginary[2]],
+        "scale": list(scale),
+        "physics_enabled": physics_enabled,
+        "shelf": category_prim.GetParent().GetName(),
+        "category": category_prim.GetName(),
+    }
+    if velocity is not None:
+        product_data["velocity"] = velocity
+    if angular_velocity is not None:
+        product_data["angular_velocity"] = angular_velocity
+
+    # Drop the instance from every packed array so indices stay consistent
+    remaining_values = []
+    for attr in (instancer.GetProtoIndicesAttr(), instancer.GetPositionsAttr(),
+                 instancer.GetOrientationsAttr(), instancer.GetScalesAttr(),
+                 instancer_prim.GetAttribute(PRODUCT_IDS_ATTR)):
+        values = list(attr.Get())
+        del values[index]
+        remaining_values.append((attr.GetName(), attr.GetTypeName(), values))
+
+    layer = stage.GetEditTarget().GetLayer()
+    with Sdf.ChangeBlock():
+        instancer_spec = Sdf.CreatePrimInLayer(layer, instancer_prim.GetPath())
+        for name, type_name, values in remaining_values:
+            set_attribute_spec(instancer_spec, name, type_name, values)
+        product_path = author_product_spec(layer, product_id, product_data, True, force_collision, root_path)
+
+    print(f"Expanded instance {product_id} into {product_path}")
+    return product_path
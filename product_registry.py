@@ -0,0 +1,367 @@
+"""
+Indexed Product Registry for the Dynamic Shop Placer
+
+Finding the products on a shelf, in a category or using an asset used to
+scan the whole catalog. ProductRegistry keeps hash indexes by shelf level,
+category, asset and prim path, updated per product, so those lookups cost
+only the size of the answer.
+
+Once the registry is bound to a stage, it computes the world-space bounding
+box of every placed product in one UsdGeom.BBoxCache pass and caches it.
+When products move, it recomputes only those products. A Usd.Notice
+listener marks a product stale whenever something at or below its prim
+changes. Payload loads/unloads count as changes, and so do edits to a shelf
+or category scope, which mark everything below them. The next query then
+recomputes only the stale products.
+
+Products whose payload is not loaded have no geometry, so their bounds
+collapse to the pivot (the product prim's world-space origin), like
+region_loading.py. Products without a prim (PointInstancer instances) have
+no bounds.
+
+Only pxr (usd-core or Isaac Sim) and NumPy are required.
+
+Usage:
+    registry = ProductRegistry(PRODUCT_DATA)
+    registry.find(shelf="Items_Lower", category="TunaCans")
+    registry.bind_stage(stage)
+    registry.query((x, y, z), radius=0.5, shelf="Items_Lower")  # [(product_id, distance), ...]
+"""
+
+import numpy as np
+from pxr import Gf, Sdf, Tf, Usd, UsdGeom
+
+from bulk_authoring import SHELF_ROOT_PATH, get_product_path
+from region_loading import to_range
+
+# Change kinds of incremental_placement.diff_catalogs that move a product's bounds
+BOUNDS_DIFF_KINDS = ("moved", "rotated", "scaled")
+
+
+class ProductRegistry:
+    """Product lookups by shelf, category, asset and prim path, plus cached world-space bounds."""
+
+    def __init__(self, product_data=None, root_path=SHELF_ROOT_PATH):
+        """
+        Args:
+            product_data (dict or CompactCatalog): Products to register, None = start empty
+            root_path (str): Root prim of the product hierarchy
+        """
+        self.root_path = root_path
+        self.products = {}  # product_id -> product data
+        self.paths = {}  # product_id -> Sdf.Path
+        self.by_path = {}  # Sdf.Path -> product_id
+        self.by_shelf = {}  # shelf level -> set of product IDs
+        self.by_category = {}  # category -> set of product IDs
+        self.by_asset = {}  # asset -> set of product IDs
+        self.by_scope = {}  # (shelf level, category) -> set of product IDs
+        self.bounds = {}  # product_id -> (2, 3) array (min, max), world space
+        self.stale = set()  # product IDs whose bounds must be recomputed
+        self.stage = None
+        self.listener = None
+        self._groups = {}  # shelf level (None = all) -> cached query arrays
+        if product_data is not None:
+            for product_id, data in product_data.items():
+                self.add_product(product_id, data)
+
+    def __len__(self):
+        return len(self.products)
+
+    def __contains__(self, product_id):
+        return product_id in self.products
+
+    # --- Indexes ---
+
+    def add_product(self, product_id, data):
+        """Register a product (an existing entry with the same ID is replaced)."""
+        if product_id in self.products:
+            self.remove_product(product_id)
+        shelf = data.get("shelf", "Items_Lower")  # Default fallback
+        category = data.get("category", "Unknown")  # Default fallback
+        path = Sdf.Path(get_product_path(product_id, data, self.root_path))
+        self.products[product_id] = data
+        self.paths[product_id] = path
+        self.by_path[path] = product_id
+        self.by_shelf.setdefault(shelf, set()).add(product_id)
+        self.by_category.setdefault(category, set()).add(product_id)
+        self.by_asset.setdefault(data["asset"], set()).add(product_id)
+        self.by_scope.setdefault((shelf, category), set()).add(product_id)
+        self.stale.add(product_id)
+        self._drop_groups(shelf)
+
+    def remove_product(self, product_id):
+        """Unregister a product; returns False if it was not registered."""
+        data = self.products.pop(product_id, None)
+        if data is None:
+            return False
+        shelf = data.get("shelf", "Items_Lower")
+        category = data.get("category", "Unknown")
+        del self.by_path[self.paths.pop(product_id)]
+        for index, key in ((self.by_shelf, shelf), (self.by_category, category),
+                           (self.by_asset, data["asset"]), (self.by_scope, (shelf, category))):
+            index[key].discard(product_id)
+            if not index[key]:
+                del index[key]
+        self.bounds.pop(product_id, None)
+        self.stale.discard(product_id)
+        self._drop_groups(shelf)
+        return True
+
+    def apply_diff(self, diff, new_data):
+        """
+        Update the registry with a catalog diff (incremental_placement.diff_catalogs).
+
+        Removed products are dropped, and added or replaced products are
+        re-indexed. Moved, rotated or scaled products keep their index
+        entries and only their bounds go stale.
+
+        Args:
+            diff (dict): Product IDs per change kind
+            new_data (dict or CompactCatalog): The edited catalog
+        """
+        for product_id in diff["removed"]:
+            self.remove_product(product_id)
+        for product_id in diff["added"] + diff["replaced"]:
+            self.add_product(product_id, new_data[product_id])
+        for kind in BOUNDS_DIFF_KINDS + ("physics",):
+            for product_id in diff[kind]:
+                self.products[product_id] = new_data[product_id]
+        self.invalidate(product_id for kind in BOUNDS_DIFF_KINDS for product_id in diff[kind])
+
+    def get(self, product_id):
+        """Return a product's data, or None."""
+        return self.products.get(product_id)
+
+    def get_path(self, product_id):
+        """Return the prim path (Sdf.Path) of a product."""
+        return self.paths[product_id]
+
+    def get_product_at(self, path):
+        """
+        Return the ID of the product at a prim path or containing it (e.g. a mesh of its payload).
+
+        Args:
+            path (str or Sdf.Path): Prim or property path, e.g. from a raycast hit
+
+        Returns:
+            str: Product ID, or None if the path is not part of a product
+        """
+        path = Sdf.Path(path).GetPrimPath()
+        while path != Sdf.Path.absoluteRootPath and not path.isEmpty:
+            product_id = self.by_path.get(path)
+            if product_id is not None:
+                return product_id
+            path = path.GetParentPath()
+        return None
+
+    def find(self, shelf=None, category=None, asset=None):
+        """
+        Return the IDs of the products matching every given key, sorted.
+
+        Args:
+            shelf (str): Shelf level (e.g. "Items_Lower"), None = any
+            category (str): Category, None = any
+            asset (str): Asset path, None = any
+        """
+        candidates = [index.get(key, set()) for index, key in ((self.by_shelf, shelf),
+                                                                (self.by_category, category),
+                                                                (self.by_asset, asset)) if key is not None]
+        if not candidates:
+            return sorted(self.products)
+        return sorted(set.intersection(*sorted(candidates, key=len)))
+
+    def get_shelf_categories(self):
+        """Return the shelf level -> categories mapping of the registered products."""
+        shelf_categories = {}
+        for shelf, category in self.by_scope:
+            shelf_categories.setdefault(shelf, set()).add(category)
+        return shelf_categories
+
+    def get_hierarchy_paths(self):
+        """Return the shelf level and category Scope paths of the registered products."""
+        paths = []
+        for shelf, categories in self.get_shelf_categories().items():
+            paths.append(f"{self.root_path}/{shelf}")
+            paths.extend(f"{self.root_path}/{shelf}/{category}" for category in categories)
+        return paths
+
+    # --- Bounds ---
+
+    def bind_stage(self, stage, watch=True):
+        """
+        Compute bounds from a stage; every product's bounds go stale.
+
+        Args:
+            stage (Usd.Stage): Stage the products are placed on
+            watch (bool): Listen for stage changes and mark the changed products stale
+        """
+        self.unbind_stage()
+        self.stage = stage
+        if watch:
+            self.listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+        self.invalidate()
+
+    def unbind_stage(self):
+        """Stop listening to the bound stage and drop every cached bound."""
+        if self.listener is not None:
+            self.listener.Revoke()
+        self.listener = None
+        self.stage = None
+        self.bounds.clear()
+        self._groups.clear()
+
+    def invalidate(self, product_ids=None):
+        """Mark product bounds stale (None = every product); they are recomputed on the next query."""
+        if product_ids is None:
+            self.stale.update(self.products)
+            return
+        self.stale.update(product_id for product_id in product_ids if product_id in self.products)
+
+    def invalidate_path(self, path):
+        """
+        Mark the products at, inside or below a changed prim path stale.
+
+        Args:
+            path (str or Sdf.Path): Changed prim or property path
+        """
+        path = Sdf.Path(path).GetPrimPath()
+        product_id = self.get_product_at(path)
+        if product_id is not None:
+            self.stale.add(product_id)
+        elif path.HasPrefix(self.root_path) or Sdf.Path(self.root_path).HasPrefix(path):
+            # A shelf, category or ancestor scope changed: everything below it may have moved
+            self.stale.update(product_id for product_id, product_path in self.paths.items()
+                              if product_path.HasPrefix(path))
+
+    def _on_objects_changed(self, notice, stage):
+        for path in notice.GetResyncedPaths():
+            self.invalidate_path(path)
+        for path in notice.GetChangedInfoOnlyPaths():
+            self.invalidate_path(path)
+
+    def refresh_bounds(self):
+        """
+        Recompute the bounds of the stale products in one UsdGeom.BBoxCache pass.
+
+        Returns:
+            int: Number of products whose bounds were recomputed
+        """
+        if self.stage is None or not self.stale:
+            return 0
+        bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_, UsdGeom.Tokens.render],
+                                       useExtentsHint=True)
+        xform_cache = UsdGeom.XformCache()
+        refreshed = self.stale
+        self.stale = set()
+        for product_id in refreshed:
+            prim = self.stage.GetPrimAtPath(self.paths[product_id])
+            product_bounds = self._compute_bounds(prim, bbox_cache, xform_cache) if prim else None
+            if product_bounds is None:
+                self.bounds.pop(product_id, None)
+            else:
+                self.bounds[product_id] = product_bounds
+            self._update_groups(product_id, product_bounds)
+        return len(refreshed)
+
+    @staticmethod
+    def _compute_bounds(prim, bbox_cache, xform_cache):
+        """World-space (min, max) of a product prim, or its pivot while the payload has no geometry."""
+        bound_range = bbox_cache.ComputeWorldBound(prim).ComputeAlignedRange()
+        if not bound_range.IsEmpty():
+            return np.array([bound_range.GetMin(), bound_range.GetMax()])
+        # Unloaded products are typeless, so XformCache ignores their ops; apply them on top of the parent
+        to_world = UsdGeom.Xformable(prim).GetLocalTransformation() * \
+            xform_cache.GetLocalToWorldTransform(prim.GetParent())
+        pivot = np.array(to_world.ExtractTranslation())
+        return np.array([pivot, pivot])
+
+    def get_bounds(self, product_id):
+        """Return a product's world-space bounds as Gf.Range3d, or None without a prim."""
+        self.refresh_bounds()
+        product_bounds = self.bounds.get(product_id)
+        if product_bounds is None:
+            return None
+        return Gf.Range3d(Gf.Vec3d(*product_bounds[0]), Gf.Vec3d(*product_bounds[1]))
+
+    def query(self, point, radius=None, shelf=None, category=None, limit=None):
+        """
+        Find the products nearest to a world-space point, by distance to their bounding box.
+
+        Args:
+            point (3-sequence): World-space point (e.g. the gripper position)
+            radius (float): Maximum distance, None = no limit
+            shelf (str): Shelf level to search, None = every shelf
+            category (str): Only return products of this category, None = any
+            limit (int): Return at most this many products, None = all
+
+        Returns:
+            list: (product_id, distance) pairs, nearest first (0.0 = point inside the box)
+        """
+        self.refresh_bounds()
+        group = self._get_group(shelf)
+        if not group["ids"]:
+            return []
+        point = np.asarray(point, dtype=np.float64)
+        lower, upper = group["bounds"][:, 0], group["bounds"][:, 1]
+        distances = np.linalg.norm(np.maximum(np.maximum(lower - point, point - upper), 0.0), axis=1)
+        candidates = np.ones(len(distances), dtype=bool)
+        if radius is not None:
+            candidates &= distances <= radius
+        if category is not None:
+            members = self.by_category.get(category, set())
+            candidates &= np.fromiter((product_id in members for product_id in group["ids"]), bool,
+                                      len(group["ids"]))
+        rows = np.flatnonzero(candidates)
+        rows = rows[np.argsort(distances[rows], kind="stable")][:limit]
+        return [(group["ids"][row], float(distances[row])) for row in rows]
+
+    def find_in_box(self, bbox, shelf=None):
+        """
+        Return the IDs of the products whose bounds intersect a world-space box.
+
+        Args:
+            bbox (Gf.Range3d or tuple): World-space box ((min), (max))
+            shelf (str): Shelf level to search, None = every shelf
+        """
+        self.refresh_bounds()
+        group = self._get_group(shelf)
+        if not group["ids"]:
+            return []
+        bbox = to_range(bbox)
+        box_min, box_max = np.array(bbox.GetMin()), np.array(bbox.GetMax())
+        lower, upper = group["bounds"][:, 0], group["bounds"][:, 1]
+        inside = np.all((lower <= box_max) & (upper >= box_min), axis=1)
+        return sorted(group["ids"][row] for row in np.flatnonzero(inside))
+
+    # --- Query arrays per shelf level ---
+
+    def _get_group(self, shelf):
+        """Return the stacked bounds of the products on a shelf level (None = all), built on first use."""
+        group = self._groups.get(shelf)
+        if group is None:
+            ids = sorted(self.by_shelf.get(shelf, ()) if shelf is not None else self.products)
+            ids = [product_id for product_id in ids if product_id in self.bounds]
+            group = {"ids": ids, "rows": {product_id: row for row, product_id in enumerate(ids)},
+                     "bounds": np.array([self.bounds[product_id] for product_id in ids]).reshape(-1, 2, 3)}
+            self._groups[shelf] = group
+        return group
+
+    def _update_groups(self, product_id, product_bounds):
+        """Write refreshed bounds into the cached query arrays in place."""
+        shelf = self.products[product_id].get("shelf", "Items_Lower")
+        for key in (shelf, None):
+            group = self._groups.get(key)
+            if group is None:
+                continue
+            row = group["rows"].get(product_id)
+            if row is None and product_bounds is None:
+                continue
+            if row is None or product_bounds is None:
+                # The product gained or lost its bounds, so the group's rows change
+                del self._groups[key]
+            else:
+                group["bounds"][row] = product_bounds
+
+    def _drop_groups(self, shelf):
+        self._groups.pop(shelf, None)
+        self._groups.pop(None, None)
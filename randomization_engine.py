@@ -0,0 +1,182 @@
+"""
+Vectorized, Seeded Randomization Engine for the Dynamic Shop Placer
+
+Holds the catalog as NumPy arrays and draws rotations, position jitter and
+scale jitter for any number of products in one batched call from a seeded
+np.random.Generator. Every episode has its own generator derived from
+(seed, episode), so any episode can be replayed exactly without replaying
+the ones before it.
+
+Only NumPy is required (no pxr, no Isaac Sim).
+
+Usage:
+    engine = RandomizationEngine(PRODUCT_DATA, seed=42)
+    draw = engine.draw(num_products=3, episode=17)
+    randomized_data = engine.apply(PRODUCT_DATA, draw)
+"""
+
+import numpy as np
+
+from compact_catalog import CompactCatalog, ROTATION_EULER, ROTATION_ORIENT
+
+ROTATION_MODES = ("auto", "euler", "quaternion")
+
+
+def random_unit_quaternions(rng, count):
+    """
+    Draw uniformly distributed unit quaternions (w, x, y, z).
+
+    Same construction as the original per-product code, applied to whole
+    arrays: three uniforms per quaternion, no rejection loop.
+
+    Args:
+        rng (np.random.Generator): Generator to draw from
+        count (int): Number of quaternions
+
+    Returns:
+        np.ndarray: (count, 4) float64 array of unit quaternions
+    """
+    u1, u2, u3 = rng.random((3, count))
+    r1 = np.sqrt(1.0 - u1)
+    r2 = np.sqrt(u1)
+    return np.stack([
+        r2 * np.cos(2.0 * np.pi * u3),  # w
+        r1 * np.sin(2.0 * np.pi * u2),  # x
+        r1 * np.cos(2.0 * np.pi * u2),  # y
+        r2 * np.sin(2.0 * np.pi * u3),  # z
+    ], axis=1)
+
+
+class RandomizationEngine:
+    """Batched domain randomization over the whole catalog."""
+
+    def __init__(self, product_data, seed=None):
+        """
+        Args:
+            product_data (dict or CompactCatalog): Product data (product_id -> data)
+            seed (int): Seed for reproducible draws, None = fresh OS entropy
+                (the chosen seed is kept in self.seed so the run can be replayed)
+        """
+        if isinstance(product_data, CompactCatalog):
+            # The instance table already holds everything as arrays
+            self.product_ids = product_data.product_ids
+            self.translate = np.array(product_data.instances["translate"])
+            self.scale = product_data.get_scales()
+            self.uses_orient = product_data.instances["rotation_kind"] == ROTATION_ORIENT
+        else:
+            self.product_ids = list(product_data.keys())
+            self.translate = np.array([product_data[pid]["translate"] for pid in self.product_ids],
+                                      dtype=np.float64).reshape(-1, 3)
+            self.scale = np.array([product_data[pid].get("scale", [1.0, 1.0, 1.0]) for pid in self.product_ids],
+                                  dtype=np.float64).reshape(-1, 3)
+            # Products authored with a quaternion keep getting quaternions in "auto" mode
+            self.uses_orient = np.array(["orient" in product_data[pid] and "rotate" not in product_data[pid]
+                                         for pid in self.product_ids], dtype=bool)
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.rng = np.random.default_rng(self.seed)
+
+    def episode_rng(self, episode):
+        """Return the generator of one episode; the same (seed, episode) always draws the same values."""
+        return np.random.default_rng([self.seed, episode])
+
+    def draw(self, num_products=None, rotation="auto", rotation_range=180.0,
+             position_jitter=0.0, scale_jitter=0.0, episode=None):
+        """
+        Draw randomized transforms for a random subset of products in one batched call.
+
+        Args:
+            num_products (int): Number of products to randomize, None = all
+            rotation (str): "auto" (Euler, quaternion for orient products), "euler",
+                "quaternion", or None to keep the original rotations
+            rotation_range (float): Euler angles are drawn from [-range, range] degrees
+            position_jitter (float or sequence): Max absolute offset per axis (stage units)
+            scale_jitter (float): Max relative uniform scale change (0.1 = +-10%)
+            episode (int): Draw from the episode's own generator (replayable), None = engine stream
+
+        Returns:
+            dict: indices, product_ids and the drawn arrays (None for anything not randomized):
+                rotate (k, 3) degrees, orient (k, 4) w,x,y,z, use_orient (k,) bool,
+                translate (k, 3) and scale (k, 3) absolute values
+        """
+        if rotation is not None and rotation not in ROTATION_MODES:
+            raise ValueError(f"Unknown rotation mode '{rotation}', expected one of {ROTATION_MODES}")
+
+        rng = self.rng if episode is None else self.episode_rng(episode)
+        total = len(self.product_ids)
+        count = total if num_products is None else min(num_products, total)
+        indices = rng.choice(total, size=count, replace=False)
+
+        draw = {
+            "indices": indices,
+            "product_ids": [str(self.product_ids[i]) for i in indices],
+            "rotate": None,
+            "orient": None,
+            "use_orient": None,
+            "translate": None,
+            "scale": None,
+        }
+
+        if rotation is not None:
+            if rotation == "quaternion":
+                use_orient = np.ones(count, dtype=bool)
+            elif rotation == "euler":
+                use_orient = np.zeros(count, dtype=bool)
+            else:
+                use_orient = self.uses_orient[indices]
+            draw["use_orient"] = use_orient
+            draw["rotate"] = rng.uniform(-rotation_range, rotation_range, (count, 3))
+            draw["orient"] = random_unit_quaternions(rng, count)
+
+        jitter = np.broadcast_to(np.asarray(position_jitter, dtype=np.float64), (3,))
+        if np.any(jitter):
+            draw["translate"] = self.translate[indices] + rng.uniform(-1.0, 1.0, (count, 3)) * jitter
+
+        if scale_jitter:
+            factors = rng.uniform(1.0 - scale_jitter, 1.0 + scale_jitter, (count, 1))
+            draw["scale"] = self.scale[indices] * factors
+
+        return draw
+
+    def apply(self, product_data, draw):
+        """
+        Return a copy of the product data with a draw applied.
+
+        Only the randomized entries are copied; the input is never modified.
+        A product gets either "rotate" or "orient", never both. A
+        CompactCatalog gets a new instance table with the drawn rows replaced.
+        """
+        if isinstance(product_data, CompactCatalog):
+            return self.apply_to_catalog(product_data, draw)
+
+        randomized_data = product_data.copy()
+        for row, product_id in enumerate(draw["product_ids"]):
+            data = randomized_data[product_id].copy()
+            if draw["use_orient"] is not None:
+                if draw["use_orient"][row]:
+                    data["orient"] = draw["orient"][row].tolist()
+                    data.pop("rotate", None)
+                else:
+                    data["rotate"] = draw["rotate"][row].tolist()
+                    data.pop("orient", None)
+            if draw["translate"] is not None:
+                data["translate"] = draw["translate"][row].tolist()
+            if draw["scale"] is not None:
+                data["scale"] = draw["scale"][row].tolist()
+            randomized_data[product_id] = data
+        return randomized_data
+
+    def apply_to_catalog(self, catalog, draw):
+        """Return a CompactCatalog with a draw applied to its instance table (vectorized)."""
+        instances = np.array(catalog.instances)
+        rows = draw["indices"]
+        if draw["use_orient"] is not None:
+            use_orient = draw["use_orient"]
+            instances["rotation_kind"][rows] = np.where(use_orient, ROTATION_ORIENT, ROTATION_EULER)
+            euler = np.zeros((len(rows), 4))
+            euler[:, :3] = draw["rotate"]
+            instances["rotation"][rows] = np.where(use_orient[:, None], draw["orient"], euler)
+        if draw["translate"] is not None:
+            instances["translate"][rows] = draw["translate"]
+        if draw["scale"] is not None:
+            instances["scale"][rows] = draw["scale"]
+        return catalog.with_instances(instances)
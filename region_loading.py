@@ -0,0 +1,138 @@
+"""
+Region-Scoped Payload Loading for the Dynamic Shop Placer
+
+In streaming mode the shop is opened with a load-none policy, so product
+payloads are authored but not loaded. The helpers in this module load or
+unload product payloads per shelf level or per world-space bounding box by
+editing the stage's Usd.StageLoadRules, so only the products a robot can
+actually see are composed and held in memory.
+
+Product bounds are unknown until a payload is loaded, so a product belongs
+to a region when its pivot (the product prim's world-space origin) lies
+inside the box. The prototype of a PointInstancer is loaded when any of its
+instances lies inside the box.
+
+Only pxr (usd-core or Isaac Sim) is required.
+
+Usage:
+    positions = collect_payload_positions(stage)
+    paths = select_payload_paths(positions, bbox=Gf.Range3d((-20, 0, 0), (-15, 2, 1)))
+    set_payloads_loaded(stage, paths, True)
+"""
+
+from pxr import Gf, Sdf, Usd, UsdGeom
+
+from bulk_authoring import SHELF_ROOT_PATH
+
+
+def to_range(bbox):
+    """Convert a Gf.Range3d or a (min, max) pair of 3-sequences to Gf.Range3d."""
+    if isinstance(bbox, Gf.Range3d):
+        return bbox
+    bbox_min, bbox_max = bbox
+    return Gf.Range3d(Gf.Vec3d(*bbox_min), Gf.Vec3d(*bbox_max))
+
+
+def get_instancer_positions(instancer_prim, xform_cache):
+    """Return the world-space positions of every instance of a PointInstancer."""
+    positions = UsdGeom.PointInstancer(instancer_prim).GetPositionsAttr().Get() or []
+    to_world = xform_cache.GetLocalToWorldTransform(instancer_prim)
+    return [to_world.Transform(Gf.Vec3d(position)) for position in positions]
+
+
+def collect_payload_positions(stage, root_path=SHELF_ROOT_PATH):
+    """
+    Collect every prim with a payload below the shelf root and its world-space pivots.
+
+    Works on unloaded prims: transforms are authored on the product prims
+    themselves, and traversal does not descend into payload contents.
+    Positions are the same whether a product is loaded or not.
+
+    Args:
+        stage (Usd.Stage): Stage with the products authored
+        root_path (str): Root prim of the product hierarchy
+
+    Returns:
+        dict: payload prim path (Sdf.Path) -> list of world-space positions (Gf.Vec3d)
+    """
+    root_prim = stage.GetPrimAtPath(root_path)
+    if not root_prim:
+        return {}
+
+    xform_cache = UsdGeom.XformCache()
+    payload_positions = {}
+    prim_range = iter(Usd.PrimRange(root_prim, Usd.PrimAllPrimsPredicate))
+    for prim in prim_range:
+        if not prim.HasAuthoredPayloads():
+            continue
+        prim_range.PruneChildren()
+        # PointInstancer prototypes live at <instancer>/Prototypes/<sku>
+        instancer_prim = prim.GetParent().GetParent()
+        if instancer_prim and instancer_prim.IsA(UsdGeom.PointInstancer):
+            payload_positions[prim.GetPath()] = get_instancer_positions(instancer_prim, xform_cache)
+        else:
+            # Unloaded products are typeless until the payload's Xform type composes in,
+            # so XformCache ignores their ops; apply them on top of the parent explicitly
+            local = UsdGeom.Xformable(prim).GetLocalTransformation()
+            to_world = local * xform_cache.GetLocalToWorldTransform(prim.GetParent())
+            payload_positions[prim.GetPath()] = [to_world.ExtractTranslation()]
+    return payload_positions
+
+
+def select_payload_paths(payload_positions, bbox=None, shelf_level=None, root_path=SHELF_ROOT_PATH):
+    """
+    Select the payload prims inside a bounding box and/or on a shelf level.
+
+    Args:
+        payload_positions (dict): Result of collect_payload_positions
+        bbox (Gf.Range3d or tuple): World-space box, None = no spatial filter
+        shelf_level (str): Shelf level prim name (e.g. "Items_Lower"), None = all shelves
+        root_path (str): Root prim of the product hierarchy
+
+    Returns:
+        list: Selected payload prim paths (Sdf.Path)
+    """
+    bbox = to_range(bbox) if bbox is not None else None
+    shelf_path = Sdf.Path(root_path).AppendChild(shelf_level) if shelf_level else None
+
+    selected = []
+    for path, positions in payload_positions.items():
+        if shelf_path is not None and not path.HasPrefix(shelf_path):
+            continue
+        if bbox is not None and not any(bbox.Contains(position) for position in positions):
+            continue
+        selected.append(path)
+    return selected
+
+
+def set_payloads_loaded(stage, paths, loaded):
+    """
+    Load or unload payload prims with a single load rules update.
+
+    The stage recomposes once for the whole batch instead of once per prim.
+
+    Args:
+        stage (Usd.Stage): Stage opened with Usd.Stage.LoadNone (or any load policy)
+        paths (list): Payload prim paths to change
+        loaded (bool): True to load, False to unload
+
+    Returns:
+        int: Number of paths whose load state changed
+    """
+    rule = Usd.StageLoadRules.AllRule if loaded else Usd.StageLoadRules.NoneRule
+    rules = stage.GetLoadRules()
+    changed = 0
+    for path in paths:
+        if rules.IsLoaded(path) != loaded:
+            rules.AddRule(path, rule)
+            changed += 1
+    if changed:
+        rules.Minimize()
+        stage.SetLoadRules(rules)
+    return changed
+
+
+def get_loaded_payload_paths(stage, root_path=SHELF_ROOT_PATH):
+    """Return the loaded payload prim paths below the shelf root."""
+    root = Sdf.Path(root_path)
+    return [path for path in stage.GetLoadSet() if path.HasPrefix(root)]
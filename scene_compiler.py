@@ -0,0 +1,292 @@
+"""
+Headless Scene Compiler for the Dynamic Shop Placer
+
+Builds the populated shop without Isaac Sim: opens the empty shop as a
+plain Usd.Stage (usd-core), runs the same randomization, hierarchy,
+placement and physics-schema authoring the placer uses, and writes a
+ready-to-open .usdc or .usda. Isaac Sim then only opens the compiled file
+(PRECOMPILED_SCENE in dynamic_shop_placer.py), so scene construction can
+run on CPU-only workers.
+
+The compiled root layer sublayers the empty shop (or, with flatten=True,
+contains it) and records the build key of shop, catalog and options in its
+customLayerData, so the placer can tell whether a compiled scene matches
+its own catalog and settings.
+
+Only pxr (usd-core) and NumPy are required - no omni/Kit modules.
+
+Usage:
+    python scene_compiler.py --output build/shop.usdc --seed 42
+    python scene_compiler.py --output build/shop.usda --placement-mode point_instancer --flatten
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pxr import Sdf, Usd, UsdUtils, Vt
+
+from asset_cache import AssetCache
+from bulk_authoring import author_products_to_layer, author_mesh_collision, SHELF_ROOT_PATH
+from compact_catalog import load_catalog
+from orientation import normalize_orientations, ORIENTATION_MODES
+from layout_sampler import LayoutSampler, RANDOMIZATION_MODES
+from overlap_checker import SkuExtentCache, apply_overlap_check, OVERLAP_CHECK_MODES
+from point_instancer_placement import author_point_instancers_to_layer
+from randomization_engine import RandomizationEngine
+from shelf_surfaces import apply_shelf_snap, load_shelf_surfaces
+from stage_build_cache import compute_build_key
+from variant_farm import relative_asset_path
+
+COMPILER_METADATA_KEY = "dynamicShop"
+PLACEMENT_MODES = ("per_prim", "bulk", "point_instancer")
+
+# Same keys as DynamicShopPlacer.get_build_options, so both compute the same build key
+DEFAULT_OPTIONS = {
+    "enable_physics": True,
+    "force_collision": True,
+    "randomization_seed": None,
+    "randomization_mode": "rotations",
+    "num_products": 3,
+    "layout_position_jitter": 0.02,
+    "layout_yaw_range": 10.0,
+    "layout_min_facings": None,
+    "orientation_mode": "quaternion",
+    "overlap_check": None,
+    "snap_to_shelves": False,
+    "position_jitter": 0.0,
+    "scale_jitter": 0.0,
+    "placement_mode": "per_prim",
+    "instanceable": False,
+    "asset_cache_dir": None,
+}
+
+# Stage metadata of the empty shop that has to live on the compiled root layer
+ROOT_METADATA_KEYS = ("defaultPrim", "upAxis", "metersPerUnit", "startTimeCode", "endTimeCode",
+                      "timeCodesPerSecond", "customLayerData")
+
+
+def keep_asset_path(layer, asset_path):
+    """Asset path resolver for FlattenLayerStack that keeps every path as authored."""
+    return asset_path
+
+
+def randomize_catalog(product_data, options, extents_path=None, shelf_surfaces=None):
+    """
+    Randomize, snap onto the shelves, check for overlaps and normalize the catalog exactly like
+    DynamicShopPlacer.prepare_products.
+
+    Args:
+        product_data (dict or CompactCatalog): Product data (product_id -> data)
+        options (dict): Build options (DEFAULT_OPTIONS keys)
+        extents_path (str): JSON cache of per-asset extents for the overlap check, the shelf
+            snap and the layout sampler, None = memory only
+        shelf_surfaces (ShelfSurfaces): Shelf surface index of the empty shop (needed for snap_to_shelves)
+
+    Returns:
+        tuple: (randomized product data, engine seed, randomized product IDs)
+    """
+    if options["randomization_mode"] not in RANDOMIZATION_MODES:
+        raise ValueError(f"Unknown randomization mode '{options['randomization_mode']}', "
+                         f"expected one of {RANDOMIZATION_MODES}")
+    if options["snap_to_shelves"] and shelf_surfaces is None:
+        raise ValueError("snap_to_shelves needs the shelf surfaces of the empty shop")
+    sku_extents = None
+    if options["overlap_check"] or options["snap_to_shelves"] or options["randomization_mode"] == "layout":
+        # Remote assets cannot be opened by plain usd-core, cached copies can
+        resolve = AssetCache(options["asset_cache_dir"]).resolve if options["asset_cache_dir"] else None
+        sku_extents = SkuExtentCache(extents_path, resolve=resolve).get_extents(product_data)
+
+    if options["randomization_mode"] == "layout":
+        sampler = LayoutSampler(product_data, sku_extents, position_jitter=options["layout_position_jitter"],
+                                yaw_range=options["layout_yaw_range"], min_facings=options["layout_min_facings"],
+                                seed=options["randomization_seed"])
+        layout = sampler.sample()
+        randomized_data, seed, randomized_ids = sampler.apply(product_data, layout), sampler.seed, layout["product_ids"]
+    else:
+        engine = RandomizationEngine(product_data, seed=options["randomization_seed"])
+        draw = engine.draw(num_products=options["num_products"], position_jitter=options["position_jitter"],
+                           scale_jitter=options["scale_jitter"])
+        randomized_data, seed, randomized_ids = engine.apply(product_data, draw), engine.seed, draw["product_ids"]
+    if options["snap_to_shelves"]:
+        randomized_data = apply_shelf_snap(randomized_data, sku_extents, shelf_surfaces)
+    if options["overlap_check"]:
+        randomized_data = apply_overlap_check(randomized_data, sku_extents, options["overlap_check"],
+                                              reference_data=product_data, movable=randomized_ids)
+    randomized_data = normalize_orientations(randomized_data, options["orientation_mode"])
+    return randomized_data, int(seed), randomized_ids
+
+
+def compile_scene(empty_shop_path, product_data, output_path, options=None, flatten=False,
+                  mesh_collision=False, extents_path=None):
+    """
+    Compile the populated shop into a single USD file.
+
+    Args:
+        empty_shop_path (str): Path of the empty shop USD file
+        product_data (dict or CompactCatalog): Product data (product_id -> data)
+        output_path (str): .usdc or .usda file to write (the extension picks the format)
+        options (dict): Overrides for DEFAULT_OPTIONS
+        flatten (bool): Merge the empty shop into the output instead of sublayering it
+        mesh_collision (bool): Load the product payloads and add mesh-level convex hull collision
+            (the assets must be readable by usd-core, e.g. through asset_cache_dir)
+        extents_path (str): JSON cache of per-asset extents for options["overlap_check"] and
+            options["snap_to_shelves"]
+
+    Returns:
+        dict: Build summary (output path, build key, seed, counts, seconds)
+    """
+    start = time.perf_counter()
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    if options["placement_mode"] not in PLACEMENT_MODES:
+        raise ValueError(f"Unknown placement mode '{options['placement_mode']}', expected one of {PLACEMENT_MODES}")
+    empty_shop_path = str(Path(empty_shop_path).resolve())
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # The shelf surface index is cached next to the empty shop
+    shelf_surfaces = load_shelf_surfaces(empty_shop_path) if options["snap_to_shelves"] else None
+    randomized_data, seed, randomized_ids = randomize_catalog(product_data, options, extents_path, shelf_surfaces)
+    # The seed that was actually used makes the compiled scene reproducible
+    options["randomization_seed"] = seed
+    if options["asset_cache_dir"]:
+        randomized_data = AssetCache(options["asset_cache_dir"]).localize_catalog(randomized_data)
+
+    layer = Sdf.Layer.CreateAnonymous(output_path.suffix)
+    layer.subLayerPaths.append(empty_shop_path)
+    stage = Usd.Stage.Open(layer, load=Usd.Stage.LoadAll if mesh_collision else Usd.Stage.LoadNone)
+    if not stage.GetPrimAtPath(SHELF_ROOT_PATH):
+        raise ValueError(f"{empty_shop_path} has no {SHELF_ROOT_PATH} prim")
+
+    # per_prim and bulk author identical specs; the compiler always takes the Sdf path
+    if options["placement_mode"] == "point_instancer":
+        product_paths, instancer_paths = author_point_instancers_to_layer(
+            layer, randomized_data, options["enable_physics"], options["force_collision"],
+            instanceable=options["instanceable"])
+    else:
+        product_paths = author_products_to_layer(
+            layer, randomized_data, options["enable_physics"], options["force_collision"],
+            instanceable=options["instanceable"])
+        instancer_paths = {}
+    mesh_count = 0
+    if mesh_collision and options["enable_physics"] and options["force_collision"]:
+        mesh_count = author_mesh_collision(stage, layer, product_paths.values())
+
+    key = compute_build_key(empty_shop_path, product_data, options)
+    shop_layer = Sdf.Layer.FindOrOpen(empty_shop_path)
+    if flatten:
+        output_layer = UsdUtils.FlattenLayerStack(stage, keep_asset_path)
+    else:
+        output_layer = layer
+        layer.subLayerPaths[0] = relative_asset_path(empty_shop_path, output_path.parent)
+        for info_key in ROOT_METADATA_KEYS:
+            if shop_layer.pseudoRoot.HasInfo(info_key):
+                layer.pseudoRoot.SetInfo(info_key, shop_layer.pseudoRoot.GetInfo(info_key))
+
+    instance_count = sum(len(ids) for ids in instancer_paths.values())
+    custom_data = dict(output_layer.customLayerData)
+    custom_data[COMPILER_METADATA_KEY] = {
+        "buildKey": key,
+        # Unseeded runs pick a 128-bit seed, too wide for a USD int64
+        "seed": str(seed),
+        "randomizedProducts": Vt.StringArray(randomized_ids),
+        "productCount": len(product_paths) + instance_count,
+    }
+    output_layer.customLayerData = custom_data
+    if not output_layer.Export(str(output_path)):
+        raise IOError(f"Could not export compiled scene to {output_path}")
+
+    return {
+        "output": str(output_path),
+        "build_key": key,
+        "seed": seed,
+        "randomized_products": randomized_ids,
+        "products": len(product_paths),
+        "instanced_products": instance_count,
+        "collision_meshes": mesh_count,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def read_compiled_metadata(layer):
+    """Return the compiler metadata of a compiled scene's root layer, or None for other files."""
+    return layer.customLayerData.get(COMPILER_METADATA_KEY)
+
+
+def main():
+    """Command line entry point."""
+    base_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Compile the populated shop into a USD file without Isaac Sim")
+    parser.add_argument("--output", required=True, help="Output .usdc or .usda file")
+    parser.add_argument("--catalog", default=str(base_dir / "assets" / "product_data.json"),
+                        help="Product catalog (JSON, .npz or .npy directory)")
+    parser.add_argument("--empty-shop", default=str(base_dir / "assets" / "Shop Minimal Empty.usda"),
+                        help="Empty shop USD file")
+    parser.add_argument("--seed", type=int, default=None, help="Randomization seed (default: random, printed)")
+    parser.add_argument("--randomization-mode", choices=RANDOMIZATION_MODES, default="rotations",
+                        help="rotations: spin --num-products in place, layout: jitter every product collision-free")
+    parser.add_argument("--num-products", type=int, default=DEFAULT_OPTIONS["num_products"],
+                        help="Products with randomized rotation")
+    parser.add_argument("--layout-jitter", type=float, default=DEFAULT_OPTIONS["layout_position_jitter"],
+                        help="Max offset along the shelf plane per product (layout mode)")
+    parser.add_argument("--layout-yaw", type=float, default=DEFAULT_OPTIONS["layout_yaw_range"],
+                        help="Max turn around the up axis in degrees (layout mode)")
+    parser.add_argument("--min-facings", type=int, default=None,
+                        help="Keep between this many and all products per shelf category (layout mode)")
+    parser.add_argument("--orientation-mode", choices=ORIENTATION_MODES, default=DEFAULT_OPTIONS["orientation_mode"],
+                        help="quaternion: translate/orient/scale for every product, original: keep rotateZYX/orient")
+    parser.add_argument("--overlap-check", choices=OVERLAP_CHECK_MODES, default=None,
+                        help="Check for intersecting products before placing: report, reset randomized ones, or nudge")
+    parser.add_argument("--snap-to-shelves", action="store_true",
+                        help="Drop every product onto the shelf surface under it (shelf_surfaces.py)")
+    parser.add_argument("--extents-cache", default=None,
+                        help="JSON file caching per-asset extents for --overlap-check, --snap-to-shelves and layout mode")
+    parser.add_argument("--position-jitter", type=float, default=0.0, help="Max position offset per axis")
+    parser.add_argument("--scale-jitter", type=float, default=0.0, help="Max relative scale change")
+    parser.add_argument("--placement-mode", choices=PLACEMENT_MODES, default="per_prim",
+                        help="Placement mode (per_prim and bulk write the same layer)")
+    parser.add_argument("--instanceable", action="store_true", help="Mark product prims instanceable")
+    parser.add_argument("--static", action="store_true", help="Author products without physics")
+    parser.add_argument("--no-collision", action="store_true", help="Skip the collision APIs")
+    parser.add_argument("--asset-cache-dir", default=None, help="Point payloads at a local asset cache")
+    parser.add_argument("--mesh-collision", action="store_true",
+                        help="Load payloads and add mesh collision (needs local assets)")
+    parser.add_argument("--flatten", action="store_true", help="Merge the empty shop into the output file")
+    args = parser.parse_args()
+
+    if Path(args.output).suffix not in (".usdc", ".usda"):
+        parser.error("--output must end in .usdc or .usda")
+    try:
+        product_data = load_catalog(args.catalog)
+    except Exception as e:
+        print(f"❌ Failed to load product data: {e}")
+        return 1
+    options = {
+        "enable_physics": not args.static,
+        "force_collision": not args.no_collision,
+        "randomization_seed": args.seed,
+        "randomization_mode": args.randomization_mode,
+        "num_products": args.num_products,
+        "layout_position_jitter": args.layout_jitter,
+        "layout_yaw_range": args.layout_yaw,
+        "layout_min_facings": args.min_facings,
+        "orientation_mode": args.orientation_mode,
+        "overlap_check": args.overlap_check,
+        "snap_to_shelves": args.snap_to_shelves,
+        "position_jitter": args.position_jitter,
+        "scale_jitter": args.scale_jitter,
+        "placement_mode": args.placement_mode,
+        "instanceable": args.instanceable,
+        "asset_cache_dir": args.asset_cache_dir,
+    }
+    summary = compile_scene(args.empty_shop, product_data, args.output, options,
+                            flatten=args.flatten, mesh_collision=args.mesh_collision,
+                            extents_path=args.extents_cache)
+    print(f"Randomized products (seed {summary['seed']}): {summary['randomized_products']}")
+    print(f"✅ Compiled {summary['products'] + summary['instanced_products']} products into {summary['output']} "
+          f"in {summary['seconds']:.2f}s (build key {summary['build_key'][:16]})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
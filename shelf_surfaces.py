@@ -0,0 +1,434 @@
+"""
+Shelf Surface Index for the Dynamic Shop Placer
+
+Products are placed at hand-copied heights, and validation guessed shelf
+levels from hard-coded bounds. This module reads the actual shelf geometry
+of the empty shop instead and answers "which surface supports this point,
+and at what height" in O(1):
+
+- Every SM_RackShelf_* prim under /World/Shelf/ShelfObjects is one shelf
+  level. The upward-facing triangles of its meshes (Section0/1/2) are the
+  candidate support faces, transformed into the catalog's frame (the
+  /World/Shelf scopes the products live in).
+- Coplanar faces are grouped by height. Groups smaller than
+  MIN_SURFACE_AREA (clips, screw heads) are ignored, so they cannot lift a
+  product.
+- The remaining faces are rasterized into one heightfield per level on a
+  shared grid (the highest face in each cell wins, NaN = no support).
+  A query is a cell lookup per level.
+
+The index is cached as .npz next to the stage and rebuilt when the stage
+file changes. Only NumPy is needed to use it, while extracting it needs pxr
+(usd-core or Isaac Sim).
+
+Usage:
+    surfaces = load_shelf_surfaces("assets/Shop Minimal Empty.usda")
+    heights, levels = surfaces.find_support(points)
+    product_data, report = snap_to_surfaces(product_data, sku_extents, surfaces)
+    python shelf_surfaces.py "assets/Shop Minimal Empty.usda" --cell-size 0.01
+"""
+
+import argparse
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+
+from compact_catalog import CompactCatalog
+from overlap_checker import UP_AXIS, get_product_boxes, set_products
+
+CATALOG_FRAME_PATH = "/World/Shelf"  # Parent of the Items_* scopes, the frame of every catalog translate
+SHELF_OBJECTS_PATH = "/World/Shelf/ShelfObjects"
+SHELF_PRIM_PREFIX = "SM_RackShelf"  # One shelf level per prim
+DEFAULT_SURFACES_FILE = "shelf_surfaces.npz"  # Cache file, next to the stage
+DEFAULT_CELL_SIZE = 0.01  # Heightfield resolution (catalog units)
+MIN_UP_NORMAL = 0.9  # Faces whose normal is closer than this to the up axis are support candidates
+MIN_SURFACE_AREA = 0.01  # Coplanar support faces with less area in total are ignored (clips, screw heads)
+PLANE_TOLERANCE = 0.002  # Faces closer than this in height belong to the same plane
+SNAP_TOLERANCE = 0.05  # Products sunk up to this far into a surface are still snapped onto it
+SURFACES_VERSION = 1  # Bump when the extraction changes for the same stage
+
+PLANE_AXES = [axis for axis in range(3) if axis != UP_AXIS]
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Return the sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ShelfSurfaces:
+    """One support heightfield per shelf level, on a shared grid in the catalog frame."""
+
+    def __init__(self, origin, cell_size, heights, names, source_hash=None):
+        """
+        Args:
+            origin (array-like): Plane coordinates of the grid's first cell corner
+            cell_size (float): Cell edge length
+            heights (np.ndarray): (levels, rows, columns) support height per cell, NaN = no support;
+                rows run along the second plane axis, columns along the first
+            names (list): Shelf prim name of each level (levels sorted by height)
+            source_hash (str): sha256 of the stage the index was extracted from
+        """
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.heights = np.asarray(heights, dtype=np.float32)
+        self.names = list(names)
+        self.source_hash = source_hash
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != SURFACES_VERSION:
+                raise ValueError(f"{path} was written by shelf surface version {int(data['version'])}")
+            return cls(data["origin"], float(data["cell_size"]), data["heights"], data["names"].tolist(),
+                       str(data["source_hash"]) or None)
+
+    def save(self, path):
+        """Write the index as compressed .npz."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, version=SURFACES_VERSION, origin=self.origin, cell_size=self.cell_size,
+                            heights=self.heights, names=np.array(self.names, dtype=str),
+                            source_hash=self.source_hash or "")
+        return str(path)
+
+    def get_level_heights(self):
+        """Median support height of every level."""
+        return np.array([np.nanmedian(level) for level in self.heights])
+
+    def surface_heights(self, points):
+        """
+        Return every level's support height under each point.
+
+        Args:
+            points (array-like): (n, 2) plane coordinates or (n, 3) positions
+
+        Returns:
+            np.ndarray: (levels, n) heights, NaN where a level has no surface under the point
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+        plane = points[:, PLANE_AXES] if points.shape[1] == 3 else points
+        cells = np.floor((plane - self.origin) / self.cell_size).astype(np.int64)
+        rows, columns = self.heights.shape[1:]
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < columns) & (cells[:, 1] >= 0) & (cells[:, 1] < rows)
+        heights = np.full((len(self), len(points)), np.nan)
+        heights[:, inside] = self.heights[:, cells[inside, 1], cells[inside, 0]]
+        return heights
+
+    def find_support(self, points, tolerance=0.0):
+        """
+        Find the surface each point rests on: the highest one at or below it.
+
+        Args:
+            points (array-like): (n, 3) positions in the catalog frame
+            tolerance (float): Surfaces up to this far above a point still count (e.g. a product sunk
+                into its shelf)
+
+        Returns:
+            tuple: (support heights (n,), NaN if unsupported; level index (n,), -1 if unsupported)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        heights = self.surface_heights(points)
+        below = np.where(heights <= points[:, UP_AXIS] + tolerance, heights, -np.inf)
+        levels = np.argmax(below, axis=0) if len(self) else np.zeros(len(points), dtype=np.int64)
+        support = below[levels, np.arange(len(points))] if len(self) else np.full(len(points), -np.inf)
+        supported = np.isfinite(support)
+        return np.where(supported, support, np.nan), np.where(supported, levels, -1)
+
+
+def triangulate(counts, indices):
+    """Fan-triangulate polygon faces; returns (k, 3) vertex indices."""
+    counts = np.asarray(counts, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    fans = np.maximum(counts - 2, 0)
+    first = np.repeat(starts, fans)
+    step = np.arange(fans.sum()) - np.repeat(np.cumsum(fans) - fans, fans) + 1
+    return np.stack([indices[first], indices[first + step], indices[first + step + 1]], axis=1)
+
+
+def get_support_triangles(triangles, min_up_normal=MIN_UP_NORMAL, min_area=MIN_SURFACE_AREA,
+                          plane_tolerance=PLANE_TOLERANCE):
+    """
+    Keep the upward faces of one shelf level that belong to a large enough plane.
+
+    Args:
+        triangles (np.ndarray): (k, 3, 3) triangles in the catalog frame
+
+    Returns:
+        np.ndarray: (m, 3, 3) support triangles
+    """
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    up = normals[:, UP_AXIS] > min_up_normal * np.maximum(lengths, 1e-12)
+    triangles, area = triangles[up], normals[up, UP_AXIS] / 2.0  # Area projected onto the shelf plane
+    if not len(triangles):
+        return triangles
+    planes = np.round(triangles[:, :, UP_AXIS].mean(axis=1) / plane_tolerance).astype(np.int64)
+    _, plane_index = np.unique(planes, return_inverse=True)
+    plane_area = np.bincount(plane_index.reshape(-1), weights=area)
+    return triangles[plane_area[plane_index.reshape(-1)] >= min_area]
+
+
+def rasterize(triangles, origin, shape, cell_size):
+    """
+    Rasterize support triangles into a heightfield (the highest face per cell center).
+
+    Returns:
+        np.ndarray: (rows, columns) heights, NaN where no triangle covers the cell center
+    """
+    heights = np.full(shape, np.nan)
+    u, v = PLANE_AXES
+    for triangle in triangles:
+        low = np.floor((triangle[:, [u, v]].min(axis=0) - origin) / cell_size).astype(int)
+        high = np.ceil((triangle[:, [u, v]].max(axis=0) - origin) / cell_size).astype(int)
+        low, high = np.maximum(low, 0), np.minimum(high, [shape[1], shape[0]])
+        if np.any(high <= low):
+            continue
+        columns, rows = np.meshgrid(np.arange(low[0], high[0]), np.arange(low[1], high[1]))
+        centers_u = origin[0] + (columns + 0.5) * cell_size
+        centers_v = origin[1] + (rows + 0.5) * cell_size
+        # Barycentric coordinates of the cell centers
+        (u0, v0), (u1, v1), (u2, v2) = triangle[:, [u, v]]
+        area = (u1 - u0) * (v2 - v0) - (u2 - u0) * (v1 - v0)
+        if abs(area) < 1e-12:
+            continue
+        b1 = ((centers_u - u0) * (v2 - v0) - (u2 - u0) * (centers_v - v0)) / area
+        b2 = ((u1 - u0) * (centers_v - v0) - (centers_u - u0) * (v1 - v0)) / area
+        b0 = 1.0 - b1 - b2
+        inside = (b0 >= -1e-9) & (b1 >= -1e-9) & (b2 >= -1e-9)
+        z = b0 * triangle[0, UP_AXIS] + b1 * triangle[1, UP_AXIS] + b2 * triangle[2, UP_AXIS]
+        cell_rows, cell_columns = rows[inside], columns[inside]
+        heights[cell_rows, cell_columns] = np.fmax(heights[cell_rows, cell_columns], z[inside])
+    return heights
+
+
+def build_surfaces(levels, cell_size=DEFAULT_CELL_SIZE, source_hash=None):
+    """
+    Build the index from the support triangles of each level.
+
+    Args:
+        levels (dict): shelf name -> (k, 3, 3) support triangles in the catalog frame
+        cell_size (float): Heightfield resolution
+
+    Returns:
+        ShelfSurfaces: Levels sorted by height, empty levels left out
+    """
+    levels = {name: triangles for name, triangles in levels.items() if len(triangles)}
+    if not levels:
+        return ShelfSurfaces(np.zeros(2), cell_size, np.zeros((0, 0, 0)), [], source_hash)
+    corners = np.concatenate([triangles.reshape(-1, 3) for triangles in levels.values()])[:, PLANE_AXES]
+    origin = np.floor(corners.min(axis=0) / cell_size) * cell_size - cell_size
+    columns, rows = (np.ceil((corners.max(axis=0) - origin) / cell_size).astype(int) + 1).tolist()
+    names = sorted(levels, key=lambda name: np.median(levels[name][:, :, UP_AXIS]))
+    heights = np.stack([rasterize(levels[name], origin, (rows, columns), cell_size) for name in names])
+    return ShelfSurfaces(origin, cell_size, heights, names, source_hash)
+
+
+def read_shelf_triangles(stage_path, shelf_prefix=SHELF_PRIM_PREFIX, min_up_normal=MIN_UP_NORMAL,
+                         min_area=MIN_SURFACE_AREA):
+    """
+    Read the support triangles of every shelf level from the shelf meshes of a stage (needs pxr).
+
+    Args:
+        stage_path (str): Empty shop USD file
+        shelf_prefix (str): Name prefix of the shelf level prims under SHELF_OBJECTS_PATH
+
+    Returns:
+        dict: shelf name -> (k, 3, 3) support triangles in the catalog frame
+    """
+    from pxr import Usd, UsdGeom
+    stage = Usd.Stage.Open(str(stage_path))
+    if not stage:
+        raise ValueError(f"Could not open {stage_path}")
+    xform_cache = UsdGeom.XformCache()
+    frame_prim = stage.GetPrimAtPath(CATALOG_FRAME_PATH)
+    to_frame = np.linalg.inv(np.array(xform_cache.GetLocalToWorldTransform(frame_prim))) if frame_prim \
+        else np.eye(4)
+    objects = stage.GetPrimAtPath(SHELF_OBJECTS_PATH)
+    levels = {}
+    for shelf in (objects.GetChildren() if objects else []):
+        if not shelf.GetName().startswith(shelf_prefix):
+            continue
+        triangles = []
+        for prim in Usd.PrimRange(shelf, Usd.TraverseInstanceProxies()):
+            if not prim.IsA(UsdGeom.Mesh):
+                continue
+            mesh = UsdGeom.Mesh(prim)
+            points, counts, indices = (mesh.GetPointsAttr().Get(), mesh.GetFaceVertexCountsAttr().Get(),
+                                       mesh.GetFaceVertexIndicesAttr().Get())
+            if not points or not counts:
+                continue
+            # Row-vector matrices: local -> world -> catalog frame
+            matrix = np.array(xform_cache.GetLocalToWorldTransform(prim)) @ to_frame
+            points = np.array(points, dtype=np.float64) @ matrix[:3, :3] + matrix[3, :3]
+            faces = triangulate(counts, indices)
+            if mesh.GetOrientationAttr().Get() == UsdGeom.Tokens.leftHanded:
+                faces = faces[:, ::-1]
+            triangles.append(points[faces])
+        if triangles:
+            levels[shelf.GetName()] = get_support_triangles(np.concatenate(triangles), min_up_normal, min_area)
+    return levels
+
+
+def extract_shelf_surfaces(stage_path, cell_size=DEFAULT_CELL_SIZE, shelf_prefix=SHELF_PRIM_PREFIX):
+    """
+    Extract the shelf surface index from the shelf meshes of a stage (needs pxr).
+
+    Args:
+        stage_path (str): Empty shop USD file
+        cell_size (float): Heightfield resolution
+        shelf_prefix (str): Name prefix of the shelf level prims under SHELF_OBJECTS_PATH
+
+    Returns:
+        ShelfSurfaces: The index, stamped with the stage's hash
+    """
+    return build_surfaces(read_shelf_triangles(stage_path, shelf_prefix), cell_size, hash_file(stage_path))
+
+
+def load_shelf_surfaces(stage_path, cache_path=None, cell_size=DEFAULT_CELL_SIZE):
+    """
+    Return the shelf surface index of a stage, from the cache if it was extracted from the same file.
+
+    Args:
+        stage_path (str): Empty shop USD file
+        cache_path (str): .npz cache, None = DEFAULT_SURFACES_FILE next to the stage
+        cell_size (float): Heightfield resolution of a rebuilt index
+
+    Returns:
+        ShelfSurfaces: The index (extracted and cached on a miss, which needs pxr)
+    """
+    cache_path = Path(cache_path) if cache_path else Path(stage_path).with_name(DEFAULT_SURFACES_FILE)
+    source_hash = hash_file(stage_path)
+    if cache_path.exists():
+        try:
+            surfaces = ShelfSurfaces.load(cache_path)
+            if surfaces.source_hash == source_hash:
+                return surfaces
+        except (ValueError, KeyError, OSError) as e:
+            print(f"Warning: ignoring shelf surface cache {cache_path}: {e}")
+    start = time.perf_counter()
+    surfaces = extract_shelf_surfaces(stage_path, cell_size)
+    surfaces.save(cache_path)
+    print(f"Extracted {len(surfaces)} shelf surfaces in {time.perf_counter() - start:.2f}s -> {cache_path}")
+    return surfaces
+
+
+def snap_to_surfaces(product_data, sku_extents, surfaces, tolerance=SNAP_TOLERANCE):
+    """
+    Drop every product onto the surface under it, so its box rests exactly on the shelf.
+
+    The support is looked up under the center of each product's box. A
+    product moves along the up axis only. Products without an extent or
+    without a surface under them keep their pose.
+
+    Args:
+        product_data (dict or CompactCatalog): Catalog to snap (not modified)
+        sku_extents (dict): asset -> (min, max) local extents
+        surfaces (ShelfSurfaces): Shelf surface index
+        tolerance (float): Surfaces up to this far above a box bottom still support it
+
+    Returns:
+        tuple: (snapped catalog, report with snapped (count of products moved), unsupported (IDs),
+            max_shift (largest move) and levels (product count per level name))
+    """
+    boxes = get_product_boxes(product_data, sku_extents)
+    reach = np.einsum("nij,nj->ni", np.abs(boxes["axes"]), boxes["half_extents"])
+    bottoms = boxes["centers"].copy()
+    bottoms[:, UP_AXIS] -= reach[:, UP_AXIS]
+    heights, levels = surfaces.find_support(bottoms, tolerance)
+    supported = levels >= 0
+    shift = np.where(supported, heights - bottoms[:, UP_AXIS], 0.0)
+    moved = np.flatnonzero(np.abs(shift) > 1e-9)
+    translate = boxes["pivots"][moved]
+    translate[:, UP_AXIS] += shift[moved]
+
+    product_ids = boxes["product_ids"]
+    if isinstance(product_data, CompactCatalog):
+        instances = np.array(product_data.instances)
+        if len(product_ids) == len(product_data):
+            rows = moved
+        else:
+            index = product_data.get_index()
+            rows = np.array([index[product_ids[row]] for row in moved], dtype=np.int64)
+        instances["translate"][rows] = translate
+        snapped = product_data.with_instances(instances)
+    else:
+        snapped = set_products(product_data, {product_ids[row]: dict(product_data[product_ids[row]],
+                                                                     translate=position)
+                                              for row, position in zip(moved.tolist(), translate.tolist())})
+    counts = np.bincount(levels[supported], minlength=len(surfaces))
+    return snapped, {
+        "snapped": len(moved),
+        "unsupported": [product_ids[row] for row in np.flatnonzero(~supported)],
+        "max_shift": float(np.abs(shift).max()) if len(shift) else 0.0,
+        "levels": dict(zip(surfaces.names, counts.tolist())),
+    }
+
+
+def apply_shelf_snap(product_data, sku_extents, surfaces, tolerance=SNAP_TOLERANCE):
+    """
+    Snap the catalog onto the shelves before placing (placer and scene compiler), and print the result.
+
+    Returns:
+        dict or CompactCatalog: The catalog to place
+    """
+    product_data, report = snap_to_surfaces(product_data, sku_extents, surfaces, tolerance)
+    print_snap_report(report)
+    return product_data
+
+
+def merge_snap_reports(reports):
+    """Combine the snap_to_surfaces reports of a catalog snapped in parts (e.g. streamed chunks)."""
+    merged = {"snapped": 0, "unsupported": [], "max_shift": 0.0, "levels": {}}
+    for report in reports:
+        merged["snapped"] += report["snapped"]
+        merged["unsupported"].extend(report["unsupported"])
+        merged["max_shift"] = max(merged["max_shift"], report["max_shift"])
+        for name, count in report["levels"].items():
+            merged["levels"][name] = merged["levels"].get(name, 0) + count
+    return merged
+
+
+def print_snap_report(report):
+    """Print the summary of a snap_to_surfaces report."""
+    levels = ", ".join(f"{name}: {count}" for name, count in report["levels"].items())
+    print(f"Shelf snap: {report['snapped']} products dropped onto their shelf "
+          f"(max shift {report['max_shift'] * 1000:.1f} mm; {levels})")
+    if report["unsupported"]:
+        print(f"Warning: {len(report['unsupported'])} products have no shelf surface under them: "
+              f"{report['unsupported'][:10]}")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Extract the shelf surface index of the empty shop")
+    parser.add_argument("stage", nargs="?", default=str(Path(__file__).parent / "assets" / "Shop Minimal Empty.usda"),
+                        help="Empty shop USD file")
+    parser.add_argument("--output", default=None, help=f"Cache file, default {DEFAULT_SURFACES_FILE} next to the stage")
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE, help="Heightfield resolution")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    surfaces = extract_shelf_surfaces(args.stage, args.cell_size)
+    if not len(surfaces):
+        print(f"❌ No {SHELF_PRIM_PREFIX}* meshes with support faces in {args.stage}")
+        return 1
+    target = surfaces.save(args.output or Path(args.stage).with_name(DEFAULT_SURFACES_FILE))
+    print(f"✅ Extracted {len(surfaces)} shelf surfaces in {time.perf_counter() - start:.2f}s -> {target}")
+    for name, height, level in zip(surfaces.names, surfaces.get_level_heights(), surfaces.heights):
+        print(f"  {name}: height {height:.3f}, {int(np.isfinite(level).sum())} cells of {surfaces.cell_size}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+"""
+Prebuilt Binary Stage Cache for the Dynamic Shop Placer
+
+Rebuilding the product layer on every run is wasted work when neither the
+empty shop, the catalog nor the placer options changed. This cache hashes
+those three inputs into a build key and stores the composed product layer as
+a binary .usdc crate file. On a cache hit the file is simply sublayered into
+the stage instead of re-authoring every product.
+
+Only pxr (usd-core or Isaac Sim) is required.
+
+Usage:
+    build_cache = StageBuildCache("./build_cache")
+    key = compute_build_key(empty_shop_path, PRODUCT_DATA, options)
+    success, cache_hit = apply_product_layer(stage, build_cache, key, build_function)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from pxr import Sdf, Usd
+
+from compact_catalog import CompactCatalog
+
+# Bump when the authored product layer changes for the same inputs
+BUILD_CACHE_VERSION = 1
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Return the sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_build_key(empty_shop_path, product_data, options):
+    """
+    Hash the empty shop, the catalog and the placer options into a build key.
+
+    The catalog is hashed as canonical JSON (compact catalogs by their array
+    contents), so in-memory edits to PRODUCT_DATA invalidate the cache
+    exactly like edits to the file.
+
+    Args:
+        empty_shop_path (str): Path of the empty shop USD file
+        product_data (dict or CompactCatalog): Product data (product_id -> data)
+        options (dict): JSON-serializable placer options (physics flags, seed, ...)
+
+    Returns:
+        str: sha256 hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"version={BUILD_CACHE_VERSION}\n".encode())
+    digest.update(hash_file(empty_shop_path).encode())
+    if isinstance(product_data, CompactCatalog):
+        digest.update(product_data.content_hash().encode())
+    else:
+        digest.update(json.dumps(product_data, sort_keys=True).encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class StageBuildCache:
+    """Directory of prebuilt product layers (.usdc) keyed by build key."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_path(self, key):
+        """Return the cache file path for a build key."""
+        return self.cache_dir / f"products_{key[:32]}.usdc"
+
+    def lookup(self, key):
+        """Return the cached product layer path for a key, or None."""
+        cache_path = self.get_path(key)
+        return str(cache_path) if cache_path.exists() else None
+
+    def store(self, key, layer):
+        """
+        Export a product layer as a .usdc crate file for a key.
+
+        The file is written next to its final name and renamed, so a crashed
+        build never leaves a half-written cache entry behind.
+        """
+        cache_path = self.get_path(key)
+        temp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.usdc")
+        if not layer.Export(str(temp_path)):
+            raise IOError(f"Could not export product layer to {temp_path}")
+        os.replace(temp_path, cache_path)
+        return str(cache_path)
+
+    def clear(self):
+        """Remove every cached product layer."""
+        for cache_path in self.cache_dir.glob("products_*.usdc"):
+            cache_path.unlink()
+
+
+def apply_product_layer(stage, build_cache, key, build_function):
+    """
+    Sublayer the cached product layer, or build, store and sublayer it.
+
+    On a miss, an anonymous layer is inserted as the strongest sublayer of the
+    root layer and made the edit target while build_function(stage) authors
+    the products; the result is exported to the cache and swapped in.
+
+    Args:
+        stage (Usd.Stage): Stage with the empty shop opened
+        build_cache (StageBuildCache): Cache to read from / write to
+        key (str): Build key from compute_build_key
+        build_function (callable): Authors the products into the edit target, returns bool
+
+    Returns:
+        tuple: (success, cache_hit)
+    """
+    root_layer = stage.GetRootLayer()
+    cached_path = build_cache.lookup(key)
+    if cached_path:
+        # The root layer may be shared with an earlier stage that already sublayered it
+        if cached_path not in root_layer.subLayerPaths:
+            root_layer.subLayerPaths.insert(0, cached_path)
+        print(f"Build cache hit: sublayered {cached_path}")
+        return True, True
+
+    print("Build cache miss: building product layer...")
+    product_layer = Sdf.Layer.CreateAnonymous("products.usdc")
+    root_layer.subLayerPaths.insert(0, product_layer.identifier)
+    previous_edit_target = stage.GetEditTarget()
+    stage.SetEditTarget(Usd.EditTarget(product_layer))
+    try:
+        success = build_function(stage)
+    finally:
+        stage.SetEditTarget(previous_edit_target)
+
+    if not success:
+        root_layer.subLayerPaths.remove(product_layer.identifier)
+        return False, False
+
+    cached_path = build_cache.store(key, product_layer)
+    # Reference the cache file instead of the anonymous layer so the stage can be saved
+    root_layer.subLayerPaths.replace(product_layer.identifier, cached_path)
+    print(f"Stored product layer in build cache: {cached_path}")
+    return True, False
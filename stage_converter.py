@@ -0,0 +1,246 @@
+"""
+Shop Environment Format Converter and Open-Time Benchmark
+
+The shop files in assets/ are ~2.3 MB of text .usda, most of it inline
+arrays (mesh points, primvars:vc, cooked collision data), so parsing text
+dominates open_stage. This tool writes binary variants next to each source
+file and measures them:
+
+- "usdc": the root layer as a .usdc crate file, composition arcs as authored
+- "flat": the composed stage flattened into one .flat.usdc. Only written
+  when every arc resolves; otherwise flattening would silently drop the
+  payloads it cannot open (e.g. remote product assets without the Isaac Sim
+  resolver)
+- "optimized": shared materials and instanced geometry (stage_optimizer.py)
+
+Each file (source included) is opened in a fresh interpreter, so no layer
+is already cached in memory, and the best open time, the resident memory
+the open added (Linux) and the composed prim count are recorded. The
+results and the hashes of the source and every variant go into a
+<name>.formats.json manifest. The placer reads it to open the fastest
+variant that is still current (PREFER_BINARY_SHOP).
+
+Only pxr (usd-core or Isaac Sim) is required.
+
+Usage:
+    manifest = convert_stage("assets/Shop Minimal Empty.usda")
+    variant_path = find_fastest_variant("assets/Shop Minimal Empty.usda")
+    python stage_converter.py                      # every .usda in assets/
+    python stage_converter.py "assets/Shop Minimal Empty.usda" --variants usdc optimized --repeats 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from pxr import Sdf, Usd
+
+from stage_build_cache import hash_file
+from stage_optimizer import get_optimized_path, write_optimized_stage
+
+VARIANTS = ["usdc", "flat", "optimized"]
+MANIFEST_SUFFIX = ".formats.json"  # "Shop Minimal Empty.usda" -> "Shop Minimal Empty.formats.json"
+OPEN_REPEATS = 3  # Fresh-interpreter opens per file (the best open time counts)
+CONVERTER_VERSION = 1  # Bump when the variants change for the same source
+
+# Runs in a fresh interpreter: open the stage once and print its measurements as JSON
+MEASURE_SCRIPT = """
+import json, os, sys, time
+from pxr import Usd
+from stage_statistics import collect_stage_statistics
+
+def resident_memory():
+    # Resident set size from /proc (Linux); None elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+before = resident_memory()
+start = time.perf_counter()
+stage = Usd.Stage.Open(sys.argv[1], Usd.Stage.LoadAll)
+open_time = time.perf_counter() - start
+after = resident_memory()
+print(json.dumps({
+    "open_time": open_time,
+    "memory": None if before is None else after - before,
+    "prims": collect_stage_statistics(stage)["composed_prims"],
+}))
+"""
+
+
+def get_variant_path(source_path, variant):
+    """Output file of a variant, next to the source."""
+    source_path = Path(source_path)
+    if variant == "usdc":
+        return source_path.with_suffix(".usdc")
+    if variant == "flat":
+        return source_path.with_name(source_path.stem + ".flat.usdc")
+    if variant == "optimized":
+        return get_optimized_path(source_path)
+    raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+
+
+def get_manifest_path(source_path):
+    """The <name>.formats.json manifest of a source file."""
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.stem + MANIFEST_SUFFIX)
+
+
+def write_variant(source_path, variant):
+    """
+    Write one binary variant of a source file.
+
+    Args:
+        source_path (str): Text .usda shop file
+        variant (str): "usdc", "flat" or "optimized"
+
+    Returns:
+        Path: The written file
+
+    Raises:
+        ValueError: If the variant cannot be written faithfully (unresolved arcs for "flat")
+    """
+    source_path = Path(source_path)
+    output_path = get_variant_path(source_path, variant)
+    if variant == "optimized":
+        write_optimized_stage(source_path, output_path)
+        return output_path
+
+    if variant == "usdc":
+        layer = Sdf.Layer.FindOrOpen(str(source_path))
+    else:
+        stage = Usd.Stage.Open(str(source_path), Usd.Stage.LoadAll)
+        errors = stage.GetCompositionErrors()
+        if errors:
+            raise ValueError(f"{len(errors)} composition arcs do not resolve, flattening would drop them")
+        layer = stage.Flatten(addSourceFileComment=False)
+    if not layer or not layer.Export(str(output_path)):
+        raise OSError(f"Could not write {output_path}")
+    return output_path
+
+
+def measure_open(stage_path, repeats=OPEN_REPEATS):
+    """
+    Open a stage in fresh interpreters and return its best open time, memory and prim count.
+
+    Returns:
+        dict: open_time (s), memory (bytes the open added to the resident set, None off Linux), prims
+    """
+    results = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", MEASURE_SCRIPT, str(stage_path)], capture_output=True,
+                                text=True, check=True, cwd=Path(__file__).parent).stdout
+        # Composition warnings (unresolved payloads) go to stderr, the result is the last stdout line
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    best = min(results, key=lambda result: result["open_time"])
+    return dict(best, file_size=os.path.getsize(stage_path))
+
+
+def convert_stage(source_path, variants=None, repeats=OPEN_REPEATS):
+    """
+    Write the binary variants of a source file, measure them and the source, and save the manifest.
+
+    Args:
+        source_path (str): Text .usda shop file
+        variants (list): Variants to write, None = VARIANTS
+        repeats (int): Fresh-interpreter opens per file
+
+    Returns:
+        dict: The manifest (source hash and measurements, per variant file, hash, measurements,
+              conversion time, or the reason it was skipped)
+    """
+    source_path = Path(source_path)
+    manifest = {
+        "version": CONVERTER_VERSION,
+        "source": source_path.name,
+        "sourceHash": hash_file(source_path),
+        "measurements": measure_open(source_path, repeats),
+        "variants": {},
+    }
+    for variant in variants or VARIANTS:
+        start = time.perf_counter()
+        try:
+            output_path = write_variant(source_path, variant)
+        except ValueError as e:
+            manifest["variants"][variant] = {"skipped": str(e)}
+            continue
+        manifest["variants"][variant] = {
+            "file": output_path.name,
+            "hash": hash_file(output_path),
+            "convert_time": time.perf_counter() - start,
+            "measurements": measure_open(output_path, repeats),
+        }
+    with open(get_manifest_path(source_path), 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def find_fastest_variant(source_path):
+    """
+    Return the variant of a source file that opened fastest and is still current, or None.
+
+    A variant is current when the manifest was written for the source as it
+    is now and the variant file was not replaced since. None when there is
+    no manifest, it is stale, or the source itself opened fastest.
+    """
+    source_path = Path(source_path)
+    manifest_path = get_manifest_path(source_path)
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != CONVERTER_VERSION or manifest.get("sourceHash") != hash_file(source_path):
+        print(f"Note: the binary variants of {source_path.name} are out of date, rerun stage_converter.py")
+        return None
+
+    best_path, best_time = None, manifest["measurements"]["open_time"]
+    for variant in manifest["variants"].values():
+        if "skipped" in variant or variant["measurements"]["open_time"] >= best_time:
+            continue
+        variant_path = source_path.with_name(variant["file"])
+        if variant_path.exists() and hash_file(variant_path) == variant["hash"]:
+            best_path, best_time = variant_path, variant["measurements"]["open_time"]
+    return best_path
+
+
+def print_manifest(manifest):
+    """Print the measurements of a source file and its variants as a table."""
+    print(f"{manifest['source']}")
+    print(f"  {'variant':10s} {'file (KB)':>10s} {'convert (s)':>12s} {'open (ms)':>10s} {'memory (MB)':>12s} "
+          f"{'prims':>6s}")
+    rows = [("usda", None, manifest["measurements"])]
+    rows += [(name, variant.get("convert_time"), variant.get("measurements"))
+             for name, variant in manifest["variants"].items()]
+    fastest = min((row for row in rows if row[2]), key=lambda row: row[2]["open_time"])[0]
+    for name, convert_time, measurements in rows:
+        if measurements is None:
+            print(f"  {name:10s} skipped: {manifest['variants'][name]['skipped']}")
+            continue
+        memory = "-" if measurements["memory"] is None else f"{measurements['memory'] / 1024 ** 2:.1f}"
+        convert = "-" if convert_time is None else f"{convert_time:.3f}"
+        marker = "  <- fastest" if name == fastest else ""
+        print(f"  {name:10s} {measurements['file_size'] / 1024:10.0f} {convert:>12s} "
+              f"{measurements['open_time'] * 1000:10.1f} {memory:>12s} {measurements['prims']:6d}{marker}")
+
+
+def main():
+    assets_dir = Path(__file__).parent / "assets"
+    parser = argparse.ArgumentParser(description="Convert shop .usda files to binary variants and benchmark them")
+    parser.add_argument("sources", nargs="*", help="Text .usda files (default: every .usda in assets/)")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS, help="Variants to write")
+    parser.add_argument("--repeats", type=int, default=OPEN_REPEATS, help="Fresh-interpreter opens per file")
+    args = parser.parse_args()
+    print("=== SHOP FORMAT BENCHMARK ===")
+    for source in args.sources or sorted(assets_dir.glob("*.usda")):
+        print_manifest(convert_stage(source, args.variants, args.repeats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,408 @@
+"""
+Empty Shop Optimizer for the Dynamic Shop Placer
+
+The empty shop was exported object by object, so every rack brings its own
+copy of the same materials (MI_RackSetA/C/D_01, each with an
+MI_CeilingA_06b shader) in a Looks scope, and identical objects repeat
+their meshes. This offline pass content-hashes the stage and collapses the
+duplicates:
+
+- Materials: every Material prim is hashed with its shaders (paths inside
+  the material taken relative to it). Materials with the same hash become
+  one definition in the /World/Looks library, bindings and connections are
+  retargeted, and Looks scopes left empty are removed.
+- Geometry: the geometry children of every object under
+  /World/Shelf/ShelfObjects (e.g. SM_RackShelf_01 with Section0/1/2) are
+  hashed after the material pass, ignoring their own transform. Subtrees
+  that repeat become one prototype under the /Prototypes class prim, and
+  every copy is an instanceable reference to it that keeps its transform.
+
+The result is written as a binary .usdc next to the source, with the hash
+of the source in its layer metadata, for the placer to open instead of the
+.usda (OPTIMIZED_SHOP_FILE). Instanced meshes are instance proxies on the
+optimized stage, so tools that read them traverse with
+Usd.TraverseInstanceProxies().
+
+Only pxr (usd-core or Isaac Sim) is required.
+
+Usage:
+    report = optimize_stage("assets/Shop Minimal Empty.usda")
+    print_optimization_report(report)
+    python stage_optimizer.py "assets/Shop Minimal Empty.usda"
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from pxr import Sdf, Usd
+
+from stage_build_cache import hash_file
+from stage_statistics import collect_stage_statistics
+
+LOOKS_PATH = "/World/Looks"  # Library the shared materials move to
+PROTOTYPES_PATH = "/Prototypes"  # Class prim holding the shared geometry (not rendered itself)
+INSTANCE_ROOT_PATH = "/World/Shelf/ShelfObjects"  # The geometry children of these objects get instanced
+OPTIMIZED_SUFFIX = ".optimized.usdc"  # "Shop Minimal Empty.usda" -> "Shop Minimal Empty.optimized.usdc"
+MIN_INSTANCES = 2  # Identical subtrees needed for a prototype
+OPEN_REPEATS = 3  # Stage opens per file for the open time (the best one counts)
+OPTIMIZER_VERSION = 1  # Bump when the optimized output changes for the same source
+# Caches derived from the mesh (PhysX cooks them again when missing); copies of one mesh can differ in them
+DERIVED_PROPERTY_PREFIXES = ("physxCookedData:",)
+
+METADATA_KEY = "dynamicShopOptimizer"  # customLayerData entry of the optimized layer
+PATH_LIST_FIELDS = {"targetPaths": "targetPathList", "connectionPaths": "connectionPathList"}  # field -> editor
+
+
+def get_optimized_path(source_path):
+    """Return the default output of a source stage: the .optimized.usdc sibling."""
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.stem + OPTIMIZED_SUFFIX)
+
+
+def _hashable(value, root):
+    """Bytes or a repr for a spec field value, with paths under root made relative."""
+    if isinstance(value, Sdf.Path):
+        return str(value.MakeRelativePath(root)) if value.HasPrefix(root) else str(value)
+    if isinstance(value, Sdf.PathListOp):
+        return (value.isExplicit,) + tuple(tuple(_hashable(path, root) for path in items) for items in (
+            value.explicitItems, value.prependedItems, value.appendedItems, value.deletedItems))
+    if isinstance(value, Sdf.AssetPath):
+        return value.path
+    try:
+        # Vt arrays (points, indices, cooked collision data) hash as their raw buffer
+        return bytes(memoryview(value))
+    except TypeError:
+        return repr(value)
+
+
+def is_xform_property(name):
+    """True for xformOp:* and xformOpOrder, the transform a subtree root keeps as an instance."""
+    return name.startswith("xformOp")
+
+
+def hash_prim_spec(prim_spec, skip_root_xform=False):
+    """
+    Content hash of a prim spec and everything below it.
+
+    Field values, child and property names count, the root's own name and
+    location do not: two copies of a material or mesh at different paths
+    hash the same. Derived caches (DERIVED_PROPERTY_PREFIXES) are skipped.
+
+    Args:
+        prim_spec (Sdf.PrimSpec): Root of the subtree
+        skip_root_xform (bool): Ignore the root's xformOps (instances keep their own transform)
+
+    Returns:
+        str: sha256 hex digest
+    """
+    root = prim_spec.path
+    digest = hashlib.sha256()
+
+    def visit(spec):
+        digest.update(str(spec.path.MakeRelativePath(root)).encode())
+        for key in sorted(spec.ListInfoKeys()):
+            value = _hashable(spec.GetInfo(key), root)
+            digest.update(key.encode())
+            digest.update(value if isinstance(value, bytes) else repr(value).encode())
+        if isinstance(spec, Sdf.PrimSpec):
+            for property_spec in sorted(spec.properties, key=lambda s: s.name):
+                if property_spec.name.startswith(DERIVED_PROPERTY_PREFIXES):
+                    continue
+                if not (skip_root_xform and spec.path == root and is_xform_property(property_spec.name)):
+                    visit(property_spec)
+            for child in sorted(spec.nameChildren, key=lambda s: s.name):
+                visit(child)
+
+    visit(prim_spec)
+    return digest.hexdigest()
+
+
+def iter_prim_specs(layer):
+    """Yield every prim spec of a layer, parents before children."""
+    stack = list(reversed(layer.rootPrims))
+    while stack:
+        prim_spec = stack.pop()
+        yield prim_spec
+        stack.extend(reversed(prim_spec.nameChildren))
+
+
+def iter_path_lists(layer):
+    """Yield (property spec, field, Sdf.PathListOp) for every relationship target and attribute connection."""
+    for prim_spec in iter_prim_specs(layer):
+        for property_spec in prim_spec.properties:
+            for field in PATH_LIST_FIELDS:
+                if property_spec.HasInfo(field):
+                    yield property_spec, field, property_spec.GetInfo(field)
+
+
+def remap_paths(layer, mapping):
+    """
+    Point every relationship target and connection under an old path to the new one.
+
+    Args:
+        layer (Sdf.Layer): Layer to edit
+        mapping (dict): old prim path -> new prim path (Sdf.Path)
+
+    Returns:
+        int: Edited path lists
+    """
+    def remap(path):
+        for old, new in mapping.items():
+            if path.HasPrefix(old):
+                return path.ReplacePrefix(old, new)
+        return path
+
+    edited = 0
+    for property_spec, field, list_op in list(iter_path_lists(layer)):
+        paths = set(list_op.explicitItems) | set(list_op.prependedItems) | set(list_op.appendedItems) \
+            | set(list_op.deletedItems)
+        changes = [(path, remap(path)) for path in paths if remap(path) != path]
+        editor = getattr(property_spec, PATH_LIST_FIELDS[field])
+        for path, new_path in changes:
+            editor.ReplaceItemEdits(path, new_path)
+        edited += bool(changes)
+    return edited
+
+
+def get_unique_path(layer, parent_path, name):
+    """parent_path/name, with _1, _2, ... appended while that prim already exists."""
+    path = Sdf.Path(parent_path).AppendChild(name)
+    suffix = 0
+    while layer.GetPrimAtPath(path):
+        suffix += 1
+        path = Sdf.Path(parent_path).AppendChild(f"{name}_{suffix}")
+    return path
+
+
+def remove_prim_spec(layer, path):
+    """Remove a prim spec, then its parents while they are empty Scopes (the per-object Looks)."""
+    prim_spec = layer.GetPrimAtPath(path)
+    parent = prim_spec.nameParent
+    del parent.nameChildren[prim_spec.name]
+    while parent and parent.typeName == "Scope" and not parent.nameChildren and not parent.properties \
+            and parent.nameParent:
+        grandparent = parent.nameParent
+        del grandparent.nameChildren[parent.name]
+        parent = grandparent
+
+
+def dedupe_materials(layer, library_path=LOOKS_PATH):
+    """
+    Collapse identical materials into one definition each in the material library.
+
+    A material that already lives in the library stays the shared one,
+    otherwise the first copy moves there under its own name.
+
+    Args:
+        layer (Sdf.Layer): Layer to edit
+        library_path (str): Scope of the shared materials
+
+    Returns:
+        dict: old material path -> shared material path, for every removed copy
+    """
+    groups = {}
+    for prim_spec in iter_prim_specs(layer):
+        if prim_spec.typeName == "Material":
+            groups.setdefault(hash_prim_spec(prim_spec), []).append(prim_spec.path)
+    library_path = Sdf.Path(library_path)
+
+    mapping = {}
+    for paths in groups.values():
+        if len(paths) < 2:
+            continue
+        shared = next((path for path in paths if path.GetParentPath() == library_path), None)
+        if shared is None:
+            if not layer.GetPrimAtPath(library_path):
+                Sdf.CreatePrimInLayer(layer, library_path).typeName = "Scope"
+            shared = get_unique_path(layer, library_path, paths[0].name)
+            Sdf.CopySpec(layer, paths[0], layer, shared)
+        mapping.update({path: shared for path in paths if path != shared})
+
+    remap_paths(layer, mapping)
+    for path in mapping:
+        remove_prim_spec(layer, path)
+    return mapping
+
+
+def contains_mesh(prim_spec):
+    """True if the prim or anything below it is a Mesh."""
+    return prim_spec.typeName == "Mesh" or any(contains_mesh(child) for child in prim_spec.nameChildren)
+
+
+def instance_geometry(layer, root_path=INSTANCE_ROOT_PATH, prototypes_path=PROTOTYPES_PATH,
+                      min_instances=MIN_INSTANCES):
+    """
+    Turn repeated geometry subtrees into instanceable references to one prototype.
+
+    Candidates are the children with meshes of every object under root_path.
+    A subtree something else points into (a relationship target or
+    connection) is left as it is, since instance proxies cannot be targeted.
+    The prototype is the first copy, so it keeps that copy's derived caches.
+
+    Args:
+        layer (Sdf.Layer): Layer to edit (after dedupe_materials, so copies bind the same materials)
+        root_path (str): Parent of the objects
+        prototypes_path (str): Class prim the prototypes are created under
+        min_instances (int): Identical subtrees needed for a prototype
+
+    Returns:
+        dict: prototype path -> instance paths
+    """
+    root_spec = layer.GetPrimAtPath(root_path)
+    if not root_spec:
+        return {}
+    targets = [path for _, _, list_op in iter_path_lists(layer) for path in list_op.GetAddedOrExplicitItems()]
+    groups = {}
+    for object_spec in root_spec.nameChildren:
+        for child in object_spec.nameChildren:
+            if not contains_mesh(child):
+                continue
+            if any(target.HasPrefix(child.path) for target in targets):
+                continue
+            groups.setdefault(hash_prim_spec(child, skip_root_xform=True), []).append(child.path)
+
+    prototypes = {}
+    for paths in groups.values():
+        if len(paths) < min_instances:
+            continue
+        if not layer.GetPrimAtPath(prototypes_path):
+            Sdf.CreatePrimInLayer(layer, prototypes_path).specifier = Sdf.SpecifierClass
+        prototype_path = get_unique_path(layer, prototypes_path, paths[0].name)
+        Sdf.CopySpec(layer, paths[0], layer, prototype_path)
+        prototype_spec = layer.GetPrimAtPath(prototype_path)
+        for property_spec in list(prototype_spec.properties):
+            if is_xform_property(property_spec.name):
+                prototype_spec.RemoveProperty(property_spec)
+
+        for path in paths:
+            # The instance keeps its transform and takes everything else from the prototype
+            instance_spec = layer.GetPrimAtPath(path)
+            for property_spec in list(instance_spec.properties):
+                if not is_xform_property(property_spec.name):
+                    instance_spec.RemoveProperty(property_spec)
+            for child in list(instance_spec.nameChildren):
+                del instance_spec.nameChildren[child.name]
+            instance_spec.referenceList.Prepend(Sdf.Reference(primPath=prototype_path))
+            instance_spec.instanceable = True
+        prototypes[prototype_path] = paths
+    return prototypes
+
+
+def measure_stage(stage_path, repeats=OPEN_REPEATS):
+    """
+    File size, best open time and prim counts of a stage file.
+
+    Returns:
+        dict: file_size (bytes), open_time (s) and the stage_statistics counts
+    """
+    open_times = []
+    for _ in range(repeats):
+        # Nothing else holds the layer, so every open reads the file again
+        start = time.perf_counter()
+        stage = Usd.Stage.Open(str(stage_path))
+        open_times.append(time.perf_counter() - start)
+        statistics = collect_stage_statistics(stage)
+        del stage
+    return dict({"file_size": os.path.getsize(stage_path), "open_time": min(open_times)}, **statistics)
+
+
+def write_optimized_stage(source_path, output_path=None):
+    """
+    Write the deduplicated, instanced binary version of a stage.
+
+    Args:
+        source_path (str): Empty shop USD file
+        output_path (str): Optimized .usdc, None = get_optimized_path(source_path)
+
+    Returns:
+        dict: output path, materials collapsed and prototypes created
+    """
+    source_path = Path(source_path)
+    output_path = Path(output_path) if output_path else get_optimized_path(source_path)
+    source_layer = Sdf.Layer.FindOrOpen(str(source_path))
+    if not source_layer:
+        raise ValueError(f"Could not open {source_path}")
+    layer = Sdf.Layer.CreateAnonymous(".usda")
+    layer.TransferContent(source_layer)
+    del source_layer
+
+    with Sdf.ChangeBlock():
+        materials = dedupe_materials(layer)
+        prototypes = instance_geometry(layer)
+    layer.customLayerData = dict(layer.customLayerData, **{METADATA_KEY: {
+        "source": source_path.name,
+        "sourceHash": hash_file(source_path),
+        "version": OPTIMIZER_VERSION,
+    }})
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if not layer.Export(str(output_path)):
+        raise OSError(f"Could not write {output_path}")
+
+    return {
+        "output": str(output_path),
+        "materials_removed": len(materials),
+        "shared_materials": len(set(materials.values())),
+        "prototypes": len(prototypes),
+        "instances": sum(len(paths) for paths in prototypes.values()),
+    }
+
+
+def optimize_stage(source_path, output_path=None, repeats=OPEN_REPEATS):
+    """
+    Write the deduplicated, instanced binary version of a stage and measure both.
+
+    Args:
+        source_path (str): Empty shop USD file
+        output_path (str): Optimized .usdc, None = get_optimized_path(source_path)
+        repeats (int): Stage opens per file for the open time
+
+    Returns:
+        dict: write_optimized_stage's report plus before/after measurements
+    """
+    report = write_optimized_stage(source_path, output_path)
+    report["before"] = measure_stage(source_path, repeats)
+    report["after"] = measure_stage(report["output"], repeats)
+    return report
+
+
+def is_optimized_stage_current(optimized_path, source_path):
+    """True if optimized_path exists and was written by this optimizer version from source_path as it is now."""
+    if not Path(optimized_path).exists():
+        return False
+    layer = Sdf.Layer.OpenAsAnonymous(str(optimized_path), metadataOnly=True)
+    metadata = layer.customLayerData.get(METADATA_KEY) if layer else None
+    return bool(metadata) and metadata.get("version") == OPTIMIZER_VERSION \
+        and metadata.get("sourceHash") == hash_file(source_path)
+
+
+def print_optimization_report(report):
+    """Print what was collapsed and the before/after measurements."""
+    before, after = report["before"], report["after"]
+    print("=== EMPTY SHOP OPTIMIZATION ===")
+    print(f"Materials: {report['materials_removed']} copies collapsed into {report['shared_materials']} "
+          f"shared materials")
+    print(f"Geometry: {report['instances']} subtrees instanced from {report['prototypes']} prototypes")
+    print(f"{'':18s} {'before':>12s} {'after':>12s}")
+    print(f"  {'file size (KB)':16s} {before['file_size'] / 1024:12.0f} {after['file_size'] / 1024:12.0f}")
+    print(f"  {'open time (ms)':16s} {before['open_time'] * 1000:12.1f} {after['open_time'] * 1000:12.1f}")
+    for name in ("composed_prims", "instances", "prototypes", "expanded_prims"):
+        print(f"  {name:16s} {before[name]:12d} {after[name]:12d}")
+    print(f"✅ Wrote {report['output']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate materials and instance repeated geometry of a stage")
+    parser.add_argument("source", nargs="?", default=str(Path(__file__).parent / "assets" / "Shop Minimal Empty.usda"),
+                        help="Empty shop USD file")
+    parser.add_argument("--output", help="Optimized .usdc (default: <source>.optimized.usdc next to the source)")
+    parser.add_argument("--repeats", type=int, default=OPEN_REPEATS, help="Stage opens per file for the open time")
+    args = parser.parse_args()
+    print_optimization_report(optimize_stage(args.source, args.output, args.repeats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+"""
+Stage Statistics for the Dynamic Shop Placer
+
+Counts how many prims a stage actually composes, how many of them are
+instances and how many prototypes the instances share. Used to compare
+placement modes (e.g. regular product prims vs. instanceable products).
+
+Only pxr (usd-core or Isaac Sim) is required.
+"""
+
+from pxr import Usd
+
+
+def collect_stage_statistics(stage):
+    """
+    Collect composition statistics for a stage.
+
+    Returns:
+        dict: Counts for:
+            composed_prims   - prims composed on the stage, including prototype contents
+            instances        - instanceable prims that share a prototype
+            prototypes       - prototypes shared by the instances
+            prototype_prims  - prims composed inside prototypes
+            expanded_prims   - prims the stage would compose without instancing
+    """
+    stage_prims = 0
+    instances = 0
+    for prim in Usd.PrimRange.Stage(stage, Usd.PrimAllPrimsPredicate):
+        stage_prims += 1
+        if prim.IsInstance():
+            instances += 1
+
+    prototypes = stage.GetPrototypes()
+    prototype_sizes = {}
+    for prototype in prototypes:
+        # The prototype root itself stands in for the instance prim, so only count descendants
+        prototype_sizes[prototype.GetPath()] = sum(
+            1 for _ in Usd.PrimRange(prototype, Usd.PrimAllPrimsPredicate)) - 1
+
+    expanded_prims = stage_prims
+    for prim in Usd.PrimRange.Stage(stage, Usd.PrimAllPrimsPredicate):
+        if prim.IsInstance():
+            expanded_prims += prototype_sizes.get(prim.GetPrototype().GetPath(), 0)
+
+    prototype_prims = sum(prototype_sizes.values())
+    return {
+        "composed_prims": stage_prims + prototype_prims,
+        "instances": instances,
+        "prototypes": len(prototypes),
+        "prototype_prims": prototype_prims,
+        "expanded_prims": expanded_prims,
+    }
+
+
+def print_stage_statistics(statistics, title="STAGE STATISTICS"):
+    """Print the statistics of a single stage."""
+    print(f"=== {title} ===")
+    for name, value in statistics.items():
+        print(f"  {name:16s}: {value}")
+
+
+def print_statistics_comparison(before, after, before_label="before", after_label="after"):
+    """Print two statistics dictionaries side by side."""
+    print(f"{'':18s} {before_label:>12s} {after_label:>12s}")
+    for name in before:
+        print(f"  {name:16s} {before[name]:12d} {after.get(name, 0):12d}")
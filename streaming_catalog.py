@@ -0,0 +1,217 @@
+"""
+NDJSON Streaming Catalog for the Dynamic Shop Placer
+
+product_data.json is one JSON object, so json.load has to read all of it
+before the first product can be placed. An NDJSON catalog (.ndjson/.jsonl)
+has one product per line, {"id": <product_id>, <product fields>}, and is
+read as a generator instead:
+
+- iter_catalog_products yields products as their lines are read; malformed
+  lines are reported and skipped (the same reader as catalog_validator.py)
+- iter_catalog_chunks groups any product stream into {product_id: data}
+  dicts of a fixed size
+- place_catalog_stream prepares and places each chunk before the next one
+  is parsed, so memory stays at one chunk and placement starts right away
+
+With PRODUCT_CATALOG_FILE set to an .ndjson file, the placer's
+place_all_products streams it in CATALOG_CHUNK_SIZE chunks. Every other
+catalog user reads the file whole through load_catalog.
+
+The converter streams too: JSON -> NDJSON decodes the object one product at
+a time, and NDJSON -> JSON writes the product_data.json format line by line.
+Other catalog formats (.npz, .npy directory) are loaded and written out.
+
+Usage:
+    for chunk in iter_catalog_chunks(iter_catalog_products("assets/product_data.ndjson"), 1000):
+        place(chunk)
+    python streaming_catalog.py assets/product_data.json assets/product_data.ndjson
+    python streaming_catalog.py assets/product_data.ndjson catalog.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+NDJSON_ID_KEY = "id"  # Product ID field of an NDJSON line
+CHUNK_SIZE = 1000  # Products per chunk
+
+
+def is_ndjson_catalog(path):
+    """True if the catalog path is line-delimited (.ndjson/.jsonl)."""
+    return Path(path).suffix in NDJSON_SUFFIXES
+
+
+def iter_catalog_products(path):
+    """
+    Yield (product_id, data) from an NDJSON catalog as its lines are read.
+
+    Malformed lines (not a JSON object, no "id") are printed and skipped,
+    like the entries CompactCatalog.from_product_data cannot convert.
+
+    Args:
+        path (str): NDJSON catalog file
+    """
+    from catalog_validator import iter_ndjson_entries
+    errors = []
+    with open(path, 'r', encoding="utf-8") as f:
+        for _, product_id, data in iter_ndjson_entries(f, errors=errors):
+            for line, message in errors:
+                print(f"Skipping line {line} of {path}: {message}")
+            errors.clear()
+            yield product_id, data
+    for line, message in errors:
+        print(f"Skipping line {line} of {path}: {message}")
+
+
+def iter_catalog_chunks(products, chunk_size=CHUNK_SIZE):
+    """
+    Group a product stream into catalog chunks.
+
+    Args:
+        products (iterable): (product_id, data) pairs, e.g. iter_catalog_products(path)
+        chunk_size (int): Products per chunk
+
+    Yields:
+        dict: product_id -> data, chunk_size products (fewer in the last chunk)
+    """
+    chunk = {}
+    for product_id, data in products:
+        chunk[product_id] = data
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = {}
+    if chunk:
+        yield chunk
+
+
+def place_catalog_stream(chunks, place_chunk, prepare_chunk=None):
+    """
+    Prepare and place catalog chunks one at a time, as the generator yields them.
+
+    Args:
+        chunks (iterable): product_id -> data dicts, e.g. iter_catalog_chunks(...)
+        place_chunk (callable): place_chunk(chunk) -> number of products placed
+        prepare_chunk (callable): prepare_chunk(chunk) -> chunk to place, None = place as parsed
+
+    Returns:
+        dict: products (parsed), placed, chunks, first_chunk_time (seconds until the first chunk
+              was placed), total_time
+    """
+    result = {"products": 0, "placed": 0, "chunks": 0, "first_chunk_time": None, "total_time": 0.0}
+    start = time.perf_counter()
+    for chunk in chunks:
+        result["products"] += len(chunk)
+        if prepare_chunk is not None:
+            chunk = prepare_chunk(chunk)
+        result["placed"] += place_chunk(chunk)
+        result["chunks"] += 1
+        if result["first_chunk_time"] is None:
+            result["first_chunk_time"] = time.perf_counter() - start
+    result["total_time"] = time.perf_counter() - start
+    return result
+
+
+def write_ndjson_catalog(products, path):
+    """
+    Write products as an NDJSON catalog, one product per line.
+
+    Args:
+        products (dict or iterable): product_id -> data mapping, or (product_id, data) pairs
+        path (str): Output file
+
+    Returns:
+        int: Number of products written
+    """
+    items = products.items() if hasattr(products, "items") else products
+    count = 0
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding="utf-8") as f:
+        for product_id, data in items:
+            f.write(json.dumps({NDJSON_ID_KEY: product_id, **data}) + "\n")
+            count += 1
+    return count
+
+
+def write_json_catalog(products, path):
+    """
+    Write products in the product_data.json format (indent 4) without building the whole object.
+
+    Args:
+        products (dict or iterable): product_id -> data mapping, or (product_id, data) pairs
+        path (str): Output file
+
+    Returns:
+        int: Number of products written
+    """
+    items = products.items() if hasattr(products, "items") else products
+    count = 0
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding="utf-8") as f:
+        f.write("{")
+        for product_id, data in items:
+            entry = json.dumps(data, indent=4).replace("\n", "\n    ")
+            f.write(f"{',' if count else ''}\n    {json.dumps(product_id)}: {entry}")
+            count += 1
+        f.write("\n}" if count else "}")
+    return count
+
+
+def iter_source_products(source):
+    """(product_id, data) pairs of any catalog; JSON and NDJSON are streamed, other formats loaded."""
+    source = Path(source)
+    if is_ndjson_catalog(source):
+        yield from iter_catalog_products(source)
+    elif source.suffix == ".json":
+        from catalog_validator import iter_json_entries
+        with open(source, 'r', encoding="utf-8") as f:
+            for _, product_id, data in iter_json_entries(f):
+                yield product_id, data
+    else:
+        from compact_catalog import load_catalog
+        yield from load_catalog(source).to_product_data().items()
+
+
+def convert_catalog(source, target):
+    """
+    Convert a catalog to NDJSON (.ndjson/.jsonl) or the product_data.json format (.json).
+
+    Args:
+        source (str): Catalog file: .json, .ndjson/.jsonl, .npz or .npy directory
+        target (str): Output file
+
+    Returns:
+        int: Number of products written
+
+    Raises:
+        ValueError: For an unsupported target format
+    """
+    if is_ndjson_catalog(target):
+        return write_ndjson_catalog(iter_source_products(source), target)
+    if Path(target).suffix == ".json":
+        return write_json_catalog(iter_source_products(source), target)
+    raise ValueError(f"Unsupported target format: {target} (use .ndjson, .jsonl or .json)")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Convert a product catalog to or from NDJSON")
+    parser.add_argument("source", help="Catalog: .json, .ndjson/.jsonl, .npz or .npy directory")
+    parser.add_argument("target", help="Output: .ndjson/.jsonl (one product per line) or .json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        count = convert_catalog(args.source, args.target)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Converted {count} products to {args.target} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
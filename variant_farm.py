@@ -0,0 +1,268 @@
+"""
+Scene-Variant Farm for the Dynamic Shop Placer
+
+Generates K randomized shop layouts headlessly. The catalog is authored
+once into a shared base layer (empty shop + all products); every variant is
+a small override layer that sublayers the base and only holds the
+randomized transforms of its products. Variants are independent of each
+other, so they are generated across a process pool, and a contiguous seed
+range can be split into shards so several machines share the work. Each
+shard writes a manifest with every variant's seed, options and output path.
+
+Only pxr (usd-core) and NumPy are required - no Kit - so the farm runs on
+CPU-only nodes.
+
+Usage:
+    python variant_farm.py --count 1000 --workers 8 --output-dir ./variants
+    python variant_farm.py --count 1000 --shard-index 2 --shard-count 4 --position-jitter 0.005
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pxr import Sdf
+
+from bulk_authoring import convert_transform, set_transform_specs, get_product_path, author_products_to_layer
+from compact_catalog import CompactCatalog, load_catalog
+from randomization_engine import RandomizationEngine
+from stage_build_cache import compute_build_key
+
+MANIFEST_VERSION = 1
+
+DEFAULT_OPTIONS = {
+    "num_products": 3,
+    "rotation": "auto",
+    "position_jitter": 0.0,
+    "scale_jitter": 0.0,
+    "enable_physics": True,
+    "force_collision": True,
+    "format": "usdc",
+}
+
+# Catalog of the products authored in the base layer, set once per worker process
+_worker_product_data = None
+
+
+def shard_seeds(seed_start, count, shard_index=0, shard_count=1):
+    """
+    Return the contiguous seed range of one shard.
+
+    The range [seed_start, seed_start + count) is split into shard_count
+    consecutive slices whose sizes differ by at most one.
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard_index must be in [0, {shard_count}), got {shard_index}")
+    base_size, remainder = divmod(count, shard_count)
+    start = seed_start + shard_index * base_size + min(shard_index, remainder)
+    size = base_size + (1 if shard_index < remainder else 0)
+    return range(start, start + size)
+
+
+def relative_asset_path(target, anchor_dir):
+    """Return target relative to anchor_dir (posix, './'-prefixed), or absolute across drives."""
+    try:
+        relative = os.path.relpath(target, anchor_dir)
+    except ValueError:
+        return Path(target).resolve().as_posix()
+    return "./" + Path(relative).as_posix()
+
+
+def build_base_layer(empty_shop_path, product_data, output_dir, options):
+    """
+    Author the shared base layer (empty shop sublayer + every product) once.
+
+    The file name contains the build key of the shop, catalog and physics
+    options, so shards writing to the same directory share it, and variants of
+    a different catalog never pick up a stale base.
+
+    Returns:
+        tuple: (base layer path, {product_id: prim path} of the authored products)
+    """
+    base_options = {key: options[key] for key in ("enable_physics", "force_collision")}
+    key = compute_build_key(empty_shop_path, product_data, base_options)
+    base_path = Path(output_dir) / f"base_{key[:16]}.usdc"
+
+    layer = Sdf.Layer.CreateAnonymous("base.usdc")
+    layer.subLayerPaths.append(relative_asset_path(empty_shop_path, output_dir))
+    product_paths = author_products_to_layer(layer, product_data,
+                                             enable_physics=options["enable_physics"],
+                                             force_collision=options["force_collision"])
+    if not base_path.exists():
+        # Written next to its final name and renamed, shards may race on a shared directory
+        temp_path = base_path.with_name(f"{base_path.stem}.{os.getpid()}.tmp.usdc")
+        if not layer.Export(str(temp_path)):
+            raise IOError(f"Could not export base layer to {temp_path}")
+        os.replace(temp_path, base_path)
+    return str(base_path), product_paths
+
+
+def author_variant_layer(layer, product_data, randomized_data, product_ids):
+    """Author 'over' specs with the randomized transforms of product_ids."""
+    with Sdf.ChangeBlock():
+        for product_id in product_ids:
+            data = randomized_data[product_id]
+            prim_spec = Sdf.CreatePrimInLayer(layer, get_product_path(product_id, product_data[product_id]))
+            set_transform_specs(prim_spec, convert_transform(data))
+
+
+def _init_worker(product_data):
+    global _worker_product_data
+    _worker_product_data = product_data
+
+
+def generate_variant(seed, base_path, output_dir, options):
+    """
+    Write the override layer of one variant.
+
+    The variant only depends on (catalog, seed, options), so any single
+    variant can be regenerated on its own.
+
+    Returns:
+        dict: Manifest entry of the variant
+    """
+    start = time.perf_counter()
+    product_data = _worker_product_data
+    engine = RandomizationEngine(product_data, seed=seed)
+    draw = engine.draw(num_products=options["num_products"], rotation=options["rotation"],
+                       position_jitter=options["position_jitter"], scale_jitter=options["scale_jitter"])
+    randomized_data = engine.apply(product_data, draw)
+
+    variant_path = Path(output_dir) / f"variant_{seed:06d}.{options['format']}"
+    layer = Sdf.Layer.CreateNew(str(variant_path))
+    layer.subLayerPaths.append(relative_asset_path(base_path, output_dir))
+    author_variant_layer(layer, product_data, randomized_data, draw["product_ids"])
+    layer.Save()
+
+    return {
+        "seed": seed,
+        "path": variant_path.name,
+        "options": options,
+        "randomized_products": draw["product_ids"],
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def hash_catalog(product_data):
+    """Return the sha256 of the catalog contents (dict or CompactCatalog, the same for both)."""
+    if not isinstance(product_data, CompactCatalog):
+        product_data = CompactCatalog.from_product_data(product_data)
+    return product_data.content_hash()
+
+
+def get_manifest_path(output_dir, shard_index=0, shard_count=1):
+    """Return the manifest path of a shard (one manifest per shard, so shards never overwrite each other)."""
+    if shard_count == 1:
+        return Path(output_dir) / "manifest.json"
+    return Path(output_dir) / f"manifest_shard_{shard_index:03d}_of_{shard_count:03d}.json"
+
+
+def run_farm(empty_shop_path, product_data, output_dir, count, seed_start=0, shard_index=0,
+             shard_count=1, workers=None, options=None):
+    """
+    Generate the variants of one shard and write its manifest.
+
+    Args:
+        empty_shop_path (str): Path of the empty shop USD file
+        product_data (dict or CompactCatalog): Product catalog (product_id -> data)
+        output_dir (str): Directory for the base layer, variants and manifest
+        count (int): Total number of variants across all shards
+        seed_start (int): First seed of the whole run
+        shard_index (int): Index of this shard
+        shard_count (int): Number of shards the seed range is split into
+        workers (int): Worker processes, None = os.cpu_count(), 0 = run in this process
+        options (dict): Overrides for DEFAULT_OPTIONS
+
+    Returns:
+        dict: The manifest
+    """
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    seeds = shard_seeds(seed_start, count, shard_index, shard_count)
+    start = time.perf_counter()
+
+    base_path, product_paths = build_base_layer(empty_shop_path, product_data, output_dir, options)
+    # Only products present in the base layer can be overridden
+    base_product_data = {pid: product_data[pid] for pid in product_paths}
+    print(f"Base layer: {base_path} ({len(base_product_data)} products)")
+    print(f"Generating {len(seeds)} variants (seeds {seeds.start}-{seeds.stop - 1}, "
+          f"shard {shard_index + 1}/{shard_count})...")
+
+    if workers == 0:
+        _init_worker(base_product_data)
+        variants = [generate_variant(seed, base_path, output_dir, options) for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(base_product_data,)) as executor:
+            futures = [executor.submit(generate_variant, seed, base_path, output_dir, options) for seed in seeds]
+            variants = [future.result() for future in futures]
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "empty_shop": str(empty_shop_path),
+        "catalog_sha256": hash_catalog(product_data),
+        "base_layer": Path(base_path).name,
+        "options": options,
+        "shard": {"index": shard_index, "count": shard_count,
+                  "seed_start": seeds.start, "seed_stop": seeds.stop},
+        "variants": variants,
+    }
+    manifest_path = get_manifest_path(output_dir, shard_index, shard_count)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(variants)} variants and {manifest_path.name} in {elapsed:.1f}s "
+          f"({len(variants) / elapsed:.1f} variants/s)")
+    return manifest
+
+
+def main():
+    """Command line entry point."""
+    base_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Generate randomized shop layouts as override layers")
+    parser.add_argument("--count", type=int, required=True, help="Total number of variants (all shards)")
+    parser.add_argument("--seed-start", type=int, default=0, help="First seed of the run")
+    parser.add_argument("--shard-index", type=int, default=0, help="Index of this shard")
+    parser.add_argument("--shard-count", type=int, default=1, help="Number of shards (machines)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = no pool)")
+    parser.add_argument("--output-dir", default=str(base_dir / "variants"), help="Output directory")
+    parser.add_argument("--catalog", default=str(base_dir / "assets" / "product_data.json"),
+                        help="Product catalog: .json, .ndjson, .npz or .npy directory")
+    parser.add_argument("--empty-shop", default=str(base_dir / "assets" / "Shop Minimal Empty.usda"),
+                        help="Empty shop USD file")
+    parser.add_argument("--num-products", type=int, default=DEFAULT_OPTIONS["num_products"],
+                        help="Products randomized per variant")
+    parser.add_argument("--rotation", choices=["auto", "euler", "quaternion"], default="auto",
+                        help="Rotation randomization mode")
+    parser.add_argument("--position-jitter", type=float, default=0.0, help="Max position offset per axis")
+    parser.add_argument("--scale-jitter", type=float, default=0.0, help="Max relative scale change")
+    parser.add_argument("--static", action="store_true", help="Author products without physics")
+    parser.add_argument("--format", choices=["usdc", "usda"], default="usdc", help="Variant layer format")
+    args = parser.parse_args()
+
+    try:
+        product_data = load_catalog(args.catalog)
+    except Exception as e:
+        print(f"❌ Failed to load product data: {e}")
+        return
+    if not len(product_data):
+        return
+    options = {
+        "num_products": args.num_products,
+        "rotation": args.rotation,
+        "position_jitter": args.position_jitter,
+        "scale_jitter": args.scale_jitter,
+        "enable_physics": not args.static,
+        "format": args.format,
+    }
+    run_farm(args.empty_shop, product_data, args.output_dir, args.count, args.seed_start,
+             args.shard_index, args.shard_count, args.workers, options)
+
+
+if __name__ == "__main__":
+    main()